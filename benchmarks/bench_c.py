@@ -0,0 +1,102 @@
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_maquina import CONFIGURACOES, ESPERADO, compilar, rodar
+from gerador_c import ErroGeracaoC, ProgramaC
+from gerador_python import ProgramaPython
+from maquina import ErroExecucao, Maquina
+from programas import (SUITE_EXECUCAO, gerar_programa_funcoes, gerar_programa_fluxo, gerar_programa_numerico,
+                       gerar_programa_vetores)
+
+# --------------------------------------------------------------------
+# Backend C (gerador_c) contra a Maquina e a tradução para Python. Confere
+# que o executável construído com o `cc` do sistema termina no mesmo estado
+# (ou no mesmo erro de execução) que a Maquina, na suíte e em programas
+# gerados, com e sem otimização; depois mede, em laços aritméticos gerados
+# (gerar_programa_numerico) de tamanho crescente, o tempo da Maquina, do
+# ProgramaPython e da biblioteca compartilhada chamada via ctypes, além do
+# tempo de construção pelo compilador C.
+# --------------------------------------------------------------------
+
+def iguais(a, b):
+    """ Igualdade de estados em que nan == nan (a conta em reais pode chegar lá nos dois lados). """
+    if isinstance(a, float) and isinstance(b, float):
+        return a == b or (math.isnan(a) and math.isnan(b))
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(iguais(x, y) for x, y in zip(a, b))
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(iguais(a[k], b[k]) for k in a)
+    return a == b
+
+def estado_ou_erro(executar):
+    try:
+        return executar()
+    except ErroExecucao as erro:
+        return str(erro)
+
+def verificar(sementes, tamanho):
+    fontes = list(SUITE_EXECUCAO.values())
+    for semente in range(sementes):
+        fontes += [gerar_programa_fluxo(tamanho, semente), gerar_programa_vetores(tamanho // 10, semente),
+                   gerar_programa_funcoes(tamanho // 10, semente), gerar_programa_numerico(tamanho // 10, 50, semente)]
+    for fonte in fontes:
+        for opcoes in CONFIGURACOES.values():
+            resultado = compilar(fonte, opcoes)
+            esperado = estado_ou_erro(lambda: Maquina(resultado).executar(max_passos=10**7))
+            obtido = estado_ou_erro(ProgramaC(resultado).executar)
+            assert iguais(esperado, obtido), (fonte[:200], opcoes, esperado, obtido)
+    print(f"{len(fontes)} programas: mesmo estado final da Maquina, com e sem otimização.\n")
+
+def melhor_tempo(funcao, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        valor = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return valor, melhor
+
+def linha(programa, nome, resultado, repeticoes):
+    maquina = Maquina(resultado)
+    esperado, tempo_maquina = melhor_tempo(maquina.executar, repeticoes)
+    python = ProgramaPython(resultado)
+    _, tempo_python = melhor_tempo(python.executar, repeticoes)
+    programa_c = ProgramaC(resultado)
+    _, tempo_construcao = melhor_tempo(lambda: programa_c.construir(compartilhado=True), 1)
+    biblioteca = programa_c.carregar()
+    estado, tempo_c = melhor_tempo(lambda: programa_c.executar_biblioteca(biblioteca), repeticoes)
+    assert iguais(estado, esperado), (programa, nome)
+    print(f"{programa:>14}  {nome:>15}  {tempo_maquina:8.3f}s  {tempo_python:8.4f}s  {tempo_c * 1000:7.3f}ms  "
+          f"{tempo_maquina / tempo_c:9.0f}x  {tempo_python / tempo_c:9.0f}x  {tempo_construcao:6.2f}s")
+    return estado
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--repeticoes', type=int, default=3)
+    ap.add_argument('--sementes', type=int, default=3)
+    ap.add_argument('--comandos', type=int, default=30)
+    args = ap.parse_args()
+
+    try:
+        verificar(args.sementes, 300)
+    except ErroGeracaoC as erro:
+        print(erro)
+        return
+
+    print(f"{'programa':>14}  {'configuração':>15}  {'Maquina':>9}  {'Python':>9}  {'C':>9}  {'vs Maquina':>10}  "
+          f"{'vs Python':>10}  {'cc':>7}")
+    for programa, fonte in SUITE_EXECUCAO.items():
+        for nome, opcoes in CONFIGURACOES.items():
+            estado = linha(programa, nome, compilar(fonte, opcoes), args.repeticoes)
+            assert ESPERADO[programa](estado), (programa, nome)
+    for iteracoes in (100, 1000, 10000):
+        fonte = gerar_programa_numerico(args.comandos, iteracoes)
+        for nome, opcoes in CONFIGURACOES.items():
+            linha(f"numerico {iteracoes}", nome, compilar(fonte, opcoes), args.repeticoes)
+
+if __name__ == "__main__":
+    main()
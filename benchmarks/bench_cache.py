@@ -0,0 +1,91 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cache_compilacao import CacheCompilacao
+from compilar_lote import compilar_lote
+from parser import Compilador
+from programas import gerar_programa
+
+# --------------------------------------------------------------------
+# Cache de compilação: lote frio (cache vazio), lote quente (tudo em cache)
+# e lote com alguns arquivos alterados. A saída com cache tem de ser igual à
+# saída sem cache, e o diretório do cache não pode passar do limite.
+# --------------------------------------------------------------------
+
+def ler_saidas(pasta):
+    saidas = {}
+    for raiz, _, nomes in os.walk(pasta):
+        for nome in nomes:
+            with open(os.path.join(raiz, nome)) as file:
+                saidas[os.path.relpath(os.path.join(raiz, nome), pasta)] = file.read()
+    return saidas
+
+def rodar(arquivos, trabalhadores, dir_saida, dir_cache, max_cache=256 * 2**20):
+    inicio = time.perf_counter()
+    relatorios = list(compilar_lote(arquivos, trabalhadores, dir_saida, dir_cache=dir_cache, max_cache=max_cache))
+    decorrido = time.perf_counter() - inicio
+    assert all(rel['sucesso'] for rel in relatorios)
+    return decorrido, sum(bool(rel['cache']) for rel in relatorios)
+
+def tamanho_cache(pasta):
+    return sum(os.path.getsize(os.path.join(raiz, nome)) for raiz, _, nomes in os.walk(pasta) for nome in nomes)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--arquivos', type=int, default=200)
+    ap.add_argument('--comandos', type=int, default=500)
+    ap.add_argument('-j', '--jobs', type=int, default=2)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        fontes = os.path.join(pasta, 'fontes')
+        os.makedirs(fontes)
+        arquivos = []
+        for k in range(args.arquivos):
+            arquivos.append(os.path.join(fontes, f"p{k}.pas"))
+            with open(arquivos[-1], 'w') as file:
+                file.write(gerar_programa(args.comandos, semente=k))
+        dir_cache = os.path.join(pasta, 'cache')
+
+        t_sem, _ = rodar(arquivos, args.jobs, os.path.join(pasta, 'sem'), None)
+        referencia = ler_saidas(os.path.join(pasta, 'sem'))
+        print(f"{args.arquivos} arquivos de {args.comandos} comandos, {args.jobs} processos")
+        print(f"  sem cache:            {t_sem:6.2f}s")
+        for rotulo in ("frio", "quente"):
+            saida = os.path.join(pasta, rotulo)
+            t, acertos = rodar(arquivos, args.jobs, saida, dir_cache)
+            assert ler_saidas(saida) == referencia, f"cache {rotulo}: a saída mudou"
+            print(f"  cache {rotulo + ':':<14} {t:6.2f}s ({acertos}/{len(arquivos)} acertos)")
+        assert acertos == len(arquivos)
+
+        # Um décimo dos arquivos muda: só esses são recompilados.
+        alterados = arquivos[::10]
+        for arquivo in alterados:
+            with open(arquivo, 'a') as file:
+                file.write("# alterado\n")
+        t, acertos = rodar(arquivos, args.jobs, os.path.join(pasta, 'alterado'), dir_cache)
+        assert acertos == len(arquivos) - len(alterados)
+        print(f"  {len(alterados)} alterados:         {t:6.2f}s ({acertos}/{len(arquivos)} acertos)")
+
+        # Limite pequeno: as entradas menos usadas são removidas e o diretório, somado o que
+        # todos os processos gravam, fica abaixo do limite.
+        limite = tamanho_cache(dir_cache) // 4
+        rodar(arquivos, args.jobs, os.path.join(pasta, 'limite'), dir_cache, limite)
+        assert tamanho_cache(dir_cache) <= limite, (tamanho_cache(dir_cache), limite)
+        print(f"  com limite de {limite // 1024} KiB: cache com {tamanho_cache(dir_cache) // 1024} KiB")
+
+        # A AST também pode ser guardada.
+        cache = CacheCompilacao(os.path.join(pasta, 'cache_ast'), guardar_ast=True)
+        compilador = Compilador(lexer_rapido=True)
+        codigo = open(arquivos[1]).read()
+        cache.compilar(compilador, codigo)
+        resultado = cache.compilar(compilador, codigo)
+        assert cache.acertos == 1 and resultado.ast is not None and len(resultado.ast.corpo) == args.comandos
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer_rapido import LexerRapido
+from parser import construir_parser
+from programas import gerar_programa
+
+# --------------------------------------------------------------------
+# Escala do parse: tempo por comando para corpos de 1k a 1M comandos.
+# Com listas construídas por append, o crescimento deve ser quase linear.
+# --------------------------------------------------------------------
+
+def medir_parse(parser, num_comandos):
+    codigo = gerar_programa(num_comandos, comentarios=False)
+    lexer = LexerRapido()
+    # Tokeniza antes de medir, para que o tempo seja só o do parser.
+    lexer.input(codigo)
+    tokens = list(lexer)
+    proximo = iter(tokens).__next__
+    def token():
+        try: return proximo()
+        except StopIteration: return None
+    inicio = time.perf_counter()
+    programa = parser.parse(lexer=lexer, tokenfunc=token)
+    decorrido = time.perf_counter() - inicio
+    assert programa is not None and len(programa.corpo) == num_comandos
+    return decorrido
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--tamanhos', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    ap.add_argument('--tolerancia', type=float, default=2.0,
+                    help="razão máxima entre o tempo por comando do maior e o do segundo menor tamanho")
+    args = ap.parse_args()
+
+    parser = construir_parser()
+    por_comando = []
+    for n in args.tamanhos:
+        t = medir_parse(parser, n)
+        por_comando.append(t / n)
+        print(f"{n:>9} comandos: {t:8.2f}s ({1e6 * t / n:6.1f} µs/comando)")
+
+    # O menor tamanho só aquece caches; a referência é o segundo.
+    referencia = por_comando[1] if len(por_comando) > 1 else por_comando[0]
+    razao = por_comando[-1] / referencia
+    print(f"Razão do tempo por comando (maior / referência): {razao:.2f}")
+    assert razao <= args.tolerancia, "o tempo de parse cresce mais que linearmente"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maquina import ErroExecucao, Maquina
+from parser import Compilador
+from programas import SUITE_EXECUCAO, gerar_programa, gerar_programa_funcoes, gerar_programa_vetores
+
+# --------------------------------------------------------------------
+# Expansão de funções em linha (expansao): chamadas expandidas, variação do
+# número de instruções logo depois da expansão e no código final (-O e
+# reaproveitamento de temporários), e instruções executadas pela Maquina e
+# tempo, com e sem a expansão. Confere que o estado final (ou o erro de
+# execução) não muda, e mostra o efeito do orçamento num programa cheio de
+# chamadas.
+# --------------------------------------------------------------------
+
+CHAMADAS = """var
+    total: integer;
+    k: integer;
+    x: real;
+
+def quadrado(a: integer) :: integer
+begin
+    return a * a;
+end;
+
+def soma3(a: integer, b: integer, c: integer) :: integer
+begin
+    return a + b + c;
+end;
+
+def media(a: real, b: real) :: real
+begin
+    return (a + b) / 2.0;
+end;
+
+def limitar(a: integer) :: integer
+var
+    r: integer;
+begin
+    r := a - a / 1000 * 1000;
+    return r;
+end;
+
+begin
+    k := 1;
+    while k <= 20000 do
+        total := limitar(total + soma3(quadrado(k), quadrado(k + 1), k));
+        x := media(x, 1.0);
+        k := k + 1;
+    end;
+end;
+"""
+
+def rodar(resultado):
+    maquina = Maquina(resultado)
+    inicio = time.perf_counter()
+    try:
+        estado = repr(maquina.executar(max_passos=10**8))
+    except ErroExecucao as erro:
+        estado = str(erro)
+    return estado, maquina.passos, time.perf_counter() - inicio
+
+def tamanho(resultado):
+    return len(resultado.codigo) + sum(len(funcao.codigo) for funcao in resultado.funcoes.values())
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--comandos', type=int, default=500)
+    ap.add_argument('--funcoes', type=int, default=50)
+    ap.add_argument('--sementes', type=int, default=3)
+    args = ap.parse_args()
+
+    corpora = [('chamadas', CHAMADAS)]
+    corpora += [(f"gerado {args.comandos}#{s}", gerar_programa(args.comandos, s)) for s in range(args.sementes)]
+    corpora += [(f"funções {args.funcoes}", gerar_programa_funcoes(args.funcoes)),
+                ("vetores 30", gerar_programa_vetores(30))]
+    corpora += list(SUITE_EXECUCAO.items())
+
+    print(f"{'programa':>16}  {'chamadas':>8}  {'expansão':>16}  {'final -O':>16}  {'passos':>17}  {'tempo':>16}")
+    for nome, fonte in corpora:
+        base = Compilador(lexer_rapido=True, otimizar=True, reusar_temps=True).compilar_codigo(fonte)
+        expandido = Compilador(lexer_rapido=True, otimizar=True, reusar_temps=True, expandir=True).compilar_codigo(fonte)
+        assert base.sucesso and expandido.sucesso, base.erros[:3]
+        expansao = expandido.expansao
+        (estado, passos, tempo), (estado_exp, passos_exp, tempo_exp) = rodar(base), rodar(expandido)
+        assert estado == estado_exp, nome
+        print(f"{nome:>16}  {expansao.chamadas:8}  {expansao.instrucoes_antes:7} {expansao.variacao:+8}  "
+              f"{tamanho(base):7} {tamanho(expandido) - tamanho(base):+8}  {passos:8} {passos_exp - passos:+8}  "
+              f"{tempo:7.3f}s {tempo_exp:7.3f}s")
+
+    print("\nOrçamento no programa 'chamadas' (fração do código que a expansão pode acrescentar):")
+    for orcamento in (0.0, 0.1, 0.25, 0.5, 1.0):
+        resultado = Compilador(lexer_rapido=True, otimizar=True, expandir=True,
+                               orcamento_expansao=orcamento).compilar_codigo(CHAMADAS)
+        _, passos, tempo = rodar(resultado)
+        print(f"  {orcamento:4.2f}: {resultado.expansao.chamadas} chamadas, {resultado.expansao.variacao:+d} instruções "
+              f"na expansão, {tamanho(resultado)} no final, {passos} passos, {tempo:.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_otimizador import executar
+from grafo_fluxo import GrafoFluxo, definicoes_alcancantes, vivacidade_blocos
+from otimizador_tac import eh_temp, max_temporarios_vivos, operandos_lidos
+from parser import Compilador, InstrucaoTAC
+from programas import gerar_programa_fluxo
+
+# --------------------------------------------------------------------
+# Grafo de fluxo e análise de fluxo de dados (grafo_fluxo). Primeiro compara
+# a vivacidade e as definições alcançantes por bloco, em vetores de bits,
+# com uma versão direta por instrução sobre conjuntos, em TAC aleatório com
+# laços, desvios, chamadas e blocos inalcançáveis. Depois confere que o
+# código com if/while otimizado e com temporários reaproveitados executa
+# igual ao original, e mede o tempo do resolvedor contra o número de blocos.
+# --------------------------------------------------------------------
+
+NOMES = ['a', 'b', 'c', 'd', 't0', 't1', 't2', 't3']
+
+def tac_aleatorio(rng, tamanho, num_rotulos):
+    rotulos = [f"L{k}" for k in range(num_rotulos)]
+    codigo = [InstrucaoTAC('label', None, None, rotulo) for rotulo in rotulos]
+    while len(codigo) < tamanho + num_rotulos:
+        escolha = rng.random()
+        destino = rng.choice(NOMES)
+        if escolha < 0.3:
+            codigo.append(InstrucaoTAC(rng.choice(('+', '<', '==')), rng.choice(NOMES), rng.choice(NOMES + [1]), destino))
+        elif escolha < 0.5:
+            codigo.append(InstrucaoTAC(':=', rng.choice(NOMES + [0]), None, destino))
+        elif escolha < 0.55:
+            codigo.append(InstrucaoTAC(':=', rng.choice(NOMES), None, f"v[{rng.choice(NOMES)}]"))
+        elif escolha < 0.6:
+            codigo.append(InstrucaoTAC('call', 'f', 0, destino))
+        elif escolha < 0.75:
+            codigo.append(InstrucaoTAC('ifFalse', rng.choice(NOMES), None, rng.choice(rotulos)))
+        elif escolha < 0.85:
+            codigo.append(InstrucaoTAC('goto', None, None, rng.choice(rotulos)))
+        elif escolha < 0.88:
+            codigo.append(InstrucaoTAC('return', rng.choice(NOMES), None, None))
+        else:
+            codigo.append(InstrucaoTAC(':=', f"v[{rng.choice(NOMES)}]", None, destino))
+    rng.shuffle(codigo)
+    return codigo
+
+def sucessores_instrucao(codigo):
+    rotulos = {instr.dest: i for i, instr in enumerate(codigo) if instr.op == 'label'}
+    sucessores = []
+    for i, instr in enumerate(codigo):
+        s = []
+        if instr.op in ('goto', 'ifFalse'): s.append(rotulos[instr.dest])
+        if instr.op not in ('goto', 'return') and i + 1 < len(codigo): s.append(i + 1)
+        sucessores.append(s)
+    return sucessores
+
+def definido(instr):
+    if instr.op in ('label', 'goto', 'ifFalse', 'param', 'return'): return None
+    dest = instr.dest
+    return dest if type(dest) is str and '[' not in dest and '.' not in dest else None
+
+def vivacidade_referencia(codigo, vivos_na_saida):
+    """ Vivacidade por instrução até o ponto fixo, com conjuntos. """
+    variaveis = {nome for instr in codigo for nome in list(operandos_lidos(instr)) + [definido(instr)]
+                 if nome is not None and not eh_temp(nome)}
+    sucessores = sucessores_instrucao(codigo)
+    entrada = [set() for _ in codigo]
+    saida = [set() for _ in codigo]
+    mudou = True
+    while mudou:
+        mudou = False
+        for i in range(len(codigo) - 1, -1, -1):
+            instr = codigo[i]
+            sai = instr.op == 'return' or (i == len(codigo) - 1 and instr.op != 'goto')
+            fora = set(vivos_na_saida) if sai else set()
+            for s in sucessores[i]: fora |= entrada[s]
+            dentro = fora - {definido(instr)}
+            dentro |= set(operandos_lidos(instr))
+            if instr.op == 'call': dentro |= variaveis
+            if dentro != entrada[i] or fora != saida[i]:
+                entrada[i], saida[i] = dentro, fora
+                mudou = True
+    return entrada, saida
+
+def definicoes_referencia(codigo):
+    sucessores = sucessores_instrucao(codigo)
+    predecessores = [[] for _ in codigo]
+    for i, s in enumerate(sucessores):
+        for j in s: predecessores[j].append(i)
+    entrada = [set() for _ in codigo]
+    saida = [set() for _ in codigo]
+    mudou = True
+    while mudou:
+        mudou = False
+        for i, instr in enumerate(codigo):
+            dentro = set()
+            for p in predecessores[i]: dentro |= saida[p]
+            fora = set(dentro)
+            nome = definido(instr)
+            if nome is not None and not eh_temp(nome):
+                fora = {d for d in fora if d[1] != nome} | {(i, nome)}
+            if instr.op == 'call':
+                fora.add((i, None))
+            if dentro != entrada[i] or fora != saida[i]:
+                entrada[i], saida[i] = dentro, fora
+                mudou = True
+    return entrada, saida
+
+def verificar_solucoes(casos, semente):
+    rng = random.Random(semente)
+    for caso in range(casos):
+        codigo = tac_aleatorio(rng, rng.randint(1, 60), rng.randint(1, 8))
+        grafo = GrafoFluxo(codigo)
+        vivos_na_saida = ('a', 'c')
+        bits, entradas, saidas = vivacidade_blocos(grafo, vivos_na_saida=vivos_na_saida)
+        ref_entrada, ref_saida = vivacidade_referencia(codigo, vivos_na_saida)
+        definicoes, d_entradas, d_saidas = definicoes_alcancantes(grafo)
+        ref_d_entrada, ref_d_saida = definicoes_referencia(codigo)
+        conjunto = lambda b: {definicoes[i] for i in range(len(definicoes)) if b >> i & 1}
+        for bloco in grafo.blocos:
+            primeira, ultima = bloco.inicio, bloco.fim - 1
+            assert set(bits.conjunto(entradas[bloco.indice])) == ref_entrada[primeira], (caso, bloco)
+            assert set(bits.conjunto(saidas[bloco.indice])) == ref_saida[ultima], (caso, bloco)
+            assert conjunto(d_entradas[bloco.indice]) == ref_d_entrada[primeira], (caso, bloco)
+            assert conjunto(d_saidas[bloco.indice]) == ref_d_saida[ultima], (caso, bloco)
+    print(f"Vivacidade e definições alcançantes iguais à referência por instrução em {casos} TAC aleatórios.")
+
+def verificar_execucao(sementes, num_comandos):
+    for semente in range(sementes):
+        fonte = gerar_programa_fluxo(num_comandos, semente)
+        original = Compilador(lexer_rapido=True).compilar_codigo(fonte)
+        assert original.sucesso
+        esperado = executar(original.codigo)
+        for otimizar in (False, True):
+            otimizado = Compilador(lexer_rapido=True, otimizar=otimizar).compilar_codigo(fonte)
+            reusado = Compilador(lexer_rapido=True, otimizar=otimizar, reusar_temps=True).compilar_codigo(fonte)
+            assert reusado.num_temporarios == max_temporarios_vivos(otimizado.codigo)
+            assert executar(otimizado.codigo) == esperado
+            assert executar(reusado.codigo) == esperado
+    print(f"{sementes} programas com if/while: mesmo estado final otimizados e com temporários reaproveitados.")
+
+def compilar(num_comandos, semente):
+    resultado = Compilador(lexer_rapido=True).compilar_codigo(gerar_programa_fluxo(num_comandos, semente, desvios=0.8))
+    assert resultado.sucesso
+    return resultado.codigo
+
+def medir(blocos, semente):
+    # Estima os blocos por comando numa amostra e gera um programa com ~`blocos` blocos.
+    por_comando = len(GrafoFluxo(compilar(1000, semente)).blocos) / 1000
+    codigo = compilar(max(1, int(blocos / por_comando)), semente)
+    tempos = []
+    inicio = time.perf_counter()
+    grafo = GrafoFluxo(codigo)
+    tempos.append(time.perf_counter() - inicio)
+    for analise in (lambda: vivacidade_blocos(grafo), lambda: vivacidade_blocos(grafo, considerar=eh_temp),
+                    lambda: definicoes_alcancantes(grafo)):
+        inicio = time.perf_counter()
+        resultado = analise()
+        tempos.append(time.perf_counter() - inicio)
+    num_definicoes = len(resultado[0])
+    return len(codigo), len(grafo.blocos), num_definicoes, tempos
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--blocos', type=int, nargs='+', default=[1000, 2000, 4000, 8000, 16000, 32000])
+    ap.add_argument('--casos', type=int, default=500)
+    ap.add_argument('--semente', type=int, default=0)
+    args = ap.parse_args()
+
+    verificar_solucoes(args.casos, args.semente)
+    verificar_execucao(5, 400)
+    print(f"\n{'instruções':>10}  {'blocos':>7}  {'definições':>10}  {'grafo':>7}  {'vivos':>7}  {'vivos tN':>8}  "
+          f"{'def. alc.':>9}  {'µs/bloco':>8}")
+    for blocos in args.blocos:
+        instrucoes, n, definicoes, tempos = medir(blocos, args.semente)
+        print(f"{instrucoes:10}  {n:7}  {definicoes:10}  " + "  ".join(f"{t:6.3f}s" for t in tempos[:3])
+              + f"  {tempos[3]:8.3f}s  {1e6 * sum(tempos) / n:8.1f}")
+
+if __name__ == "__main__":
+    main()
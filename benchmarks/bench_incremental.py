@@ -0,0 +1,101 @@
+import argparse
+import io
+import os
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from incremental import CompiladorIncremental
+from parser import Compilador
+from programas import gerar_programa, gerar_programa_funcoes, gerar_programa_vetores
+
+# --------------------------------------------------------------------
+# Compilação incremental: equivalência com a compilação completa sob
+# edições aleatórias (em programas com funções e em programas que indexam
+# vetores, cujas verificações 'limite' dependem do tamanho declarado noutro
+# segmento) e custo de uma edição de uma linha em 25k e 50k linhas.
+# --------------------------------------------------------------------
+
+TRECHOS = ['x', ' ', '\n', ';', 'end;', 'begin', 'var', 'def', 'type', '1', ':=', '"', '#', '(', 'y := 2;\n',
+           'var z: integer;\n', 'total := total + 1;\n', 'aluno', 'real', '[30]', '[i0]', '2', '0']
+
+def programa(n, rng):
+    if rng.random() < 0.5:
+        return gerar_programa_funcoes(rng.randint(1, 12), n)
+    return gerar_programa_vetores(rng.randint(1, 6), n)
+
+def resumo(resultado):
+    if resultado.diagnosticos and resultado.diagnosticos[0].fase == 'sintatico':
+        # Depois do primeiro erro de sintaxe a recuperação depende do contexto do
+        # parse (arquivo inteiro ou segmento), então só o primeiro é comparado.
+        return (resultado.erros[:1], [], {}, None)
+    return (resultado.erros, [repr(i) for i in resultado.codigo],
+            {nome: [repr(i) for i in funcao.codigo] for nome, funcao in resultado.funcoes.items()},
+            sorted(resultado.tabela_simbolos or ()) if not resultado.erros else None)
+
+def verificar_equivalencia(edicoes, semente):
+    rng = random.Random(semente)
+    completo = Compilador(lexer_rapido=True)
+    with redirect_stdout(io.StringIO()):
+        inc = CompiladorIncremental(gerar_programa_funcoes(12, semente) + "\n")
+        for n in range(edicoes):
+            texto = inc.texto
+            inicio = rng.randint(0, len(texto))
+            fim = min(len(texto), inicio + rng.choice([0, 0, 1, 3, 20]))
+            inc.editar(inicio, fim, rng.choice(TRECHOS) if rng.random() < 0.7 else '')
+            if rng.random() < 0.3:
+                # Desfaz parte do estrago para alternar entre programas válidos e inválidos.
+                inc = CompiladorIncremental(programa(n, rng))
+            esperado = resumo(completo.compilar_codigo(inc.texto))
+            obtido = resumo(inc.resultado())
+            if esperado != obtido:
+                raise AssertionError(f"Divergência na edição {n}:\n{inc.texto}\n{esperado}\n{obtido}")
+        # Mudar o tamanho do vetor muda o 'limite' dos acessos nos segmentos seguintes.
+        inc = CompiladorIncremental(gerar_programa_vetores(5, semente))
+        declaracao = inc.texto.index("array [30]")
+        inc.editar(declaracao, declaracao + len("array [30]"), "array [40]")
+        esperado = resumo(completo.compilar_codigo(inc.texto))
+        assert resumo(inc.resultado()) == esperado, "o tamanho novo do vetor não chegou ao 'limite'"
+        assert any(i.startswith('limite') and ', 40 (' in i for i in esperado[1])
+    print(f"Equivalência: {edicoes} edições aleatórias com o mesmo resultado da compilação completa.")
+
+def medir_edicao(num_funcoes):
+    codigo = gerar_programa_funcoes(num_funcoes)
+    linhas = codigo.count('\n')
+    inicio = time.perf_counter()
+    Compilador(lexer_rapido=True).compilar_codigo(codigo)
+    t_completo = time.perf_counter() - inicio
+
+    inc = CompiladorIncremental(codigo)
+    # Troca a constante da primeira linha de comando de uma função no meio do arquivo.
+    alvo = codigo.index(f"def f{num_funcoes // 2}(")
+    linha = codigo.index("    x := a * b + ", alvo)
+    fim_linha = codigo.index("\n", linha)
+    inicio = time.perf_counter()
+    estat = inc.editar(linha, fim_linha, "    x := a * b + 12345;")
+    t_edicao = time.perf_counter() - inicio
+    assert inc.resultado().sucesso
+    print(f"{linhas:>7} linhas: completo {t_completo * 1000:8.1f} ms | edição de uma linha {t_edicao * 1000:6.2f} ms "
+          f"({estat['tokens_relexados']} tokens relexados, {estat['segmentos_reanalisados']} segmentos reanalisados)")
+    return t_completo, t_edicao
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--edicoes', type=int, default=300)
+    ap.add_argument('--semente', type=int, default=0)
+    args = ap.parse_args()
+
+    verificar_equivalencia(args.edicoes, args.semente)
+    t_completo_25k, t_edicao_25k = medir_edicao(2500)
+    t_completo_50k, t_edicao_50k = medir_edicao(5000)
+    # A edição deve custar uma fração ínfima da compilação completa e quase não
+    # crescer quando o arquivo dobra de tamanho.
+    assert t_edicao_50k < t_completo_50k / 50, "edição não é proporcional ao trecho editado"
+    assert t_edicao_50k < 4 * t_edicao_25k + 0.002, "custo da edição cresce com o tamanho do arquivo"
+    print("Custo da edição proporcional ao trecho editado, não ao arquivo.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import io
+import os
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import lexer as lexer_ply, reserved
+import lexer_rapido
+from lexer_rapido import LexerRapido
+from programas import gerar_ate_tamanho
+
+# --------------------------------------------------------------------
+# Equivalência e vazão (tokens/s) do LexerRapido contra o lexer PLY.
+# --------------------------------------------------------------------
+
+FRAGMENTOS = list(reserved) + ['BEGIN', 'End', 'x', 'sala_a', '_t1', 'abc9', '0', '42', '3.14', '7.', '.5',
+    ':=', '==', '!=', '>=', '<=', '>', '<', '=', ':', ';', ',', '.', '+', '-', '*', '/', '(', ')', '[', ']',
+    '"texto"', '"esc \\" aspas"', '"duas\nlinhas"', '"sem fim', '# comentario', '~', '@', '\r', '\\', ' ', '\t', '\n', '\n\n']
+
+def gerar_entrada_aleatoria(rng, tamanho):
+    partes = []
+    for _ in range(tamanho):
+        partes.append(rng.choice(FRAGMENTOS))
+        if rng.random() < 0.5: partes.append(' ')
+    return ''.join(partes)
+
+def tokens_de(lex, data):
+    saida = io.StringIO()
+    with redirect_stdout(saida):
+        lex.lineno = 1
+        lex.input(data)
+        tokens = []
+        while True:
+            tok = lex.token()
+            if tok is None: break
+            tokens.append((tok.type, tok.value, type(tok.value), tok.lineno, tok.lexpos))
+    return tokens, saida.getvalue()
+
+def verificar_equivalencia(casos, semente):
+    rng = random.Random(semente)
+    rapido = LexerRapido()
+    ply = lexer_ply.clone()
+    # Fatias pequenas exercitam a continuação de strings entre fatias.
+    tamanho_original = lexer_rapido.TAMANHO_FATIA
+    lexer_rapido.TAMANHO_FATIA = 16
+    for caso in range(casos):
+        data = gerar_entrada_aleatoria(rng, rng.randint(1, 400))
+        esperado = tokens_de(ply, data)
+        obtido = tokens_de(rapido, data)
+        if esperado != obtido:
+            raise AssertionError(f"Divergência no caso {caso}: {data!r}")
+    lexer_rapido.TAMANHO_FATIA = tamanho_original
+    print(f"Equivalência: {casos} entradas aleatórias com o mesmo fluxo de tokens e mensagens de erro.")
+
+def medir(nome, lex, data):
+    inicio = time.perf_counter()
+    lex.lineno = 1
+    lex.input(data)
+    n = 0
+    token = lex.token
+    while token() is not None:
+        n += 1
+    decorrido = time.perf_counter() - inicio
+    print(f"{nome:>8}: {n} tokens em {decorrido:.2f}s ({n / decorrido:,.0f} tokens/s)")
+    return decorrido
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--megabytes', type=float, default=4.0)
+    ap.add_argument('--casos', type=int, default=500)
+    ap.add_argument('--semente', type=int, default=0)
+    args = ap.parse_args()
+
+    verificar_equivalencia(args.casos, args.semente)
+    data = gerar_ate_tamanho(int(args.megabytes * 1024 * 1024), args.semente)
+    print(f"Fonte gerada: {len(data) / (1024 * 1024):.1f} MB")
+    t_ply = medir('PLY', lexer_ply.clone(), data)
+    t_rapido = medir('rápido', LexerRapido(), data)
+    print(f"Aceleração: {t_ply / t_rapido:.2f}x")
+
+if __name__ == "__main__":
+    main()
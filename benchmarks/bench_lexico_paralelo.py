@@ -0,0 +1,97 @@
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_lexer import FRAGMENTOS
+from lexer_paralelo import LexerParalelo
+from lexer_rapido import LexerRapido
+from programas import gerar_ate_tamanho
+
+# --------------------------------------------------------------------
+# Análise léxica paralela (LexerParalelo): o fluxo de tokens e de erros tem
+# de ser idêntico ao serial, com blocos pequenos que cortam strings de várias
+# linhas (inclusive sem fechamento). Depois mede a aceleração contra o número
+# de processos num arquivo grande, lido por cada processo direto do disco.
+# --------------------------------------------------------------------
+
+def tokens(lexer):
+    saida = io.StringIO()
+    with redirect_stdout(saida):
+        lista = [(t.type, t.value, type(t.value), t.lineno, t.lexpos) for t in iter(lexer.token, None)]
+    return lista, saida.getvalue()
+
+def verificar_equivalencia(pasta, casos, semente):
+    rng = random.Random(semente)
+    fragmentos = FRAGMENTOS + ['"ação ∑"', '\r\n', '"a\n\nb"']
+    caminho = os.path.join(pasta, 'aleatorio.pas')
+    with LexerParalelo(3, tamanho_bloco=40) as paralelo:
+        for caso in range(casos):
+            texto = ''.join(rng.choice(fragmentos) + rng.choice(('', ' ')) for _ in range(rng.randint(1, 400)))
+            serial = LexerRapido()
+            serial.input(texto)
+            paralelo.lineno = 1
+            paralelo.input(texto)
+            if tokens(paralelo) != tokens(serial):
+                raise AssertionError(f"Divergência no caso {caso}: {texto!r}")
+            with open(caminho, 'w', encoding='utf-8', newline='') as file:
+                file.write(texto)
+            serial = LexerRapido()
+            with open(caminho, encoding='utf-8') as file:
+                serial.input(file.read())
+            paralelo.lineno = 1
+            paralelo.input_arquivo(caminho)
+            if tokens(paralelo) != tokens(serial):
+                raise AssertionError(f"Divergência no caso {caso} (arquivo): {texto!r}")
+    print(f"Equivalência: {casos} entradas aleatórias (texto e arquivo) com blocos de 40 caracteres.")
+
+def gravar_fonte(caminho, megabytes, semente):
+    """ Repete um programa gerado até o tamanho pedido (para o léxico basta a sequência de tokens). """
+    pedaco = gerar_ate_tamanho(8 * 2**20, semente)
+    with open(caminho, 'w') as file:
+        for _ in range(max(1, round(megabytes * 2**20 / len(pedaco)))):
+            file.write(pedaco)
+
+def medir(lexer, caminho):
+    inicio = time.perf_counter()
+    lexer.lineno = 1
+    if isinstance(lexer, LexerParalelo):
+        lexer.input_arquivo(caminho)
+    else:
+        with open(caminho) as file:
+            lexer.input(file.read())
+    n = 0
+    ultimo = None
+    for ultimo in iter(lexer.token, None):
+        n += 1
+    return time.perf_counter() - inicio, n, (ultimo.lineno, ultimo.lexpos)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--megabytes', type=float, default=64.0, help="tamanho da fonte (o pedido original é de 500 MB)")
+    ap.add_argument('--trabalhadores', type=int, nargs='+', default=[1, 2, 4, 8])
+    ap.add_argument('--casos', type=int, default=300)
+    ap.add_argument('--semente', type=int, default=0)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        verificar_equivalencia(pasta, args.casos, args.semente)
+        caminho = os.path.join(pasta, 'grande.pas')
+        gravar_fonte(caminho, args.megabytes, args.semente)
+        print(f"Fonte: {os.path.getsize(caminho) / 2**20:.0f} MB, {os.cpu_count()} CPU(s)")
+        t_serial, n, fim = medir(LexerRapido(), caminho)
+        print(f"  {'serial':>10}: {t_serial:7.2f}s ({n / t_serial:,.0f} tokens/s)")
+        for trabalhadores in args.trabalhadores:
+            with LexerParalelo(trabalhadores) as lexer:
+                t, n_paralelo, fim_paralelo = medir(lexer, caminho)
+            assert (n_paralelo, fim_paralelo) == (n, fim)
+            print(f"  {trabalhadores:>2} processos: {t:7.2f}s ({n / t:,.0f} tokens/s, {t_serial / t:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from limites import contar_verificacoes
+from maquina import ErroExecucao, Maquina
+from otimizador_tac import otimizar_tac
+from parser import Compilador, FuncaoTAC, _eliminar_verificacoes
+from programas import SUITE_EXECUCAO, gerar_programa_vetores
+
+# --------------------------------------------------------------------
+# Verificações de limites (limites): quantas instruções 'limite' a análise
+# de intervalos remove no corpus, contadas no código (estáticas) e na
+# execução pela Maquina (dinâmicas). Cada programa é compilado sem -O e
+# passa por otimizar_tac em três versões: com todas as verificações, só com
+# as que a análise não prova e sem nenhuma. Cada 'limite' vira uma única
+# instrução LIMITE da máquina, então a diferença de passos entre as versões
+# conta as verificações executadas. Em laços gerados com limites e passos
+# aleatórios, que muitas vezes saem do vetor, confere que a versão com a
+# eliminação, e a compilação com -O, terminam no mesmo estado ou no mesmo
+# erro que a completa.
+# --------------------------------------------------------------------
+
+LACO = """type
+    dez == array [10] of integer;
+var
+    v: dez;
+    i: integer;
+    j: integer;
+    s: integer;
+begin
+    i := {inicio};
+    while i {op} {fim} do
+        v[{indice}] := i;
+        j := 1;
+        while j <= i do
+            s := s + v[j] * v[i - j + 1];
+            j := j + 1;
+        end;
+        i := i + {passo};
+    end;
+    s := s + {final};
+end;
+"""
+
+# Índices de v[...] nos laços; os restos (com o multiplicador igual ao divisor, ou não)
+# exercitam a regra de x - x / c * c.
+INDICES = ['i', 'i + 1', 'i - 1', 'i * 1', 'i - i / 4 * 4 + 1', 'i - i / 4 * (0 - 4) + 1', 'i - i / (0 - 4) * (0 - 4) + 1']
+
+class _Versao:
+    """ Resultado de compilação com o código do corpo e das funções trocado. """
+    def __init__(self, resultado, codigo, funcoes):
+        self.tabela_simbolos = resultado.tabela_simbolos
+        self.codigo = codigo
+        self.funcoes = funcoes
+
+def versoes(resultado):
+    """ (completa, eliminada, sem verificações) do TAC de um resultado compilado sem -O. """
+    def trocar(f, codigo): return FuncaoTAC(f.nome, f.parametros, f.locais, f.tipo_retorno, codigo)
+    codigo = otimizar_tac(resultado.codigo)
+    funcoes = {nome: trocar(f, otimizar_tac(f.codigo)) for nome, f in resultado.funcoes.items()}
+    eliminadas = {nome: trocar(f, f.codigo) for nome, f in funcoes.items()}
+    inicio = time.perf_counter()
+    codigo_eliminado = _eliminar_verificacoes(codigo, eliminadas, resultado.tabela_simbolos)
+    tempo = time.perf_counter() - inicio
+    def sem(c): return [instr for instr in c if instr.op != 'limite']
+    nenhuma = {nome: trocar(f, sem(f.codigo)) for nome, f in funcoes.items()}
+    return (_Versao(resultado, codigo, funcoes), _Versao(resultado, codigo_eliminado, eliminadas),
+            _Versao(resultado, sem(codigo), nenhuma), tempo)
+
+def estaticas(versao):
+    return contar_verificacoes(versao.codigo) + sum(contar_verificacoes(f.codigo) for f in versao.funcoes.values())
+
+def rodar(versao):
+    maquina = Maquina(versao)
+    try:
+        return repr(maquina.executar(max_passos=10**7)), maquina.passos
+    except ErroExecucao as erro:
+        return str(erro), None
+
+def verificar_lacos(casos, semente):
+    rng = random.Random(semente)
+    compilador = Compilador(lexer_rapido=True)
+    otimizador = Compilador(lexer_rapido=True, otimizar=True)
+    erros = removidas = total = 0
+    for caso in range(casos):
+        fonte = LACO.format(inicio=rng.randint(0, 3), op=rng.choice(['<', '<=', '!=']), fim=rng.randint(5, 12),
+                            indice=rng.choice(INDICES), passo=rng.randint(1, 3), final=rng.choice(['v[{}]', 'v[{}] * 0', '0 * v[{}]']).format(rng.choice(['i', 'j', 's'])))
+        resultado = compilador.compilar_codigo(fonte)
+        assert resultado.sucesso, resultado.erros[:3]
+        completa, eliminada, _, _ = versoes(resultado)
+        saida_completa, saida_eliminada = rodar(completa), rodar(eliminada)
+        assert saida_completa[0] == saida_eliminada[0], (caso, fonte, saida_completa, saida_eliminada)
+        # Com -O (OtimizadorAST, otimizar_tac e a eliminação), um 'v[k] * 0' não pode sumir com o erro.
+        saida_otimizada = rodar(otimizador.compilar_codigo(fonte))
+        assert saida_completa[0] == saida_otimizada[0], (caso, fonte, saida_completa, saida_otimizada)
+        erros += saida_completa[1] is None
+        total += estaticas(completa)
+        removidas += estaticas(completa) - estaticas(eliminada)
+    print(f"{casos} laços aleatórios ({erros} com índice fora dos limites): mesmo estado ou erro depois de remover "
+          f"{removidas} de {total} verificações.\n")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--casos', type=int, default=300)
+    ap.add_argument('--nucleos', type=int, default=100)
+    ap.add_argument('--sementes', type=int, default=3)
+    ap.add_argument('--semente', type=int, default=0)
+    args = ap.parse_args()
+
+    verificar_lacos(args.casos, args.semente)
+
+    corpora = [(f"vetores {args.nucleos}#{s}", gerar_programa_vetores(args.nucleos, s)) for s in range(args.sementes)]
+    corpora += list(SUITE_EXECUCAO.items())
+    print(f"{'programa':>16}  {'estáticas':>9}  {'restantes':>15}  {'dinâmicas':>10}  {'restantes':>18}  {'análise':>8}")
+    compilador = Compilador(lexer_rapido=True)
+    totais = [0, 0, 0, 0]
+    for nome, fonte in corpora:
+        resultado = compilador.compilar_codigo(fonte)
+        assert resultado.sucesso, resultado.erros[:3]
+        completa, eliminada, nenhuma, tempo = versoes(resultado)
+        (estado, passos), (estado_eliminada, passos_eliminada), (estado_nenhuma, passos_nenhuma) = (
+            rodar(completa), rodar(eliminada), rodar(nenhuma))
+        assert estado == estado_eliminada == estado_nenhuma, nome
+        antes, depois = estaticas(completa), estaticas(eliminada)
+        executadas, restantes = passos - passos_nenhuma, passos_eliminada - passos_nenhuma
+        for k, valor in enumerate((antes, depois, executadas, restantes)): totais[k] += valor
+        print(f"{nome:>16}  {antes:9}  {depois:6} ({1 - depois / max(antes, 1):6.1%})  {executadas:10}  "
+              f"{restantes:9} ({1 - restantes / max(executadas, 1):6.1%})  {tempo * 1000:6.1f}ms")
+    antes, depois, executadas, restantes = totais
+    print(f"{'total':>16}  {antes:9}  {depois:6} ({1 - depois / antes:6.1%})  {executadas:10}  "
+          f"{restantes:9} ({1 - restantes / executadas:6.1%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maquina import ErroExecucao, Maquina
+from parser import Compilador
+from programas import SUITE_EXECUCAO, gerar_programa_fluxo, gerar_programa_vetores
+
+# --------------------------------------------------------------------
+# Máquina virtual (maquina): instruções por segundo na suíte de programas
+# Paston (SUITE_EXECUCAO), sem otimização e com -O e reaproveitamento de
+# temporários. Confere o resultado conhecido de cada programa e, em
+# programas gerados com if/while e vetores de records, que as duas versões
+# do TAC terminam no mesmo estado (ou no mesmo erro de execução).
+# --------------------------------------------------------------------
+
+CONFIGURACOES = {
+    'sem otimização': {},
+    '-O + temps': {'otimizar': True, 'reusar_temps': True},
+}
+
+def _passos_collatz(n):
+    passos = 0
+    while n != 1:
+        n = n // 2 if n % 2 == 0 else 3 * n + 1
+        passos += 1
+    return passos
+
+def _ordenado(estado):
+    return estado['v'] == sorted(estado['v']) and len(set(estado['v'])) > 1
+
+ESPERADO = {
+    'fibonacci': lambda estado: estado['r'] == 6765,
+    'primos': lambda estado: estado['total'] == 669,
+    'ordenacao': _ordenado,
+    'integral': lambda estado: abs(estado['soma'] - math.pi) < 1e-8,
+    'collatz': lambda estado: estado['passos'] == sum(_passos_collatz(n) for n in range(1, 3000)),
+}
+
+def compilar(fonte, opcoes):
+    resultado = Compilador(lexer_rapido=True, **opcoes).compilar_codigo(fonte)
+    assert resultado.sucesso, resultado.erros[:3]
+    return resultado
+
+def rodar(maquina):
+    try:
+        return repr(maquina.executar(max_passos=10**7))
+    except ErroExecucao as erro:
+        return str(erro)
+
+def verificar_gerados(sementes, tamanho):
+    for semente in range(sementes):
+        for fonte in (gerar_programa_fluxo(tamanho, semente), gerar_programa_vetores(tamanho // 10, semente)):
+            estados = {rodar(Maquina(compilar(fonte, opcoes))) for opcoes in CONFIGURACOES.values()}
+            assert len(estados) == 1, (semente, estados)
+    print(f"{2 * sementes} programas gerados: mesmo estado final com e sem otimização.\n")
+
+def medir(maquina, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        estado = maquina.executar()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return estado, melhor
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--repeticoes', type=int, default=3)
+    ap.add_argument('--sementes', type=int, default=5)
+    args = ap.parse_args()
+
+    verificar_gerados(args.sementes, 300)
+
+    print(f"{'programa':>12}  {'configuração':>15}  {'código':>7}  {'instruções':>11}  {'tempo':>8}  {'instruções/s':>13}")
+    totais = {nome: [0, 0.0] for nome in CONFIGURACOES}
+    for programa, fonte in SUITE_EXECUCAO.items():
+        for nome, opcoes in CONFIGURACOES.items():
+            maquina = Maquina(compilar(fonte, opcoes))
+            estado, tempo = medir(maquina, args.repeticoes)
+            assert ESPERADO[programa](estado), (programa, nome)
+            totais[nome][0] += maquina.passos
+            totais[nome][1] += tempo
+            tamanho = len(maquina.codigo) + sum(len(funcao.codigo) for funcao in maquina.funcoes)
+            print(f"{programa:>12}  {nome:>15}  {tamanho:7}  {maquina.passos:11}  {tempo:7.3f}s  "
+                  f"{maquina.passos / tempo:13,.0f}")
+    for nome, (passos, tempo) in totais.items():
+        print(f"{'total':>12}  {nome:>15}  {'':7}  {passos:11}  {tempo:7.3f}s  {passos / tempo:13,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parser
+from parser import ASTNode, AnalisadorSemantico, GeradorCI, Compilador
+from programas import gerar_programa
+
+# --------------------------------------------------------------------
+# Memória da AST (tracemalloc): nós com __slots__ contra cópias das mesmas
+# classes com __dict__ por instância, como eram antes.
+# --------------------------------------------------------------------
+
+def classes_com_dict():
+    """ Recria cada subclasse de ASTNode sem __slots__, com o mesmo nome e __init__. """
+    base = type('ASTNode', (), {'__repr__': ASTNode.__repr__})
+    classes = {cls.__name__: type(cls.__name__, (base,), {'__init__': cls.__init__})
+               for cls in ASTNode.__subclasses__()}
+    classes['ASTNode'] = base
+    return classes
+
+def contar_nos(no):
+    if isinstance(no, list):
+        return sum(contar_nos(item) for item in no)
+    if not isinstance(no, ASTNode) and not hasattr(no, '__dict__'):
+        return 0
+    return 1 + sum(contar_nos(getattr(no, campo)) for campo in campos(no))
+
+def campos(no):
+    return vars(no) if hasattr(no, '__dict__') else [c for cls in type(no).__mro__ for c in getattr(cls, '__slots__', ())]
+
+def medir(codigo, rotulo):
+    compilador = Compilador(lexer_rapido=True)
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    compilador.lexer.input(codigo)
+    arvore = compilador.parser.parse(lexer=compilador.lexer)
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    nos = contar_nos(arvore)
+    # As duas fases seguintes continuam funcionando sobre a mesma AST.
+    AnalisadorSemantico().visitar(arvore)
+    gerador = GeradorCI()
+    gerador.visitar(arvore)
+    bytes_ast = depois - antes
+    print(f"{rotulo:>10}: {nos} nós, {bytes_ast / 1024 / 1024:7.1f} MB, {bytes_ast / nos:6.1f} bytes/nó "
+          f"(inclui as listas e os valores folha), {len(gerador.codigo)} instruções TAC")
+    return bytes_ast / nos
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--comandos', type=int, default=50000)
+    args = ap.parse_args()
+    codigo = gerar_programa(args.comandos)
+
+    originais = {cls.__name__: cls for cls in ASTNode.__subclasses__()}
+    originais['ASTNode'] = ASTNode
+    substitutas = classes_com_dict()
+    vars(parser).update(substitutas)
+    try:
+        com_dict = medir(codigo, '__dict__')
+    finally:
+        vars(parser).update(originais)
+    com_slots = medir(codigo, '__slots__')
+    print(f"Redução: {100 * (1 - com_slots / com_dict):.0f}% por nó")
+
+if __name__ == "__main__":
+    main()
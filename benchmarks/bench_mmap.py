@@ -0,0 +1,129 @@
+import argparse
+import io
+import os
+import random
+import subprocess
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from bench_lexer import FRAGMENTOS
+from lexer_rapido import LexerRapido
+from parser import Compilador
+from programas import gerar_ate_tamanho
+
+# --------------------------------------------------------------------
+# Leitura por mmap em janelas (LexerRapido.input_arquivo): o fluxo de tokens
+# tem de ser igual ao da leitura do arquivo inteiro, com janelas bem menores
+# que o arquivo, cortando linhas, strings, comentários, números, '\r\n' e
+# caracteres UTF-8 de vários bytes. Depois compara o pico de memória (RSS) de
+# um processo novo lendo o arquivo inteiro contra o mmap.
+# --------------------------------------------------------------------
+
+EXTRAS = ['"ação ü ∑"', '# comentário €', '\r\n', 'variável', '"linha\r\nquebrada"', '123456789', '3.14159']
+
+SCRIPT = """
+import sys
+sys.path.insert(0, sys.argv[1])
+def pico_rss():
+    # VmHWM recomeça no exec; ru_maxrss herdaria o pico do processo pai.
+    with open('/proc/self/status') as status:
+        return next(int(linha.split()[1]) for linha in status if linha.startswith('VmHWM:'))
+from lexer_rapido import LexerRapido
+from parser import Compilador
+caminho, modo, fase = sys.argv[2:5]
+base = pico_rss()
+if fase == 'lexico':
+    lexer = LexerRapido()
+    if modo == 'mmap':
+        lexer.input_arquivo(caminho)
+    else:
+        with open(caminho) as file:
+            lexer.input(file.read())
+    n = sum(1 for _ in iter(lexer.token, None))
+else:
+    resultado = Compilador(lexer_rapido=True).compilar_arquivo(caminho, mmap=(modo == 'mmap'))
+    assert resultado.sucesso
+    n = len(resultado.codigo)
+print(n, base, pico_rss())
+"""
+
+def tokens(lexer):
+    saida = io.StringIO()
+    with redirect_stdout(saida):
+        lista = [(t.type, t.value, type(t.value), t.lineno, t.lexpos) for t in iter(lexer.token, None)]
+    return lista, saida.getvalue()
+
+def tac(resultado):
+    assert resultado.sucesso
+    return [(i.op, i.arg1, i.arg2, i.dest) for i in resultado.codigo]
+
+def verificar_equivalencia(pasta, casos, semente):
+    rng = random.Random(semente)
+    fragmentos = FRAGMENTOS + EXTRAS
+    caminho = os.path.join(pasta, 'aleatorio.pas')
+    for caso in range(casos):
+        texto = ''.join(rng.choice(fragmentos) + rng.choice(('', ' ')) for _ in range(rng.randint(1, 600)))
+        with open(caminho, 'w', encoding='utf-8', newline='') as file:
+            file.write(texto)
+        with open(caminho, encoding='utf-8') as file:
+            inteiro = LexerRapido()
+            inteiro.input(file.read())
+        esperado = tokens(inteiro)
+        janela = rng.choice((1, 2, 3, 7, 64, 1000))
+        em_janelas = LexerRapido()
+        em_janelas.input_arquivo(caminho, janela)
+        if tokens(em_janelas) != esperado:
+            raise AssertionError(f"Divergência no caso {caso} (janela de {janela} bytes): {texto!r}")
+    print(f"Equivalência: {casos} arquivos aleatórios lidos em janelas de 1 a 1000 bytes.")
+
+def medir(caminho, modo, fase):
+    saida = subprocess.run([sys.executable, '-c', SCRIPT, RAIZ, caminho, modo, fase],
+                           capture_output=True, text=True, check=True).stdout
+    n, base, pico = map(int, saida.split())
+    return n, base, pico
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--megabytes', type=float, default=64.0)
+    ap.add_argument('--compilar-megabytes', type=float, default=4.0)
+    ap.add_argument('--casos', type=int, default=300)
+    ap.add_argument('--so-memoria', action='store_true', help="pula as verificações de equivalência")
+    ap.add_argument('--semente', type=int, default=0)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        # Um programa real várias vezes maior que a janela: mesmos tokens e mesmo TAC.
+        caminho = os.path.join(pasta, 'programa.pas')
+        with open(caminho, 'w') as file:
+            file.write(gerar_ate_tamanho(int(args.compilar_megabytes * 2**20), args.semente))
+        if not args.so_memoria:
+            verificar_equivalencia(pasta, args.casos, args.semente)
+            inteiro, mapeado = LexerRapido(), LexerRapido()
+            with open(caminho) as file:
+                inteiro.input(file.read())
+            mapeado.input_arquivo(caminho, 4096)
+            assert tokens(inteiro) == tokens(mapeado)
+            del inteiro, mapeado
+            compilador = Compilador(lexer_rapido=True)
+            assert tac(compilador.compilar_arquivo(caminho)) == tac(compilador.compilar_arquivo(caminho, mmap=True))
+            print(f"Programa de {os.path.getsize(caminho) / 2**20:.1f} MB: mesmos tokens e mesmo TAC com janelas de 4 KiB.")
+
+        print(f"\n{'fase':>9}  {'tamanho':>8}  {'leitura':>8}  {'RSS pico':>9}  {'acima da partida':>16}")
+        grande = os.path.join(pasta, 'grande.pas')
+        with open(grande, 'w') as file:
+            file.write(gerar_ate_tamanho(int(args.megabytes * 2**20), args.semente))
+        for fase, arquivo in (('lexico', grande), ('compilar', caminho)):
+            tamanho = os.path.getsize(arquivo) / 2**20
+            contagens = set()
+            for modo in ('inteiro', 'mmap'):
+                n, base, pico = medir(arquivo, modo, fase)
+                contagens.add(n)
+                print(f"{fase:>9}  {tamanho:6.1f}MB  {modo:>8}  {pico / 1024:7.1f}MB  {(pico - base) / 1024:14.1f}MB")
+            assert len(contagens) == 1
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import argparse
+import copy
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from otimizador_tac import RELACIONAIS, eh_acesso, eh_temp, ler_acesso, otimizar_tac
+from parser import Compilador
+from programas import gerar_programa, gerar_programa_fluxo, gerar_programa_funcoes
+
+# --------------------------------------------------------------------
+# Otimização: instruções TAC removidas por arquivo do corpus gerado, só com o
+# otimizador do TAC e com o pipeline completo (OtimizadorAST + otimizar_tac).
+# Cada versão (o corpo principal e o de cada função) é executada por um
+# interpretador de referência e o estado final das variáveis tem de ser o
+# mesmo do código sem otimização.
+# --------------------------------------------------------------------
+
+def corpus(num_programas, num_comandos):
+    for semente in range(num_programas):
+        yield f"programa {semente}", gerar_programa(num_comandos, semente)
+    yield "funções", gerar_programa_funcoes(200)
+    yield "if/while", gerar_programa_fluxo(num_comandos)
+
+def _inicial(caminho):
+    # Valor inicial determinístico e diferente de 0 e 1 para cada posição de memória.
+    return sum(map(ord, caminho)) % 97 + 2
+
+def _inteiro(valor):
+    # Inteiros de 64 bits com sinal, como numa máquina: evita números que crescem sem limite.
+    return (valor + 2**63) % 2**64 - 2**63 if type(valor) is int else valor
+
+def executar(codigo):
+    """ Interpretador de referência do TAC. As chamadas somam os argumentos e, para
+    exercitar a invalidação, também escrevem em i0 e em sala_a[1].matricula; o
+    'return' termina a execução e guarda o valor em '<retorno>'. Devolve o estado
+    final, caminho ('a[1].f') -> valor como texto (repr, para que nan == nan),
+    das posições escritas que não são temporários. """
+    memoria = {}
+
+    def ler(operando):
+        if type(operando) is not str: return operando
+        if not eh_acesso(operando):
+            return memoria.get(operando, _inicial(operando))
+        base, partes = ler_acesso(operando)
+        valor, caminho = memoria.get(base, {}), base
+        for tipo, chave in partes:
+            chave = ler(chave) if tipo == '[' else chave
+            caminho += f"[{chave}]" if tipo == '[' else f".{chave}"
+            valor = valor.get(chave, {}) if type(valor) is dict else {}
+        return valor if valor != {} else _inicial(caminho)
+
+    def escrever(destino, valor):
+        if type(valor) is dict: valor = copy.deepcopy(valor)   # atribuição de record/vetor copia
+        if not eh_acesso(destino):
+            memoria[destino] = valor
+            return
+        base, partes = ler_acesso(destino)
+        # Um record ainda não escrito lido por inteiro vale um número; vira um dict na primeira escrita.
+        atual = memoria
+        for tipo, chave in ((None, base),) + partes[:-1]:
+            chave = ler(chave) if tipo == '[' else chave
+            if type(atual.get(chave)) is not dict: atual[chave] = {}
+            atual = atual[chave]
+        tipo, chave = partes[-1]
+        atual[ler(chave) if tipo == '[' else chave] = valor
+
+    rotulos = {instr.dest: i for i, instr in enumerate(codigo) if instr.op == 'label'}
+    params = []
+    pc = 0
+    while pc < len(codigo):
+        instr = codigo[pc]
+        pc += 1
+        op = instr.op
+        if op == ':=':
+            escrever(instr.dest, ler(instr.arg1))
+        elif op in ('+', '-', '*', '/'):
+            a, b = ler(instr.arg1), ler(instr.arg2)
+            if op == '+': r = a + b
+            elif op == '-': r = a - b
+            elif op == '*': r = a * b
+            elif type(a) is int and type(b) is int: r = int(a / b) if b else 0
+            else: r = a / b if b else 0.0
+            escrever(instr.dest, _inteiro(r))
+        elif op in RELACIONAIS:
+            escrever(instr.dest, int(RELACIONAIS[op](ler(instr.arg1), ler(instr.arg2))))
+        elif op == 'goto':
+            pc = rotulos[instr.dest]
+        elif op == 'ifFalse':
+            if not ler(instr.arg1): pc = rotulos[instr.dest]
+        elif op == 'param':
+            params.append(ler(instr.arg1))
+        elif op == 'call':
+            args = params[-instr.arg2:] if instr.arg2 else []
+            del params[len(params) - instr.arg2:]
+            resultado = _inteiro(sum(args) + len(instr.arg1))
+            escrever('i0', resultado)
+            escrever('sala_a[1].matricula', resultado)
+            escrever(instr.dest, resultado)
+        elif op == 'return':
+            if instr.arg1 is not None: memoria['<retorno>'] = ler(instr.arg1)
+            break
+
+    estado = {}
+    def achatar(caminho, valor):
+        if type(valor) is not dict:
+            estado[caminho] = repr(valor)
+            return
+        for chave, v in valor.items():
+            achatar(caminho + (f"[{chave}]" if type(chave) is int else f".{chave}"), v)
+    for nome, valor in memoria.items():
+        if not eh_temp(nome): achatar(nome, valor)
+    return estado
+
+def mesmo_estado(a, b):
+    """ Compara dois estados de executar(). Uma posição que só um deles escreveu tem de
+    valer, no outro, o valor inicial: a otimização pode tirar uma escrita que não muda nada. """
+    return all(a.get(caminho, repr(_inicial(caminho))) == b.get(caminho, repr(_inicial(caminho)))
+               for caminho in a.keys() | b.keys())
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--programas', type=int, default=10)
+    ap.add_argument('--comandos', type=int, default=2000)
+    args = ap.parse_args()
+
+    normal = Compilador(lexer_rapido=True)
+    otimizado = Compilador(lexer_rapido=True, otimizar=True)
+    totais = [0, 0, 0]
+    t_normal = t_otimizado = 0.0
+    print(f"{'arquivo':>12}  {'sem otim.':>9}  {'só TAC':>15}  {'AST + TAC':>15}")
+    for nome, codigo in corpus(args.programas, args.comandos):
+        inicio = time.perf_counter()
+        antes = normal.compilar_codigo(codigo)
+        t_normal += time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        depois = otimizado.compilar_codigo(codigo)
+        t_otimizado += time.perf_counter() - inicio
+        assert antes.sucesso and depois.sucesso, (antes.erros, depois.erros)
+        so_tac = otimizar_tac(antes.codigo)
+        funcoes_so_tac = {nome_funcao: otimizar_tac(f.codigo) for nome_funcao, f in antes.funcoes.items()}
+
+        corpos = [('', antes.codigo, so_tac, depois.codigo)]
+        corpos += [(f" (função {nome_funcao})", f.codigo, funcoes_so_tac[nome_funcao], depois.funcoes[nome_funcao].codigo)
+                   for nome_funcao, f in antes.funcoes.items()]
+        for rotulo, original, otimizado_tac, otimizado_completo in corpos:
+            esperado = executar(original)
+            assert mesmo_estado(executar(otimizado_tac), esperado), f"{nome}{rotulo}: otimizar_tac mudou o resultado"
+            assert mesmo_estado(executar(otimizado_completo), esperado), \
+                f"{nome}{rotulo}: o pipeline completo mudou o resultado"
+
+        def tamanho(codigo, funcoes): return len(codigo) + sum(len(c) for c in funcoes)
+        contagens = (tamanho(antes.codigo, [f.codigo for f in antes.funcoes.values()]),
+                     tamanho(so_tac, funcoes_so_tac.values()),
+                     tamanho(depois.codigo, [f.codigo for f in depois.funcoes.values()]))
+        for i, n in enumerate(contagens): totais[i] += n
+        n0 = contagens[0]
+        print(f"{nome:>12}  {n0:9}  {contagens[1]:7} ({100 * (n0 - contagens[1]) / n0:4.1f}%)  "
+              f"{contagens[2]:7} ({100 * (n0 - contagens[2]) / n0:4.1f}%)")
+
+    n0 = totais[0]
+    print(f"{'total':>12}  {n0:9}  {totais[1]:7} ({100 * (n0 - totais[1]) / n0:4.1f}%)  "
+          f"{totais[2]:7} ({100 * (n0 - totais[2]) / n0:4.1f}%)")
+    print("Mesmo estado final das variáveis em todas as versões.")
+    print(f"Tempo de compilação: {t_normal:.2f}s sem otimização, {t_otimizado:.2f}s com otimização")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# --------------------------------------------------------------------
+# Partida a frio: tempo do import do compilador até o fim da primeira
+# compilação de um arquivo pequeno, em um processo novo a cada medida, com e
+# sem cache de bytecode. O caminho de produção carrega lextab.py e
+# parsetab.py prontos e não pode gravar nada, nem na pasta do pacote nem no
+# diretório corrente. Para comparação, o caminho de desenvolvimento valida as
+# regras do lexer e a gramática (lex.lex() e yacc.yacc() padrão).
+# --------------------------------------------------------------------
+
+PROGRAMA = "var\n    x: integer;\n\nbegin\n    x := 1 + 2 * 3;\nend;\n"
+
+SCRIPT = """
+import sys, time
+inicio = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+from parser import Compilador
+import_feito = time.perf_counter()
+compilador = Compilador()
+parser_pronto = time.perf_counter()
+resultado = compilador.compilar_codigo(sys.argv[2])
+assert resultado.sucesso
+fim = time.perf_counter()
+extra = 0.0
+if sys.argv[3] == 'desenvolvimento':
+    import ply.lex as lex
+    import lexer, parser
+    antes = time.perf_counter()
+    lex.lex(module=lexer)
+    parser.construir_parser(desenvolvimento=True)
+    extra = time.perf_counter() - antes
+print(import_feito - inicio, parser_pronto - import_feito, fim - parser_pronto, extra)
+"""
+
+def arquivos_do_pacote():
+    return {nome: os.stat(os.path.join(RAIZ, nome)).st_mtime_ns for nome in os.listdir(RAIZ)
+            if os.path.isfile(os.path.join(RAIZ, nome))}
+
+def medir(modo, ambiente, repeticoes, cwd):
+    medidas = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        saida = subprocess.run([sys.executable, '-c', SCRIPT, RAIZ, PROGRAMA, modo], env=ambiente, cwd=cwd,
+                               capture_output=True, text=True, check=True).stdout
+        total = time.perf_counter() - inicio
+        medidas.append([float(x) for x in saida.split()] + [total])
+    return [statistics.median(coluna) for coluna in zip(*medidas)]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--repeticoes', type=int, default=15)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as cwd, tempfile.TemporaryDirectory() as cache_bytecode:
+        com_cache = dict(os.environ, PYTHONPYCACHEPREFIX=cache_bytecode)
+        com_cache.pop('PYTHONDONTWRITEBYTECODE', None)
+        sem_cache = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+        # Aquece o cache de bytecode.
+        subprocess.run([sys.executable, '-c', SCRIPT, RAIZ, PROGRAMA, 'producao'], env=com_cache, cwd=cwd, check=True,
+                       capture_output=True)
+
+        antes = arquivos_do_pacote()
+        print(f"{'bytecode':>12}  {'import':>8}  {'parser':>8}  {'1º parse':>8}  {'import→fim':>10}  {'processo':>9}  "
+              f"{'validação (dev)':>15}")
+        for rotulo, ambiente in (("em cache", com_cache), ("sem cache", sem_cache)):
+            t_import, t_parser, t_parse, _, t_total = medir('producao', ambiente, args.repeticoes, cwd)
+            validacao = medir('desenvolvimento', ambiente, max(3, args.repeticoes // 3), cwd)[3]
+            print(f"{rotulo:>12}  {1e3 * t_import:6.1f}ms  {1e3 * t_parser:6.1f}ms  {1e3 * t_parse:6.1f}ms  "
+                  f"{1e3 * (t_import + t_parser + t_parse):8.1f}ms  {1e3 * t_total:7.1f}ms  {1e3 * validacao:13.1f}ms")
+        assert arquivos_do_pacote() == antes, "a compilação gravou arquivos na pasta do pacote"
+        assert not os.listdir(cwd), "a compilação gravou arquivos no diretório corrente"
+    print("Nenhum arquivo gravado pela partida de produção.")
+
+if __name__ == "__main__":
+    main()
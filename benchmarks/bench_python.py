@@ -0,0 +1,72 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_maquina import CONFIGURACOES, ESPERADO, rodar
+from gerador_python import CacheCodigos, ProgramaPython
+from maquina import ErroExecucao, Maquina
+from parser import Compilador
+from programas import SUITE_EXECUCAO, gerar_programa_funcoes, gerar_programa_fluxo, gerar_programa_vetores
+
+# --------------------------------------------------------------------
+# Tradução do TAC para Python (gerador_python) contra a interpretação do
+# TAC pela Maquina, nos programas aritméticos de SUITE_EXECUCAO. Confere
+# que os dois terminam no mesmo estado (ou no mesmo erro de execução) em
+# programas gerados, com e sem otimização; mede o tempo de execução, o da
+# tradução com compile() e o de um acerto do CacheCodigos.
+# --------------------------------------------------------------------
+
+def rodar_python(programa):
+    try:
+        return repr(programa.executar())
+    except ErroExecucao as erro:
+        return str(erro)
+
+def verificar_gerados(sementes, tamanho):
+    for semente in range(sementes):
+        for fonte in (gerar_programa_fluxo(tamanho, semente), gerar_programa_vetores(tamanho // 10, semente),
+                      gerar_programa_funcoes(tamanho // 10, semente)):
+            for opcoes in CONFIGURACOES.values():
+                resultado = Compilador(lexer_rapido=True, **opcoes).compilar_codigo(fonte)
+                assert resultado.sucesso, resultado.erros[:3]
+                assert rodar(Maquina(resultado)) == rodar_python(ProgramaPython(resultado)), (semente, opcoes)
+    print(f"{3 * sementes} programas gerados: mesmo estado final da Maquina, com e sem otimização.\n")
+
+def melhor_tempo(funcao, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        valor = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return valor, melhor
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--repeticoes', type=int, default=3)
+    ap.add_argument('--sementes', type=int, default=5)
+    args = ap.parse_args()
+
+    verificar_gerados(args.sementes, 300)
+
+    print(f"{'programa':>12}  {'configuração':>15}  {'Maquina':>9}  {'Python':>9}  {'aceleração':>10}  "
+          f"{'tradução':>9}  {'cache':>9}")
+    for programa, fonte in SUITE_EXECUCAO.items():
+        for nome, opcoes in CONFIGURACOES.items():
+            compilador = Compilador(lexer_rapido=True, **opcoes)
+            resultado = compilador.compilar_codigo(fonte)
+            maquina = Maquina(resultado)
+            esperado, tempo_maquina = melhor_tempo(maquina.executar, args.repeticoes)
+            python, tempo_traducao = melhor_tempo(lambda: ProgramaPython(resultado), args.repeticoes)
+            estado, tempo_python = melhor_tempo(python.executar, args.repeticoes)
+            assert estado == esperado and ESPERADO[programa](estado), (programa, nome)
+            cache = CacheCodigos()
+            cache.programa(compilador, fonte)
+            _, tempo_cache = melhor_tempo(lambda: cache.programa(compilador, fonte), args.repeticoes)
+            print(f"{programa:>12}  {nome:>15}  {tempo_maquina:8.3f}s  {tempo_python:8.4f}s  "
+                  f"{tempo_maquina / tempo_python:9.1f}x  {tempo_traducao * 1000:7.2f}ms  {tempo_cache * 1e6:7.1f}µs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_fluxo import tac_aleatorio
+from bench_otimizador import executar
+from otimizador_tac import OPERADORES, otimizar_tac
+from parser import Compilador
+from programas import gerar_programa_fluxo, gerar_programa_vetores
+from ssa import construir_ssa, numerar_valores_ssa, sair_ssa, verificar_ssa
+
+# --------------------------------------------------------------------
+# Forma SSA e numeração de valores global (ssa). Confere os invariantes
+# com verificar_ssa logo após a construção e depois da numeração, em TAC
+# aleatório (laços, blocos inalcançáveis, chamadas, escritas em memória) e
+# no código compilado; confere que o código otimizado executa igual ao
+# original; e compara as instruções aritméticas restantes com a otimização
+# só local (global_=False) e com a numeração global.
+# --------------------------------------------------------------------
+
+def conferir(codigo, caso):
+    ssa = construir_ssa(codigo)
+    problemas = verificar_ssa(ssa)
+    assert not problemas, (caso, 'construção', problemas[:3])
+    numerar_valores_ssa(ssa)
+    problemas = verificar_ssa(ssa)
+    assert not problemas, (caso, 'numeração', problemas[:3])
+    return sair_ssa(ssa)
+
+def verificar_aleatorio(casos, semente):
+    rng = random.Random(semente)
+    for caso in range(casos):
+        conferir(tac_aleatorio(rng, rng.randint(1, 60), rng.randint(1, 8)), caso)
+    print(f"Invariantes SSA conferidos em {casos} TAC aleatórios, antes e depois da numeração global.")
+
+def aritmeticas(codigo):
+    return sum(1 for instr in codigo if instr.op in OPERADORES)
+
+def compilar(fonte):
+    resultado = Compilador(lexer_rapido=True).compilar_codigo(fonte)
+    assert resultado.sucesso, resultado.erros[:3]
+    return resultado.codigo
+
+def verificar_execucao(sementes, tamanho):
+    for semente in range(sementes):
+        for fonte in (gerar_programa_fluxo(tamanho, semente), gerar_programa_vetores(tamanho // 10, semente)):
+            codigo = compilar(fonte)
+            esperado = executar(codigo)
+            assert executar(conferir(codigo, semente)) == esperado
+            assert executar(otimizar_tac(codigo)) == esperado
+    print(f"{2 * sementes} programas com if/while: invariantes conferidos e mesmo estado final com a numeração global.")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--casos', type=int, default=500)
+    ap.add_argument('--nucleos', type=int, nargs='+', default=[100, 1000, 10000])
+    ap.add_argument('--semente', type=int, default=0)
+    args = ap.parse_args()
+
+    verificar_aleatorio(args.casos, args.semente)
+    verificar_execucao(5, 400)
+
+    print(f"\n{'corpus':>16}  {'instruções':>10}  {'aritm.':>7}  {'só local':>16}  {'global':>16}  {'tempo -O':>9}")
+    corpora = [(f"fluxo {n * 10}", gerar_programa_fluxo(n * 10, args.semente)) for n in args.nucleos[:1]]
+    corpora += [(f"vetores {n}", gerar_programa_vetores(n, args.semente)) for n in args.nucleos]
+    for nome, fonte in corpora:
+        codigo = compilar(fonte)
+        local = aritmeticas(otimizar_tac(codigo, global_=False))
+        inicio = time.perf_counter()
+        otimizado = otimizar_tac(codigo)
+        tempo = time.perf_counter() - inicio
+        glob = aritmeticas(otimizado)
+        print(f"{nome:>16}  {len(codigo):10}  {aritmeticas(codigo):7}  {local:7} ({1 - local / aritmeticas(codigo):5.1%})  "
+              f"{glob:7} ({1 - glob / aritmeticas(codigo):5.1%})  {tempo:8.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import argparse
+import gc
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from otimizador_tac import chave_constante
+from parser import Compilador, InstrucaoTAC
+from programas import gerar_programa, gerar_programa_funcoes
+from tac_binario import abrir_tac, carregar_programa, carregar_tac, codificar_tac, salvar_tac
+
+# --------------------------------------------------------------------
+# Formato binário do TAC contra o texto de InstrucaoTAC.__repr__: tamanho do
+# arquivo e tempo de carga. A ida e volta pelo binário tem de reproduzir as
+# instruções exatamente (inclusive o tipo int/float das constantes), e as
+# funções com a assinatura e o código.
+# --------------------------------------------------------------------
+
+_LINHA = re.compile(r'(?:(\S+) := )?(?:(call) (\S+), (\d+)|(param|return) (\S+)|(\S+)(?: ([-+*/]) (\S+))?)$')
+
+def _literal(texto):
+    # O texto não distingue um nome de um número a não ser pela forma; 'None' vira None.
+    if texto is None or texto == 'None': return None
+    try: return int(texto)
+    except ValueError: pass
+    try: return float(texto)
+    except ValueError: return texto
+
+def ler_texto(caminho):
+    """ Carga do TAC em texto, como o pipeline fazia: uma expressão regular por linha. """
+    codigo = []
+    with open(caminho) as file:
+        for linha in file:
+            dest, call, funcao, n, op_unario, arg_unario, a, op, b = _LINHA.match(linha.rstrip('\n')).groups()
+            if call:
+                codigo.append(InstrucaoTAC('call', funcao, int(n), dest))
+            elif op_unario:
+                codigo.append(InstrucaoTAC(op_unario, _literal(arg_unario), None, None))
+            elif op:
+                codigo.append(InstrucaoTAC(op, _literal(a), _literal(b), dest))
+            else:
+                codigo.append(InstrucaoTAC(':=', _literal(a), None, dest))
+    return codigo
+
+def chave(instr):
+    return tuple(chave_constante(x) for x in (instr.op, instr.arg1, instr.arg2, instr.dest))
+
+def melhor_tempo(funcao, repeticoes):
+    melhor = float('inf')
+    gc.disable()
+    try:
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            funcao()
+            melhor = min(melhor, time.perf_counter() - inicio)
+    finally:
+        gc.enable()
+    return melhor
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--tamanhos', type=int, nargs='+', default=[1000, 10000, 100000])
+    ap.add_argument('--repeticoes', type=int, default=5)
+    args = ap.parse_args()
+
+    compiladores = (("", Compilador(lexer_rapido=True)), (" -O reuso", Compilador(lexer_rapido=True, otimizar=True, reusar_temps=True)))
+    # Ida e volta exata, inclusive para operações desconhecidas, inteiros grandes e o sinal do zero.
+    especiais = [InstrucaoTAC('goto', None, None, 'L1'), InstrucaoTAC(':=', 2**70, None, 'x'),
+                 InstrucaoTAC(':=', -1.5, None, 'a[b[t1]].c'), InstrucaoTAC(':=', 2.0, None, 'a[01]'),
+                 InstrucaoTAC(':=', 0.0, None, 'x'), InstrucaoTAC(':=', -0.0, None, 'y')]
+    resultado = Compilador().compilar_codigo(gerar_programa_funcoes(50))
+    codigo = resultado.codigo + especiais
+    assert list(map(chave, carregar_tac(codificar_tac(codigo)))) == list(map(chave, codigo))
+    codigo_lido, funcoes = carregar_programa(codificar_tac(codigo, resultado.funcoes))
+    assert list(map(chave, codigo_lido)) == list(map(chave, codigo))
+    assert list(funcoes) == list(resultado.funcoes)
+    for nome, funcao in resultado.funcoes.items():
+        lida = funcoes[nome]
+        assert (lida.parametros, lida.locais, lida.tipo_retorno) == (funcao.parametros, funcao.locais, funcao.tipo_retorno)
+        assert list(map(chave, lida.codigo)) == list(map(chave, funcao.codigo)), nome
+
+    print(f"{'comandos':>15}  {'instruções':>10}  {'texto':>10}  {'binário':>10}  {'carga texto':>11}  "
+          f"{'binário (visão)':>15}  {'binário (lista)':>15}")
+    with tempfile.TemporaryDirectory() as pasta:
+        texto, binario = os.path.join(pasta, 'saida.tac'), os.path.join(pasta, 'saida.ptac')
+        for n in args.tamanhos:
+            fonte = gerar_programa(n, comentarios=False)
+            for rotulo, compilador in compiladores:
+                codigo = compilador.compilar_codigo(fonte).codigo
+                with open(texto, 'w') as file:
+                    for instr in codigo: file.write(f"{instr}\n")
+                salvar_tac(codigo, binario)
+                assert list(map(chave, abrir_tac(binario))) == list(map(chave, codigo)), "a ida e volta mudou o TAC"
+
+                t_texto = melhor_tempo(lambda: ler_texto(texto), args.repeticoes)
+                t_visao = melhor_tempo(lambda: abrir_tac(binario), args.repeticoes)
+                t_lista = melhor_tempo(lambda: abrir_tac(binario).lista(), args.repeticoes)
+                print(f"{f'{n}{rotulo}':>15}  {len(codigo):10}  {os.path.getsize(texto):10}  {os.path.getsize(binario):10}  "
+                      f"{1e3 * t_texto:9.1f}ms  {1e3 * t_visao:13.1f}ms  {1e3 * t_lista:13.1f}ms")
+
+if __name__ == "__main__":
+    main()
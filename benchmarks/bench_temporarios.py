@@ -0,0 +1,50 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_otimizador import executar
+from otimizador_tac import eh_temp, max_temporarios_vivos, operandos_lidos
+from parser import Compilador
+from programas import gerar_programa
+
+# --------------------------------------------------------------------
+# Reaproveitamento de temporários: quantos tN distintos o TAC usa com e sem
+# análise de vivacidade. Com o reaproveitamento o número tem de ser igual ao
+# máximo de temporários vivos, e o estado final das variáveis não pode mudar.
+# --------------------------------------------------------------------
+
+def temporarios_distintos(codigo):
+    nomes = set()
+    for instr in codigo:
+        if eh_temp(instr.dest): nomes.add(instr.dest)
+        nomes.update(nome for nome in operandos_lidos(instr) if eh_temp(nome))
+    return len(nomes)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--comandos', type=int, default=100000)
+    args = ap.parse_args()
+
+    codigo = gerar_programa(args.comandos, comentarios=False)
+    print(f"{args.comandos} comandos")
+    for otimizar in (False, True):
+        antes = Compilador(lexer_rapido=True, otimizar=otimizar).compilar_codigo(codigo)
+        inicio = time.perf_counter()
+        depois = Compilador(lexer_rapido=True, otimizar=otimizar, reusar_temps=True).compilar_codigo(codigo)
+        decorrido = time.perf_counter() - inicio
+        assert antes.sucesso and depois.sucesso
+
+        vivos = max_temporarios_vivos(antes.codigo)
+        distintos = temporarios_distintos(depois.codigo)
+        assert depois.num_temporarios == vivos == distintos, (depois.num_temporarios, vivos, distintos)
+        assert len(depois.codigo) == len(antes.codigo)
+        assert executar(depois.codigo) == executar(antes.codigo), "o reaproveitamento mudou o resultado"
+        print(f"  {'com' if otimizar else 'sem'} otimização: {temporarios_distintos(antes.codigo):7} temporários -> "
+              f"{distintos} (máximo vivo: {vivos}); compilação com reaproveitamento: {decorrido:.2f}s")
+    print("Mesmo estado final das variáveis com e sem reaproveitamento.")
+
+if __name__ == "__main__":
+    main()
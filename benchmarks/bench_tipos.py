@@ -0,0 +1,63 @@
+import argparse
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import AnalisadorSemantico, construir_parser
+
+# --------------------------------------------------------------------
+# Checagem de tipos em records largos e cadeias aninhadas.
+# Com descritores internados e mapa campo -> (tipo, índice), o custo de cada
+# acesso não depende da largura do record nem da profundidade da pilha de escopos.
+# --------------------------------------------------------------------
+
+def gerar_programa_tipos(largura, num_acessos):
+    """ Record com `largura` campos, aninhado em outro record e em um vetor; o corpo acessa o último campo. """
+    partes = ["type\n    largo == record\n"]
+    partes.extend(f"        c{k}: integer;\n" for k in range(largura))
+    partes.append("    end;\n    externo == record\n        sub: largo;\n        peso: real;\n    end;\n"
+                  "    grade == array [30] of externo;\n\nvar\n    g: grade;\n    i: integer;\n\nbegin\n")
+    ultimo = f"c{largura - 1}"
+    for k in range(num_acessos):
+        partes.append(f"    i := g[{k % 30 + 1}].sub.{ultimo} + g[i].sub.c0;\n")
+    partes.append("end;\n")
+    return ''.join(partes)
+
+def medir_checagem(parser, largura, num_acessos):
+    programa = parser.parse(gerar_programa_tipos(largura, num_acessos))
+    melhor = float('inf')
+    gc.disable()
+    try:
+        for _ in range(5):
+            analisador = AnalisadorSemantico()
+            inicio = time.perf_counter()
+            analisador.visitar(programa)
+            melhor = min(melhor, time.perf_counter() - inicio)
+    finally:
+        gc.enable()
+    return melhor
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--larguras', type=int, nargs='+', default=[4, 256, 4096])
+    ap.add_argument('--acessos', type=int, default=20000)
+    ap.add_argument('--tolerancia', type=float, default=2.0,
+                    help="razão máxima entre o tempo por acesso do record mais largo e o do mais estreito")
+    args = ap.parse_args()
+
+    parser = construir_parser()
+    por_acesso = []
+    for largura in args.larguras:
+        t = medir_checagem(parser, largura, args.acessos)
+        por_acesso.append(t / args.acessos)
+        print(f"{largura:>6} campos: {t:6.3f}s ({1e6 * t / args.acessos:5.2f} µs/comando)")
+
+    razao = por_acesso[-1] / por_acesso[0]
+    print(f"Razão do tempo por comando (mais largo / mais estreito): {razao:.2f}")
+    assert razao <= args.tolerancia, "o custo do acesso a campo cresce com a largura do record"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import AnalisadorGeradorCI, AnalisadorSemantico, Compilador, GeradorCI
+from programas import gerar_programa
+
+# --------------------------------------------------------------------
+# Visitas por segundo: despacho por getattr com f-string (como era antes)
+# contra a tabela de despacho do Visitante, e a travessia fundida.
+# --------------------------------------------------------------------
+
+def visitar_por_getattr(self, no):
+    if no is None: return
+    if isinstance(no, list):
+        for item in no: self.visitar(item)
+        return
+    nome_metodo = f'visitar_{type(no).__name__}'
+    visitante = getattr(self, nome_metodo, self.erro_generico)
+    return visitante(no)
+
+class AnalisadorGetattr(AnalisadorSemantico):
+    visitar = visitar_por_getattr
+
+class GeradorGetattr(GeradorCI):
+    visitar = visitar_por_getattr
+
+def contar_visitas(classe, arvore):
+    contador = 0
+    original = classe.visitar
+    def visitar(self, no):
+        nonlocal contador
+        contador += 1
+        return original(self, no)
+    contando = type('Contando', (classe,), {'visitar': visitar})
+    contando().visitar(arvore)
+    return contador
+
+def medir(classe, arvore, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        passo = classe()
+        # O coletor de ciclos é desligado para medir só o despacho, não as pausas de GC.
+        gc.collect()
+        gc.disable()
+        inicio = time.perf_counter()
+        passo.visitar(arvore)
+        melhor = min(melhor, time.perf_counter() - inicio)
+        gc.enable()
+    return melhor
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--comandos', type=int, default=50000)
+    ap.add_argument('--repeticoes', type=int, default=3)
+    args = ap.parse_args()
+
+    resultado = Compilador(lexer_rapido=True).compilar_codigo(gerar_programa(args.comandos))
+    arvore = resultado.ast
+    for rotulo, antes, depois in (('análise semântica', AnalisadorGetattr, AnalisadorSemantico),
+                                  ('geração de TAC', GeradorGetattr, GeradorCI)):
+        visitas = contar_visitas(depois, arvore)
+        t_antes = medir(antes, arvore, args.repeticoes)
+        t_depois = medir(depois, arvore, args.repeticoes)
+        print(f"{rotulo:>18}: {visitas} visitas | getattr {visitas / t_antes:12,.0f} visitas/s | "
+              f"tabela {visitas / t_depois:12,.0f} visitas/s ({t_antes / t_depois:.2f}x)")
+
+    separado = medir(AnalisadorSemantico, arvore, args.repeticoes) + medir(GeradorCI, arvore, args.repeticoes)
+    fundido = medir(AnalisadorGeradorCI, arvore, args.repeticoes)
+    print(f"{'travessia fundida':>18}: {separado:.3f}s em duas passadas -> {fundido:.3f}s em uma ({separado / fundido:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+import random
+
+# --------------------------------------------------------------------
+# GERADOR DE PROGRAMAS PASTON PARA OS BENCHMARKS
+# Os programas gerados são sintática e semanticamente válidos.
+# --------------------------------------------------------------------
+
+CABECALHO = """type
+    aluno == record
+        matricula: integer;
+        media: real;
+    end;
+    turma == array [30] of aluno;
+
+var
+    sala_a: turma;
+    melhor_aluno: aluno;
+"""
+
+def _expr_inteira(rng, inteiros, profundidade=0):
+    escolha = rng.random()
+    if profundidade > 2 or escolha < 0.35:
+        folha = rng.random()
+        if folha < 0.4: return str(rng.randint(0, 99))
+        if folha < 0.8: return rng.choice(inteiros)
+        if folha < 0.9: return f"sala_a[{rng.randint(1, 30)}].matricula"
+        return "melhor_aluno.matricula"
+    if escolha < 0.45:
+        return f"soma({_expr_inteira(rng, inteiros, profundidade + 1)}, {_expr_inteira(rng, inteiros, profundidade + 1)})"
+    op = rng.choice('+-*')
+    esq = _expr_inteira(rng, inteiros, profundidade + 1)
+    dir = _expr_inteira(rng, inteiros, profundidade + 1)
+    return f"({esq} {op} {dir})" if rng.random() < 0.3 else f"{esq} {op} {dir}"
+
+def _expr_real(rng, reais, profundidade=0):
+    if profundidade > 2 or rng.random() < 0.4:
+        folha = rng.random()
+        if folha < 0.4: return f"{rng.randint(0, 99)}.{rng.randint(0, 9)}"
+        if folha < 0.8: return rng.choice(reais)
+        return f"sala_a[{rng.randint(1, 30)}].media"
+    op = rng.choice('+-*/')
+    return f"{_expr_real(rng, reais, profundidade + 1)} {op} {_expr_real(rng, reais, profundidade + 1)}"
+
+def gerar_comando(rng, inteiros, reais):
+    tipo = rng.random()
+    if tipo < 0.45:
+        return f"{rng.choice(inteiros)} := {_expr_inteira(rng, inteiros)};"
+    if tipo < 0.65:
+        return f"{rng.choice(reais)} := {_expr_real(rng, reais)};"
+    if tipo < 0.8:
+        return f"sala_a[{rng.randint(1, 30)}].matricula := {_expr_inteira(rng, inteiros)};"
+    if tipo < 0.9:
+        return f"melhor_aluno.media := {_expr_real(rng, reais)};"
+    return f"sala_a[{rng.randint(1, 30)}] := melhor_aluno;"
+
+def gerar_programa(num_comandos, semente=0, num_variaveis=20, comentarios=True):
+    """ Gera um programa com `num_comandos` comandos no corpo principal (um por linha). """
+    rng = random.Random(semente)
+    inteiros = [f"i{k}" for k in range(num_variaveis)]
+    reais = [f"r{k}" for k in range(num_variaveis)]
+    partes = [CABECALHO]
+    partes.extend(f"    {nome}: integer;\n" for nome in inteiros)
+    partes.extend(f"    {nome}: real;\n" for nome in reais)
+    partes.append("\ndef soma(a: integer, b: integer) :: integer\nbegin\n    return a + b;\nend;\n\nbegin\n")
+    for k in range(num_comandos):
+        if comentarios and k % 10 == 0:
+            partes.append(f"    # comando {k}\n")
+        partes.append(f"    {gerar_comando(rng, inteiros, reais)}\n")
+    partes.append("end;\n")
+    return ''.join(partes)
+
+def gerar_ate_tamanho(num_bytes, semente=0):
+    """ Gera um programa válido com aproximadamente `num_bytes` caracteres. """
+    amostra = gerar_programa(1000, semente)
+    por_comando = len(amostra) / 1000
+    return gerar_programa(max(1, int(num_bytes / por_comando)), semente)
+
+def gerar_programa_funcoes(num_funcoes, semente=0):
+    """ Gera um programa com `num_funcoes` funções de dez linhas, cada uma chamando a anterior. """
+    rng = random.Random(semente)
+    partes = [CABECALHO, "    total: integer;\n\n"]
+    for k in range(num_funcoes):
+        chamada = f"f{k - 1}(x, y)" if k else "x + y"
+        partes.append(
+            f"def f{k}(a: integer, b: integer) :: integer\n"
+            f"var\n"
+            f"    x: integer;\n"
+            f"    y: integer;\n"
+            f"begin\n"
+            f"    x := a * b + {rng.randint(0, 99)};\n"
+            f"    y := x - b * {rng.randint(1, 9)};\n"
+            f"    return {chamada} + total;\n"
+            f"end;\n\n")
+    partes.append("begin\n")
+    for k in range(0, num_funcoes, max(1, num_funcoes // 10)):
+        partes.append(f"    total := f{k}(total, {k});\n")
+    partes.append("end;\n")
+    return ''.join(partes)
+
+def _condicao(rng, inteiros, reais):
+    op = rng.choice(('==', '=', '!=', '<', '<=', '>', '>='))
+    if rng.random() < 0.7:
+        return f"{_expr_inteira(rng, inteiros, 1)} {op} {_expr_inteira(rng, inteiros, 1)}"
+    return f"{_expr_real(rng, reais, 1)} {op} {_expr_real(rng, reais, 1)}"
+
+def _comandos_fluxo(rng, inteiros, reais, num_comandos, profundidade, laco, linhas, desvios):
+    """ Gera comandos até gastar `num_comandos`. Cada while de nível `laco` conta com c{laco} até 3. """
+    recuo = "    " * (profundidade + 1)
+    while num_comandos > 0:
+        escolha = rng.random()
+        if escolha < desvios * 2 / 3 and profundidade < 4 and num_comandos > 1:
+            entao = rng.randint(1, min(num_comandos - 1, 5))
+            senao = rng.randint(0, min(num_comandos - 1 - entao, 5)) if rng.random() < 0.5 else 0
+            linhas.append(f"{recuo}if {_condicao(rng, inteiros, reais)} then")
+            _comandos_fluxo(rng, inteiros, reais, entao, profundidade + 1, laco, linhas, desvios)
+            if senao:
+                linhas.append(f"{recuo}else")
+                _comandos_fluxo(rng, inteiros, reais, senao, profundidade + 1, laco, linhas, desvios)
+            linhas.append(f"{recuo}end;")
+            num_comandos -= 1 + entao + senao
+        elif escolha < desvios and laco < 2 and num_comandos > 1:
+            corpo = rng.randint(1, min(num_comandos - 1, 6))
+            linhas.append(f"{recuo}c{laco} := 0;")
+            linhas.append(f"{recuo}while c{laco} < 3 do")
+            _comandos_fluxo(rng, inteiros, reais, corpo, profundidade + 1, laco + 1, linhas, desvios)
+            linhas.append(f"{recuo}    c{laco} := c{laco} + 1;")
+            linhas.append(f"{recuo}end;")
+            num_comandos -= 1 + corpo
+        else:
+            linhas.append(f"{recuo}{gerar_comando(rng, inteiros, reais)}")
+            num_comandos -= 1
+
+def gerar_programa_fluxo(num_comandos, semente=0, num_variaveis=20, desvios=0.3):
+    """ Como gerar_programa, com if/else e while aninhados (laços de 3 voltas, no máximo 2 níveis).
+
+    `desvios` é a probabilidade de cada comando ser um if ou um while.
+    """
+    rng = random.Random(semente)
+    inteiros = [f"i{k}" for k in range(num_variaveis)]
+    reais = [f"r{k}" for k in range(num_variaveis)]
+    partes = [CABECALHO, "    c0: integer;\n    c1: integer;\n"]
+    partes.extend(f"    {nome}: integer;\n" for nome in inteiros)
+    partes.extend(f"    {nome}: real;\n" for nome in reais)
+    partes.append("\ndef soma(a: integer, b: integer) :: integer\nbegin\n    return a + b;\nend;\n\nbegin\n")
+    linhas = []
+    _comandos_fluxo(rng, inteiros, reais, num_comandos, 0, 0, linhas, desvios)
+    partes.append('\n'.join(linhas))
+    partes.append("\nend;\n")
+    return ''.join(partes)
+
+_NUCLEOS = [
+    # Busca do melhor aluno, comparando vizinhos.
+    """{i} := 1;
+while {i} < 30 do
+    if sala_a[{i}].media > sala_a[{i} + 1].media then
+        melhor_aluno := sala_a[{i}];
+        {r} := sala_a[{i}].media - sala_a[{i} + 1].media;
+    else
+        {r} := sala_a[{i} + 1].media - sala_a[{i}].media;
+    end;
+    {i} := {i} + 1;
+end;""",
+    # Atualização com limite.
+    """{i} := 1;
+while {i} <= 30 do
+    {x} := sala_a[{i}].matricula * {k} + {y};
+    if {x} > {n} then
+        sala_a[{i}].matricula := {x} - {n};
+    else
+        sala_a[{i}].matricula := {x};
+    end;
+    sala_a[{i}].media := sala_a[{i}].media * {f};
+    {i} := {i} + 1;
+end;""",
+    # Média dos vizinhos.
+    """{i} := 2;
+while {i} < 30 do
+    {x} := sala_a[{i} - 1].matricula + sala_a[{i} + 1].matricula;
+    if {x} / 2 != sala_a[{i}].matricula then
+        {y} := {y} + ({x} / 2 - sala_a[{i}].matricula) * ({i} - 1);
+        {r} := {r} + sala_a[{i} - 1].media;
+    end;
+    {i} := {i} + 1;
+end;""",
+    # Expressão repetida nos dois ramos.
+    """if {x} * {y} + {k} > {n} then
+    {z} := {x} * {y} + {k} - {n};
+else
+    {z} := {n} - ({x} * {y} + {k});
+    {y} := soma({z}, {x} * {y});
+end;""",
+]
+
+def gerar_programa_vetores(num_nucleos, semente=0, num_variaveis=20):
+    """ Gera um programa com `num_nucleos` laços e desvios típicos sobre o vetor de records sala_a. """
+    rng = random.Random(semente)
+    inteiros = [f"i{k}" for k in range(num_variaveis)]
+    reais = [f"r{k}" for k in range(num_variaveis)]
+    partes = [CABECALHO]
+    partes.extend(f"    {nome}: integer;\n" for nome in inteiros)
+    partes.extend(f"    {nome}: real;\n" for nome in reais)
+    partes.append("\ndef soma(a: integer, b: integer) :: integer\nbegin\n    return a + b;\nend;\n\nbegin\n")
+    for _ in range(num_nucleos):
+        i, x, y, z = rng.sample(inteiros, 4)
+        nucleo = rng.choice(_NUCLEOS).format(i=i, x=x, y=y, z=z, r=rng.choice(reais), k=rng.randint(2, 9),
+                                             n=rng.randint(10, 99), f=f"{rng.randint(0, 2)}.{rng.randint(1, 9)}")
+        partes.append(''.join(f"    {linha}\n" for linha in nucleo.split('\n')))
+    partes.append("end;\n")
+    return ''.join(partes)
+
+def _comando_numerico(rng, inteiros, reais):
+    a, b, c = rng.sample(inteiros, 3)
+    x, y = rng.sample(reais, 2)
+    escolha = rng.random()
+    # Os inteiros ficam limitados pelo resto da divisão por m, e os reais por f(x) = x / (1 + x * x).
+    m = rng.randint(500, 2000)
+    if escolha < 0.35:
+        e = f"{b} * {rng.randint(2, 99)} + {c}"
+        return [f"{a} := {e} - ({e}) / {m} * {m};"]
+    if escolha < 0.6:
+        return [f"{x} := {y} * 0.5 + {x} * 0.25 + {a} / {m}.0;"]
+    if escolha < 0.75:
+        return [f"{x} := f({y}) + {x} * 0.5;"]
+    if escolha < 0.9:
+        indice = f"{a} * {a} - {a} * {a} / 64 * 64 + 1"
+        return [f"v[{indice}] := v[{indice}] / 2 + {b};"]
+    return [f"if {a} > {b} then", f"    {x} := {x} * 0.5 + 1.0;", "else",
+            f"    {c} := {c} + {a} - {c} / {m} * {m};", "end;"]
+
+def gerar_programa_numerico(num_comandos, iteracoes, semente=0, num_variaveis=10):
+    """ Gera um laço de `iteracoes` voltas com `num_comandos` comandos aritméticos sobre inteiros,
+    reais e um vetor, sem divisão por zero nem índice fora dos limites. """
+    rng = random.Random(semente)
+    inteiros = [f"i{k}" for k in range(num_variaveis)]
+    reais = [f"r{k}" for k in range(num_variaveis)]
+    partes = ["var\n    v: array_64;\n    n: integer;\n"]
+    partes.extend(f"    {nome}: integer;\n" for nome in inteiros)
+    partes.extend(f"    {nome}: real;\n" for nome in reais)
+    partes.append("\ndef f(x: real) :: real\nbegin\n    return x / (1.0 + x * x);\nend;\n\nbegin\n")
+    partes.extend(f"    {nome} := {k + 1};\n" for k, nome in enumerate(inteiros))
+    partes.extend(f"    {nome} := {k}.5;\n" for k, nome in enumerate(reais))
+    partes.append(f"    n := 0;\n    while n < {iteracoes} do\n")
+    for _ in range(num_comandos):
+        partes.extend(f"        {linha}\n" for linha in _comando_numerico(rng, inteiros, reais))
+    partes.append("        n := n + 1;\n    end;\nend;\n")
+    return "type\n    array_64 == array [64] of integer;\n\n" + ''.join(partes)
+
+# Programas fixos com resultado conhecido, para medir a execução.
+SUITE_EXECUCAO = {
+    "fibonacci": """var
+    r: integer;
+
+def fib(k: integer) :: integer
+begin
+    if k < 2 then
+        return k;
+    end;
+    return fib(k - 1) + fib(k - 2);
+end;
+
+begin
+    r := fib(20);
+end;
+""",
+    "primos": """var
+    n: integer;
+    total: integer;
+
+def resto(a: integer, b: integer) :: integer
+begin
+    return a - a / b * b;
+end;
+
+def primo(k: integer) :: integer
+var
+    d: integer;
+begin
+    if k < 2 then
+        return 0;
+    end;
+    d := 2;
+    while d * d <= k do
+        if resto(k, d) == 0 then
+            return 0;
+        end;
+        d := d + 1;
+    end;
+    return 1;
+end;
+
+begin
+    n := 2;
+    total := 0;
+    while n < 5000 do
+        total := total + primo(n);
+        n := n + 1;
+    end;
+end;
+""",
+    "ordenacao": """type
+    vetor == array [300] of integer;
+
+var
+    v: vetor;
+    i: integer;
+    j: integer;
+    x: integer;
+    troca: integer;
+
+begin
+    x := 7;
+    i := 1;
+    while i <= 300 do
+        x := x * 75 + 74;
+        x := x - x / 65537 * 65537;
+        v[i] := x;
+        i := i + 1;
+    end;
+    i := 1;
+    while i < 300 do
+        j := 1;
+        while j <= 300 - i do
+            if v[j] > v[j + 1] then
+                troca := v[j];
+                v[j] := v[j + 1];
+                v[j + 1] := troca;
+            end;
+            j := j + 1;
+        end;
+        i := i + 1;
+    end;
+end;
+""",
+    "integral": """var
+    i: integer;
+    x: real;
+    h: real;
+    soma: real;
+
+def f(x: real) :: real
+begin
+    return 4.0 / (1.0 + x * x);
+end;
+
+begin
+    h := 1.0 / 20000;
+    soma := 0.0;
+    i := 0;
+    while i < 20000 do
+        x := h * i + h / 2.0;
+        soma := soma + f(x);
+        i := i + 1;
+    end;
+    soma := soma * h;
+end;
+""",
+    "collatz": """var
+    n: integer;
+    k: integer;
+    passos: integer;
+
+begin
+    n := 1;
+    passos := 0;
+    while n < 3000 do
+        k := n;
+        while k != 1 do
+            if k - k / 2 * 2 == 0 then
+                k := k / 2;
+            else
+                k := 3 * k + 1;
+            end;
+            passos := passos + 1;
+        end;
+        n := n + 1;
+    end;
+end;
+""",
+}
@@ -0,0 +1,275 @@
+import hashlib
+import json
+import os
+import struct
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava, cada processo confia no registro lido
+    fcntl = None
+
+import parsetab
+from expansao import RelatorioExpansao
+from parser import (ERRO, INTEGER, REAL, STRING, VERSAO_COMPILADOR, VOID, ASTNode, Diagnostico, ResultadoCompilacao, Tipo,
+                    TipoPrimitivo)
+from tac_binario import ErroFormatoTAC, carregar_programa, codificar_tac
+
+# --------------------------------------------------------------------
+# CACHE DE COMPILAÇÃO EM DISCO
+# Cada entrada é endereçada pelo SHA-256 do código-fonte, das opções que
+# mudam a saída, da assinatura da gramática (_lr_signature do parsetab), da
+# VERSAO_COMPILADOR e do conteúdo dos módulos do compilador. Guarda o TAC
+# final do programa e das funções (no formato binário), os diagnósticos e, opcionalmente, a AST e a
+# tabela de símbolos; um acerto pula todas as fases.
+#
+# Uma entrada é o tamanho u32 de um objeto JSON, o JSON e o TAC binário. A
+# AST e a tabela vão no JSON como {"o": classe, "c": [campos]}, só para as
+# classes da AST e dos tipos, e um objeto repetido vira {"r": n}; tuplas e
+# dicionários viram {"t": [...]} e {"d": [[chave, valor], ...]}. Ler uma
+# entrada nunca executa código, mesmo num diretório escrito por outro usuário.
+#
+# Vários processos podem usar o mesmo diretório: as entradas são escritas em
+# um arquivo temporário e publicadas com os.replace (atômico), e leituras de
+# entradas removidas ou corrompidas contam como falta. Um acerto atualiza o
+# mtime da entrada. O tamanho do diretório fica num registro compartilhado
+# (arquivo REGISTRO), atualizado sob uma trava (fcntl.flock) a cada entrada
+# gravada, de modo que o limite vale para todos os processos juntos; quando
+# ele passa de max_bytes, o diretório é medido de novo e as entradas menos
+# recentemente usadas são removidas até 90% do limite.
+# --------------------------------------------------------------------
+
+EXTENSAO = '.pcc'
+REGISTRO = 'tamanho'
+_MODULOS = ('parser.py', 'lexer.py', 'lexer_rapido.py', 'otimizador_tac.py', 'grafo_fluxo.py', 'ssa.py', 'limites.py',
+            'expansao.py', 'tac_binario.py')
+_assinatura = None
+_TAMANHO_JSON = struct.Struct('<I')
+
+def _classes(*bases):
+    classes, pilha = {}, list(bases)
+    while pilha:
+        classe = pilha.pop()
+        classes[classe.__name__] = classe
+        pilha.extend(classe.__subclasses__())
+    return classes
+
+_CLASSES = _classes(ASTNode, Tipo)
+_PRIMITIVOS = {tipo.nome: tipo for tipo in (INTEGER, REAL, STRING, VOID, ERRO)}
+
+def _campos(classe):
+    return [campo for base in reversed(classe.__mro__) for campo in getattr(base, '__slots__', ())]
+
+def _para_json(valor, memo):
+    """ Valor da AST ou da tabela de símbolos em tipos do JSON; `memo` numera os objetos já vistos. """
+    tipo = type(valor)
+    if valor is None or tipo is bool or tipo is int or tipo is float or tipo is str:
+        return valor
+    if tipo is list:
+        return [_para_json(v, memo) for v in valor]
+    if tipo is tuple:
+        return {'t': [_para_json(v, memo) for v in valor]}
+    if tipo is dict:
+        return {'d': [[_para_json(k, memo), _para_json(v, memo)] for k, v in valor.items()]}
+    if _CLASSES.get(tipo.__name__) is not tipo:
+        raise TypeError(f"Valor não suportado no cache: {valor!r}")
+    if id(valor) in memo:
+        return {'r': memo[id(valor)]}
+    memo[id(valor)] = len(memo)
+    return {'o': tipo.__name__, 'c': [_para_json(getattr(valor, campo, None), memo) for campo in _campos(tipo)]}
+
+def _de_json(valor, objetos):
+    """ Inverso de _para_json; `objetos` recebe os objetos na ordem em que foram numerados. """
+    if type(valor) is list:
+        return [_de_json(v, objetos) for v in valor]
+    if type(valor) is not dict:
+        return valor
+    if 't' in valor:
+        return tuple(_de_json(v, objetos) for v in valor['t'])
+    if 'd' in valor:
+        return {_de_json(k, objetos): _de_json(v, objetos) for k, v in valor['d']}
+    if 'r' in valor:
+        return objetos[valor['r']]
+    classe = _CLASSES[valor['o']]
+    if classe is TipoPrimitivo:
+        # Os tipos primitivos são únicos: igualdade de tipos é identidade.
+        objetos.append(_PRIMITIVOS[valor['c'][0]])
+        return objetos[-1]
+    objeto = classe.__new__(classe)
+    objetos.append(objeto)
+    for campo, v in zip(_campos(classe), valor['c']):
+        setattr(objeto, campo, _de_json(v, objetos))
+    return objeto
+
+def assinatura_compilador():
+    """ Resumo da versão do compilador, da gramática e do código dos seus módulos. """
+    global _assinatura
+    if _assinatura is None:
+        h = hashlib.sha256()
+        h.update(VERSAO_COMPILADOR.encode())
+        h.update(parsetab._lr_signature.encode())
+        pasta = os.path.dirname(os.path.abspath(__file__))
+        for nome in _MODULOS:
+            with open(os.path.join(pasta, nome), 'rb') as file:
+                h.update(file.read())
+        _assinatura = h.digest()
+    return _assinatura
+
+class CacheCompilacao:
+    """ Cache de resultados de compilação em `diretorio`, limitado a `max_bytes`.
+
+    `acertos` e `faltas` contam as consultas feitas por este objeto.
+    """
+    def __init__(self, diretorio, max_bytes=256 * 2**20, guardar_ast=False):
+        self.diretorio = diretorio
+        self.max_bytes = max_bytes
+        self.guardar_ast = guardar_ast
+        self.acertos = 0
+        self.faltas = 0
+        os.makedirs(diretorio, exist_ok=True)
+        with self._registro() as registro:
+            tamanho = sum(t for _, _, t in self._entradas())
+            self._gravar_registro(registro, self.podar() if tamanho > self.max_bytes else tamanho)
+
+    def chave(self, codigo, compilador):
+        h = hashlib.sha256(assinatura_compilador())
+        h.update(repr((compilador.otimizar, compilador.reusar_temps, compilador.max_erros, self.guardar_ast,
+                       compilador.expandir, compilador.tamanho_expansao, compilador.orcamento_expansao)).encode())
+        h.update(codigo.encode('utf-8', 'surrogatepass'))
+        return h.hexdigest()
+
+    def caminho(self, chave):
+        return os.path.join(self.diretorio, chave[:2], chave[2:] + EXTENSAO)
+
+    def obter(self, chave):
+        """ ResultadoCompilacao guardado para a chave, ou None. """
+        caminho = self.caminho(chave)
+        try:
+            with open(caminho, 'rb') as file:
+                dados = file.read()
+            n = _TAMANHO_JSON.unpack_from(dados)[0]
+            entrada = json.loads(dados[_TAMANHO_JSON.size:_TAMANHO_JSON.size + n])
+            codigo, funcoes = carregar_programa(memoryview(dados)[_TAMANHO_JSON.size + n:])
+            objetos = []
+            resultado = ResultadoCompilacao(ast=_de_json(entrada.get('ast'), objetos),
+                                            tabela_simbolos=_de_json(entrada.get('tabela_simbolos'), objetos),
+                                            codigo=codigo, num_tokens=entrada['num_tokens'],
+                                            diagnosticos=[Diagnostico(*d) for d in entrada['diagnosticos']],
+                                            num_temporarios=entrada['num_temporarios'],
+                                            expansao=entrada['expansao'] and RelatorioExpansao(*entrada['expansao']),
+                                            funcoes=funcoes)
+            os.utime(caminho)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Entrada corrompida (ou de um formato antigo): descarta.
+            self._remover(caminho)
+            return None
+        return resultado
+
+    def guardar(self, chave, resultado):
+        try:
+            entrada = {
+                'diagnosticos': [(d.fase, d.mensagem, d.linha) for d in resultado.diagnosticos],
+                'num_tokens': resultado.num_tokens,
+                'num_temporarios': resultado.num_temporarios,
+                'expansao': resultado.expansao and (resultado.expansao.chamadas, resultado.expansao.instrucoes_antes,
+                                                    resultado.expansao.instrucoes_depois),
+            }
+            if self.guardar_ast:
+                memo = {}
+                entrada['ast'] = _para_json(resultado.ast, memo)
+                entrada['tabela_simbolos'] = _para_json(resultado.tabela_simbolos, memo)
+            texto = json.dumps(entrada, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            dados = _TAMANHO_JSON.pack(len(texto)) + texto + codificar_tac(resultado.codigo, resultado.funcoes)
+        except (ErroFormatoTAC, TypeError, ValueError, RecursionError):
+            return
+        caminho = self.caminho(chave)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho), suffix='.tmp')
+        try:
+            with os.fdopen(descritor, 'wb') as file:
+                file.write(dados)
+            os.replace(temporario, caminho)
+        except OSError:
+            self._remover(temporario)
+            return
+        # O registro soma o que todos os processos gravaram; só a poda mede o diretório.
+        with self._registro() as registro:
+            tamanho = self._ler_registro(registro) + len(dados)
+            self._gravar_registro(registro, self.podar() if tamanho > self.max_bytes else tamanho)
+
+    def compilar(self, compilador, codigo):
+        """ Resultado do cache ou, numa falta, da compilação (que é guardada). """
+        chave = self.chave(codigo, compilador)
+        resultado = self.obter(chave)
+        if resultado is not None:
+            self.acertos += 1
+            return resultado
+        self.faltas += 1
+        resultado = compilador.compilar_codigo(codigo)
+        self.guardar(chave, resultado)
+        return resultado
+
+    def _entradas(self):
+        """ (mtime, caminho, tamanho) de cada entrada no diretório. """
+        for pasta in os.scandir(self.diretorio):
+            if not pasta.is_dir():
+                continue
+            for entrada in os.scandir(pasta.path):
+                if entrada.name.endswith(EXTENSAO):
+                    try:
+                        info = entrada.stat()
+                    except FileNotFoundError:
+                        continue
+                    yield info.st_mtime, entrada.path, info.st_size
+
+    @contextmanager
+    def _registro(self):
+        """ Arquivo do registro de tamanho, aberto e travado para este processo. """
+        with open(os.path.join(self.diretorio, REGISTRO), 'a+b') as registro:
+            if fcntl: fcntl.flock(registro, fcntl.LOCK_EX)
+            try:
+                yield registro
+            finally:
+                if fcntl: fcntl.flock(registro, fcntl.LOCK_UN)
+
+    def _ler_registro(self, registro):
+        registro.seek(0)
+        try:
+            return int(registro.read() or 0)
+        except ValueError:
+            return sum(t for _, _, t in self._entradas())
+
+    def _gravar_registro(self, registro, tamanho):
+        registro.seek(0)
+        registro.truncate()
+        registro.write(str(tamanho).encode())
+        registro.flush()
+        self.tamanho = tamanho
+
+    def _remover(self, caminho):
+        try:
+            os.remove(caminho)
+        except FileNotFoundError:
+            pass
+
+    def podar(self):
+        """ Remove as entradas menos recentemente usadas até 90% de max_bytes. Devolve o tamanho
+        medido que sobrou; quem chama atualiza o registro. """
+        entradas = sorted(self._entradas())
+        tamanho = sum(t for _, _, t in entradas)
+        alvo = self.max_bytes * 9 // 10
+        for _, caminho, t in entradas:
+            if tamanho <= alvo:
+                break
+            self._remover(caminho)
+            tamanho -= t
+        return tamanho
+
+    def limpar(self):
+        with self._registro() as registro:
+            for _, caminho, _ in list(self._entradas()):
+                self._remover(caminho)
+            self._gravar_registro(registro, 0)
@@ -0,0 +1,140 @@
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from cache_compilacao import CacheCompilacao
+from parser import MAX_ERROS, Compilador, linhas_tac
+from tac_binario import salvar_tac
+
+# --------------------------------------------------------------------
+# COMPILAÇÃO EM LOTE
+# Distribui arquivos .pas entre processos. Cada processo mantém o seu
+# próprio Compilador (parser yacc e lexer já construídos) durante todo o lote.
+# --------------------------------------------------------------------
+
+_compilador = None
+_cache = None
+
+def _iniciar_worker(max_erros=MAX_ERROS, otimizar=False, dir_cache=None, max_cache=None):
+    global _compilador, _cache
+    _compilador = Compilador(max_erros=max_erros, otimizar=otimizar)
+    _cache = CacheCompilacao(dir_cache, max_cache) if dir_cache else None
+
+def expandir_entradas(entradas):
+    """ Converte diretórios, globs e arquivos em uma lista ordenada de arquivos .pas sem repetições. """
+    arquivos = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            encontrados = glob.glob(os.path.join(entrada, '**', '*.pas'), recursive=True)
+        elif glob.has_magic(entrada):
+            encontrados = glob.glob(entrada, recursive=True)
+        else:
+            encontrados = [entrada]
+        arquivos.extend(sorted(encontrados))
+    return list(dict.fromkeys(arquivos))
+
+def caminho_saida(arquivo, dir_saida, raiz, extensao='.tac'):
+    nome_tac = os.path.splitext(arquivo)[0] + extensao
+    if dir_saida is None:
+        return nome_tac
+    return os.path.join(dir_saida, os.path.relpath(nome_tac, raiz))
+
+def compilar_um(arquivo, dir_saida=None, raiz='.', binario=False):
+    inicio = time.perf_counter()
+    acertos = _cache.acertos if _cache else 0
+    try:
+        if _cache:
+            with open(arquivo, 'r') as file:
+                resultado = _cache.compilar(_compilador, file.read())
+        else:
+            resultado = _compilador.compilar_arquivo(arquivo)
+    except (OSError, UnicodeDecodeError) as e:
+        return {'arquivo': arquivo, 'sucesso': False, 'erros': [str(e)], 'saida': None, 'tokens': 0,
+                'tempo': time.perf_counter() - inicio, 'cache': None}
+
+    saida = None
+    if resultado.sucesso:
+        saida = caminho_saida(arquivo, dir_saida, raiz, '.ptac' if binario else '.tac')
+        os.makedirs(os.path.dirname(saida) or '.', exist_ok=True)
+        if binario:
+            salvar_tac(resultado.codigo, saida, resultado.funcoes)
+        else:
+            with open(saida, 'w') as file:
+                for linha in linhas_tac(resultado.codigo, resultado.funcoes):
+                    file.write(f"{linha}\n")
+    return {'arquivo': arquivo, 'sucesso': resultado.sucesso, 'erros': resultado.erros, 'saida': saida,
+            'tokens': resultado.num_tokens, 'tempo': time.perf_counter() - inicio,
+            'cache': (_cache.acertos > acertos) if _cache else None}
+
+def _compilar_tarefa(tarefa):
+    return compilar_um(*tarefa)
+
+def compilar_lote(arquivos, trabalhadores=None, dir_saida=None, max_erros=MAX_ERROS, otimizar=False, binario=False,
+                  dir_cache=None, max_cache=256 * 2**20):
+    """ Compila os arquivos em paralelo e produz (em ordem) o relatório de cada um.
+
+    Com dir_cache, os processos compartilham o cache de compilação nesse
+    diretório e o relatório diz em 'cache' se o arquivo veio dele.
+    """
+    raiz = os.path.commonpath([os.path.abspath(os.path.dirname(a)) for a in arquivos]) if arquivos else '.'
+    tarefas = [(arquivo, dir_saida, raiz, binario) for arquivo in arquivos]
+    if trabalhadores == 1:
+        _iniciar_worker(max_erros, otimizar, dir_cache, max_cache)
+        try:
+            yield from map(_compilar_tarefa, tarefas)
+        finally:
+            _compilador.fechar()
+        return
+    trabalhadores = trabalhadores or os.cpu_count() or 1
+    # Lotes de tarefas por envio reduzem o custo de comunicação entre processos.
+    lote = max(1, min(64, len(tarefas) // (4 * trabalhadores)))
+    with ProcessPoolExecutor(max_workers=trabalhadores, initializer=_iniciar_worker, initargs=(max_erros, otimizar, dir_cache, max_cache)) as executor:
+        yield from executor.map(_compilar_tarefa, tarefas, chunksize=lote)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Compila arquivos Paston em paralelo.")
+    ap.add_argument('entradas', nargs='+', help="arquivos, diretórios ou padrões glob")
+    ap.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help="número de processos (padrão: núcleos da CPU)")
+    ap.add_argument('-o', '--saida', default=None, help="diretório para os arquivos .tac (padrão: ao lado do fonte)")
+    ap.add_argument('--max-erros', type=int, default=MAX_ERROS, help=f"erros informados por arquivo (padrão: {MAX_ERROS})")
+    ap.add_argument('-O', '--otimizar', action='store_true', help="dobra constantes e simplifica expressões antes de gerar o TAC")
+    ap.add_argument('-b', '--binario', action='store_true', help="grava o TAC no formato binário (.ptac) em vez de texto")
+    ap.add_argument('--cache', default=None, metavar='DIR', help="diretório do cache de compilação (padrão: sem cache)")
+    ap.add_argument('--cache-max-mb', type=float, default=256, help="tamanho máximo do cache em MB (padrão: 256)")
+    ap.add_argument('-q', '--quiet', action='store_true', help="mostra apenas falhas e o resumo")
+    args = ap.parse_args(argv)
+
+    arquivos = expandir_entradas(args.entradas)
+    if not arquivos:
+        print("Nenhum arquivo .pas encontrado.")
+        return 1
+
+    inicio = time.perf_counter()
+    total_tokens = 0
+    falhas = 0
+    acertos_cache = 0
+    for rel in compilar_lote(arquivos, args.jobs, args.saida, args.max_erros, args.otimizar, args.binario,
+                             args.cache, int(args.cache_max_mb * 2**20)):
+        total_tokens += rel['tokens']
+        acertos_cache += bool(rel['cache'])
+        if rel['sucesso']:
+            if not args.quiet:
+                print(f"OK    {rel['arquivo']} -> {rel['saida']}")
+        else:
+            falhas += 1
+            for erro in rel['erros']:
+                print(f"ERRO  {rel['arquivo']}: {erro}")
+    decorrido = time.perf_counter() - inicio
+
+    print(f"\n{len(arquivos)} arquivos, {len(arquivos) - falhas} compilados, {falhas} com erro em {decorrido:.2f}s "
+          f"({len(arquivos) / decorrido:.1f} arquivos/s, {total_tokens / decorrido:.0f} tokens/s)")
+    if args.cache:
+        print(f"Cache: {acertos_cache} acertos, {len(arquivos) - acertos_cache} faltas "
+              f"({100 * acertos_cache / len(arquivos):.1f}% de acertos)")
+    return 1 if falhas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
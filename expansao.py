@@ -0,0 +1,217 @@
+import copy
+
+from otimizador_tac import eh_acesso, eh_temp, nomes_lidos, operandos_lidos, renomear
+
+# --------------------------------------------------------------------
+# EXPANSÃO DE FUNÇÕES EM LINHA
+# Troca 'param a_n; ...; param a_1; tN := call f, n' pelo corpo de f, com
+# os parâmetros e locais de f em temporários novos:
+#     tP1 := a_1; ...; tPn := a_n; tL := 0; <corpo de f>; tN := <valor do return>
+# Os temporários de f também são renomeados, a partir do maior tK do corpo
+# que chama, para não colidir com os nomes do GeradorCI.novo_temp.
+#
+# Só são expandidas as funções cujo corpo, até o primeiro 'return', não tem
+# desvios (o que vem depois dele nunca executa), com no máximo
+# `tamanho_maximo` instruções e parâmetros e locais de tipos primitivos. O
+# código expandido fica dentro do bloco básico da chamada, e cada
+# temporário que atravessa blocos continua com uma só definição. Um local
+# lido antes de ser escrito começa com o valor inicial do tipo; sem
+# 'return', o resultado é o valor inicial do tipo de retorno. Uma função
+# não é expandida no próprio corpo nem num corpo que declara um parâmetro
+# ou local com o nome de uma global que ela usa.
+#
+# As funções são tratadas de baixo para cima no grafo de chamadas, então um
+# corpo já expandido é o que vai para quem o chama. `orcamento` limita o
+# crescimento total, como fração do número de instruções do programa; as
+# chamadas que não aumentam o código são sempre expandidas.
+# --------------------------------------------------------------------
+
+TAMANHO_MAXIMO = 10
+ORCAMENTO = 0.5
+
+_INICIAIS = {'integer': 0, 'real': 0.0}
+_PRIMITIVOS = ('integer', 'real', 'string')
+_DESVIOS = ('label', 'goto', 'ifFalse')
+
+class RelatorioExpansao:
+    """ Chamadas expandidas e número de instruções (corpo principal e funções) antes e depois. """
+    __slots__ = ('chamadas', 'instrucoes_antes', 'instrucoes_depois')
+    def __init__(self, chamadas=0, instrucoes_antes=0, instrucoes_depois=0):
+        self.chamadas = chamadas
+        self.instrucoes_antes = instrucoes_antes
+        self.instrucoes_depois = instrucoes_depois
+
+    @property
+    def variacao(self):
+        return self.instrucoes_depois - self.instrucoes_antes
+
+    def __repr__(self):
+        return (f"RelatorioExpansao(chamadas={self.chamadas}, instrucoes={self.instrucoes_antes}"
+                f" -> {self.instrucoes_depois}, variacao={self.variacao:+d})")
+
+def _instrucao(modelo, op, arg1, arg2, dest):
+    novo = copy.copy(modelo)
+    novo.op, novo.arg1, novo.arg2, novo.dest = op, arg1, arg2, dest
+    return novo
+
+def _maior_temp(codigo):
+    maior = -1
+    for instr in codigo:
+        for nome in operandos_lidos(instr):
+            if eh_temp(nome): maior = max(maior, int(nome[1:]))
+        if eh_temp(instr.dest): maior = max(maior, int(instr.dest[1:]))
+    return maior
+
+def _globais_usadas(codigo, proprios):
+    """ Nomes que não são temporários nem de `proprios`, inclusive as bases de acessos e os vetores de 'limite'. """
+    nomes = set()
+    for instr in codigo:
+        if instr.op in _DESVIOS: continue
+        lidos = list(operandos_lidos(instr))
+        if type(instr.dest) is str and instr.op != 'limite':
+            lidos.extend(nomes_lidos(instr.dest))
+        elif instr.op == 'limite':
+            lidos.append(instr.dest)
+        nomes.update(nome for nome in lidos if not eh_temp(nome) and nome not in proprios)
+    return nomes
+
+class _Modelo:
+    """ O que é preciso para expandir uma função: o corpo até o primeiro 'return' e os seus nomes. """
+    __slots__ = ('parametros', 'locais', 'corpo', 'retorno', 'globais', 'iniciar')
+    def __init__(self, parametros, locais, corpo, retorno, globais, iniciar):
+        self.parametros = parametros
+        self.locais = locais
+        self.corpo = corpo
+        self.retorno = retorno
+        self.globais = globais
+        self.iniciar = iniciar
+
+def _modelo(funcao, tamanho_maximo):
+    """ _Modelo da FuncaoTAC, ou None se ela não pode ser expandida. """
+    if any(nome_tipo not in _PRIMITIVOS for _, nome_tipo in funcao.parametros):
+        return None
+    corpo, retorno = [], None
+    for instr in funcao.codigo:
+        if instr.op == 'return':
+            retorno = instr.arg1
+            break
+        if instr.op in _DESVIOS or len(corpo) == tamanho_maximo:
+            return None
+        corpo.append(instr)
+    if retorno is None:
+        if funcao.tipo_retorno != 'void' and funcao.tipo_retorno not in _INICIAIS:
+            return None
+        retorno = _INICIAIS.get(funcao.tipo_retorno, 0)
+    parametros = [nome for nome, _ in funcao.parametros]
+    locais = [nome for nome, _ in funcao.locais]
+    # Locais lidos antes da primeira escrita (o retorno conta como leitura).
+    escritos, iniciar = set(), []
+    for instr in corpo + [None]:
+        lidos = nomes_lidos(retorno) if instr is None else operandos_lidos(instr)
+        for nome in lidos:
+            if nome in locais and nome not in escritos and nome not in iniciar: iniciar.append(nome)
+        if instr is not None and type(instr.dest) is str and not eh_acesso(instr.dest): escritos.add(instr.dest)
+    tipos = dict(funcao.locais)
+    if any(tipos[nome] not in _INICIAIS for nome in iniciar) or any(t not in _PRIMITIVOS for t in tipos.values()):
+        return None
+    iniciar = [(nome, _INICIAIS[tipos[nome]]) for nome in iniciar]
+    proprios = set(parametros) | set(locais)
+    globais = _globais_usadas(corpo, proprios)
+    globais.update(nome for nome in nomes_lidos(retorno) if not eh_temp(nome) and nome not in proprios)
+    return _Modelo(parametros, locais, corpo, retorno, globais, iniciar)
+
+def _chamadas(codigo):
+    return {instr.arg1 for instr in codigo if instr.op == 'call'}
+
+def _ordem(funcoes):
+    """ Nomes das funções em pós-ordem do grafo de chamadas (quem é chamado vem antes). """
+    ordem, visitadas = [], set()
+    for raiz in funcoes:
+        if raiz in visitadas: continue
+        visitadas.add(raiz)
+        pilha = [(raiz, iter(sorted(_chamadas(funcoes[raiz].codigo))))]
+        while pilha:
+            nome, filhos = pilha[-1]
+            for filho in filhos:
+                if filho in funcoes and filho not in visitadas:
+                    visitadas.add(filho)
+                    pilha.append((filho, iter(sorted(_chamadas(funcoes[filho].codigo)))))
+                    break
+            else:
+                pilha.pop()
+                ordem.append(nome)
+    return ordem
+
+class _Expansor:
+    def __init__(self, funcoes, tamanho_maximo, orcamento):
+        self.funcoes = funcoes
+        self.tamanho_maximo = tamanho_maximo
+        self.orcamento = orcamento
+        self.modelos = {}
+        self.chamadas = 0
+
+    def modelo(self, nome):
+        if nome not in self.modelos:
+            funcao = self.funcoes.get(nome)
+            self.modelos[nome] = _modelo(funcao, self.tamanho_maximo) if funcao is not None else None
+        return self.modelos[nome]
+
+    def expandir(self, codigo, proprio=None, nomes_proprios=frozenset()):
+        """ Código com as chamadas expandidas. `proprio` é a função dona do corpo (None no
+        principal) e `nomes_proprios`, os seus parâmetros e locais. """
+        if not any(instr.op == 'call' for instr in codigo):
+            return codigo
+        proximo = _maior_temp(codigo) + 1
+        saida = []
+        for instr in codigo:
+            modelo = self.modelo(instr.arg1) if instr.op == 'call' and instr.arg1 != proprio else None
+            n = instr.arg2 if modelo is not None else 0
+            if (modelo is None or n != len(modelo.parametros) or len(saida) < n
+                    or any(anterior.op != 'param' for anterior in saida[len(saida) - n:])
+                    or not modelo.globais.isdisjoint(nomes_proprios)):
+                saida.append(instr)
+                continue
+            # Saem n 'param' e o 'call'; entram n cópias, as iniciações, o corpo e a cópia do resultado.
+            crescimento = len(modelo.iniciar) + len(modelo.corpo)
+            if crescimento > self.orcamento:
+                saida.append(instr)
+                continue
+            self.orcamento -= crescimento
+            # Os parâmetros vêm do último 'param' para o primeiro.
+            argumentos = [anterior.arg1 for anterior in reversed(saida[len(saida) - n:])]
+            del saida[len(saida) - n:]
+            mapa = {}
+            for nome in modelo.parametros + modelo.locais:
+                mapa[nome], proximo = f"t{proximo}", proximo + 1
+            for nome, argumento in zip(modelo.parametros, argumentos):
+                saida.append(_instrucao(instr, ':=', argumento, None, mapa[nome]))
+            for nome, inicial in modelo.iniciar:
+                saida.append(_instrucao(instr, ':=', inicial, None, mapa[nome]))
+            for corpo_instr in modelo.corpo:
+                for nome in (corpo_instr.arg1, corpo_instr.arg2, corpo_instr.dest):
+                    if eh_temp(nome) and nome not in mapa:
+                        mapa[nome], proximo = f"t{proximo}", proximo + 1
+                op, arg1, arg2, dest = corpo_instr.op, corpo_instr.arg1, corpo_instr.arg2, corpo_instr.dest
+                # O nome da função chamada e o vetor de um 'limite' não são renomeados.
+                if op != 'call': arg1, arg2 = renomear(arg1, mapa), renomear(arg2, mapa)
+                if op != 'limite': dest = renomear(dest, mapa)
+                saida.append(_instrucao(corpo_instr, op, arg1, arg2, dest))
+            saida.append(_instrucao(instr, ':=', renomear(modelo.retorno, mapa), None, instr.dest))
+            self.chamadas += 1
+        return saida
+
+def expandir_chamadas(codigo, funcoes, tamanho_maximo=TAMANHO_MAXIMO, orcamento=ORCAMENTO):
+    """ Expande em linha as chamadas de funções pequenas no corpo principal e nas funções.
+
+    `funcoes` (nome -> FuncaoTAC) é alterado: cada função recebe o código
+    expandido. Devolve (código do corpo principal, RelatorioExpansao).
+    """
+    antes = len(codigo) + sum(len(funcao.codigo) for funcao in funcoes.values())
+    expansor = _Expansor(funcoes, tamanho_maximo, int(antes * orcamento))
+    for nome in _ordem(funcoes):
+        funcao = funcoes[nome]
+        nomes_proprios = frozenset(nome for nome, _ in funcao.parametros + funcao.locais)
+        funcao.codigo = expansor.expandir(funcao.codigo, nome, nomes_proprios)
+    codigo = expansor.expandir(codigo)
+    depois = len(codigo) + sum(len(funcao.codigo) for funcao in funcoes.values())
+    return codigo, RelatorioExpansao(expansor.chamadas, antes, depois)
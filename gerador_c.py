@@ -0,0 +1,445 @@
+import ctypes
+import math
+import os
+import subprocess
+import tempfile
+
+from maquina import ErroExecucao
+from otimizador_tac import RELACIONAIS, eh_acesso, eh_constante, eh_temp, ler_acesso
+from parser import INTEGER, PRIMITIVOS, REAL, STRING, TipoArray, TipoRecord
+
+# --------------------------------------------------------------------
+# TAC -> C
+# Traduz um programa compilado (a tabela de símbolos da análise semântica
+# e o TAC do corpo principal e das funções) para uma unidade de tradução C
+# autocontida, construída com o `cc` do sistema. integer vira long, real
+# vira double; cada record vira um struct e cada 'array [N] of T' um struct
+# com um vetor T e[N], para que a atribuição copie o valor inteiro. Cada
+# def vira uma função C e o corpo principal, p_principal. Rótulos e desvios
+# do TAC viram rótulos e goto.
+#
+# A semântica é a da Maquina: inteiros de 64 bits dão a volta (a conta é
+# feita em unsigned long), a divisão inteira trunca em direção a zero e
+# divisão por zero, índice fora dos limites (a instrução 'limite') e recursão
+# funda demais são erros, com as mesmas mensagens. O executável imprime o estado final das
+# globais, um valor primitivo por linha; a biblioteca compartilhada exporta
+# paston_executar(), paston_erro() e paston_estado().
+# --------------------------------------------------------------------
+
+PRELUDIO = r"""#include <setjmp.h>
+#include <stdarg.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+static jmp_buf p_salto;
+static char p_mensagem[512];
+static long p_profundidade;
+
+static void p_erro(const char *formato, ...)
+{
+    va_list args;
+    va_start(args, formato);
+    vsnprintf(p_mensagem, sizeof p_mensagem, formato, args);
+    va_end(args);
+    longjmp(p_salto, 1);
+}
+
+static inline long p_soma(long a, long b) { return (long)((unsigned long)a + (unsigned long)b); }
+static inline long p_sub(long a, long b) { return (long)((unsigned long)a - (unsigned long)b); }
+static inline long p_mul(long a, long b) { return (long)((unsigned long)a * (unsigned long)b); }
+
+static inline long p_div(long a, long b)
+{
+    if (b == 0) p_erro("Erro de Execução: Divisão por zero.");
+    if (b == -1) return (long)(0UL - (unsigned long)a);
+    return a / b;
+}
+
+static inline double p_divr(double a, double b)
+{
+    if (b == 0) p_erro("Erro de Execução: Divisão por zero.");
+    return a / b;
+}
+
+static inline void p_conferir(long k, long n, const char *vetor)
+{
+    if (k < 1 || k > n) p_erro("Erro de Execução: Índice %ld fora dos limites do vetor '%s' (1 a %ld).", k, vetor, n);
+}
+
+static inline void p_entrar(const char *funcao)
+{
+    if (++p_profundidade > P_MAX_PROFUNDIDADE) p_erro("Erro de Execução: Recursão profunda demais em '%s'.", funcao);
+}
+
+static char *p_saida;
+static size_t p_capacidade, p_usado;
+
+static void p_escrever(const char *formato, ...)
+{
+    for (;;) {
+        va_list args;
+        va_start(args, formato);
+        int n = vsnprintf(p_saida + p_usado, p_capacidade - p_usado, formato, args);
+        va_end(args);
+        if (n >= 0 && p_usado + n < p_capacidade) {
+            p_usado += n;
+            return;
+        }
+        p_capacidade = 2 * p_capacidade + (n > 0 ? n : 0) + 256;
+        p_saida = realloc(p_saida, p_capacidade);
+    }
+}
+"""
+
+MAIN = r"""
+#ifndef PASTON_BIBLIOTECA
+int main(void)
+{
+    if (paston_executar()) {
+        fprintf(stderr, "%s\n", paston_erro());
+        return 1;
+    }
+    fputs(paston_estado(), stdout);
+    return 0;
+}
+#endif
+"""
+
+class ErroGeracaoC(Exception):
+    """ O programa não pode ser traduzido para C, ou o compilador C falhou. """
+    pass
+
+def _composto(tipo):
+    return type(tipo) is TipoArray or type(tipo) is TipoRecord
+
+def _literal(valor):
+    if type(valor) is int:
+        if valor == -2**63: return "(-9223372036854775807L - 1)"
+        return f"{valor}L" if valor >= 0 else f"({valor}L)"
+    if math.isnan(valor): return '__builtin_nan("")'
+    if math.isinf(valor): return '__builtin_inf()' if valor > 0 else '(-__builtin_inf())'
+    return f"{valor!r}" if valor >= 0 else f"({valor!r})"
+
+class _Tipos:
+    """ Nomes C dos tipos e os typedefs, em ordem de dependência. """
+    def __init__(self):
+        self.nomes = {INTEGER: 'long', REAL: 'double', STRING: 'const char *'}
+        self.sufixos = {INTEGER: 'l', REAL: 'd', STRING: 's'}
+        self.definicoes = []
+
+    def nome(self, tipo):
+        if tipo not in self.nomes:
+            if type(tipo) is TipoArray:
+                corpo = f"    {self.nome(tipo.tipo_base)} e[{tipo.tamanho}];"
+            elif type(tipo) is TipoRecord:
+                campos = sorted(tipo.campos.items(), key=lambda campo: campo[1][1])
+                corpo = '\n'.join(f"    {self.nome(t)} c_{nome};" for nome, (t, _) in campos)
+            else:
+                raise ErroGeracaoC(f"Tipo '{tipo}' sem representação em C.")
+            nome = f"t_{tipo.nome}"
+            self.definicoes.append(f"typedef struct {{\n{corpo}\n}} {nome};")
+            self.nomes[tipo] = nome
+            self.sufixos[tipo] = tipo.nome
+        return self.nomes[tipo]
+
+    def sufixo(self, tipo):
+        self.nome(tipo)
+        return self.sufixos[tipo]
+
+    def declaracao(self, tipo, nome):
+        c = self.nome(tipo)
+        return f"{c}{'' if c.endswith('*') else ' '}{nome}"
+
+    def inicial(self, tipo):
+        if _composto(tipo): return '{0}'
+        return '""' if tipo is STRING else '0'
+
+class _Tradutor:
+    """ Traduz o TAC de um corpo para as linhas de uma função C. `variaveis` dá o tipo dos
+    parâmetros e locais (vazio no corpo principal, que só usa globais). """
+    def __init__(self, programa, codigo, variaveis, nome_funcao=None):
+        self.programa = programa
+        self.tipos = programa.tipos
+        self.codigo = codigo
+        self.variaveis = variaveis
+        self.nome_funcao = nome_funcao
+        self.tipos_temp = {}      # temporário -> tipo da definição mais recente, na ordem do código
+        self.declarados = {}      # nome C -> tipo, dos temporários e argumentos guardados
+        self.linhas = []
+
+    def tipo_nome(self, base):
+        tipo = self.variaveis.get(base) or self.programa.tipos_globais.get(base)
+        if tipo is None:
+            raise ErroGeracaoC(f"Nome '{base}' não declarado.")
+        return tipo
+
+    def temporario(self, nome, tipo):
+        # Um temporário reaproveitado pode guardar valores de tipos diferentes: uma variável C por tipo.
+        nome_c = f"{nome}_{self.tipos.sufixo(tipo)}"
+        self.declarados[nome_c] = tipo
+        return nome_c
+
+    def expressao(self, operando):
+        """ (expressão C, tipo) do operando; os índices já foram conferidos pelas instruções 'limite'. """
+        if eh_constante(operando):
+            return _literal(operando), INTEGER if type(operando) is int else REAL
+        if eh_temp(operando):
+            tipo = self.tipos_temp.get(operando)
+            if tipo is None:
+                raise ErroGeracaoC(f"Temporário '{operando}' lido antes de definido.")
+            return self.temporario(operando, tipo), tipo
+        base, partes = ler_acesso(operando) if eh_acesso(operando) else (operando, ())
+        tipo = self.tipo_nome(base)
+        texto = f"v_{base}"
+        for parte, chave in partes:
+            if parte == '.':
+                texto += f".c_{chave}"
+                tipo = tipo.campos[chave][0]
+                continue
+            tipo = tipo.tipo_base
+            if type(chave) is int:
+                texto += f".e[{chave - 1}]"
+                continue
+            indice, _ = self.expressao(chave)
+            texto += f".e[{indice} - 1]"
+        return texto, tipo
+
+    def guardar(self, destino, valor, tipo):
+        """ Guarda um valor do tipo; um temporário passa a ter esse tipo. """
+        if eh_temp(destino):
+            self.tipos_temp[destino] = tipo
+            self.linhas.append(f"{self.temporario(destino, tipo)} = {valor};")
+            return
+        self.linhas.append(f"{self.expressao(destino)[0]} = {valor};")
+
+    def operacao(self, instr):
+        a, tipo_a = self.expressao(instr.arg1)
+        b, tipo_b = self.expressao(instr.arg2)
+        op = instr.op
+        if op in RELACIONAIS:
+            return f"({a} {op} {b})", INTEGER
+        if tipo_a is INTEGER and tipo_b is INTEGER:
+            funcao = {'+': 'p_soma', '-': 'p_sub', '*': 'p_mul', '/': 'p_div'}[op]
+            return f"{funcao}({a}, {b})", INTEGER
+        if op == '/':
+            return f"p_divr({a}, {b})", REAL
+        return f"{a} {op} {b}", REAL
+
+    def retorno(self, valor):
+        if self.nome_funcao is None:
+            return "return;"
+        return f"p_profundidade--; return {valor};"
+
+    def traduzir(self):
+        params = []
+        linhas = self.linhas
+        codigo = self.codigo
+        for i, instr in enumerate(codigo):
+            op = instr.op
+            if op == ':=':
+                self.guardar(instr.dest, *self.expressao(instr.arg1))
+            elif op in RELACIONAIS or op in ('+', '-', '*', '/'):
+                self.guardar(instr.dest, *self.operacao(instr))
+            elif op == 'param':
+                valor, tipo = self.expressao(instr.arg1)
+                proxima = codigo[i + 1] if i + 1 < len(codigo) else None
+                if proxima is None or proxima.op not in ('param', 'call'):
+                    # Algo acontece entre o 'param' e o 'call': o valor é lido agora.
+                    nome = f"p_a{len(params)}_{self.tipos.sufixo(tipo)}"
+                    self.declarados[nome] = tipo
+                    linhas.append(f"{nome} = {valor};")
+                    valor = nome
+                params.append((valor, tipo))
+            elif op == 'call':
+                funcao = self.programa.funcoes.get(instr.arg1)
+                if funcao is None:
+                    raise ErroGeracaoC(f"Função '{instr.arg1}' sem código.")
+                n = instr.arg2
+                args = params[len(params) - n:] if n else []
+                del params[len(params) - n:]
+                # O último 'param' é o primeiro argumento; os protótipos convertem integer em real.
+                chamada = f"f_{instr.arg1}({', '.join(valor for valor, _ in reversed(args))})"
+                self.guardar(instr.dest, chamada, self.programa.tipos_retorno[instr.arg1])
+            elif op == 'return':
+                valor, _ = self.expressao(instr.arg1)
+                linhas.append(self.retorno(valor))
+            elif op == 'limite':
+                indice, _ = self.expressao(instr.arg1)
+                linhas.append(f"p_conferir({indice}, {instr.arg2}, \"{instr.dest}\");")
+            elif op == 'label':
+                linhas.append(f"{instr.dest}:;")
+            elif op == 'goto':
+                linhas.append(f"goto {instr.dest};")
+            elif op == 'ifFalse':
+                valor, _ = self.expressao(instr.arg1)
+                linhas.append(f"if (!{valor}) goto {instr.dest};")
+            else:
+                raise ErroGeracaoC(f"Instrução TAC desconhecida: {instr!r}")
+        return linhas
+
+class ProgramaC:
+    """ Um resultado de compilação bem-sucedida traduzido para C.
+
+    `fonte` é a unidade de tradução. construir() chama o `cc` (ou $CC) e devolve
+    o caminho do executável ou, com compartilhado=True, da biblioteca.
+    executar() roda o executável (construído na primeira chamada) e devolve o
+    estado final das globais no formato de Maquina.estado(); um erro de
+    execução levanta ErroExecucao com a mesma mensagem da Maquina.
+    """
+    def __init__(self, resultado, max_profundidade=10000):
+        tabela = resultado.tabela_simbolos
+        self.tipos = _Tipos()
+        self.tipos_globais = {nome: info['tipo'] for nome, info in tabela.items() if info['tipo_estrutura'] == 'var'}
+
+        def resolver(nome_tipo):
+            tipo = PRIMITIVOS.get(nome_tipo)
+            return tipo if tipo is not None else tabela[nome_tipo]['descritor']
+
+        self.funcoes = resultado.funcoes
+        # Funções sem tipo de retorno devolvem 0, como na Maquina.
+        self.tipos_retorno = {nome: INTEGER if funcao.tipo_retorno == 'void' else resolver(funcao.tipo_retorno)
+                              for nome, funcao in resultado.funcoes.items()}
+        for tipo in self.tipos_globais.values(): self.tipos.nome(tipo)
+
+        prototipos, definicoes = [], []
+        for funcao in resultado.funcoes.values():
+            variaveis = {nome: resolver(nome_tipo) for nome, nome_tipo in funcao.parametros + funcao.locais}
+            tipo_retorno = self.tipos_retorno[funcao.nome]
+            parametros = ', '.join(self.tipos.declaracao(variaveis[nome], f"v_{nome}") for nome, _ in funcao.parametros)
+            cabecalho = f"static {self.tipos.declaracao(tipo_retorno, f'f_{funcao.nome}')}({parametros or 'void'})"
+            prototipos.append(cabecalho + ';')
+            tradutor = _Tradutor(self, funcao.codigo, variaveis, funcao.nome)
+            corpo = tradutor.traduzir()
+            linhas = [cabecalho, '{']
+            linhas.extend(f"    {self.tipos.declaracao(variaveis[nome], f'v_{nome}')} = {self.tipos.inicial(variaveis[nome])};"
+                          for nome, _ in funcao.locais)
+            linhas.extend(f"    {self.tipos.declaracao(tipo, nome)};" for nome, tipo in sorted(tradutor.declarados.items()))
+            linhas.append(f"    p_entrar(\"{funcao.nome}\");")
+            linhas.extend(('' if linha.endswith(':;') else '    ') + linha for linha in corpo)
+            if not corpo or not corpo[-1].startswith('p_profundidade--; return'):
+                # Sair da função sem 'return' devolve o valor inicial do tipo de retorno.
+                linhas.append(f"    {{ {self.tipos.declaracao(tipo_retorno, 'p_r')} = {self.tipos.inicial(tipo_retorno)};")
+                linhas.append("    p_profundidade--; return p_r; }")
+            linhas.append('}')
+            definicoes.append('\n'.join(linhas))
+
+        tradutor = _Tradutor(self, resultado.codigo, {})
+        corpo = tradutor.traduzir()
+        principal = ['static void p_principal(void)', '{']
+        principal.extend(f"    {self.tipos.declaracao(tipo, nome)};" for nome, tipo in sorted(tradutor.declarados.items()))
+        principal.extend(('' if linha.endswith(':;') else '    ') + linha for linha in corpo)
+        principal.append('}')
+
+        globais = [f"static {self.tipos.declaracao(tipo, f'v_{nome}')};" for nome, tipo in self.tipos_globais.items()]
+        self.fonte = '\n\n'.join([
+            "/* Gerado por gerador_c.py a partir do TAC de um programa Paston. */",
+            f"#define P_MAX_PROFUNDIDADE {max_profundidade}L\n" + PRELUDIO,
+            '\n\n'.join(self.tipos.definicoes),
+            '\n'.join(globais),
+            '\n'.join(prototipos),
+            '\n\n'.join(definicoes),
+            '\n'.join(principal),
+            self._estado(),
+        ]) + '\n' + MAIN
+        self.executavel = None
+        self.biblioteca = None
+
+    def _estado(self):
+        """ paston_executar, paston_erro e paston_estado, que imprime um valor primitivo por linha. """
+        imprimir = {}
+
+        def funcao(tipo):
+            if tipo in imprimir: return imprimir[tipo][0]
+            nome = f"p_estado_{tipo.nome}"
+            c = self.tipos.nome(tipo)
+            if type(tipo) is TipoArray:
+                corpo = [f"    for (long k = 0; k < {tipo.tamanho}; k++)", f"        {folha(tipo.tipo_base, 'v->e[k]')}"]
+            else:
+                corpo = [f"    {folha(t, f'v->c_{campo}')}" for campo, (t, _) in tipo.campos.items()]
+            # Os tipos dos elementos e campos já foram definidos durante a montagem do corpo.
+            imprimir[tipo] = (nome, '\n'.join([f"static void {nome}(const {c} *v)", '{'] + corpo + ['}']))
+            return nome
+
+        def folha(tipo, valor):
+            if tipo is INTEGER: return f'p_escrever("%ld\\n", {valor});'
+            if tipo is REAL: return f'p_escrever("%.17g\\n", {valor});'
+            if tipo is STRING: return f'p_escrever("%s\\n", {valor} ? {valor} : "");'
+            return f"{funcao(tipo)}(&{valor});"
+
+        estado = [folha(tipo, f"v_{nome}") for nome, tipo in self.tipos_globais.items()]
+        reiniciar = [f"    memset(&v_{nome}, 0, sizeof v_{nome});" for nome in self.tipos_globais]
+        reiniciar += [f"    v_{nome} = \"\";" for nome, tipo in self.tipos_globais.items() if tipo is STRING]
+        partes = [definicao for _, definicao in imprimir.values()]
+        partes.append('\n'.join(['int paston_executar(void)', '{'] + reiniciar + [
+            '    p_profundidade = 0;',
+            '    if (setjmp(p_salto)) return 1;',
+            '    p_principal();',
+            '    return 0;',
+            '}']))
+        partes.append('const char *paston_erro(void)\n{\n    return p_mensagem;\n}')
+        partes.append('\n'.join(['const char *paston_estado(void)', '{', '    p_usado = 0;',
+                                 '    p_escrever("%s", "");'] + ['    ' + linha for linha in estado] +
+                                ['    return p_saida;', '}']))
+        return '\n\n'.join(partes)
+
+    def construir(self, destino=None, compartilhado=False, cc=None, opcoes=('-O2',)):
+        """ Compila a fonte com o compilador C; sem `destino`, num diretório temporário. """
+        if destino is None:
+            destino = os.path.join(tempfile.mkdtemp(prefix='paston_'), 'programa.so' if compartilhado else 'programa')
+        fonte = os.path.splitext(destino)[0] + '.c'
+        with open(fonte, 'w', encoding='utf-8') as file:
+            file.write(self.fonte)
+        comando = [cc or os.environ.get('CC', 'cc'), *opcoes]
+        if compartilhado:
+            comando += ['-shared', '-fPIC', '-DPASTON_BIBLIOTECA']
+        comando += ['-o', destino, fonte]
+        try:
+            processo = subprocess.run(comando, capture_output=True, text=True)
+        except OSError as erro:
+            raise ErroGeracaoC(f"Compilador C indisponível: {erro}") from None
+        if processo.returncode != 0:
+            raise ErroGeracaoC(f"O compilador C falhou:\n{processo.stderr}")
+        if compartilhado:
+            self.biblioteca = destino
+        else:
+            self.executavel = destino
+        return destino
+
+    def executar(self):
+        if self.executavel is None:
+            self.construir()
+        processo = subprocess.run([self.executavel], capture_output=True, text=True)
+        if processo.returncode != 0:
+            raise ErroExecucao(processo.stderr.strip())
+        return self.ler_estado(processo.stdout)
+
+    def carregar(self):
+        """ A biblioteca compartilhada (construída na primeira chamada) aberta com ctypes. """
+        if self.biblioteca is None:
+            self.construir(compartilhado=True)
+        biblioteca = ctypes.CDLL(os.path.abspath(self.biblioteca))
+        biblioteca.paston_erro.restype = ctypes.c_char_p
+        biblioteca.paston_estado.restype = ctypes.c_char_p
+        return biblioteca
+
+    def executar_biblioteca(self, biblioteca):
+        if biblioteca.paston_executar():
+            raise ErroExecucao(biblioteca.paston_erro().decode())
+        return self.ler_estado(biblioteca.paston_estado().decode())
+
+    def ler_estado(self, saida):
+        """ Variáveis globais -> valor, a partir das linhas impressas por paston_estado. """
+        valores = iter(saida.split('\n'))
+
+        def valor(tipo):
+            if type(tipo) is TipoArray:
+                return [valor(tipo.tipo_base) for _ in range(tipo.tamanho)]
+            if type(tipo) is TipoRecord:
+                return {campo: valor(tipo_campo) for campo, (tipo_campo, _) in tipo.campos.items()}
+            texto = next(valores)
+            if tipo is INTEGER: return int(texto)
+            if tipo is REAL: return float(texto)
+            return texto
+
+        return {nome: valor(tipo) for nome, tipo in self.tipos_globais.items()}
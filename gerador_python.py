@@ -0,0 +1,508 @@
+import hashlib
+import math
+import sys
+from collections import OrderedDict
+
+from maquina import MAX_INTEIRO, MIN_INTEIRO, VALORES_INICIAIS, ErroExecucao, ajustar_inteiro, dividir
+from grafo_fluxo import GrafoFluxo, vivacidade_blocos
+from otimizador_tac import RELACIONAIS, eh_acesso, eh_constante, eh_temp, ler_acesso
+from parser import INTEGER, PRIMITIVOS, REAL, TipoArray, TipoRecord
+
+# --------------------------------------------------------------------
+# TAC -> FUNÇÕES PYTHON
+# Traduz o TAC do GeradorCI para o texto de um módulo Python, compilado uma
+# vez com compile(). Cada função Paston vira uma função Python (f_<nome>)
+# e o corpo principal vira _principal. Variáveis são v_<nome>, temporários
+# continuam tN, e ambos são variáveis locais rápidas; as globais usadas por
+# alguma função ficam no módulo, e as outras são locais de _principal.
+# 'param ...; tN := call f, n' vira 'tN = f_f(...)'.
+#
+# Vetores são listas com a posição 0 vazia (a[i] é a[i] na lista) e records
+# são listas com um campo por posição, na ordem da declaração. Os limites
+# são conferidos só pelas instruções 'limite' do TAC. Os desvios viram while/if
+# quando o código tem a forma que o GeradorCI emite; senão, os blocos
+# básicos são despachados por um laço com uma variável de estado. A
+# semântica é a da Maquina: inteiros de 64 bits com sinal, divisão inteira
+# truncada em direção a zero, vetores e records copiados na atribuição.
+# --------------------------------------------------------------------
+
+_FORMATO_INTEIRO = f"if not {MIN_INTEIRO} <= {{0}} <= {MAX_INTEIRO}: {{0}} = _ajustar({{0}})"
+
+class _NaoEstruturado(Exception):
+    pass
+
+def _composto(tipo):
+    return type(tipo) is TipoArray or type(tipo) is TipoRecord
+
+def _literal(valor):
+    # Um inteiro fora de 64 bits (só em TAC montado à mão) dá a volta, como na Maquina.
+    if type(valor) is int:
+        return repr(ajustar_inteiro(valor))
+    if not math.isfinite(valor):
+        return f"float('{valor}')"
+    return repr(valor)
+
+def _fora(k, n, vetor):
+    raise ErroExecucao(f"Erro de Execução: Índice {k} fora dos limites do vetor '{vetor}' (1 a {n}).")
+
+def _funcao_mais_funda(erro):
+    """ Nome Paston da função gerada mais interna no traceback de `erro`. """
+    nome, tb = None, erro.__traceback__
+    while tb is not None:
+        if tb.tb_frame.f_code.co_name.startswith('f_'): nome = tb.tb_frame.f_code.co_name[2:]
+        tb = tb.tb_next
+    return nome
+
+def _copiar(valor):
+    return [_copiar(v) if type(v) is list else v for v in valor]
+
+def _posicao_campo(tipo, nome):
+    """ Posição do campo na lista do record (a ordem da declaração). """
+    indice = tipo.campos[nome][1]
+    return sum(1 for _, k in tipo.campos.values() if k < indice)
+
+def _inicial(tipo):
+    """ Expressão Python com o valor inicial de uma variável do tipo. """
+    if type(tipo) is TipoArray:
+        elemento = _inicial(tipo.tipo_base)
+        if _composto(tipo.tipo_base):
+            return f"[None] + [{elemento} for _ in range({tipo.tamanho})]"
+        return f"[None] + [{elemento}] * {tipo.tamanho}"
+    if type(tipo) is TipoRecord:
+        campos = sorted(tipo.campos.values(), key=lambda campo: campo[1])
+        return '[' + ', '.join(_inicial(tipo_campo) for tipo_campo, _ in campos) + ']'
+    return repr(VALORES_INICIAIS.get(tipo, 0))
+
+def _copia(expressao, tipo):
+    """ Cópia de um vetor ou record: fatia se os elementos são primitivos, _copiar se não. """
+    elementos = [tipo.tipo_base] if type(tipo) is TipoArray else [t for t, _ in tipo.campos.values()]
+    if any(_composto(t) for t in elementos):
+        return f"_copiar({expressao})"
+    return f"{expressao}[:]"
+
+class _Tradutor:
+    """ Traduz o TAC de um corpo para as linhas de uma função Python. `variaveis` dá o tipo das
+    variáveis locais (as globais de _principal que nenhuma função usa, ou parâmetros e locais). """
+    def __init__(self, programa, codigo, variaveis):
+        self.programa = programa
+        self.codigo = codigo
+        self.variaveis = variaveis
+        self.globais_usadas = set()
+        self.tipos_temp = self.inferir_tipos()
+
+    # ---------------- tipos ----------------
+
+    def tipo_nome(self, base):
+        if base in self.variaveis:
+            return self.variaveis[base]
+        if base in self.programa.tipos_globais:
+            return self.programa.tipos_globais[base]
+        raise ErroExecucao(f"Erro de Execução: Nome '{base}' não declarado.")
+
+    def tipo(self, operando, tipos_temp):
+        if eh_constante(operando):
+            return INTEGER if type(operando) is int else REAL
+        if eh_temp(operando):
+            return tipos_temp.get(operando)
+        base, partes = ler_acesso(operando) if eh_acesso(operando) else (operando, ())
+        tipo = self.tipo_nome(base)
+        for parte, chave in partes:
+            tipo = tipo.campos[chave][0] if parte == '.' else tipo.tipo_base
+        return tipo
+
+    def tipo_resultado(self, instr, tipos_temp):
+        op = instr.op
+        if op in RELACIONAIS:
+            return INTEGER
+        if op == ':=':
+            return self.tipo(instr.arg1, tipos_temp)
+        if op == 'call':
+            return self.programa.tipos_retorno.get(instr.arg1)
+        a, b = self.tipo(instr.arg1, tipos_temp), self.tipo(instr.arg2, tipos_temp)
+        if a is REAL or b is REAL: return REAL
+        return INTEGER if a is INTEGER and b is INTEGER else None
+
+    def inferir_tipos(self):
+        """ Tipo de cada temporário: o das suas definições, ou None se elas discordam ou se não se sabe. """
+        definicoes = [instr for instr in self.codigo if eh_temp(instr.dest) and instr.op not in ('label', 'goto', 'ifFalse')]
+        tipos = {}
+        mudou = True
+        while mudou:
+            mudou = False
+            vistos = {}
+            for instr in definicoes:
+                tipo = self.tipo_resultado(instr, tipos)
+                anterior = vistos.get(instr.dest, tipo)
+                vistos[instr.dest] = tipo if anterior is tipo else None
+            if vistos != tipos:
+                tipos, mudou = vistos, True
+        return tipos
+
+    # ---------------- operandos ----------------
+
+    def nome(self, base):
+        if base not in self.variaveis:
+            self.tipo_nome(base)
+            self.globais_usadas.add(base)
+        return 'v_' + base
+
+    def expressao(self, operando):
+        """ (expressão Python, tipo) do operando. """
+        if eh_constante(operando):
+            return _literal(operando), INTEGER if type(operando) is int else REAL
+        if eh_temp(operando):
+            return operando, self.tipos_temp.get(operando)
+        base, partes = ler_acesso(operando) if eh_acesso(operando) else (operando, ())
+        tipo = self.tipo_nome(base)
+        texto = self.nome(base)
+        for parte, chave in partes:
+            if parte == '.':
+                texto += f"[{_posicao_campo(tipo, chave)}]"
+                tipo = tipo.campos[chave][0]
+                continue
+            n = tipo.tamanho
+            tipo = tipo.tipo_base
+            if type(chave) is int and 1 <= chave <= n:
+                texto += f"[{chave}]"
+                continue
+            # Uma constante fora dos limites só é erro se for executada, e o 'limite' antes do acesso falha primeiro.
+            indice, _ = self.expressao(chave)
+            texto += f"[{indice}]"
+        return texto, tipo
+
+    def ler(self, operando):
+        """ Expressão que lê o operando; um vetor ou record de uma variável é copiado. """
+        texto, tipo = self.expressao(operando)
+        if _composto(tipo) and not eh_temp(operando):
+            texto = _copia(texto, tipo)
+        return texto, tipo
+
+    def guardar(self, destino, valor, linhas, inteiro=False, novo=True):
+        """ Linhas que guardam `valor` no destino. Com `inteiro`, o resultado é ajustado a 64 bits;
+        sem `novo` (um temporário), um vetor ou record é copiado para a variável. """
+        if eh_temp(destino):
+            linhas.append(f"{destino} = {valor}")
+            if inteiro: linhas.append(_FORMATO_INTEIRO.format(destino))
+            return
+        alvo, tipo = self.expressao(destino)
+        if _composto(tipo) and not novo:
+            valor = _copia(valor, tipo)
+        linhas.append(f"{alvo} = {valor}")
+        if inteiro: linhas.append(_FORMATO_INTEIRO.format(alvo))
+
+    # ---------------- instruções ----------------
+
+    def operacao(self, instr):
+        """ Expressão de uma instrução aritmética ou relacional e se o resultado é inteiro. """
+        a, tipo_a = self.ler(instr.arg1)
+        b, tipo_b = self.ler(instr.arg2)
+        op = instr.op
+        if op in RELACIONAIS:
+            return f"{a} {op} {b}", False
+        inteiros = tipo_a is INTEGER and tipo_b is INTEGER
+        if op == '/':
+            if tipo_a is REAL or tipo_b is REAL:
+                return f"{a} / {b}", False
+            if inteiros and type(instr.arg2) is int and instr.arg2 > 0:
+                return f"({a} // {b} if {a} >= 0 else -(-{a} // {b}))", False
+            return f"_dividir({a}, {b})", False
+        return f"{a} {op} {b}", tipo_a is not REAL and tipo_b is not REAL
+
+    def traduzir(self, final):
+        """ Linhas do corpo da função (sem cabeçalho), terminadas pela linha `final`. """
+        itens = self.itens(final)
+        try:
+            self.rotulos = {item[1]: i for i, item in enumerate(itens) if item[0] == 'label'}
+            self.ultimo_goto = {rotulo: i for i, item in enumerate(itens) if item[0] == 'goto'
+                                for rotulo in (item[1],)}
+            linhas = []
+            self.estruturar(itens, 0, len(itens), (), linhas, 1)
+            if not linhas or not linhas[-1].startswith('    return'): linhas.append('    ' + final)
+            return linhas
+        except _NaoEstruturado:
+            return self.despachar(itens, final)
+
+    def testes_mortos(self):
+        """ Índices dos 'ifFalse' cujo temporário testado não é lido depois do desvio. """
+        codigo = self.codigo
+        if not any(instr.op == 'ifFalse' for instr in codigo):
+            return set()
+        grafo = GrafoFluxo(codigo)
+        bits, _, saidas = vivacidade_blocos(grafo, considerar=eh_temp)
+        mortos = set()
+        for bloco, saida in zip(grafo.blocos, saidas):
+            instr = codigo[bloco.fim - 1] if bloco.fim > bloco.inicio else None
+            if instr is not None and instr.op == 'ifFalse' and eh_temp(instr.arg1):
+                indice = bits.indices.get(instr.arg1)
+                if indice is None or not saida >> indice & 1: mortos.add(bloco.fim - 1)
+        return mortos
+
+    def itens(self, final):
+        """ O corpo como ('codigo', linhas), ('label', L), ('goto', L) e ('se_nao', linhas, condição, L). """
+        codigo = self.codigo
+        testes_mortos = self.testes_mortos()
+        itens = []
+        linhas = []
+        params = []
+        i = 0
+        while i < len(codigo):
+            instr = codigo[i]
+            i += 1
+            op = instr.op
+            if op == ':=':
+                valor, _ = self.ler(instr.arg1)
+                self.guardar(instr.dest, valor, linhas, novo=not eh_temp(instr.arg1))
+            elif op in RELACIONAIS or op in ('+', '-', '*', '/'):
+                proxima = codigo[i] if i < len(codigo) else None
+                if (op in RELACIONAIS and eh_temp(instr.dest) and proxima is not None and proxima.op == 'ifFalse'
+                        and proxima.arg1 == instr.dest and i in testes_mortos):
+                    # 'tN := a < b; ifFalse tN goto L' com tN morto depois vira 'if not (a < b)'.
+                    condicao, _ = self.operacao(instr)
+                    itens.append(('codigo', linhas))
+                    itens.append(('se_nao', [], condicao, proxima.dest))
+                    linhas = []
+                    i += 1
+                    continue
+                expressao, inteiro = self.operacao(instr)
+                if op in RELACIONAIS: expressao = f"1 if {expressao} else 0"
+                self.guardar(instr.dest, expressao, linhas, inteiro)
+            elif op == 'param':
+                valor, _ = self.expressao(instr.arg1)
+                proxima = codigo[i] if i < len(codigo) else None
+                if proxima is None or proxima.op not in ('param', 'call'):
+                    # Algo acontece entre o 'param' e o 'call': o valor é lido agora.
+                    linhas.append(f"_p{len(params)} = {valor}")
+                    valor = f"_p{len(params)}"
+                params.append(valor)
+            elif op == 'call':
+                if instr.arg1 not in self.programa.tipos_retorno:
+                    raise ErroExecucao(f"Erro de Execução: Função '{instr.arg1}' sem código.")
+                n = instr.arg2
+                args = params[len(params) - n:] if n else []
+                del params[len(params) - n:]
+                # O último 'param' é o primeiro argumento.
+                chamada = f"f_{instr.arg1}({', '.join(reversed(args))})"
+                self.guardar(instr.dest, chamada, linhas)
+            elif op == 'return':
+                valor, _ = self.ler(instr.arg1)
+                linhas.append(f"return {valor}")
+            elif op == 'limite':
+                indice, _ = self.expressao(instr.arg1)
+                linhas.append(f"if not 0 < {indice} <= {instr.arg2}: _fora({indice}, {instr.arg2}, {instr.dest!r})")
+            elif op == 'label' or op == 'goto' or op == 'ifFalse':
+                if linhas: itens.append(('codigo', linhas))
+                linhas = []
+                if op == 'ifFalse':
+                    condicao, _ = self.expressao(instr.arg1)
+                    itens.append(('se_nao', linhas, condicao, instr.dest))
+                    linhas = []
+                else:
+                    itens.append((op, instr.dest))
+            else:
+                raise ErroExecucao(f"Erro de Execução: Instrução TAC desconhecida: {instr!r}")
+        if linhas: itens.append(('codigo', linhas))
+        return itens
+
+    # ---------------- desvios ----------------
+
+    def salto(self, rotulo, lacos):
+        """ 'break' ou 'continue' para um desvio ao fim ou ao início do laço mais interno. """
+        if lacos and rotulo == lacos[-1][0]: return 'continue'
+        if lacos and rotulo == lacos[-1][1]: return 'break'
+        raise _NaoEstruturado(rotulo)
+
+    def estruturar(self, itens, inicio, fim, lacos, linhas, nivel):
+        """ Traduz itens[inicio:fim] para while/if. Desvios fora dessas formas levantam _NaoEstruturado. """
+        recuo = '    ' * nivel
+        i = inicio
+        while i < fim:
+            item = itens[i]
+            tipo = item[0]
+            if tipo == 'codigo':
+                linhas.extend(recuo + linha for linha in item[1])
+                i += 1
+            elif tipo == 'label':
+                j = self.ultimo_goto.get(item[1], -1)
+                if j >= fim:
+                    raise _NaoEstruturado(item[1])
+                if j < i:
+                    # Só desvios para frente, já traduzidos pelo if que os contém.
+                    i += 1
+                    continue
+                # Linicio: ... goto Linicio [Lfim:]
+                saida = itens[j + 1][1] if j + 1 < len(itens) and itens[j + 1][0] == 'label' else None
+                linhas.append(recuo + 'while True:')
+                self.bloco(itens, i + 1, j, lacos + ((item[1], saida),), linhas, nivel + 1)
+                i = j + 1
+            elif tipo == 'goto':
+                linhas.append(recuo + self.salto(item[1], lacos))
+                i += 1
+            else:
+                _, previas, condicao, rotulo = item
+                linhas.extend(recuo + linha for linha in previas)
+                if lacos and rotulo in lacos[-1]:
+                    linhas.append(f"{recuo}if not ({condicao}): {self.salto(rotulo, lacos)}")
+                    i += 1
+                    continue
+                k = self.rotulos.get(rotulo, -1)
+                if not i < k < fim:
+                    raise _NaoEstruturado(rotulo)
+                linhas.append(f"{recuo}if {condicao}:")
+                anterior = itens[k - 1]
+                if (k - 1 > i and anterior[0] == 'goto' and not (lacos and anterior[1] in lacos[-1])
+                        and k < self.rotulos.get(anterior[1], -1) < fim):
+                    # ifFalse c goto Lsenao; entao; goto Lfim; Lsenao: senao; Lfim:
+                    m = self.rotulos[anterior[1]]
+                    self.bloco(itens, i + 1, k - 1, lacos, linhas, nivel + 1)
+                    linhas.append(recuo + 'else:')
+                    self.bloco(itens, k + 1, m, lacos, linhas, nivel + 1)
+                    i = m
+                else:
+                    self.bloco(itens, i + 1, k, lacos, linhas, nivel + 1)
+                    i = k
+
+    def bloco(self, itens, inicio, fim, lacos, linhas, nivel):
+        tamanho = len(linhas)
+        self.estruturar(itens, inicio, fim, lacos, linhas, nivel)
+        if len(linhas) == tamanho: linhas.append('    ' * nivel + 'pass')
+
+    def despachar(self, itens, final):
+        """ Um bloco por rótulo, escolhido num laço pela variável _b. """
+        inicios = [0] + [i for i, item in enumerate(itens) if item[0] == 'label' and i > 0]
+        numero = {itens[i][1]: b for b, i in enumerate(inicios) if itens[i][0] == 'label'}
+        linhas = ['    _b = 0', '    while True:']
+        for b, inicio in enumerate(inicios):
+            fim = inicios[b + 1] if b + 1 < len(inicios) else len(itens)
+            linhas.append(f"        {'if' if b == 0 else 'elif'} _b == {b}:")
+            for item in itens[inicio:fim]:
+                if item[0] == 'codigo':
+                    linhas.extend('            ' + linha for linha in item[1])
+                elif item[0] == 'goto':
+                    linhas.append(f"            _b = {numero[item[1]]}")
+                    linhas.append('            continue')
+                elif item[0] == 'se_nao':
+                    _, previas, condicao, rotulo = item
+                    linhas.extend('            ' + linha for linha in previas)
+                    linhas.append(f"            if not ({condicao}):")
+                    linhas.append(f"                _b = {numero[rotulo]}")
+                    linhas.append('                continue')
+            if b + 1 < len(inicios):
+                linhas.append(f"            _b = {b + 1}")
+            else:
+                linhas.append('            ' + final)
+        return linhas
+
+class ProgramaPython:
+    """ Um resultado de compilação bem-sucedida traduzido para Python.
+
+    `fonte` é o texto do módulo gerado e `codigo`, o code object compilado.
+    executar() roda o programa desde o início num namespace novo e devolve o
+    estado final das variáveis globais, no formato de Maquina.estado().
+    Divisão por zero, índice fora dos limites e recursão mais funda que
+    max_profundidade levantam ErroExecucao.
+    """
+    def __init__(self, resultado, max_profundidade=10000):
+        self.max_profundidade = max_profundidade
+        tabela = resultado.tabela_simbolos
+        self.tipos_globais = {nome: info['tipo'] for nome, info in tabela.items() if info['tipo_estrutura'] == 'var'}
+
+        def resolver(nome_tipo):
+            tipo = PRIMITIVOS.get(nome_tipo)
+            return tipo if tipo is not None else tabela[nome_tipo]['descritor']
+
+        self.tipos_retorno = {nome: None if funcao.tipo_retorno == 'void' else resolver(funcao.tipo_retorno)
+                              for nome, funcao in resultado.funcoes.items()}
+        definicoes = []
+        globais_modulo = set()
+        for funcao in resultado.funcoes.values():
+            variaveis = {nome: resolver(nome_tipo) for nome, nome_tipo in funcao.parametros + funcao.locais}
+            tradutor = _Tradutor(self, funcao.codigo, variaveis)
+            tipo_retorno = self.tipos_retorno[funcao.nome]
+            # Sair da função sem 'return' devolve o valor inicial do tipo de retorno.
+            corpo = tradutor.traduzir(f"return {_inicial(tipo_retorno) if tipo_retorno is not None else 0}")
+            globais_modulo |= tradutor.globais_usadas
+            cabecalho = [f"def f_{funcao.nome}({', '.join('v_' + nome for nome, _ in funcao.parametros)}):"]
+            if tradutor.globais_usadas:
+                cabecalho.append(f"    global {', '.join('v_' + nome for nome in sorted(tradutor.globais_usadas))}")
+            for nome, _ in funcao.parametros:
+                if _composto(variaveis[nome]): cabecalho.append(f"    v_{nome} = {_copia('v_' + nome, variaveis[nome])}")
+            cabecalho.extend(f"    v_{nome} = {_inicial(variaveis[nome])}" for nome, _ in funcao.locais)
+            definicoes.append('\n'.join(cabecalho + corpo))
+
+        # Globais que nenhuma função usa são locais de _principal, devolvidas ao final.
+        self.locais_principal = [nome for nome in self.tipos_globais if nome not in globais_modulo]
+        tradutor = _Tradutor(self, resultado.codigo, {nome: self.tipos_globais[nome] for nome in self.locais_principal})
+        retorno = ', '.join('v_' + nome for nome in self.locais_principal)
+        corpo = tradutor.traduzir(f"return ({retorno}{',' if len(self.locais_principal) == 1 else ''})")
+        cabecalho = ['def _principal():']
+        if tradutor.globais_usadas:
+            cabecalho.append(f"    global {', '.join('v_' + nome for nome in sorted(tradutor.globais_usadas))}")
+        cabecalho.extend(f"    v_{nome} = {_inicial(self.tipos_globais[nome])}" for nome in self.locais_principal)
+        modulo = [f"v_{nome} = {_inicial(self.tipos_globais[nome])}" for nome in sorted(globais_modulo)]
+        partes = (['\n'.join(modulo)] if modulo else []) + definicoes + ['\n'.join(cabecalho + corpo)]
+        self.fonte = '\n\n'.join(partes) + '\n'
+        self.codigo = compile(self.fonte, '<paston>', 'exec')
+        self.globais = None
+
+    def executar(self):
+        globais = {'_ajustar': ajustar_inteiro, '_dividir': dividir, '_fora': _fora, '_copiar': _copiar}
+        exec(self.codigo, globais)
+        limite = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limite, self.max_profundidade + 50))
+        try:
+            locais = globais['_principal']()
+        except ZeroDivisionError:
+            raise ErroExecucao("Erro de Execução: Divisão por zero.") from None
+        except RecursionError as erro:
+            raise ErroExecucao(f"Erro de Execução: Recursão profunda demais em '{_funcao_mais_funda(erro)}'.") from None
+        finally:
+            sys.setrecursionlimit(limite)
+        for nome, valor in zip(self.locais_principal, locais):
+            globais['v_' + nome] = valor
+        self.globais = globais
+        return self.estado()
+
+    def estado(self):
+        """ Variáveis globais -> valor; vetores viram listas e records, dicionários por campo. """
+        def valor(tipo, v):
+            if type(tipo) is TipoArray:
+                return [valor(tipo.tipo_base, e) for e in v[1:]]
+            if type(tipo) is TipoRecord:
+                return {campo: valor(tipo_campo, v[_posicao_campo(tipo, campo)])
+                        for campo, (tipo_campo, _) in tipo.campos.items()}
+            return v
+
+        if self.globais is None:
+            return None
+        return {nome: valor(tipo, self.globais['v_' + nome]) for nome, tipo in self.tipos_globais.items()}
+
+class CacheCodigos:
+    """ ProgramaPython já traduzido e compilado por SHA-256 do código-fonte e das opções
+    do compilador. Guarda as `max_entradas` mais recentemente usadas, em memória. """
+    def __init__(self, max_entradas=128):
+        self.max_entradas = max_entradas
+        self.entradas = OrderedDict()
+        self.acertos = 0
+        self.faltas = 0
+
+    def chave(self, codigo, compilador):
+        h = hashlib.sha256(repr((compilador.otimizar, compilador.reusar_temps, compilador.expandir)).encode())
+        h.update(codigo.encode('utf-8', 'surrogatepass'))
+        return h.hexdigest()
+
+    def programa(self, compilador, codigo):
+        """ ProgramaPython do código-fonte, ou None se a compilação falhar. """
+        chave = self.chave(codigo, compilador)
+        programa = self.entradas.get(chave)
+        if programa is not None:
+            self.acertos += 1
+            self.entradas.move_to_end(chave)
+            return programa
+        self.faltas += 1
+        resultado = compilador.compilar_codigo(codigo)
+        if not resultado.sucesso:
+            return None
+        programa = self.entradas[chave] = ProgramaPython(resultado)
+        if len(self.entradas) > self.max_entradas:
+            self.entradas.popitem(last=False)
+        return programa
@@ -0,0 +1,77 @@
+import argparse
+import os
+import re
+import sys
+
+# --------------------------------------------------------------------
+# REGENERAÇÃO DAS TABELAS DO LEXER E DO PARSER
+# O compilador carrega lextab.py e parsetab.py prontos, sem validar a
+# gramática nem gravar nada. Depois de mudar tokens ou regras p_*, rode:
+#     python3 gerar_tabelas.py               regenera lextab.py, parsetab.py e parser.out
+#     python3 gerar_tabelas.py --verificar   só confere se as tabelas estão em dia
+# --------------------------------------------------------------------
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+ARQUIVOS = ('lextab.py', 'parsetab.py', 'parser.out')
+
+def _regras_lexer(modulo, mestres, tokens, ignorar, erro):
+    """ Resumo comparável das regras: as de função em ordem e as de string como conjunto
+    (o PLY ordena as de string por tamanho, e a ordem dos empates varia). """
+    partes = [p for mestre in mestres for p in re.split(r'\|(?=\(\?P<)', mestre)]
+    funcoes = [p for p in partes if callable(getattr(modulo, p[4:p.index('>')], None))]
+    return funcoes, sorted(set(partes) - set(funcoes)), sorted(tokens), ignorar, erro
+
+def tabelas_em_dia():
+    """ Lista de tabelas geradas que não correspondem mais ao código (vazia se tudo estiver em dia). """
+    import ply.lex as lex
+    import ply.yacc as yacc
+    import lexer
+    import lextab
+    import parser
+    import parsetab
+
+    desatualizadas = []
+    # Um lexer construído do zero tem de ter as mesmas regras de lextab.py.
+    novo = lex.lex(module=lexer)
+    regras_novas = _regras_lexer(lexer, novo.lexstateretext['INITIAL'], novo.lextokens,
+                                 novo.lexstateignore['INITIAL'], novo.lexstateerrorf['INITIAL'].__name__)
+    regras_tabela = _regras_lexer(lexer, [r for r, _ in lextab._lexstatere['INITIAL']], lextab._lextokens,
+                                  lextab._lexstateignore['INITIAL'], lextab._lexstateerrorf['INITIAL'])
+    if regras_novas != regras_tabela:
+        desatualizadas.append('lextab.py')
+    informacao = yacc.ParserReflect(vars(parser))
+    informacao.get_all()
+    if informacao.signature() != parsetab._lr_signature:
+        desatualizadas.append('parsetab.py')
+    return desatualizadas
+
+def regenerar():
+    for nome in ARQUIVOS:
+        caminho = os.path.join(PASTA, nome)
+        if os.path.exists(caminho):
+            os.remove(caminho)
+    # Sem as tabelas, a importação do lexer grava lextab.py e o modo de
+    # desenvolvimento do parser grava parsetab.py e parser.out.
+    import lexer  # noqa: F401
+    import parser
+    parser.construir_parser(desenvolvimento=True)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Regenera (ou confere) as tabelas do lexer e do parser.")
+    ap.add_argument('--verificar', action='store_true', help="só confere se as tabelas estão em dia")
+    args = ap.parse_args(argv)
+
+    sys.path.insert(0, PASTA)
+    if args.verificar:
+        desatualizadas = tabelas_em_dia()
+        for nome in desatualizadas:
+            print(f"{nome} está desatualizado: rode python3 gerar_tabelas.py")
+        if not desatualizadas:
+            print("Tabelas em dia.")
+        return 1 if desatualizadas else 0
+    regenerar()
+    print("Tabelas regeneradas: " + ", ".join(ARQUIVOS))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
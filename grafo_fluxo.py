@@ -0,0 +1,311 @@
+import heapq
+
+from otimizador_tac import eh_acesso, eh_temp, operandos_lidos
+
+# --------------------------------------------------------------------
+# GRAFO DE FLUXO DE CONTROLE E ANÁLISE DE FLUXO DE DADOS
+# GrafoFluxo(codigo) divide o TAC em blocos básicos: um bloco começa na
+# primeira instrução, em cada 'label' e depois de cada desvio ('goto',
+# 'ifFalse') ou 'return'. resolver_fluxo é um resolvedor genérico por lista
+# de trabalho em que cada conjunto é um int usado como vetor de bits, então
+# união, interseção e diferença custam uma operação sobre inteiros. Sobre ele
+# ficam a vivacidade (de trás para frente) e as definições alcançantes
+# (para frente).
+#
+# Os elementos são numerados na ordem em que aparecem nos conjuntos que
+# importam (as leituras expostas de cada bloco, as definições), para que os
+# inteiros fiquem do tamanho do que de fato flui entre blocos.
+# --------------------------------------------------------------------
+
+DESVIOS = {'goto', 'ifFalse'}
+FIM_DE_BLOCO = DESVIOS | {'return'}
+
+class BlocoBasico:
+    """ Instruções codigo[inicio:fim] do grafo. `saida` indica se o controle pode sair do código a partir dele. """
+    __slots__ = ('indice', 'inicio', 'fim', 'rotulo', 'sucessores', 'predecessores', 'saida')
+
+    def __init__(self, indice, inicio, fim, rotulo=None):
+        self.indice = indice
+        self.inicio = inicio
+        self.fim = fim
+        self.rotulo = rotulo
+        self.sucessores = []
+        self.predecessores = []
+        self.saida = False
+
+    def __repr__(self):
+        return f"BlocoBasico({self.indice}, {self.inicio}:{self.fim}, -> {self.sucessores})"
+
+class GrafoFluxo:
+    def __init__(self, codigo):
+        self.codigo = codigo
+        self.blocos = []
+        self.bloco_do_rotulo = {}
+        inicio = 0
+        for i, instr in enumerate(codigo):
+            op = instr.op
+            if op == 'label' and i > inicio:
+                self._novo_bloco(inicio, i)
+                inicio = i
+            elif op in FIM_DE_BLOCO:
+                self._novo_bloco(inicio, i + 1)
+                inicio = i + 1
+        if inicio < len(codigo) or not self.blocos:
+            self._novo_bloco(inicio, len(codigo))
+
+        ultimo = len(self.blocos) - 1
+        for bloco in self.blocos:
+            fim = codigo[bloco.fim - 1] if bloco.fim > bloco.inicio else None
+            op = fim.op if fim is not None else None
+            sucessores = []
+            if op == 'goto' or op == 'ifFalse':
+                destino = self.bloco_do_rotulo.get(fim.dest)
+                if destino is None:
+                    raise ValueError(f"Rótulo '{fim.dest}' não definido.")
+                sucessores.append(destino)
+            if op != 'goto' and op != 'return':
+                if bloco.indice < ultimo:
+                    if bloco.indice + 1 not in sucessores: sucessores.append(bloco.indice + 1)
+                else:
+                    bloco.saida = True
+            bloco.saida = bloco.saida or op == 'return'
+            bloco.sucessores = sucessores
+            for s in sucessores:
+                self.blocos[s].predecessores.append(bloco.indice)
+
+    def _novo_bloco(self, inicio, fim):
+        rotulo = self.codigo[inicio].dest if inicio < fim and self.codigo[inicio].op == 'label' else None
+        bloco = BlocoBasico(len(self.blocos), inicio, fim, rotulo)
+        if rotulo is not None:
+            self.bloco_do_rotulo[rotulo] = bloco.indice
+        self.blocos.append(bloco)
+
+    def instrucoes(self, bloco):
+        return self.codigo[bloco.inicio:bloco.fim]
+
+    def pos_ordem(self):
+        """ Blocos em pós-ordem de uma busca em profundidade a partir da entrada; os inalcançáveis vêm no fim. """
+        visitado = bytearray(len(self.blocos))
+        ordem = []
+        if self.blocos:
+            visitado[0] = 1
+            pilha = [(0, iter(self.blocos[0].sucessores))]
+            while pilha:
+                b, sucessores = pilha[-1]
+                for s in sucessores:
+                    if not visitado[s]:
+                        visitado[s] = 1
+                        pilha.append((s, iter(self.blocos[s].sucessores)))
+                        break
+                else:
+                    pilha.pop()
+                    ordem.append(b)
+        ordem.extend(b for b in range(len(self.blocos)) if not visitado[b])
+        return ordem
+
+    def alcancaveis(self):
+        """ Índices dos blocos alcançáveis a partir da entrada. """
+        vistos = {0} if self.blocos else set()
+        pilha = list(vistos)
+        while pilha:
+            for s in self.blocos[pilha.pop()].sucessores:
+                if s not in vistos:
+                    vistos.add(s)
+                    pilha.append(s)
+        return vistos
+
+class Bits:
+    """ Numeração de um universo de elementos: cada elemento é um bit. """
+    def __init__(self):
+        self.indices = {}
+        self.elementos = []
+
+    def bit(self, elemento):
+        i = self.indices.get(elemento)
+        if i is None:
+            i = self.indices[elemento] = len(self.elementos)
+            self.elementos.append(elemento)
+        return 1 << i
+
+    def conjunto(self, bits):
+        """ Elementos de um vetor de bits, na ordem da numeração. """
+        elementos = []
+        i = 0
+        while bits:
+            # Pula os zeros em blocos de 64 bits antes de testar bit a bit.
+            if not bits & 0xFFFFFFFFFFFFFFFF:
+                bits >>= 64
+                i += 64
+                continue
+            if bits & 1: elementos.append(self.elementos[i])
+            bits >>= 1
+            i += 1
+        return elementos
+
+def resolver_fluxo(grafo, gen, kill, para_frente, fronteira=0, intersecao=False, universo=0):
+    """ Resolve um problema de fluxo de dados sobre vetores de bits, por lista de trabalho.
+
+    Transferência de cada bloco: depois = gen | (antes & ~kill). Em uma análise
+    para frente, `antes` é a entrada do bloco e vem das saídas dos predecessores;
+    para trás, `antes` é a saída e vem das entradas dos sucessores. A junção é a
+    união (ou, com intersecao=True, a interseção, começando de `universo`).
+    `fronteira` entra na junção do bloco de entrada (para frente) ou dos blocos
+    de onde o controle sai do código (para trás). Devolve (entradas, saidas).
+
+    A lista de trabalho é ordenada pela pós-ordem reversa (para frente) ou pela
+    pós-ordem (para trás): um laço se estabiliza antes de a mudança seguir para
+    o resto do código, em vez de cada volta percorrer o código inteiro de novo.
+    """
+    blocos = grafo.blocos
+    n = len(blocos)
+    ordem = grafo.pos_ordem()
+    if para_frente:
+        ordem.reverse()
+        fontes = [b.predecessores for b in blocos]
+        destinos = [b.sucessores for b in blocos]
+        na_fronteira = [b == 0 for b in range(n)]
+    else:
+        fontes = [b.sucessores for b in blocos]
+        destinos = [b.predecessores for b in blocos]
+        na_fronteira = [b.saida for b in blocos]
+    mantem = [~k for k in kill]
+    inicial = universo if intersecao else 0
+    antes = [inicial] * n
+    depois = [gen[b] | (inicial & mantem[b]) for b in range(n)]
+
+    posicao = [0] * n
+    for i, b in enumerate(ordem): posicao[b] = i
+    pendente = bytearray([1]) * n
+    lista = list(range(n))   # posições em `ordem`; já é um heap
+    while lista:
+        b = ordem[heapq.heappop(lista)]
+        pendente[b] = 0
+        if intersecao:
+            valor = universo
+            for f in fontes[b]: valor &= depois[f]
+            if na_fronteira[b]: valor &= fronteira
+        else:
+            valor = fronteira if na_fronteira[b] else 0
+            for f in fontes[b]: valor |= depois[f]
+        antes[b] = valor
+        novo = gen[b] | (valor & mantem[b])
+        if novo != depois[b]:
+            depois[b] = novo
+            for d in destinos[b]:
+                if not pendente[d]:
+                    pendente[d] = 1
+                    heapq.heappush(lista, posicao[d])
+    return (antes, depois) if para_frente else (depois, antes)
+
+def _eh_nome(operando):
+    return type(operando) is str and not eh_acesso(operando)
+
+def _definido(instr):
+    """ Nome definido por inteiro pela instrução (escritas em vetores e records não matam o valor anterior). """
+    if instr.op in ('label', 'goto', 'ifFalse', 'param', 'return', 'limite'):
+        return None
+    return instr.dest if _eh_nome(instr.dest) else None
+
+def vivacidade_blocos(grafo, considerar=None, vivos_na_saida=()):
+    """ Nomes vivos na entrada e na saída de cada bloco.
+
+    `considerar` filtra os nomes analisados (eh_temp, por exemplo); os nomes em
+    `vivos_na_saida` são lidos depois do fim do código. Uma chamada pode ler
+    qualquer variável que não seja temporário. Devolve (bits, entradas, saidas),
+    com os conjuntos como vetores de bits de `bits`. Só são numerados os nomes
+    lidos antes de definidos em algum bloco: os demais nunca estão vivos fora do bloco.
+    """
+    codigo = grafo.codigo
+    expostos, definidos, chamadas = [], [], []
+    variaveis = set()
+    for bloco in grafo.blocos:
+        lidos, mortos = set(), set()
+        antes_da_chamada = None   # definidos antes da primeira chamada do bloco
+        for i in range(bloco.fim - 1, bloco.inicio - 1, -1):
+            instr = codigo[i]
+            nome = _definido(instr)
+            if nome is not None and (considerar is None or considerar(nome)):
+                lidos.discard(nome)
+                mortos.add(nome)
+                if antes_da_chamada is not None: antes_da_chamada.add(nome)
+                if not eh_temp(nome): variaveis.add(nome)
+            if instr.op == 'call':
+                antes_da_chamada = set()
+            for nome in operandos_lidos(instr):
+                if considerar is None or considerar(nome):
+                    lidos.add(nome)
+                    if not eh_temp(nome): variaveis.add(nome)
+        expostos.append(lidos)
+        definidos.append(mortos)
+        chamadas.append(antes_da_chamada)
+
+    bits = Bits()
+    fronteira = 0
+    for nome in vivos_na_saida:
+        fronteira |= bits.bit(nome)
+    todas = 0
+    if any(c is not None for c in chamadas):
+        for nome in sorted(variaveis): todas |= bits.bit(nome)
+    for lidos in expostos:
+        for nome in lidos: bits.bit(nome)
+    indices = bits.indices
+    gen, kill = [], []
+    for lidos, mortos, antes_da_chamada in zip(expostos, definidos, chamadas):
+        g = k = 0
+        for nome in lidos: g |= 1 << indices[nome]
+        for nome in mortos:
+            if nome in indices: k |= 1 << indices[nome]
+        if antes_da_chamada is not None:
+            escondidos = 0
+            for nome in antes_da_chamada:
+                if nome in indices: escondidos |= 1 << indices[nome]
+            g |= todas & ~escondidos
+        gen.append(g)
+        kill.append(k)
+    entradas, saidas = resolver_fluxo(grafo, gen, kill, para_frente=False, fronteira=fronteira)
+    return bits, entradas, saidas
+
+def definicoes_alcancantes(grafo, incluir_temporarios=False):
+    """ Definições que alcançam a entrada e a saída de cada bloco.
+
+    Cada definição é (índice da instrução, nome). Uma chamada pode alterar
+    qualquer variável: é uma definição (índice, None) de todas, que não mata
+    as anteriores. Os temporários ficam de fora por padrão: o gerador os usa
+    dentro de um único bloco, e incluí-los só alargaria todos os conjuntos.
+    Devolve (definicoes, entradas, saidas), com os conjuntos como vetores de
+    bits indexados por `definicoes`.
+    """
+    codigo = grafo.codigo
+    definicoes = []
+    do_nome = {}   # nome -> vetor de bits das suas definições
+    por_bloco = []
+    for bloco in grafo.blocos:
+        locais = []
+        for i in range(bloco.inicio, bloco.fim):
+            instr = codigo[i]
+            nome = _definido(instr)
+            if nome is not None and (incluir_temporarios or not eh_temp(nome)):
+                b = 1 << len(definicoes)
+                definicoes.append((i, nome))
+                do_nome[nome] = do_nome.get(nome, 0) | b
+                locais.append((nome, b))
+            if instr.op == 'call':
+                b = 1 << len(definicoes)
+                definicoes.append((i, None))
+                locais.append((None, b))
+        por_bloco.append(locais)
+    gen, kill = [], []
+    for locais in por_bloco:
+        # Só a última definição de cada nome sai do bloco; as chamadas não são mortas.
+        ultimas = {}
+        g = k = 0
+        for nome, b in locais:
+            if nome is None: g |= b
+            else: ultimas[nome] = b
+        for nome, b in ultimas.items():
+            g |= b
+            k |= do_nome[nome]
+        gen.append(g)
+        kill.append(k)
+    entradas, saidas = resolver_fluxo(grafo, gen, kill, para_frente=True)
+    return definicoes, entradas, saidas
@@ -0,0 +1,457 @@
+import heapq
+
+from lexer_rapido import LexerRapido, Token
+from parser import (MAX_ERROS, MSG_ERRO_SINTATICO, AnalisadorSemantico, Diagnostico, Diagnosticos, GeradorCI,
+                    LimiteDiagnosticos, Programa, ResultadoCompilacao, construir_parser)
+
+# --------------------------------------------------------------------
+# COMPILAÇÃO INCREMENTAL
+# O programa é mantido como uma sequência de segmentos de nível superior:
+# cada bloco 'type', bloco 'var', função 'def' e o corpo principal. Uma edição
+# refaz a análise léxica e sintática apenas dos segmentos atingidos e refaz a
+# análise semântica apenas dos segmentos que dependem de algum símbolo global
+# cuja declaração mudou.
+# --------------------------------------------------------------------
+
+FRONTEIRAS = {'TYPE', 'VAR', 'DEF', 'BEGIN'}
+# Tokens fechados por um END.
+ABREM_BLOCO = {'BEGIN', 'RECORD', 'IF', 'WHILE'}
+
+def _erro_no_token(tok):
+    # Mesma mensagem de registrar_erro_sintatico (parser.py) para um token que o parse completo rejeitaria.
+    return Diagnostico('sintatico', f"Erro de sintaxe no token '{tok.value}' (tipo: {tok.type})", tok.lineno)
+
+def segmentar(tokens):
+    """ Divide os tokens em segmentos de nível superior.
+
+    Retorna a lista de segmentos (listas de tokens) e se o último deles termina
+    fora de qualquer bloco (função, record ou begin/end).
+    """
+    segmentos = []
+    atual = []
+    profundidade = 0
+    em_funcao = False
+    for tok in tokens:
+        tipo = tok.type
+        if profundidade == 0 and not em_funcao:
+            if tipo in FRONTEIRAS and atual:
+                segmentos.append(atual)
+                atual = []
+            if tipo == 'DEF':
+                em_funcao = True
+        if tipo in ABREM_BLOCO:
+            profundidade += 1
+        elif tipo == 'END' and profundidade > 0:
+            profundidade -= 1
+            if profundidade == 0:
+                em_funcao = False
+        atual.append(tok)
+    if atual:
+        segmentos.append(atual)
+    return segmentos, profundidade == 0 and not em_funcao
+
+def assinatura(info):
+    """ Resumo comparável de uma entrada da tabela de símbolos global.
+
+    Dois símbolos com a mesma assinatura são indistinguíveis para quem os usa,
+    então os seus dependentes não precisam ser reanalisados. Os descritores de
+    tipo são internados em uma tabela única do compilador, então tipos iguais
+    são o mesmo objeto.
+    """
+    estrutura = info['tipo_estrutura']
+    if estrutura == 'var':
+        return ('var', info['tipo'])
+    if estrutura == 'function':
+        return ('function', info['tipo_retorno'], tuple(p['tipo'] for p in info['parametros']))
+    return ('type', info['descritor'])
+
+class _SomaPrefixos:
+    """ Árvore de Fenwick sobre uma grandeza por segmento (tamanho, linhas ou temporários). """
+    def __init__(self, valores):
+        self.n = len(valores)
+        self.arvore = [0] + list(valores)
+        for i in range(1, self.n + 1):
+            pai = i + (i & -i)
+            if pai <= self.n:
+                self.arvore[pai] += self.arvore[i]
+
+    def atualizar(self, i, delta):
+        i += 1
+        while i <= self.n:
+            self.arvore[i] += delta
+            i += i & -i
+
+    def soma(self, i):
+        """ Soma dos valores dos segmentos [0, i). """
+        total = 0
+        while i > 0:
+            total += self.arvore[i]
+            i -= i & -i
+        return total
+
+    def buscar(self, alvo):
+        """ Índice do segmento que contém a posição `alvo` (o último, se alvo passar do fim). """
+        i = 0
+        passo = 1 << self.n.bit_length()
+        while passo:
+            j = i + passo
+            if j <= self.n and self.arvore[j] <= alvo:
+                i = j
+                alvo -= self.arvore[j]
+            passo >>= 1
+        return min(i, self.n - 1)
+
+class Segmento:
+    def __init__(self, texto):
+        self.texto = texto
+        self.linhas = texto.count('\n')
+        self.tokens = []
+        self.tipo = 'vazio'          # 'vazio', 'declaracao', 'corpo' ou 'invalido'
+        self.ordem = 0
+        self.ast = None              # lista de declarações ou de comandos
+        self.linha_lexica = 1         # linha inicial quando os tokens foram gerados
+        self.erro_sintatico = False
+        self.sintaticos = []         # diagnósticos, com as linhas de linha_lexica
+        self.semanticos = []
+        self.exporta = {}            # símbolos globais declarados pelo segmento
+        self.dependencias = set()    # nomes globais consultados pelo segmento
+        self.codigo = []
+        self.funcoes = {}            # TAC das funções declaradas pelo segmento
+        self.num_temps = 0
+        self.base_temps = 0
+
+class _EscopoGlobal:
+    """ Escopo global visto por um segmento: só enxerga declarações de segmentos anteriores. """
+    def __init__(self, compilador, segmento):
+        self.compilador = compilador
+        self.segmento = segmento
+
+    def __contains__(self, nome):
+        self.segmento.dependencias.add(nome)
+        return nome in self.segmento.exporta or self.compilador.buscar_global(nome, self.segmento) is not None
+
+    def __getitem__(self, nome):
+        if nome in self.segmento.exporta:
+            return self.segmento.exporta[nome]
+        return self.compilador.buscar_global(nome, self.segmento)
+
+    def __setitem__(self, nome, info):
+        self.segmento.exporta[nome] = info
+
+class _LexerRegiao(LexerRapido):
+    """ Guarda os erros léxicos em vez de imprimi-los, até a região ser confirmada. """
+    def __init__(self):
+        super().__init__()
+        self.erros = []
+
+    def erro_caractere(self, c):
+        self.erros.append((c, self.lineno))
+
+class CompiladorIncremental:
+    """ Mantém tokens, AST, tabela de símbolos e TAC de um programa entre edições. """
+    def __init__(self, codigo='', max_erros=MAX_ERROS):
+        self.max_erros = max_erros
+        self.parser = construir_parser()
+        self.lexer = LexerRapido()
+        self.segmentos = [Segmento('')]
+        self._indexar()
+        self.declarantes = {}   # nome -> segmentos que o declaram, em ordem
+        self.usuarios = {}      # nome -> segmentos que o consultam
+        self.tipos = {}         # tabela de internação dos descritores de tipo
+        self.editar(0, 0, codigo)
+
+    @property
+    def texto(self):
+        return ''.join(seg.texto for seg in self.segmentos)
+
+    # ---------------- edição ----------------
+
+    def editar(self, inicio, fim, texto):
+        """ Substitui o trecho [inicio, fim) do fonte por `texto` e atualiza a compilação. """
+        segs = self.segmentos
+        a = self._tamanhos.buscar(inicio)
+        # Uma inserção exatamente no início de um segmento pertence ao anterior.
+        if inicio == fim and a > 0 and self._tamanhos.soma(a) == inicio:
+            a -= 1
+        b = self._tamanhos.buscar(fim - 1) if fim > inicio else a
+        pos_a = self._tamanhos.soma(a)
+        regiao = ''.join(seg.texto for seg in segs[a:b + 1])
+        regiao = regiao[:inicio - pos_a] + texto + regiao[fim - pos_a:]
+        return self._reprocessar(a, b, regiao, 1 + self._linhas.soma(a), self._temps.soma(a))
+
+    def _indexar(self):
+        segs = self.segmentos
+        for i, seg in enumerate(segs):
+            seg.ordem = i
+        self._tamanhos = _SomaPrefixos([len(seg.texto) for seg in segs])
+        self._linhas = _SomaPrefixos([seg.linhas for seg in segs])
+        self._temps = _SomaPrefixos([seg.num_temps for seg in segs])
+
+    def _reprocessar(self, a, b, regiao, linha, base_temps):
+        segs = self.segmentos
+        while True:
+            lex = _LexerRegiao()
+            lex.lineno = linha
+            tokens = list(lex.tokenizar(regiao))
+            partes, fechado = segmentar(tokens)
+            aspa_aberta = any(c == '"' for c, _ in lex.erros)
+            if b + 1 < len(segs) and (not fechado or aspa_aberta or not regiao.endswith('\n')):
+                # A região pode continuar no segmento seguinte (bloco aberto, string ou
+                # comentário no fim, token colado ao próximo): incorpora o vizinho.
+                b += 1
+                regiao += segs[b].texto
+                continue
+            if a > 0 and (not partes or partes[0][0].type not in FRONTEIRAS):
+                # A região deixou de começar um bloco: pertence ao segmento anterior.
+                a -= 1
+                regiao = segs[a].texto + regiao
+                linha -= segs[a].linhas
+                base_temps -= segs[a].num_temps
+                continue
+            break
+        for c, lineno in lex.erros:
+            print(f"Caractere inválido: '{c}' na linha {lineno}")
+
+        novos = []
+        for k, parte in enumerate(partes):
+            ini = 0 if k == 0 else parte[0].lexpos
+            fim = partes[k + 1][0].lexpos if k + 1 < len(partes) else len(regiao)
+            seg = Segmento(regiao[ini:fim])
+            seg.tokens = parte
+            seg.linha_lexica = linha
+            linha += seg.linhas
+            novos.append(seg)
+        if not novos:
+            novos.append(Segmento(regiao))
+
+        antigos = segs[a:b + 1]
+        segs[a:b + 1] = novos
+        if len(novos) != len(antigos):
+            # A quantidade de segmentos mudou: os índices são refeitos do zero.
+            self._indexar()
+        else:
+            for i, (antigo, seg) in enumerate(zip(antigos, novos), a):
+                seg.ordem = i
+                self._tamanhos.atualizar(i, len(seg.texto) - len(antigo.texto))
+                self._linhas.atualizar(i, seg.linhas - antigo.linhas)
+
+        for seg in antigos:
+            self._desregistrar(seg)
+        for i, seg in enumerate(novos, a):
+            self._analisar_sintaxe(seg)
+            # A geração lê o que a análise semântica anota na AST (ArrayAccess.tamanho).
+            self._analisar_semantica(seg)
+            seg.base_temps = base_temps
+            self._gerar_codigo(seg)
+            self._temps.atualizar(i, seg.num_temps - (antigos[i - a].num_temps if len(novos) == len(antigos) else 0))
+            base_temps += seg.num_temps
+
+        # Só os símbolos da região cuja assinatura mudou invalidam segmentos posteriores.
+        antes = self._assinaturas(antigos)
+        depois = self._assinaturas(novos)
+        mudados = {nome for nome in antes.keys() | depois.keys() if antes.get(nome) != depois.get(nome)}
+        reanalisados = self._propagar(mudados, a + len(novos))
+        return {'segmentos_relexados': len(novos), 'tokens_relexados': len(tokens),
+                'segmentos_reanalisados': len(novos) + reanalisados}
+
+    # ---------------- fases por segmento ----------------
+
+    def _analisar_sintaxe(self, seg):
+        tokens = seg.tokens
+        if not tokens:
+            seg.tipo = 'vazio'
+            return
+        primeiro = tokens[0].type
+        if primeiro == 'BEGIN':
+            seg.tipo = 'corpo'
+            fluxo = tokens
+        elif primeiro in FRONTEIRAS:
+            seg.tipo = 'declaracao'
+            # Um corpo principal vazio sintético fecha o programa sem alterar a AST.
+            # Os seus tokens têm linha 0: um erro neles é um erro no que vem depois do segmento.
+            ultimo = tokens[-1]
+            fluxo = tokens + [Token(tipo, valor, 0, ultimo.lexpos) for tipo, valor in
+                              (('BEGIN', 'begin'), ('END', 'end'), ('SEMI', ';'))]
+        else:
+            seg.tipo = 'invalido'
+            seg.erro_sintatico = True
+            seg.sintaticos = [_erro_no_token(tokens[0])]
+            return
+        proximo = iter(fluxo).__next__
+        def token():
+            try: return proximo()
+            except StopIteration: return None
+        self.parser.diagnosticos_sintaticos = Diagnosticos(self.max_erros)
+        try:
+            programa = self.parser.parse(lexer=self.lexer, tokenfunc=token)
+        except LimiteDiagnosticos:
+            programa = None
+        seg.sintaticos = self.parser.diagnosticos_sintaticos.lista
+        if programa is None or seg.sintaticos:
+            seg.erro_sintatico = True
+            seg.sintaticos = seg.sintaticos or [Diagnostico('sintatico', MSG_ERRO_SINTATICO)]
+        else:
+            seg.ast = programa.corpo if seg.tipo == 'corpo' else programa.declaracoes
+
+    def _analisar_semantica(self, seg):
+        """ Reanalisa o segmento e devolve os nomes globais cuja assinatura mudou. """
+        anteriores = {nome: assinatura(info) for nome, info in seg.exporta.items()}
+        self._desregistrar(seg)
+        seg.exporta = {}
+        seg.dependencias = set()
+        seg.semanticos = []
+        if seg.ast is not None:
+            analisador = AnalisadorSemantico(self.tipos, self.max_erros)
+            analisador.pilha_escopos = [_EscopoGlobal(self, seg)]
+            try:
+                analisador.visitar(seg.ast)
+            except LimiteDiagnosticos:
+                pass
+            seg.semanticos = analisador.diagnosticos.lista
+        self._registrar(seg)
+        atuais = {nome: assinatura(info) for nome, info in seg.exporta.items()}
+        return {nome for nome in anteriores.keys() | atuais.keys() if anteriores.get(nome) != atuais.get(nome)}
+
+    def _gerar_codigo(self, seg):
+        gerador = GeradorCI()
+        gerador.contador_temp = seg.base_temps
+        # Com erros semânticos a AST pode estar sem anotações, e o resultado não traz código.
+        if seg.ast is not None and not seg.semanticos:
+            gerador.visitar(seg.ast)
+        seg.codigo = gerador.codigo
+        seg.funcoes = gerador.funcoes
+        seg.num_temps = gerador.contador_temp - seg.base_temps
+
+    # ---------------- dependências ----------------
+
+    def buscar_global(self, nome, seg):
+        for declarante in self.declarantes.get(nome, ()):
+            if declarante.ordem >= seg.ordem:
+                return None
+            return declarante.exporta[nome]
+        return None
+
+    def _registrar(self, seg):
+        for nome in seg.exporta:
+            lista = self.declarantes.setdefault(nome, [])
+            lista.append(seg)
+            lista.sort(key=lambda s: s.ordem)
+        for nome in seg.dependencias:
+            self.usuarios.setdefault(nome, set()).add(seg)
+
+    def _desregistrar(self, seg):
+        for nome in seg.exporta:
+            lista = self.declarantes.get(nome)
+            if lista and seg in lista:
+                lista.remove(seg)
+        for nome in seg.dependencias:
+            usuarios = self.usuarios.get(nome)
+            if usuarios: usuarios.discard(seg)
+
+    @staticmethod
+    def _assinaturas(segmentos):
+        assinaturas = {}
+        for seg in segmentos:
+            for nome, info in seg.exporta.items():
+                assinaturas.setdefault(nome, assinatura(info))
+        return assinaturas
+
+    def _propagar(self, nomes_mudados, ordem_minima):
+        """ Reanalisa, em ordem, os segmentos a partir de `ordem_minima` que dependem de nomes alterados,
+        e gera de novo o seu código: os tamanhos dos 'limite' vêm das declarações de outros segmentos. """
+        fila = []
+        for nome in nomes_mudados:
+            for usuario in self.usuarios.get(nome, ()):
+                if usuario.ordem >= ordem_minima:
+                    fila.append((usuario.ordem, id(usuario), usuario))
+        heapq.heapify(fila)
+        vistos = set()
+        while fila:
+            ordem, _, seg = heapq.heappop(fila)
+            if seg in vistos:
+                continue
+            vistos.add(seg)
+            mudados = self._analisar_semantica(seg)
+            num_temps = seg.num_temps
+            self._gerar_codigo(seg)
+            self._temps.atualizar(seg.ordem, seg.num_temps - num_temps)
+            for nome in mudados:
+                for usuario in self.usuarios.get(nome, ()):
+                    if usuario.ordem > ordem and usuario not in vistos:
+                        heapq.heappush(fila, (usuario.ordem, id(usuario), usuario))
+        return len(vistos)
+
+    # ---------------- resultado ----------------
+
+    def _diagnosticos_de(self, campo):
+        """ Diagnósticos de todos os segmentos, com as linhas ajustadas à posição atual de cada um. """
+        diagnosticos = []
+        for i, seg in enumerate(self.segmentos):
+            lista = getattr(seg, campo)
+            if lista:
+                deslocamento = 1 + self._linhas.soma(i) - seg.linha_lexica
+                for d in lista:
+                    if d.linha == 0:
+                        diagnosticos.append(self._erro_apos(i))
+                        break
+                    diagnosticos.append(Diagnostico(d.fase, d.mensagem, d.linha and d.linha + deslocamento))
+        return diagnosticos[:self.max_erros]
+
+    def _erro_apos(self, i):
+        """ Erro que o parse completo daria no primeiro token depois do segmento i. """
+        segs = self.segmentos
+        for j in range(i + 1, len(segs)):
+            if segs[j].tokens:
+                diagnostico = _erro_no_token(segs[j].tokens[0])
+                diagnostico.linha += 1 + self._linhas.soma(j) - segs[j].linha_lexica
+                return diagnostico
+        return Diagnostico('sintatico', "Erro de sintaxe: Fim inesperado do arquivo!")
+
+    @property
+    def diagnosticos(self):
+        """ Erros de sintaxe ou, se não houver nenhum, os erros semânticos, em ordem de posição. """
+        segs = self.segmentos
+        sintaticos = self._diagnosticos_de('sintaticos')
+        if sintaticos:
+            return sintaticos
+        corpos = [i for i, seg in enumerate(segs) if seg.tipo == 'corpo']
+        if not corpos:
+            return [Diagnostico('sintatico', "Erro de sintaxe: Fim inesperado do arquivo!")]
+        # Depois do corpo principal o parse completo falharia no primeiro token seguinte.
+        if any(seg.tokens for seg in segs[corpos[0] + 1:]):
+            return [self._erro_apos(corpos[0])]
+        return self._diagnosticos_de('semanticos')
+
+    @property
+    def erros(self):
+        return [str(d) for d in self.diagnosticos]
+
+    def resultado(self):
+        """ Monta o ResultadoCompilacao equivalente ao de uma compilação completa. """
+        num_tokens = sum(len(seg.tokens) for seg in self.segmentos)
+        diagnosticos = self.diagnosticos
+        if diagnosticos and diagnosticos[0].fase == 'sintatico':
+            return ResultadoCompilacao(diagnosticos=diagnosticos, num_tokens=num_tokens)
+
+        declaracoes = []
+        tabela = {}
+        codigo = []
+        funcoes = {}
+        base_temps = 0
+        for seg in self.segmentos:
+            if seg.tipo == 'declaracao':
+                declaracoes.extend(seg.ast)
+            for nome, info in seg.exporta.items():
+                tabela.setdefault(nome, info)
+            if seg.base_temps != base_temps:
+                seg.base_temps = base_temps
+                self._gerar_codigo(seg)
+            codigo.extend(seg.codigo)
+            for nome, funcao in seg.funcoes.items():
+                funcoes.setdefault(nome, funcao)
+            base_temps += seg.num_temps
+        ast = Programa(declaracoes=declaracoes, corpo=self.segmentos[-1].ast)
+        if diagnosticos:
+            return ResultadoCompilacao(ast=ast, tabela_simbolos=tabela, diagnosticos=diagnosticos, num_tokens=num_tokens)
+        return ResultadoCompilacao(ast=ast, tabela_simbolos=tabela, codigo=codigo, num_tokens=num_tokens,
+                                   funcoes=funcoes)
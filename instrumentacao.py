@@ -0,0 +1,117 @@
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from otimizador_tac import eh_temp, max_temporarios_vivos, operandos_lidos
+
+# --------------------------------------------------------------------
+# INSTRUMENTAÇÃO DO COMPILADOR
+# Compilador(instrumentacao=Instrumentacao()) mede cada fase (léxica,
+# sintática, semântica, otimizações, geração e alocação de temporários) e
+# conta tokens, nós da AST por classe, buscas na tabela de símbolos (e os
+# escopos percorridos), instruções TAC e temporários. relatorio() devolve um
+# dict pronto para json.dumps. Com `perfil` (um diretório), cada fase grava
+# também um perfil do cProfile (<fase>.prof) e um snapshot do tracemalloc
+# (<fase>.tracemalloc); o pico de memória da fase entra no relatório.
+# --------------------------------------------------------------------
+
+class ContadorBuscas:
+    """ Mixin para os analisadores: conta as chamadas a buscar_simbolo e os escopos percorridos. """
+    buscas = 0
+    escopos_percorridos = 0
+
+    def buscar_simbolo(self, nome):
+        self.buscas += 1
+        profundidade = 0
+        for escopo in reversed(self.pilha_escopos):
+            profundidade += 1
+            if nome in escopo:
+                self.escopos_percorridos += profundidade
+                return escopo[nome]
+        self.escopos_percorridos += profundidade
+        return None
+
+def contar_nos(raiz):
+    """ Nós da AST por classe (listas não contam). """
+    from parser import ASTNode   # aqui, e não no topo: parser importa este módulo
+    contagem = {}
+    pilha = [raiz]
+    while pilha:
+        no = pilha.pop()
+        if type(no) is list:
+            pilha.extend(no)
+        elif isinstance(no, ASTNode):
+            nome = type(no).__name__
+            contagem[nome] = contagem.get(nome, 0) + 1
+            for classe in type(no).__mro__[:-1]:
+                for campo in getattr(classe, '__slots__', ()):
+                    filho = getattr(no, campo, None)
+                    if type(filho) is list or isinstance(filho, ASTNode): pilha.append(filho)
+    return dict(sorted(contagem.items()))
+
+def contar_temporarios(codigo):
+    nomes = set()
+    for instr in codigo:
+        if eh_temp(instr.dest): nomes.add(instr.dest)
+        nomes.update(nome for nome in operandos_lidos(instr) if eh_temp(nome))
+    return len(nomes)
+
+class Instrumentacao:
+    def __init__(self, perfil=None):
+        self.perfil = perfil
+        self.fases = {}
+        self.memoria_pico = {}
+        self.contadores = {}
+        if perfil:
+            os.makedirs(perfil, exist_ok=True)
+
+    @contextmanager
+    def fase(self, nome):
+        if self.perfil:
+            import cProfile   # só com perfil: não pesa na partida do compilador
+            tracemalloc.start()
+            perfilador = cProfile.Profile()
+            perfilador.enable()
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.fases[nome] = self.fases.get(nome, 0.0) + time.perf_counter() - inicio
+            if self.perfil:
+                perfilador.disable()
+                perfilador.dump_stats(os.path.join(self.perfil, f"{nome}.prof"))
+                tracemalloc.take_snapshot().dump(os.path.join(self.perfil, f"{nome}.tracemalloc"))
+                self.memoria_pico[nome] = max(self.memoria_pico.get(nome, 0), tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+
+    def contar(self, nome, valor):
+        self.contadores[nome] = valor
+
+    def registrar_ast(self, ast):
+        nos = contar_nos(ast)
+        self.contar('nos_ast', sum(nos.values()))
+        self.contar('nos_ast_por_classe', nos)
+
+    def registrar_analisador(self, analisador):
+        self.contar('buscas_simbolo', analisador.buscas)
+        self.contar('escopos_percorridos', analisador.escopos_percorridos)
+
+    def registrar_codigo(self, nome, codigo):
+        self.contar(f'instrucoes_tac_{nome}', len(codigo))
+        self.contar(f'temporarios_{nome}', contar_temporarios(codigo))
+        self.contar(f'max_temporarios_vivos_{nome}', max_temporarios_vivos(codigo))
+
+    def relatorio(self):
+        relatorio = {
+            'fases_s': {nome: round(t, 6) for nome, t in self.fases.items()},
+            'total_s': round(sum(self.fases.values()), 6),
+            'contadores': self.contadores,
+        }
+        if self.memoria_pico:
+            relatorio['memoria_pico_bytes'] = self.memoria_pico
+        return relatorio
+
+    def json(self, **kwargs):
+        return json.dumps(self.relatorio(), ensure_ascii=False, **kwargs)
@@ -102,8 +102,10 @@ def t_error(t):
     print(f"Caractere inválido: '{t.value[0]}' na linha {t.lineno}")
     t.lexer.skip(1)
 
-# Constrói o analisador léxico
-lexer = lex.lex()
+# Constrói o analisador léxico a partir das tabelas geradas em lextab.py, sem
+# revalidar as regras a cada execução. Depois de mudar os tokens, regenere as
+# tabelas com: python3 gerar_tabelas.py
+lexer = lex.lex(optimize=True, lextab='lextab')
 
 # --- Função de teste (não alterada) ---
 def testa_lexico_com_arquivo(arquivo):
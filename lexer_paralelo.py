@@ -0,0 +1,165 @@
+import array
+import codecs
+import io
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from operator import add
+
+from lexer_rapido import LexerRapido, Token
+
+# --------------------------------------------------------------------
+# ANALISADOR LÉXICO PARALELO
+# Divide o texto (ou o arquivo) em blocos terminados em quebra de linha e
+# tokeniza cada bloco em um processo, com as regras do LexerRapido (as
+# mesmas do lexer.py). Os blocos voltam em ordem, com lineno e lexpos
+# corrigidos, e o fluxo de tokens e de mensagens de erro é idêntico ao da
+# análise serial.
+#
+# Só CONST_VALOR atravessa quebras de linha, e as quebras dentro de uma
+# string não contam linhas (como no lexer.py): por isso cada bloco informa
+# quantas linhas contou, em vez de o deslocamento vir da contagem de '\n'.
+# Se um bloco termina com uma string aberta, a tokenização especulativa do
+# bloco seguinte, que começou dentro dela, é descartada e refeita aqui a
+# partir da aspa.
+# --------------------------------------------------------------------
+
+# Caracteres (ou bytes, para arquivos) por bloco.
+TAMANHO_BLOCO = 8 << 20
+
+class _LexerBloco(LexerRapido):
+    """ Guarda os erros léxicos, com o índice do token seguinte, em vez de imprimi-los. """
+    def __init__(self, tipos):
+        super().__init__()
+        self.tipos = tipos
+        self.erros = []
+
+    def erro_caractere(self, c):
+        self.erros.append((len(self.tipos), self.lineno, c))
+
+def _texto(tarefa):
+    texto, caminho, inicio, fim, _ = tarefa
+    if texto is None:
+        with open(caminho, 'rb') as file:
+            file.seek(inicio)
+            bruto = file.read(fim - inicio)
+        # Os blocos terminam depois de um '\n': nenhum caractere UTF-8 nem '\r\n' é cortado.
+        texto = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True).decode(bruto, True)
+    return texto
+
+def _coletar(gerador, retorno):
+    retorno.append((yield from gerador))
+
+def _tokenizar_bloco(tarefa):
+    """ Tokens de um bloco em colunas (mais baratas de devolver ao processo principal que objetos Token). """
+    texto = _texto(tarefa)
+    tipos, valores, linhas, posicoes = [], [], array.array('q'), array.array('q')
+    lexer = _LexerBloco(tipos)
+    parou = []
+    for tok in _coletar(lexer.tokenizar(texto, final=tarefa[4]), parou):
+        tipos.append(tok.type)
+        valores.append(tok.value)
+        linhas.append(tok.lineno)
+        posicoes.append(tok.lexpos)
+    aberta = parou[0] if parou[0] < len(texto) else None
+    return tipos, valores, linhas, posicoes, lexer.erros, lexer.lineno - 1, len(texto), aberta
+
+def dividir(tamanho, procurar, tamanho_bloco):
+    """ (início, fim) de cada bloco: ~tamanho_bloco de comprimento, terminado logo depois de um '\\n'. """
+    inicio = 0
+    while inicio < tamanho:
+        fim = procurar(inicio + tamanho_bloco)
+        fim = tamanho if fim < 0 else fim + 1
+        yield inicio, fim
+        inicio = fim
+
+class LexerParalelo(LexerRapido):
+    """ LexerRapido que tokeniza textos maiores que um bloco em `trabalhadores` processos.
+
+    fechar() (ou o uso como gerenciador de contexto) encerra os processos.
+    """
+    def __init__(self, trabalhadores=None, tamanho_bloco=TAMANHO_BLOCO):
+        super().__init__()
+        self.trabalhadores = trabalhadores or os.cpu_count()
+        self.tamanho_bloco = tamanho_bloco
+        self._executor = None
+
+    def clone(self):
+        return LexerParalelo(self.trabalhadores, self.tamanho_bloco)
+
+    def input(self, data):
+        self.lexdata = data
+        if len(data) <= self.tamanho_bloco:
+            self._tokens = self.tokenizar(data)
+            return
+        limites = dividir(len(data), lambda pos: data.find('\n', pos), self.tamanho_bloco)
+        self._tokens = self.tokenizar_blocos((data[inicio:fim], None, inicio, fim, fim == len(data))
+                                             for inicio, fim in limites)
+
+    def input_arquivo(self, caminho, tamanho_janela=None):
+        """ Como input, mas cada processo lê do arquivo o seu bloco. """
+        self.lexdata = ''
+        tamanho = os.path.getsize(caminho)
+        if tamanho <= self.tamanho_bloco:
+            self._tokens = self.tokenizar(_texto((None, caminho, 0, tamanho, True)))
+            return
+        with open(caminho, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            limites = list(dividir(tamanho, lambda pos: mapa.find(b'\n', pos), self.tamanho_bloco))
+        self._tokens = self.tokenizar_blocos((None, caminho, inicio, fim, fim == tamanho) for inicio, fim in limites)
+
+    def tokenizar_blocos(self, tarefas):
+        """ Gera os tokens dos blocos, em ordem, mantendo no máximo 2 blocos por processo em andamento. """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.trabalhadores)
+        tarefas = iter(tarefas)
+        em_andamento = deque()
+        def enviar():
+            tarefa = next(tarefas, None)
+            if tarefa is not None:
+                em_andamento.append((tarefa, self._executor.submit(_tokenizar_bloco, tarefa)))
+        for _ in range(2 * self.trabalhadores):
+            enviar()
+
+        base = 0      # lexpos do início do próximo bloco
+        aberto = ''   # fim do bloco anterior, a partir de uma aspa ainda sem fechamento
+        while em_andamento:
+            tarefa, futuro = em_andamento.popleft()
+            enviar()
+            if aberto:
+                futuro.cancel()
+                texto = aberto + _texto(tarefa)
+                parou = yield from self.tokenizar(texto, final=tarefa[4], base=base - len(aberto))
+                base += len(texto) - len(aberto)
+                aberto = texto[parou:]
+                continue
+
+            tipos, valores, linhas, posicoes, erros, num_linhas, tamanho, aberta = futuro.result()
+            inicio_linha = self.lineno
+            deslocamento = inicio_linha - 1
+            inicio = 0
+            for indice, linha, c in erros + [(len(tipos), None, None)]:
+                # map em vez de um laço: a criação dos Token é o custo principal deste processo.
+                yield from map(Token, tipos[inicio:indice], valores[inicio:indice],
+                               map(add, linhas[inicio:indice], repeat(deslocamento)),
+                               map(add, posicoes[inicio:indice], repeat(base)))
+                if c is not None:
+                    self.lineno = linha + deslocamento
+                    self.erro_caractere(c)
+                inicio = indice
+            self.lineno = inicio_linha + num_linhas
+            if aberta is not None:
+                aberto = _texto(tarefa)[aberta:]
+            base += tamanho
+
+    def fechar(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
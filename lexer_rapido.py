@@ -0,0 +1,223 @@
+import codecs
+import io
+import mmap
+import os
+import re
+
+from lexer import reserved
+
+# --------------------------------------------------------------------
+# ANALISADOR LÉXICO RÁPIDO
+# Produz a mesma sequência de tokens do lexer.py (PLY), mas com uma única
+# expressão regular de grupos nomeados, classificação de palavras reservadas
+# em cache e tokens leves (__slots__) em vez de LexToken.
+#
+# input_arquivo(caminho) lê o arquivo por um mmap, em janelas de
+# TAMANHO_JANELA bytes, sem nunca ter o texto inteiro na memória.
+# --------------------------------------------------------------------
+
+class Token:
+    """ Token leve compatível com o que o ply.yacc espera (type, value, lineno, lexpos). """
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer')
+
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+# Cada casamento devolve (espaços ignorados, lexema). A ordem das alternativas
+# reproduz a expressão mestra do PLY: primeiro as regras definidas como função
+# (na ordem do arquivo), depois os operadores, dos mais longos para os mais curtos.
+# A última alternativa casa qualquer caractere inválido.
+_scanner = re.compile(r"""([ \t]*)(
+      \d+\.\d+ | \d+
+    | [a-zA-Z_][a-zA-Z_0-9]*
+    | "(?:[^\\"]|\\.)*"
+    | \#.*
+    | \n+
+    | := | == | != | >= | <=
+    | [-+*/()\[\];:,.=><]
+    | [^ \t]
+)""", re.VERBOSE)
+
+_OPERADORES = {
+    ':=': 'ATRIB', '==': 'EQUAL_TO', '!=': 'NOT_EQUAL_TO', '>=': 'GREATER_THAN_OR_EQUAL', '<=': 'LESS_THAN_OR_EQUAL',
+    '+': 'PLUS', '-': 'MINUS', '*': 'TIMES', '/': 'DIVIDE', '(': 'LPAREN', ')': 'RPAREN',
+    '[': 'LBRACKET', ']': 'RBRACKET', ';': 'SEMI', ':': 'COLON', '.': 'DOT', ',': 'COMMA',
+    '=': 'EQUAL', '>': 'GREATER_THAN', '<': 'LESS_THAN',
+}
+
+# Classificação pré-computada: lexema exato -> tipo do token. Começa com os
+# operadores e as palavras reservadas e aprende cada identificador na primeira
+# vez que ele aparece, até LIMITE_CLASSIFICACAO entradas: num processo que
+# tokeniza muitos arquivos, os nomes novos depois disso são classificados sem
+# ficar guardados.
+_classificacao = dict(_OPERADORES)
+_classificacao.update(reserved)
+LIMITE_CLASSIFICACAO = 1 << 16
+
+# Tamanho (em caracteres) de cada fatia entregue ao findall.
+TAMANHO_FATIA = 1 << 16
+
+# Tamanho (em bytes) de cada janela lida do arquivo por input_arquivo.
+TAMANHO_JANELA = 1 << 20
+
+def classificar_id(valor):
+    tipo = reserved.get(valor.lower(), 'ID')
+    if len(_classificacao) < LIMITE_CLASSIFICACAO:
+        _classificacao[valor] = tipo
+    return tipo
+
+class LexerRapido:
+    """ Substituto do lexer PLY com a mesma interface usada pelo parser (input/token/lineno). """
+    def __init__(self):
+        self.lineno = 1
+        self.lexdata = ''
+        self._tokens = iter(())
+
+    def clone(self):
+        return LexerRapido()
+
+    def input(self, data):
+        self.lexdata = data
+        self._tokens = self.tokenizar(data)
+
+    def token(self):
+        return next(self._tokens, None)
+
+    def __iter__(self):
+        return self._tokens
+
+    def erro_caractere(self, c):
+        print(f"Caractere inválido: '{c}' na linha {self.lineno}")
+
+    def input_arquivo(self, caminho, tamanho_janela=None):
+        """ Como input, mas lendo o arquivo aos poucos, por um mmap (janelas_arquivo). """
+        self.lexdata = ''
+        self._tokens = self.tokenizar_janelas(janelas_arquivo(caminho, tamanho_janela or TAMANHO_JANELA))
+
+    def tokenizar(self, data, final=True, base=0):
+        """ Gera os tokens de `data`, atualizando `self.lineno` a cada quebra de linha.
+
+        O texto é percorrido em fatias terminadas em '\n'. Só CONST_VALOR pode
+        atravessar uma quebra de linha: uma aspa sem fechamento antes do fim do texto
+        faz a varredura recomeçar dela com uma fatia maior. Com final=False o texto
+        pode continuar depois de `data`: uma aspa sem fechamento no fim para a
+        varredura, e o gerador devolve a posição dela (ou len(data)). `base` é somado
+        ao lexpos de cada token.
+        """
+        tamanho = len(data)
+        inicio = 0
+        minimo = TAMANHO_FATIA
+        while inicio < tamanho:
+            fim = data.find('\n', inicio + minimo)
+            fim = tamanho if fim < 0 else fim + 1
+            parou = yield from self._varrer(data, inicio, fim, base, final and fim == tamanho)
+            if parou < fim == tamanho:
+                return parou
+            # Aspa sem fechamento no fim da fatia: a string pode continuar na próxima.
+            minimo = TAMANHO_FATIA if parou == fim else 2 * (fim - parou)
+            inicio = parou
+        return tamanho
+
+    def tokenizar_janelas(self, janelas):
+        """ Como tokenizar, mas com o texto entregue aos pedaços, em janelas de tamanho qualquer.
+
+        Cada janela é varrida até a sua última quebra de linha; o resto (uma linha
+        incompleta ou uma string ainda aberta) passa para a próxima. Uma string
+        aberta só é varrida de novo quando chegou pelo menos outro tanto de texto,
+        para não repetir a varredura a cada janela. lexpos conta desde o início do texto.
+        """
+        pendente = ''   # texto ainda não varrido
+        base = 0        # posição de pendente[0] no texto inteiro
+        espera = 0      # texto novo necessário antes de varrer de novo uma string aberta
+        novos = []
+        for janela in janelas:
+            novos.append(janela)
+            espera -= len(janela)
+            if espera > 0:
+                continue
+            data = pendente + ''.join(novos)
+            novos.clear()
+            ultimo = data.rfind('\n') + 1
+            if not ultimo:
+                espera = len(data)
+            inicio = 0
+            minimo = TAMANHO_FATIA
+            while inicio < ultimo:
+                fim = data.find('\n', inicio + minimo, ultimo - 1)
+                fim = ultimo if fim < 0 else fim + 1
+                parou = yield from self._varrer(data, inicio, fim, base, False)
+                if parou < fim and fim == ultimo:
+                    espera = len(data) - parou
+                    inicio = parou
+                    break
+                minimo = TAMANHO_FATIA if parou == fim else 2 * (fim - parou)
+                inicio = parou
+            pendente = data[inicio:]
+            base += inicio
+        data = pendente + ''.join(novos)
+        if data:
+            yield from self._varrer(data, 0, len(data), base, True)
+
+    def _varrer(self, data, inicio, fim, base, final):
+        """ Gera os tokens de data[inicio:fim], que termina numa quebra de linha ou no fim
+        do texto, com lexpos deslocado de `base`. Devolve onde a varredura parou: `fim` ou,
+        se o texto pode continuar (final falso), a posição de uma aspa sem fechamento. """
+        classificacao = _classificacao
+        pos = inicio
+        for espacos, lexema in _scanner.findall(data, inicio, fim):
+            if espacos: pos += len(espacos)
+            tipo = classificacao.get(lexema)
+            if tipo is not None:
+                yield Token(tipo, lexema, self.lineno, base + pos)
+            else:
+                c = lexema[0]
+                if c == '\n':
+                    self.lineno += len(lexema)
+                elif c.isdecimal():
+                    yield Token('NUMERO', float(lexema) if '.' in lexema else int(lexema), self.lineno, base + pos)
+                elif c == '#':
+                    pass
+                elif c == '"' and len(lexema) > 1:
+                    yield Token('CONST_VALOR', lexema[1:-1], self.lineno, base + pos)
+                elif c == '_' or c.isascii() and c.isalpha():
+                    yield Token(classificar_id(lexema), lexema, self.lineno, base + pos)
+                elif c == '"' and not final:
+                    return pos
+                else:
+                    self.erro_caractere(c)
+            pos += len(lexema)
+        return fim
+
+def janelas_arquivo(caminho, tamanho_janela=None, encoding='utf-8'):
+    """ Texto do arquivo em janelas de até tamanho_janela bytes, lidas de um mmap.
+
+    O decodificador incremental completa caracteres cortados entre janelas e traduz
+    '\r\n' como o open() em modo texto. As páginas já lidas são devolvidas ao sistema
+    (MADV_DONTNEED), e o processo nunca guarda mais que uma janela do arquivo.
+    """
+    tamanho_janela = tamanho_janela or TAMANHO_JANELA
+    with open(caminho, 'rb') as file:
+        tamanho = os.fstat(file.fileno()).st_size
+        if tamanho == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            liberar = hasattr(mapa, 'madvise') and hasattr(mmap, 'MADV_DONTNEED')
+            if hasattr(mapa, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mapa.madvise(mmap.MADV_SEQUENTIAL)
+            decodificador = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(encoding)(), translate=True)
+            liberado = 0
+            for inicio in range(0, tamanho, tamanho_janela):
+                fim = min(inicio + tamanho_janela, tamanho)
+                yield decodificador.decode(mapa[inicio:fim], fim == tamanho)
+                limite = fim - fim % mmap.PAGESIZE
+                if liberar and limite > liberado:
+                    mapa.madvise(mmap.MADV_DONTNEED, liberado, limite - liberado)
+                    liberado = limite
+
+lexer = LexerRapido()
@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('ARRAY', 'ATRIB', 'BEGIN', 'COLON', 'COMMA', 'CONST', 'CONST_VALOR', 'DEF', 'DIVIDE', 'DO', 'DOT', 'ELSE', 'END', 'EQUAL', 'EQUAL_TO', 'GREATER_THAN', 'GREATER_THAN_OR_EQUAL', 'ID', 'IF', 'INTEGER', 'LBRACKET', 'LESS_THAN', 'LESS_THAN_OR_EQUAL', 'LPAREN', 'MINUS', 'NOT_EQUAL_TO', 'NUMERO', 'OF', 'PLUS', 'RBRACKET', 'READ', 'REAL', 'RECORD', 'RETURN', 'RPAREN', 'SEMI', 'STRING', 'THEN', 'TIMES', 'TYPE', 'VAR', 'WHILE', 'WRITE'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_NUMERO>\\d+(\\.\\d+)?)|(?P<t_ID>[a-zA-Z_][a-zA-Z_0-9]*)|(?P<t_CONST_VALOR>\\"([^\\\\\\"]|\\\\.)*\\")|(?P<t_COMMENT>\\#.*)|(?P<t_newline>\\n+)|(?P<t_PLUS>\\+)|(?P<t_TIMES>\\*)|(?P<t_LPAREN>\\()|(?P<t_RPAREN>\\))|(?P<t_LBRACKET>\\[)|(?P<t_RBRACKET>\\])|(?P<t_DOT>\\.)|(?P<t_ATRIB>:=)|(?P<t_EQUAL_TO>==)|(?P<t_NOT_EQUAL_TO>!=)|(?P<t_GREATER_THAN_OR_EQUAL>>=)|(?P<t_LESS_THAN_OR_EQUAL><=)|(?P<t_MINUS>-)|(?P<t_DIVIDE>/)|(?P<t_SEMI>;)|(?P<t_COLON>:)|(?P<t_COMMA>,)|(?P<t_EQUAL>=)|(?P<t_GREATER_THAN>>)|(?P<t_LESS_THAN><)', [None, ('t_NUMERO', 'NUMERO'), None, ('t_ID', 'ID'), ('t_CONST_VALOR', 'CONST_VALOR'), None, ('t_COMMENT', 'COMMENT'), ('t_newline', 'newline'), (None, 'PLUS'), (None, 'TIMES'), (None, 'LPAREN'), (None, 'RPAREN'), (None, 'LBRACKET'), (None, 'RBRACKET'), (None, 'DOT'), (None, 'ATRIB'), (None, 'EQUAL_TO'), (None, 'NOT_EQUAL_TO'), (None, 'GREATER_THAN_OR_EQUAL'), (None, 'LESS_THAN_OR_EQUAL'), (None, 'MINUS'), (None, 'DIVIDE'), (None, 'SEMI'), (None, 'COLON'), (None, 'COMMA'), (None, 'EQUAL'), (None, 'GREATER_THAN'), (None, 'LESS_THAN')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
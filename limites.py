@@ -0,0 +1,269 @@
+import heapq
+
+from grafo_fluxo import GrafoFluxo
+from otimizador_tac import RELACIONAIS, eh_acesso, eh_temp
+
+# --------------------------------------------------------------------
+# ELIMINAÇÃO DE VERIFICAÇÕES DE LIMITES
+# O GeradorCI emite 'limite k, n (v)' antes de cada acesso v[k] com índice
+# que não é uma constante dentro dos limites. Uma análise de intervalos para
+# a frente, sobre o grafo de fluxo, acha para cada ponto do código um
+# intervalo [lo, hi] que contém o valor de cada inteiro, e as verificações
+# cujo índice já está entre 1 e n são removidas.
+#
+# O estado guarda só valores que com certeza são inteiros: constantes, os
+# nomes de `inteiros` (sem intervalo, valem qualquer inteiro de 64 bits) e
+# temporários calculados a partir deles. Um resultado que pode passar de 64
+# bits dá a volta na Maquina, então vira o intervalo completo. Os desvios
+# refinam o estado: depois de 'tN := i < n; ifFalse tN goto L', i < n vale no
+# caminho que segue e i >= n no que desvia para L; uma verificação que passa
+# deixa 1 <= k <= n. Na junção os intervalos se unem e, depois de
+# ATRASO_ALARGAMENTO mudanças na entrada de um laço pela aresta de volta (ou
+# LIMITE_MUDANCAS por qualquer aresta), os limites que ainda crescem vão
+# direto aos extremos (alargamento), o que garante o fim da análise. O
+# resto 'x - x / c * c' de um mesmo bloco é reconhecido e fica entre
+# -(|c| - 1) e |c| - 1, e 'x * x' nunca é negativo.
+#
+# Uma chamada pode alterar qualquer variável que não seja de `locais`, e
+# escritas em vetores e records não mudam nenhum valor acompanhado.
+# --------------------------------------------------------------------
+
+MIN_INTEIRO = -2**63
+MAX_INTEIRO = 2**63 - 1
+COMPLETO = (MIN_INTEIRO, MAX_INTEIRO)
+ATRASO_ALARGAMENTO = 3
+LIMITE_MUDANCAS = 50
+
+_NEGACAO = {'<': '>=', '<=': '>', '>': '<=', '>=': '<', '==': '!=', '!=': '=='}
+_TROCADO = {'<': '>', '<=': '>=', '>': '<', '>=': '<=', '==': '==', '!=': '!='}
+
+def _eh_nome(operando):
+    return type(operando) is str and not eh_acesso(operando)
+
+def _truncar(a, b):
+    q = abs(a) // abs(b)
+    return -q if (a < 0) != (b < 0) else q
+
+def _calcular(op, a, b):
+    """ Intervalo de `a op b` para intervalos de inteiros. """
+    (a0, a1), (b0, b1) = a, b
+    if op == '+':
+        lo, hi = a0 + b0, a1 + b1
+    elif op == '-':
+        lo, hi = a0 - b1, a1 - b0
+    elif op == '*':
+        produtos = (a0 * b0, a0 * b1, a1 * b0, a1 * b1)
+        lo, hi = min(produtos), max(produtos)
+    else:
+        if b0 <= 0 <= b1: return COMPLETO
+        # Com o sinal do divisor fixo, o quociente truncado é monótono nos dois operandos.
+        quocientes = [_truncar(x, y) for x in (a0, a1) for y in (b0, b1)]
+        lo, hi = min(quocientes), max(quocientes)
+    if lo < MIN_INTEIRO or hi > MAX_INTEIRO: return COMPLETO
+    return lo, hi
+
+def _restringir(intervalo, op, outro):
+    """ Parte de `intervalo` em que x op y pode valer para algum y em `outro`; None se nenhuma. """
+    lo, hi = intervalo
+    o0, o1 = outro
+    if op == '<': hi = min(hi, o1 - 1)
+    elif op == '<=': hi = min(hi, o1)
+    elif op == '>': lo = max(lo, o0 + 1)
+    elif op == '>=': lo = max(lo, o0)
+    elif op == '==': lo, hi = max(lo, o0), min(hi, o1)
+    elif o0 == o1:
+        if lo == o0: lo += 1
+        if hi == o0: hi -= 1
+    return (lo, hi) if lo <= hi else None
+
+def _unir(a, b):
+    uniao = {}
+    for nome, (lo, hi) in a.items():
+        outro = b.get(nome)
+        if outro is not None: uniao[nome] = (min(lo, outro[0]), max(hi, outro[1]))
+    return uniao
+
+def _alargar(antigo, novo):
+    alargado = {}
+    for nome, (lo, hi) in novo.items():
+        a0, a1 = antigo[nome]
+        alargado[nome] = (MIN_INTEIRO if lo < a0 else lo, MAX_INTEIRO if hi > a1 else hi)
+    return alargado
+
+class _Intervalos:
+    def __init__(self, codigo, inteiros, locais):
+        self.codigo = codigo
+        self.inteiros = frozenset(inteiros)
+        self.locais = frozenset(locais)
+
+    def intervalo(self, estado, operando):
+        """ Intervalo do operando, ou None se ele pode não ser inteiro. """
+        if type(operando) is int:
+            return (operando, operando) if MIN_INTEIRO <= operando <= MAX_INTEIRO else None
+        if not _eh_nome(operando):
+            return None
+        intervalo = estado.get(operando)
+        if intervalo is None and operando in self.inteiros: return COMPLETO
+        return intervalo
+
+    def definir(self, estado, nome, intervalo):
+        if intervalo is None or (intervalo == COMPLETO and nome in self.inteiros) or not (eh_temp(nome) or nome in self.inteiros):
+            estado.pop(nome, None)
+        else:
+            estado[nome] = intervalo
+
+    def valor(self, estado, instr, restos):
+        op, a, b = instr.op, instr.arg1, instr.arg2
+        if op in RELACIONAIS: return (0, 1)
+        ia = self.intervalo(estado, a)
+        if op == ':=' or ia is None: return ia
+        produto = restos.get(b) if op == '-' else None
+        if produto is not None and produto[0] == '*' and produto[1] == a:
+            # x - x / c * c: o resto tem o sinal de x e é menor que |c| em módulo.
+            m = abs(produto[2]) - 1
+            return max(-m, min(0, ia[0])), min(m, max(0, ia[1]))
+        if op == '*' and a == b and _eh_nome(a):
+            lo, hi = ia
+            quadrado = max(lo * lo, hi * hi)
+            if quadrado > MAX_INTEIRO: return COMPLETO
+            return (0 if lo <= 0 <= hi else min(lo * lo, hi * hi)), quadrado
+        ib = self.intervalo(estado, b)
+        return None if ib is None else _calcular(op, ia, ib)
+
+    def executar(self, inicio, fim, estado, redundantes=None):
+        """ Aplica codigo[inicio:fim] ao estado (que é alterado). Com `redundantes`, junta a ele
+        as posições das verificações que sempre passam. """
+        # Quocientes e produtos do bloco: nome -> ('/', x, c) para x / c e ('*', x, c) para
+        # x / c * c, enquanto x não muda. O multiplicador tem de ser o próprio c, com o
+        # sinal: x - x / 5 * -5 é x + 5 * (x / 5), e não um resto.
+        restos = {}
+
+        def esquecer(nome):
+            restos.pop(nome, None)
+            for chave in [chave for chave, (_, x, _) in restos.items() if x == nome]:
+                del restos[chave]
+
+        for i in range(inicio, fim):
+            instr = self.codigo[i]
+            op = instr.op
+            if op == 'limite':
+                k, n = instr.arg1, instr.arg2
+                intervalo = self.intervalo(estado, k)
+                if intervalo is not None and intervalo[0] >= 1 and intervalo[1] <= n:
+                    if redundantes is not None: redundantes.add(i)
+                elif _eh_nome(k):
+                    # Depois da verificação 1 <= k <= n (o índice é inteiro pela análise semântica).
+                    lo, hi = intervalo or COMPLETO
+                    estado[k] = (max(lo, 1), min(hi, n)) if max(lo, 1) <= min(hi, n) else (1, n)
+            elif op in RELACIONAIS or op in ('+', '-', '*', '/', ':='):
+                dest = instr.dest
+                if not _eh_nome(dest): continue   # escrita em vetor ou record
+                intervalo = self.valor(estado, instr, restos)
+                self.definir(estado, dest, intervalo)
+                esquecer(dest)
+                a, b = instr.arg1, instr.arg2
+                if op == '/' and type(b) is int and b != 0 and _eh_nome(a) and a != dest:
+                    restos[dest] = ('/', a, b)
+                elif op == '*':
+                    for q, c in ((a, b), (b, a)):
+                        quociente = restos.get(q)
+                        if (type(c) is int and quociente is not None and quociente[0] == '/'
+                                and quociente[2] == c and quociente[1] != dest):
+                            restos[dest] = ('*', quociente[1], quociente[2])
+                            break
+            elif op == 'call':
+                for nome in [nome for nome in estado if not eh_temp(nome) and nome not in self.locais]:
+                    del estado[nome]
+                restos.clear()
+                if _eh_nome(instr.dest):
+                    estado.pop(instr.dest, None)
+            elif op not in ('param', 'return', 'label', 'goto', 'ifFalse') and _eh_nome(instr.dest):
+                estado.pop(instr.dest, None)
+                esquecer(instr.dest)
+        return estado
+
+    def refinar(self, estado, x, op, y):
+        """ Estado sabendo que `x op y` vale, ou None se isso é impossível. """
+        ix, iy = self.intervalo(estado, x), self.intervalo(estado, y)
+        if ix is None or iy is None or x == y:
+            return estado
+        novo_x, novo_y = _restringir(ix, op, iy), _restringir(iy, _TROCADO[op], ix)
+        if novo_x is None or novo_y is None:
+            return None
+        estado = dict(estado)
+        if _eh_nome(x): self.definir(estado, x, novo_x)
+        if _eh_nome(y): self.definir(estado, y, novo_y)
+        return estado
+
+    def saidas(self, grafo, bloco, estado):
+        """ (sucessor, estado na aresta) de cada aresta que sai do bloco, com o estado da entrada. """
+        estado = self.executar(bloco.inicio, bloco.fim, estado)
+        fim = self.codigo[bloco.fim - 1] if bloco.fim > bloco.inicio else None
+        if fim is None or fim.op != 'ifFalse' or len(bloco.sucessores) < 2:
+            return [(s, estado) for s in bloco.sucessores]
+        desvio, seguinte = grafo.bloco_do_rotulo[fim.dest], bloco.indice + 1
+        teste = self.codigo[bloco.fim - 2] if bloco.fim - 2 >= bloco.inicio else None
+        if (teste is None or teste.op not in RELACIONAIS or teste.dest != fim.arg1
+                or teste.dest in (teste.arg1, teste.arg2)):
+            return [(desvio, estado), (seguinte, estado)]
+        x, op, y = teste.arg1, teste.op, teste.arg2
+        return [(desvio, self.refinar(estado, x, _NEGACAO[op], y)), (seguinte, self.refinar(estado, x, op, y))]
+
+def analisar_intervalos(codigo, inteiros=(), locais=()):
+    """ (grafo, estados) com o estado na entrada de cada bloco: nome -> (lo, hi), ou None nos
+    blocos inalcançáveis. Veja eliminar_verificacoes para `inteiros` e `locais`. """
+    grafo = GrafoFluxo(codigo)
+    intervalos = _Intervalos(codigo, inteiros, locais)
+    entradas = [None] * len(grafo.blocos)
+    if not grafo.blocos:
+        return grafo, entradas
+    ordem = grafo.pos_ordem()
+    ordem.reverse()
+    posicao = {b: k for k, b in enumerate(ordem)}
+    # Só se alarga a entrada de um laço quando ela muda por uma aresta de volta: o que
+    # vem de fora de um laço interno já é limitado pelo alargamento do laço externo.
+    voltas = [0] * len(grafo.blocos)
+    mudancas = [0] * len(grafo.blocos)
+    entradas[0] = {}
+    lista, pendente = [posicao[0]], {0}
+    while lista:
+        b = ordem[heapq.heappop(lista)]
+        pendente.discard(b)
+        for s, estado in intervalos.saidas(grafo, grafo.blocos[b], dict(entradas[b])):
+            if estado is None:
+                continue   # aresta impossível
+            antigo = entradas[s]
+            if antigo is not None:
+                estado = _unir(antigo, estado)
+                if estado == antigo:
+                    continue
+                mudancas[s] += 1
+                volta = posicao[s] <= posicao[b]
+                if volta: voltas[s] += 1
+                if (volta and voltas[s] > ATRASO_ALARGAMENTO) or mudancas[s] > LIMITE_MUDANCAS:
+                    estado = _alargar(antigo, estado)
+            entradas[s] = estado
+            if s not in pendente:
+                pendente.add(s)
+                heapq.heappush(lista, posicao[s])
+    return grafo, entradas
+
+def eliminar_verificacoes(codigo, inteiros=(), locais=()):
+    """ Remove as instruções 'limite' que sempre passam. Devolve uma nova lista.
+
+    `inteiros` são as variáveis do tipo integer visíveis no código e `locais`
+    as que uma chamada não altera (parâmetros e locais de uma função); sem
+    elas, só constantes e temporários têm intervalo conhecido.
+    """
+    if not any(instr.op == 'limite' for instr in codigo):
+        return list(codigo)
+    grafo, entradas = analisar_intervalos(codigo, inteiros, locais)
+    intervalos = _Intervalos(codigo, inteiros, locais)
+    redundantes = set()
+    for bloco, estado in zip(grafo.blocos, entradas):
+        if estado is not None:
+            intervalos.executar(bloco.inicio, bloco.fim, dict(estado), redundantes)
+    return [instr for i, instr in enumerate(codigo) if i not in redundantes]
+
+def contar_verificacoes(codigo):
+    return sum(1 for instr in codigo if instr.op == 'limite')
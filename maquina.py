@@ -0,0 +1,501 @@
+from otimizador_tac import (MAX_INTEIRO, MIN_INTEIRO, ajustar_inteiro, chave_constante, eh_acesso, eh_constante, eh_temp,
+                           ler_acesso)
+from parser import INTEGER, PRIMITIVOS, REAL, STRING, TipoArray, TipoRecord
+
+# --------------------------------------------------------------------
+# MÁQUINA VIRTUAL DE REGISTRADORES
+# Executa o TAC do GeradorCI: o corpo principal (ResultadoCompilacao.codigo)
+# e o de cada função (ResultadoCompilacao.funcoes). Maquina(resultado)
+# traduz cada corpo para uma lista de tuplas (opcode, operandos...) com
+# opcodes inteiros e operandos que são posições de um quadro (uma lista
+# Python). Variáveis, temporários e constantes têm cada um a sua posição;
+# vetores e records ocupam posições consecutivas, e 'a[i].f' fica em
+# base + i * passo. Um acesso com índice constante vira uma posição como
+# outra qualquer; com índice variável, uma leitura ou escrita indexada. Os
+# limites são conferidos só pelas instruções 'limite' do TAC (LIMITE), que o
+# GeradorCI emite e a otimização remove quando sempre passam (limites.py).
+#
+# O quadro do corpo principal guarda as variáveis globais; o de uma função,
+# parâmetros, locais, temporários e constantes. Dentro das funções as
+# globais são lidas e escritas por instruções próprias (LE_G, ESCREVE_G...).
+# As chamadas usam uma pilha explícita, e cada função reaproveita os quadros
+# já alocados (um por nível de recursão). Inteiros têm 64 bits com sinal (o
+# resultado dá a volta) e a divisão inteira trunca em direção a zero.
+# --------------------------------------------------------------------
+
+(MOV, SOMA, SUB, MUL, DIV, MENOR, MENOR_IGUAL, MAIOR, MAIOR_IGUAL, IGUAL, DIFERENTE,
+ DESVIO, SE_FALSO, SE_NAO_MENOR, SE_NAO_MENOR_IGUAL, SE_NAO_MAIOR, SE_NAO_MAIOR_IGUAL, SE_NAO_IGUAL, SE_NAO_DIFERENTE,
+ LE_X, ESCREVE_X, LE_G, ESCREVE_G, LE_XG, ESCREVE_XG, BLOCO, PARAM, CHAMA, RETORNA, LIMITE, FIM) = range(31)
+
+NOMES_OPCODES = ('MOV', 'SOMA', 'SUB', 'MUL', 'DIV', 'MENOR', 'MENOR_IGUAL', 'MAIOR', 'MAIOR_IGUAL', 'IGUAL',
+                 'DIFERENTE', 'DESVIO', 'SE_FALSO', 'SE_NAO_MENOR', 'SE_NAO_MENOR_IGUAL', 'SE_NAO_MAIOR',
+                 'SE_NAO_MAIOR_IGUAL', 'SE_NAO_IGUAL', 'SE_NAO_DIFERENTE', 'LE_X', 'ESCREVE_X', 'LE_G', 'ESCREVE_G',
+                 'LE_XG', 'ESCREVE_XG', 'BLOCO', 'PARAM', 'CHAMA', 'RETORNA', 'LIMITE', 'FIM')
+
+_ARITMETICAS = {'+': SOMA, '-': SUB, '*': MUL, '/': DIV}
+_COMPARACOES = {'<': MENOR, '<=': MENOR_IGUAL, '>': MAIOR, '>=': MAIOR_IGUAL, '==': IGUAL, '!=': DIFERENTE}
+_DESVIOS_CONDICIONAIS = {'<': SE_NAO_MENOR, '<=': SE_NAO_MENOR_IGUAL, '>': SE_NAO_MAIOR, '>=': SE_NAO_MAIOR_IGUAL,
+                         '==': SE_NAO_IGUAL, '!=': SE_NAO_DIFERENTE}
+# Opcodes cujo último operando é o destino do desvio.
+_COM_ALVO = {DESVIO, SE_FALSO} | set(_DESVIOS_CONDICIONAIS.values())
+
+VALORES_INICIAIS = {INTEGER: 0, REAL: 0.0, STRING: ''}
+
+class ErroExecucao(Exception):
+    pass
+
+def dividir(a, b):
+    if b == 0:
+        raise ErroExecucao("Erro de Execução: Divisão por zero.")
+    if type(a) is int and type(b) is int:
+        q = a // b
+        if q < 0 and q * b != a: q += 1
+        return q if q <= MAX_INTEIRO else ajustar_inteiro(q)
+    return a / b
+
+class _Layout:
+    """ Posições e valores iniciais dos tipos, com os tamanhos e deslocamentos de campo memorizados. """
+    def __init__(self):
+        self.celulas = {}
+        self.deslocamentos = {}
+
+    def iniciais(self, tipo):
+        try:
+            return self.celulas[tipo]
+        except KeyError:
+            pass
+        if type(tipo) is TipoArray:
+            valores = self.iniciais(tipo.tipo_base) * tipo.tamanho
+        elif type(tipo) is TipoRecord:
+            valores = []
+            for tipo_campo, _ in sorted(tipo.campos.values(), key=lambda campo: campo[1]):
+                valores.extend(self.iniciais(tipo_campo))
+        else:
+            valores = [VALORES_INICIAIS.get(tipo, 0)]
+        self.celulas[tipo] = valores
+        return valores
+
+    def tamanho(self, tipo):
+        return len(self.iniciais(tipo))
+
+    def campo(self, tipo, nome):
+        """ (deslocamento, tipo) do campo `nome` do record. """
+        chave = (tipo, nome)
+        if chave not in self.deslocamentos:
+            tipo_campo, indice = tipo.campos[nome]
+            deslocamento = sum(self.tamanho(t) for t, k in tipo.campos.values() if k < indice)
+            self.deslocamentos[chave] = (deslocamento, tipo_campo)
+        return self.deslocamentos[chave]
+
+def _composto(tipo):
+    return type(tipo) is TipoArray or type(tipo) is TipoRecord
+
+class _Lugar:
+    """ Onde está um operando: no quadro atual ou no global, na posição `endereco` ou, com
+    `indice` (a posição do índice), em endereco + valor do índice * passo. """
+    __slots__ = ('global_', 'endereco', 'tipo', 'indice', 'passo')
+    def __init__(self, global_, endereco, tipo, indice=None, passo=0):
+        self.global_ = global_
+        self.endereco = endereco
+        self.tipo = tipo
+        self.indice = indice
+        self.passo = passo
+
+    def bloco(self, layout):
+        """ Descrição usada por BLOCO: tamanho 0 quer dizer valor composto guardado inteiro na posição. """
+        tamanho = layout.tamanho(self.tipo) if _composto(self.tipo) else 0
+        return (self.global_, self.endereco, -1 if self.indice is None else self.indice, self.passo, tamanho)
+
+class _Montador:
+    """ Traduz o TAC de um corpo para o código da máquina. `variaveis` dá (posição, tipo)
+    das variáveis do quadro; `globais`, o das globais (None no corpo principal, cujo quadro é o global). """
+    def __init__(self, maquina, modelo, variaveis, globais):
+        self.maquina = maquina
+        self.layout = maquina.layout
+        self.modelo = modelo
+        self.variaveis = variaveis
+        self.globais = globais
+        self.posicoes = {}
+        self.rascunhos = []
+        self.usados = 0
+        self.codigo = []
+
+    def posicao(self, chave, valor):
+        if chave not in self.posicoes:
+            self.posicoes[chave] = len(self.modelo)
+            self.modelo.append(valor)
+        return self.posicoes[chave]
+
+    def rascunho(self):
+        if self.usados == len(self.rascunhos):
+            self.rascunhos.append(len(self.modelo))
+            self.modelo.append(0)
+        self.usados += 1
+        return self.rascunhos[self.usados - 1]
+
+    def lugar(self, operando):
+        if eh_constante(operando):
+            # Um inteiro fora de 64 bits (só em TAC montado à mão) dá a volta como na aritmética.
+            if type(operando) is int: operando = ajustar_inteiro(operando)
+            # 1 e 1.0 ocupam posições diferentes, e 0.0 e -0.0 também.
+            return _Lugar(False, self.posicao(chave_constante(operando), operando), None)
+        if eh_temp(operando):
+            return _Lugar(False, self.posicao(operando, 0), None)
+        base, partes = ler_acesso(operando) if eh_acesso(operando) else (operando, ())
+        if base in self.variaveis:
+            global_ = False
+            endereco, tipo = self.variaveis[base]
+        elif self.globais is not None and base in self.globais:
+            global_ = True
+            endereco, tipo = self.globais[base]
+        else:
+            raise ErroExecucao(f"Erro de Execução: Nome '{base}' não declarado.")
+        lugar = _Lugar(global_, endereco, tipo)
+        for parte, chave in partes:
+            if parte == '.':
+                deslocamento, lugar.tipo = self.layout.campo(lugar.tipo, chave)
+                lugar.endereco += deslocamento
+                continue
+            vetor = lugar.tipo
+            passo = self.layout.tamanho(vetor.tipo_base)
+            lugar.tipo = vetor.tipo_base
+            if type(chave) is int and 1 <= chave <= vetor.tamanho:
+                lugar.endereco += (chave - 1) * passo
+            else:
+                # Uma constante fora dos limites (vinda da propagação de constantes) só é erro se for
+                # executada, e a instrução 'limite' antes do acesso falha primeiro.
+                lugar.indice, lugar.passo = self.ler(chave), passo
+                lugar.endereco -= passo
+        return lugar
+
+    def ler(self, operando):
+        return self.valor(self.lugar(operando))
+
+    def valor(self, lugar):
+        """ Posição do quadro com o valor do lugar, emitindo a leitura se for preciso. """
+        if not lugar.global_ and lugar.indice is None and not _composto(lugar.tipo):
+            return lugar.endereco
+        destino = self.rascunho()
+        self.carregar(destino, lugar)
+        return destino
+
+    def carregar(self, destino, lugar):
+        if _composto(lugar.tipo):
+            self.codigo.append((BLOCO, _Lugar(False, destino, None).bloco(self.layout), lugar.bloco(self.layout)))
+        elif lugar.indice is not None:
+            self.codigo.append((LE_XG if lugar.global_ else LE_X, destino, lugar.indice, lugar.endereco, lugar.passo))
+        elif lugar.global_:
+            self.codigo.append((LE_G, destino, lugar.endereco))
+        else:
+            self.codigo.append((MOV, destino, lugar.endereco))
+
+    def guardar(self, lugar, fonte):
+        """ Escreve no lugar o valor da posição `fonte` do quadro. """
+        if _composto(lugar.tipo):
+            self.codigo.append((BLOCO, lugar.bloco(self.layout), _Lugar(False, fonte, None).bloco(self.layout)))
+        elif lugar.indice is not None:
+            self.codigo.append((ESCREVE_XG if lugar.global_ else ESCREVE_X, fonte, lugar.indice, lugar.endereco,
+                                lugar.passo))
+        elif lugar.global_:
+            self.codigo.append((ESCREVE_G, lugar.endereco, fonte))
+        elif lugar.endereco != fonte:
+            self.codigo.append((MOV, lugar.endereco, fonte))
+
+    def destino(self, operando):
+        """ (posição onde calcular o resultado, lugar onde guardá-lo depois ou None). """
+        lugar = self.lugar(operando)
+        if not lugar.global_ and lugar.indice is None and not _composto(lugar.tipo):
+            return lugar.endereco, None
+        return self.rascunho(), lugar
+
+    def montar(self, codigo, valor_final):
+        rotulos = {}
+        i = 0
+        while i < len(codigo):
+            instr = codigo[i]
+            i += 1
+            op = instr.op
+            self.usados = 0
+            if op == ':=':
+                fonte = self.lugar(instr.arg1)
+                destino = self.lugar(instr.dest)
+                if _composto(fonte.tipo) or _composto(destino.tipo):
+                    self.codigo.append((BLOCO, destino.bloco(self.layout), fonte.bloco(self.layout)))
+                elif not destino.global_ and destino.indice is None:
+                    self.carregar(destino.endereco, fonte)
+                else:
+                    self.guardar(destino, self.valor(fonte))
+            elif op in _ARITMETICAS or op in _COMPARACOES:
+                a, b = self.ler(instr.arg1), self.ler(instr.arg2)
+                d, pendente = self.destino(instr.dest)
+                proxima = codigo[i] if i < len(codigo) else None
+                if (op in _COMPARACOES and pendente is None and proxima is not None and proxima.op == 'ifFalse'
+                        and proxima.arg1 == instr.dest):
+                    # 'tN := a < b; ifFalse tN goto L' vira uma instrução (que também guarda tN).
+                    self.codigo.append((_DESVIOS_CONDICIONAIS[op], d, a, b, proxima.dest))
+                    i += 1
+                    continue
+                self.codigo.append((_ARITMETICAS.get(op) or _COMPARACOES[op], d, a, b))
+                if pendente is not None: self.guardar(pendente, d)
+            elif op == 'label':
+                rotulos[instr.dest] = len(self.codigo)
+            elif op == 'goto':
+                self.codigo.append((DESVIO, instr.dest))
+            elif op == 'ifFalse':
+                self.codigo.append((SE_FALSO, self.ler(instr.arg1), instr.dest))
+            elif op == 'param':
+                self.codigo.append((PARAM, self.ler(instr.arg1)))
+            elif op == 'call':
+                if instr.arg1 not in self.maquina.indices:
+                    raise ErroExecucao(f"Erro de Execução: Função '{instr.arg1}' sem código.")
+                d, pendente = self.destino(instr.dest)
+                self.codigo.append((CHAMA, self.maquina.indices[instr.arg1], instr.arg2, d))
+                if pendente is not None: self.guardar(pendente, d)
+            elif op == 'return':
+                self.codigo.append((RETORNA, self.ler(instr.arg1)))
+            elif op == 'limite':
+                self.codigo.append((LIMITE, self.ler(instr.arg1), instr.arg2, instr.dest))
+            else:
+                raise ErroExecucao(f"Erro de Execução: Instrução TAC desconhecida: {instr!r}")
+        # Sair do corpo sem 'return': FIM no principal, o valor padrão do tipo de retorno numa função.
+        self.codigo.append((FIM,) if valor_final is None else (RETORNA, self.posicao(('final',), valor_final)))
+        return [instr[:-1] + (rotulos[instr[-1]],) if instr[0] in _COM_ALVO else instr for instr in self.codigo]
+
+class _Funcao:
+    __slots__ = ('nome', 'codigo', 'modelo', 'parametros', 'quadros', 'profundidade')
+    def __init__(self, nome):
+        self.nome = nome
+        self.codigo = []
+        self.modelo = []
+        self.parametros = []   # (posição, composto) na ordem da declaração
+        self.quadros = []      # quadros já alocados, um por nível de recursão
+        self.profundidade = 0
+
+class Maquina:
+    """ Máquina virtual para o resultado de uma compilação bem-sucedida.
+
+    executar() roda o programa desde o início e devolve o estado final das
+    variáveis globais (estado()). `passos` é o número de instruções da máquina
+    executadas na última execução. Erros de execução (divisão por zero, índice
+    fora dos limites, recursão profunda demais, mais de max_passos
+    instruções) levantam ErroExecucao.
+    """
+    def __init__(self, resultado, max_profundidade=10000):
+        self.max_profundidade = max_profundidade
+        self.layout = _Layout()
+        tabela = resultado.tabela_simbolos
+        self.tipos_globais = {}
+        self.modelo = []
+        globais = {}
+        for nome, info in tabela.items():
+            if info['tipo_estrutura'] == 'var':
+                globais[nome] = (len(self.modelo), info['tipo'])
+                self.tipos_globais[nome] = info['tipo']
+                self.modelo.extend(self.layout.iniciais(info['tipo']))
+        self.globais = globais
+
+        def resolver(nome_tipo):
+            tipo = PRIMITIVOS.get(nome_tipo)
+            return tipo if tipo is not None else tabela[nome_tipo]['descritor']
+
+        self.indices = {nome: k for k, nome in enumerate(resultado.funcoes)}
+        self.funcoes = []
+        for funcao_tac in resultado.funcoes.values():
+            funcao = _Funcao(funcao_tac.nome)
+            variaveis = {}
+            for k, (nome, nome_tipo) in enumerate(funcao_tac.parametros + funcao_tac.locais):
+                tipo = resolver(nome_tipo)
+                variaveis[nome] = (len(funcao.modelo), tipo)
+                if k < len(funcao_tac.parametros): funcao.parametros.append((len(funcao.modelo), _composto(tipo)))
+                funcao.modelo.extend(self.layout.iniciais(tipo))
+            if funcao_tac.tipo_retorno == 'void':
+                valor_final = 0
+            else:
+                tipo_retorno = resolver(funcao_tac.tipo_retorno)
+                iniciais = self.layout.iniciais(tipo_retorno)
+                valor_final = list(iniciais) if _composto(tipo_retorno) else iniciais[0]
+            self.funcoes.append(funcao)
+            funcao.codigo = _Montador(self, funcao.modelo, variaveis, globais).montar(funcao_tac.codigo, valor_final)
+        self.codigo = _Montador(self, self.modelo, globais, None).montar(resultado.codigo, None)
+        self.quadro_global = None
+        self.passos = 0
+
+    def listagem(self, codigo=None):
+        """ O código da máquina como texto, uma instrução por linha. """
+        codigo = self.codigo if codigo is None else codigo
+        return '\n'.join(f"{pc:5}  {NOMES_OPCODES[instr[0]]:<18} " + ' '.join(map(str, instr[1:]))
+                         for pc, instr in enumerate(codigo))
+
+    def executar(self, max_passos=None):
+        G = R = self.modelo[:]
+        self.quadro_global = G
+        funcoes = self.funcoes
+        for funcao in funcoes: funcao.profundidade = 0
+        codigo = self.codigo
+        limite = max_passos if max_passos is not None else float('inf')
+        pilha = []
+        params = []
+        pc = passos = 0
+        try:
+            while True:
+                instr = codigo[pc]
+                pc += 1
+                passos += 1
+                op = instr[0]
+                if op == MOV:
+                    R[instr[1]] = R[instr[2]]
+                elif op == SOMA:
+                    v = R[instr[2]] + R[instr[3]]
+                    R[instr[1]] = v if MIN_INTEIRO <= v <= MAX_INTEIRO else ajustar_inteiro(v)
+                elif op == SUB:
+                    v = R[instr[2]] - R[instr[3]]
+                    R[instr[1]] = v if MIN_INTEIRO <= v <= MAX_INTEIRO else ajustar_inteiro(v)
+                elif op == MUL:
+                    v = R[instr[2]] * R[instr[3]]
+                    R[instr[1]] = v if MIN_INTEIRO <= v <= MAX_INTEIRO else ajustar_inteiro(v)
+                elif op == LE_X:
+                    R[instr[1]] = R[instr[3] + R[instr[2]] * instr[4]]
+                elif op == ESCREVE_X:
+                    R[instr[3] + R[instr[2]] * instr[4]] = R[instr[1]]
+                elif op == LIMITE:
+                    k = R[instr[1]]
+                    if not 1 <= k <= instr[2]: self._fora_dos_limites(k, instr[2], instr[3])
+                elif op == SE_NAO_MENOR:
+                    if R[instr[2]] < R[instr[3]]:
+                        R[instr[1]] = 1
+                    else:
+                        R[instr[1]] = 0
+                        pc = instr[4]
+                elif op == DESVIO:
+                    pc = instr[1]
+                    if passos > limite: self._passos_demais(passos)
+                elif op == SE_NAO_MENOR_IGUAL:
+                    if R[instr[2]] <= R[instr[3]]:
+                        R[instr[1]] = 1
+                    else:
+                        R[instr[1]] = 0
+                        pc = instr[4]
+                elif op == SE_NAO_MAIOR:
+                    if R[instr[2]] > R[instr[3]]:
+                        R[instr[1]] = 1
+                    else:
+                        R[instr[1]] = 0
+                        pc = instr[4]
+                elif op == SE_NAO_MAIOR_IGUAL:
+                    if R[instr[2]] >= R[instr[3]]:
+                        R[instr[1]] = 1
+                    else:
+                        R[instr[1]] = 0
+                        pc = instr[4]
+                elif op == SE_NAO_IGUAL:
+                    if R[instr[2]] == R[instr[3]]:
+                        R[instr[1]] = 1
+                    else:
+                        R[instr[1]] = 0
+                        pc = instr[4]
+                elif op == SE_NAO_DIFERENTE:
+                    if R[instr[2]] != R[instr[3]]:
+                        R[instr[1]] = 1
+                    else:
+                        R[instr[1]] = 0
+                        pc = instr[4]
+                elif op == LE_G:
+                    R[instr[1]] = G[instr[2]]
+                elif op == ESCREVE_G:
+                    G[instr[1]] = R[instr[2]]
+                elif op == PARAM:
+                    params.append(R[instr[1]])
+                elif op == CHAMA:
+                    funcao = funcoes[instr[1]]
+                    if funcao.profundidade == len(funcao.quadros):
+                        if len(pilha) >= self.max_profundidade:
+                            raise ErroExecucao(f"Erro de Execução: Recursão profunda demais em '{funcao.nome}'.")
+                        quadro = funcao.modelo[:]
+                        funcao.quadros.append(quadro)
+                    else:
+                        quadro = funcao.quadros[funcao.profundidade]
+                        quadro[:] = funcao.modelo
+                    funcao.profundidade += 1
+                    # O último 'param' é o primeiro argumento.
+                    for posicao, composto in funcao.parametros:
+                        if composto:
+                            valor = params.pop()
+                            quadro[posicao:posicao + len(valor)] = valor
+                        else:
+                            quadro[posicao] = params.pop()
+                    pilha.append((codigo, pc, R, instr[3], funcao))
+                    codigo, pc, R = funcao.codigo, 0, quadro
+                    if passos > limite: self._passos_demais(passos)
+                elif op == RETORNA:
+                    valor = R[instr[1]]
+                    codigo, pc, R, destino, funcao = pilha.pop()
+                    funcao.profundidade -= 1
+                    R[destino] = valor
+                elif op == SE_FALSO:
+                    if not R[instr[1]]: pc = instr[2]
+                elif op == DIV:
+                    R[instr[1]] = dividir(R[instr[2]], R[instr[3]])
+                elif op == MENOR:
+                    R[instr[1]] = 1 if R[instr[2]] < R[instr[3]] else 0
+                elif op == MENOR_IGUAL:
+                    R[instr[1]] = 1 if R[instr[2]] <= R[instr[3]] else 0
+                elif op == MAIOR:
+                    R[instr[1]] = 1 if R[instr[2]] > R[instr[3]] else 0
+                elif op == MAIOR_IGUAL:
+                    R[instr[1]] = 1 if R[instr[2]] >= R[instr[3]] else 0
+                elif op == IGUAL:
+                    R[instr[1]] = 1 if R[instr[2]] == R[instr[3]] else 0
+                elif op == DIFERENTE:
+                    R[instr[1]] = 1 if R[instr[2]] != R[instr[3]] else 0
+                elif op == LE_XG:
+                    R[instr[1]] = G[instr[3] + R[instr[2]] * instr[4]]
+                elif op == ESCREVE_XG:
+                    G[instr[3] + R[instr[2]] * instr[4]] = R[instr[1]]
+                elif op == BLOCO:
+                    self._copiar_bloco(R, G, instr[1], instr[2])
+                elif op == FIM:
+                    break
+                else:
+                    raise ErroExecucao(f"Erro de Execução: Opcode desconhecido {op}.")
+        finally:
+            self.passos = passos
+            params.clear()
+            for funcao in funcoes:
+                funcao.profundidade = 0
+        return self.estado()
+
+    def _fora_dos_limites(self, k, n, vetor):
+        raise ErroExecucao(f"Erro de Execução: Índice {k} fora dos limites do vetor '{vetor}' (1 a {n}).")
+
+    def _passos_demais(self, passos):
+        raise ErroExecucao(f"Erro de Execução: Limite de {passos - 1} instruções executadas atingido.")
+
+    def _copiar_bloco(self, R, G, destino, fonte):
+        """ Cópia de um vetor ou record inteiro; um lado de tamanho 0 é um valor guardado numa só posição. """
+        def endereco(descricao):
+            global_, base, indice, passo, tamanho = descricao
+            quadro = G if global_ else R
+            if indice < 0: return quadro, base
+            return quadro, base + R[indice] * passo
+        quadro, inicio = endereco(fonte)
+        valor = quadro[inicio] if fonte[4] == 0 else quadro[inicio:inicio + fonte[4]]
+        quadro, inicio = endereco(destino)
+        if destino[4] == 0:
+            quadro[inicio] = list(valor)
+        else:
+            quadro[inicio:inicio + destino[4]] = valor
+
+    def estado(self):
+        """ Variáveis globais -> valor; vetores viram listas e records, dicionários por campo. """
+        G = self.quadro_global if self.quadro_global is not None else self.modelo
+
+        def valor(tipo, inicio):
+            if type(tipo) is TipoArray:
+                passo = self.layout.tamanho(tipo.tipo_base)
+                return [valor(tipo.tipo_base, inicio + k * passo) for k in range(tipo.tamanho)]
+            if type(tipo) is TipoRecord:
+                return {campo: valor(tipo_campo, inicio + self.layout.campo(tipo, campo)[0])
+                        for campo, (tipo_campo, _) in tipo.campos.items()}
+            return G[inicio]
+
+        return {nome: valor(tipo, self.globais[nome][0]) for nome, tipo in self.tipos_globais.items()}
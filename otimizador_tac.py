@@ -0,0 +1,492 @@
+import copy
+import heapq
+import math
+import operator
+import re
+
+# --------------------------------------------------------------------
+# OTIMIZAÇÃO DO CÓDIGO DE TRÊS ENDEREÇOS (TAC)
+# Trabalha sobre listas de InstrucaoTAC (op, arg1, arg2, dest) sem alterar a
+# lista recebida: instruções modificadas são cópias. Três passos:
+#   1. numeração de valores local (por bloco básico): eliminação de
+#      subexpressões comuns, propagação de cópias e de constantes;
+#   2. fusão de cópias 'x := tN' com a instrução imediatamente anterior que
+#      definiu tN;
+#   3. remoção de temporários cujo resultado nunca é usado.
+# Com desvios, a numeração de valores global (ssa.py) estende o passo 1
+# a todo o código, sobre a forma SSA.
+# Chamadas podem alterar qualquer variável e qualquer vetor/record; param,
+# return, limite e instruções desconhecidas nunca são removidos. Rótulos e desvios
+# encerram o bloco básico; um 'ifFalse' com condição constante vira 'goto'
+# (ou some, se nunca desvia).
+# --------------------------------------------------------------------
+
+RELACIONAIS = {'==': operator.eq, '!=': operator.ne, '<': operator.lt,
+               '<=': operator.le, '>': operator.gt, '>=': operator.ge}
+OPERADORES = {'+', '-', '*', '/'} | set(RELACIONAIS)
+COMUTATIVOS = {'+', '*', '==', '!='}
+
+_DESVIOS = {'label', 'goto', 'ifFalse'}
+
+MIN_INTEIRO = -2**63
+MAX_INTEIRO = 2**63 - 1
+
+_TEMP = re.compile(r't\d+$')
+_NOME = re.compile(r'[A-Za-z_]\w*')
+_NUMERO = re.compile(r'-?\d+(\.\d+)?$')
+
+def ajustar_inteiro(valor):
+    """ Inteiro de 64 bits com sinal: o resultado de uma operação que transborda dá a volta. """
+    if type(valor) is int:
+        return (valor - MIN_INTEIRO) % 2**64 + MIN_INTEIRO
+    return valor
+
+def eh_temp(operando):
+    return type(operando) is str and _TEMP.match(operando) is not None
+
+def eh_constante(operando):
+    return type(operando) is int or type(operando) is float
+
+def chave_constante(valor):
+    """ Chave de dicionário de uma constante: 1 e 1.0 são diferentes, e 0.0 e -0.0 também. """
+    if type(valor) is float: return (float, valor, math.copysign(1.0, valor))
+    return (type(valor), valor)
+
+_acessos = {}
+
+def ler_acesso(operando):
+    """ Divide um operando de memória em base e partes: 'a[t1].f' -> ('a', (('[', 't1'), ('.', 'f'))).
+
+    Um nome simples não tem partes. Índices numéricos voltam como int.
+    """
+    try:
+        return _acessos[operando]
+    except KeyError:
+        pass
+    base = _NOME.match(operando).group()
+    partes = []
+    i = len(base)
+    while i < len(operando):
+        if operando[i] == '[':
+            profundidade, j = 1, i + 1
+            while profundidade:
+                if operando[j] == '[': profundidade += 1
+                elif operando[j] == ']': profundidade -= 1
+                j += 1
+            indice = operando[i + 1:j - 1]
+            if _NUMERO.match(indice):
+                indice = float(indice) if '.' in indice else int(indice)
+            partes.append(('[', indice))
+            i = j
+        else:
+            campo = _NOME.match(operando, i + 1).group()
+            partes.append(('.', campo))
+            i += 1 + len(campo)
+    resultado = _acessos[operando] = (base, tuple(partes))
+    return resultado
+
+def montar_acesso(base, partes):
+    return base + ''.join(f"[{valor}]" if tipo == '[' else f".{valor}" for tipo, valor in partes)
+
+def eh_acesso(operando):
+    return type(operando) is str and ('[' in operando or '.' in operando)
+
+def nomes_lidos(operando, destino=False):
+    """ Nomes lidos por um operando. Como destino, só os índices são lidos (não a base). """
+    if type(operando) is not str:
+        return
+    if not eh_acesso(operando):
+        if not destino: yield operando
+        return
+    base, partes = ler_acesso(operando)
+    if not destino: yield base
+    for tipo, valor in partes:
+        if tipo == '[': yield from nomes_lidos(valor)
+
+def operandos_lidos(instr):
+    op = instr.op
+    if op in OPERADORES:
+        yield from nomes_lidos(instr.arg1)
+        yield from nomes_lidos(instr.arg2)
+        yield from nomes_lidos(instr.dest, destino=True)
+    elif op == ':=':
+        yield from nomes_lidos(instr.arg1)
+        yield from nomes_lidos(instr.dest, destino=True)
+    elif op == 'param' or op == 'return' or op == 'ifFalse' or op == 'limite':
+        yield from nomes_lidos(instr.arg1)
+    elif op == 'label' or op == 'goto':
+        return
+    elif op == 'call':
+        yield from nomes_lidos(instr.dest, destino=True)
+    else:
+        # Instrução desconhecida: todos os argumentos contam como lidos.
+        for arg in (instr.arg1, instr.arg2, instr.dest):
+            yield from nomes_lidos(arg)
+
+def dobrar(op, a, b):
+    """ Valor de `a op b` para constantes, ou None. Inteiros só são divididos quando a divisão é exata
+    e dão a volta em 64 bits, como na execução. """
+    if op in RELACIONAIS:
+        return int(RELACIONAIS[op](a, b))
+    if type(a) is int and type(b) is int:
+        if op == '/': return ajustar_inteiro(a // b) if b != 0 and a % b == 0 else None
+        if op == '+': return ajustar_inteiro(a + b)
+        if op == '-': return ajustar_inteiro(a - b)
+        return ajustar_inteiro(a * b)
+    a, b = float(a), float(b)
+    if op == '/': return a / b if b != 0 else None
+    if op == '+': return a + b
+    if op == '-': return a - b
+    return a * b
+
+def _pura(instr):
+    """ Se a instrução pode ser removida quando o seu resultado não é usado. """
+    if instr.op == ':=': return True
+    if instr.op in OPERADORES:
+        return instr.op != '/' or (eh_constante(instr.arg2) and instr.arg2 != 0)
+    return False
+
+class _NumeracaoValores:
+    """ Números de valor de um bloco básico. Constantes, nomes e leituras de memória
+    recebem números; dois operandos com o mesmo número têm o mesmo valor. """
+    def __init__(self):
+        self.proximo = 0
+        self.numeros = {}      # nome, ('c', chave_constante) ou ('m', base, partes) -> número
+        self.constantes = {}   # número -> valor constante
+        self.donos = {}        # número -> nomes que guardam o valor agora
+        self.expressoes = {}   # (op, n1, n2) -> número
+        self.leituras = {}     # base -> chaves ('m', ...) de leituras dessa base
+        self.variaveis = set() # nomes numerados que não são temporários
+
+    def novo(self):
+        self.proximo += 1
+        return self.proximo
+
+    def numero(self, operando):
+        if eh_constante(operando):
+            chave = ('c', chave_constante(operando))
+            n = self.numeros.get(chave)
+            if n is None:
+                n = self.numeros[chave] = self.novo()
+                self.constantes[n] = operando
+            return n
+        if eh_acesso(operando):
+            base, partes = ler_acesso(operando)
+            chave = ('m', base, tuple((t, self.numero(v) if t == '[' else v) for t, v in partes))
+            n = self.numeros.get(chave)
+            if n is None:
+                n = self.numeros[chave] = self.novo()
+                self.leituras.setdefault(base, []).append(chave)
+            return n
+        n = self.numeros.get(operando)
+        if n is None:
+            n = self.numeros[operando] = self.novo()
+            self.donos.setdefault(n, []).append(operando)
+            if not eh_temp(operando): self.variaveis.add(operando)
+        return n
+
+    def representante(self, n):
+        """ Nome que guarda o valor n, preferindo variáveis a temporários. """
+        donos = self.donos.get(n)
+        if not donos: return None
+        for nome in donos:
+            if not eh_temp(nome): return nome
+        return donos[0]
+
+    def reescrever(self, operando):
+        """ Troca o operando pela constante ou pelo representante do seu valor. """
+        if type(operando) is not str:
+            return operando
+        if eh_acesso(operando):
+            base, partes = ler_acesso(operando)
+            novas = tuple((t, self.reescrever(v)) if t == '[' else (t, v) for t, v in partes)
+            if novas != partes: operando = montar_acesso(base, novas)
+            n = self.numeros.get(('m', base, tuple((t, self.numero(v) if t == '[' else v) for t, v in novas)))
+            if n is not None:
+                nome = self.representante(n)
+                if nome is not None: return nome
+            return operando
+        n = self.numeros.get(operando)
+        if n is None: return operando
+        if n in self.constantes: return self.constantes[n]
+        if eh_temp(operando):
+            return self.representante(n) or operando
+        return operando
+
+    def reescrever_destino(self, destino):
+        if not eh_acesso(destino): return destino
+        base, partes = ler_acesso(destino)
+        novas = tuple((t, self.reescrever(v)) if t == '[' else (t, v) for t, v in partes)
+        return montar_acesso(base, novas) if novas != partes else destino
+
+    def _esquecer(self, nome):
+        n = self.numeros.pop(nome, None)
+        if n is not None:
+            self.donos[n].remove(nome)
+        for chave in self.leituras.pop(nome, ()):
+            self.numeros.pop(chave, None)
+
+    def definir(self, destino, n):
+        if eh_acesso(destino):
+            # Escrita na memória: o vetor/record inteiro e as suas leituras mudam de valor.
+            self._esquecer(ler_acesso(destino)[0])
+            return
+        self._esquecer(destino)
+        self.numeros[destino] = n
+        self.donos.setdefault(n, []).append(destino)
+        if not eh_temp(destino): self.variaveis.add(destino)
+
+    def invalidar_chamada(self):
+        """ Depois de uma chamada só os temporários (e as constantes) mantêm o valor. """
+        for nome in self.variaveis:
+            self._esquecer(nome)
+        self.variaveis.clear()
+        for chaves in self.leituras.values():
+            for chave in chaves: self.numeros.pop(chave, None)
+        self.leituras.clear()
+
+def _com(instr, **campos):
+    novo = copy.copy(instr)
+    for campo, valor in campos.items():
+        setattr(novo, campo, valor)
+    return novo
+
+def numerar_valores(codigo):
+    """ Passo 1: eliminação de subexpressões comuns e propagação de cópias e constantes. """
+    saida = []
+    vn = _NumeracaoValores()
+    for instr in codigo:
+        op = instr.op
+        if op in OPERADORES:
+            a, b = vn.reescrever(instr.arg1), vn.reescrever(instr.arg2)
+            destino = vn.reescrever_destino(instr.dest)
+            valor = dobrar(op, a, b) if eh_constante(a) and eh_constante(b) else None
+            if valor is not None:
+                op, a, b = ':=', valor, None
+            else:
+                na, nb = vn.numero(a), vn.numero(b)
+                if op in COMUTATIVOS and nb < na: na, nb = nb, na
+                chave = (op, na, nb)
+                n = vn.expressoes.get(chave)
+                existente = None
+                if n is not None:
+                    existente = vn.constantes[n] if n in vn.constantes else vn.representante(n)
+                if existente is not None:
+                    op, a, b = ':=', existente, None
+                else:
+                    n = vn.expressoes[chave] = vn.novo()
+                    saida.append(_com(instr, arg1=a, arg2=b, dest=destino) if (a, b, destino) != (instr.arg1, instr.arg2, instr.dest) else instr)
+                    vn.definir(destino, n)
+                    continue
+            instr = _com(instr, op=op, arg1=a, arg2=b, dest=destino)
+        if op == ':=':
+            a = vn.reescrever(instr.arg1)
+            destino = vn.reescrever_destino(instr.dest)
+            n = vn.numero(a)
+            if not eh_acesso(destino) and vn.numeros.get(destino) == n:
+                continue   # o destino já guarda esse valor
+            saida.append(_com(instr, arg1=a, dest=destino) if (a, destino) != (instr.arg1, instr.dest) else instr)
+            vn.definir(destino, n)
+        elif op == 'param' or op == 'return' or op == 'limite':
+            a = vn.reescrever(instr.arg1)
+            saida.append(_com(instr, arg1=a) if a != instr.arg1 or type(a) is not type(instr.arg1) else instr)
+            if op == 'return': vn = _NumeracaoValores()
+        elif op == 'ifFalse':
+            a = vn.reescrever(instr.arg1)
+            vn = _NumeracaoValores()
+            if eh_constante(a):
+                if a: continue   # nunca desvia
+                saida.append(_com(instr, op='goto', arg1=None))
+            else:
+                saida.append(_com(instr, arg1=a) if a != instr.arg1 else instr)
+        elif op == 'call':
+            vn.invalidar_chamada()
+            saida.append(instr)
+            vn.definir(instr.dest, vn.novo())
+        else:
+            # Rótulos, desvios e instruções desconhecidas encerram o bloco básico.
+            saida.append(instr)
+            vn = _NumeracaoValores()
+    return saida
+
+def contar_usos(codigo):
+    usos = {}
+    for instr in codigo:
+        for nome in operandos_lidos(instr):
+            if eh_temp(nome): usos[nome] = usos.get(nome, 0) + 1
+    return usos
+
+def fundir_copias(codigo):
+    """ Passo 2: 'tN := e; x := tN' vira 'x := e' quando tN não é usado em mais nenhum lugar. """
+    usos = contar_usos(codigo)
+    saida = []
+    for instr in codigo:
+        if (instr.op == ':=' and eh_temp(instr.arg1) and usos.get(instr.arg1) == 1 and saida
+                and saida[-1].dest == instr.arg1 and (saida[-1].op in OPERADORES or saida[-1].op in (':=', 'call'))):
+            saida[-1] = _com(saida[-1], dest=instr.dest)
+            continue
+        saida.append(instr)
+    return saida
+
+def remover_temporarios_mortos(codigo):
+    """ Passo 3: remove (de trás para frente) as definições de temporários nunca lidos. """
+    usos = contar_usos(codigo)
+    saida = []
+    for instr in reversed(codigo):
+        if eh_temp(instr.dest) and not usos.get(instr.dest) and _pura(instr):
+            for nome in operandos_lidos(instr):
+                if eh_temp(nome): usos[nome] -= 1
+            continue
+        saida.append(instr)
+    saida.reverse()
+    return saida
+
+def otimizar_tac(codigo, max_rodadas=3, global_=True):
+    """ Aplica os três passos até o código parar de diminuir. Devolve uma nova lista.
+
+    Em código com desvios, com global_=True, a numeração de valores global
+    (ssa.py) roda depois da primeira rodada e as seguintes limpam as cópias.
+    """
+    for rodada in range(max_rodadas):
+        tamanho = len(codigo)
+        codigo = remover_temporarios_mortos(fundir_copias(numerar_valores(codigo)))
+        if rodada == 0 and global_ and any(instr.op in _DESVIOS for instr in codigo):
+            from ssa import numerar_valores_global
+            codigo = numerar_valores_global(codigo)
+            continue
+        if len(codigo) == tamanho:
+            break
+    return codigo
+
+# --------------------------------------------------------------------
+# ALOCAÇÃO DE TEMPORÁRIOS
+# O gerador cria um temporário novo para cada operação e chamada. Com a
+# análise de vivacidade, cada temporário passa a ocupar o primeiro slot livre
+# e os slots são reaproveitados assim que o valor morre. O número de
+# temporários distintos do código resultante é o máximo de temporários vivos
+# ao mesmo tempo, que é o tamanho do quadro necessário para executá-lo.
+# Em código com desvios, a vivacidade vem do grafo de fluxo (grafo_fluxo):
+# um temporário vivo na saída de algum bloco ocupa o seu slot da definição
+# até a última instrução em que está vivo, na ordem do código.
+# --------------------------------------------------------------------
+
+def renomear(operando, mapa):
+    """ Troca os temporários do operando (inclusive os índices de acessos) pelos nomes de `mapa`. """
+    if type(operando) is not str:
+        return operando
+    if not eh_acesso(operando):
+        return mapa.get(operando, operando)
+    base, partes = ler_acesso(operando)
+    novas = tuple((t, renomear(v, mapa)) if t == '[' else (t, v) for t, v in partes)
+    return montar_acesso(base, novas) if novas != partes else operando
+
+def vivacidade(codigo):
+    """ Análise de vivacidade dos temporários, de trás para frente.
+
+    Devolve duas listas paralelas ao código: os temporários cuja última leitura
+    é a instrução i (o slot fica livre a partir dela) e, para cada instrução,
+    se o temporário definido por ela (se houver) nunca é lido.
+    """
+    if not any(instr.op in _DESVIOS for instr in codigo):
+        return _vivacidade_linear(codigo)
+    from grafo_fluxo import GrafoFluxo, vivacidade_blocos
+    grafo = GrafoFluxo(codigo)
+    bits, _, saidas = vivacidade_blocos(grafo, considerar=eh_temp)
+    morrem = [()] * len(codigo)
+    definicao_morta = [False] * len(codigo)
+    # Temporários que atravessam blocos: livres depois da última instrução em que estão vivos.
+    globais = {}
+    for bloco, saida in zip(grafo.blocos, saidas):
+        for nome in bits.conjunto(saida):
+            globais[nome] = max(globais.get(nome, 0), bloco.fim)
+    for bloco, saida in zip(grafo.blocos, saidas):
+        vivos = set(bits.conjunto(saida))
+        for i in range(bloco.fim - 1, bloco.inicio - 1, -1):
+            instr = codigo[i]
+            if eh_temp(instr.dest) and instr.op not in _DESVIOS:
+                if instr.dest in vivos:
+                    vivos.discard(instr.dest)
+                else:
+                    definicao_morta[i] = True
+            lidos = [nome for nome in operandos_lidos(instr) if eh_temp(nome)]
+            for nome in lidos:
+                if nome in globais:
+                    globais[nome] = max(globais[nome], i)
+            ultimas = tuple(dict.fromkeys(nome for nome in lidos if nome not in vivos and nome not in globais))
+            vivos.update(lidos)
+            if ultimas:
+                morrem[i] = ultimas
+    for nome, fim in globais.items():
+        if fim < len(codigo):
+            morrem[fim] += (nome,)
+    return morrem, definicao_morta
+
+def _vivacidade_linear(codigo):
+    vivos = set()
+    morrem = [()] * len(codigo)
+    definicao_morta = [False] * len(codigo)
+    for i in range(len(codigo) - 1, -1, -1):
+        instr = codigo[i]
+        if eh_temp(instr.dest):
+            if instr.dest in vivos:
+                vivos.discard(instr.dest)
+            else:
+                definicao_morta[i] = True
+        ultimas = tuple(dict.fromkeys(nome for nome in operandos_lidos(instr) if eh_temp(nome) and nome not in vivos))
+        if ultimas:
+            vivos.update(ultimas)
+            morrem[i] = ultimas
+    return morrem, definicao_morta
+
+def max_temporarios_vivos(codigo):
+    """ Maior número de temporários vivos ao mesmo tempo (contando o que acaba de ser definido). """
+    morrem, definicao_morta = vivacidade(codigo)
+    vivos = maximo = 0
+    for instr, ultimas, morta in zip(codigo, morrem, definicao_morta):
+        vivos -= len(ultimas)
+        if eh_temp(instr.dest):
+            vivos += 1
+            maximo = max(maximo, vivos)
+            if morta: vivos -= 1
+    return maximo
+
+def reusar_temporarios(codigo):
+    """ Renomeia os temporários reaproveitando os que já morreram.
+
+    Devolve (novo código, número de temporários usados). Os slots livres são
+    usados do menor para o maior, então o código resultante usa t0..t(n-1),
+    com n igual a max_temporarios_vivos(codigo). Todo temporário tem de ser
+    definido antes de ser lido, como no código do GeradorCI; um temporário que
+    atravessa blocos tem de ter uma única definição, antes das suas leituras.
+    """
+    morrem, definicao_morta = vivacidade(codigo)
+    livres = []
+    mapa = {}
+    total = 0
+    saida = []
+    for instr, ultimas, morta in zip(codigo, morrem, definicao_morta):
+        campos = {}
+        for campo in ('arg1', 'arg2'):
+            valor = getattr(instr, campo)
+            novo = renomear(valor, mapa)
+            if novo is not valor: campos[campo] = novo
+        if eh_acesso(instr.dest):
+            novo = renomear(instr.dest, mapa)
+            if novo is not instr.dest: campos['dest'] = novo
+        # Os valores lidos pela última vez liberam o slot antes da definição,
+        # então 't1 := t0 + 1' pode reaproveitar t0.
+        for nome in ultimas:
+            slot = mapa.pop(nome, None)
+            if slot is not None: heapq.heappush(livres, int(slot[1:]))
+        if eh_temp(instr.dest):
+            if livres:
+                slot = heapq.heappop(livres)
+            else:
+                slot, total = total, total + 1
+            if morta:
+                heapq.heappush(livres, slot)
+            else:
+                mapa[instr.dest] = f"t{slot}"
+            if instr.dest != f"t{slot}": campos['dest'] = f"t{slot}"
+        saida.append(_com(instr, **campos) if campos else instr)
+    return saida, total
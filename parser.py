@@ -1,97 +1,202 @@
+import argparse
+import json
+import os
+import sys
+from contextlib import nullcontext
 import ply.yacc as yacc
 from lexer import lexer, tokens
+from lexer_paralelo import LexerParalelo
+from lexer_rapido import LexerRapido
+from instrumentacao import ContadorBuscas
+from otimizador_tac import MAX_INTEIRO, MIN_INTEIRO, ajustar_inteiro, otimizar_tac, reusar_temporarios
+from limites import eliminar_verificacoes
+from expansao import ORCAMENTO, TAMANHO_MAXIMO, expandir_chamadas
 
 # --------------------------------------------------------------------
 # ETAPA 1: CLASSES DA ÁRVORE DE SINTAXE ABSTRATA (AST)
 # --------------------------------------------------------------------
 
 class ASTNode:
+    # Sem __dict__ por instância: a AST domina o pico de memória em programas grandes.
+    __slots__ = ()
+
     def __repr__(self):
         return f"{self.__class__.__name__}"
 
 class Programa(ASTNode):
+    __slots__ = ('declaracoes', 'corpo')
     def __init__(self, declaracoes, corpo):
         self.declaracoes = declaracoes
         self.corpo = corpo
 
 class DeclaracaoVar(ASTNode):
-    def __init__(self, variaveis, tipo):
+    __slots__ = ('variaveis', 'tipo', 'linha')
+    def __init__(self, variaveis, tipo, linha=None):
         self.variaveis = variaveis
         self.tipo = tipo
+        self.linha = linha
 
 class Variavel(ASTNode):
+    __slots__ = ('nome',)
     def __init__(self, nome):
         self.nome = nome
 
 class Atribuicao(ASTNode):
-    def __init__(self, var, expressao):
+    __slots__ = ('var', 'expressao', 'linha')
+    def __init__(self, var, expressao, linha=None):
         self.var = var
         self.expressao = expressao
+        self.linha = linha
 
 class Numero(ASTNode):
+    __slots__ = ('valor',)
     def __init__(self, valor):
         self.valor = valor
 
 class OperacaoBinaria(ASTNode):
-    def __init__(self, esq, op, dir):
+    __slots__ = ('esq', 'op', 'dir', 'tipo')
+    def __init__(self, esq, op, dir, tipo=None):
         self.esq = esq
         self.op = op
         self.dir = dir
+        self.tipo = tipo  # preenchido pela análise semântica
 
 class FunctionDecl(ASTNode):
-    def __init__(self, nome, params, tipo_retorno, corpo):
+    __slots__ = ('nome', 'params', 'tipo_retorno', 'corpo', 'linha')
+    def __init__(self, nome, params, tipo_retorno, corpo, linha=None):
         self.nome = nome
         self.params = params
         self.tipo_retorno = tipo_retorno
         self.corpo = corpo
+        self.linha = linha
 
 class FunctionBody(ASTNode):
+    __slots__ = ('declaracoes_locais', 'comandos')
     def __init__(self, declaracoes_locais, comandos):
         self.declaracoes_locais = declaracoes_locais
         self.comandos = comandos
 
 class FunctionCall(ASTNode):
-    def __init__(self, nome, args):
+    __slots__ = ('nome', 'args', 'linha')
+    def __init__(self, nome, args, linha=None):
         self.nome = nome
         self.args = args
+        self.linha = linha
 
 class Param(ASTNode):
-    def __init__(self, var_node, tipo_node):
+    __slots__ = ('var_node', 'tipo_node', 'linha')
+    def __init__(self, var_node, tipo_node, linha=None):
         self.var_node = var_node
         self.tipo_node = tipo_node
+        self.linha = linha
 
 class ReturnStmt(ASTNode):
-    def __init__(self, expressao):
+    __slots__ = ('expressao', 'linha')
+    def __init__(self, expressao, linha=None):
         self.expressao = expressao
+        self.linha = linha
+
+class Comparacao(ASTNode):
+    __slots__ = ('esq', 'op', 'dir', 'tipo')
+    def __init__(self, esq, op, dir, tipo=None):
+        self.esq = esq
+        self.op = op
+        self.dir = dir
+        self.tipo = tipo  # tipo dos operandos, preenchido pela análise semântica; o resultado é 0 ou 1
+
+class IfStmt(ASTNode):
+    __slots__ = ('condicao', 'entao', 'senao', 'linha')
+    def __init__(self, condicao, entao, senao=None, linha=None):
+        self.condicao = condicao
+        self.entao = entao
+        self.senao = senao
+        self.linha = linha
+
+class WhileStmt(ASTNode):
+    __slots__ = ('condicao', 'corpo', 'linha')
+    def __init__(self, condicao, corpo, linha=None):
+        self.condicao = condicao
+        self.corpo = corpo
+        self.linha = linha
 
 class TypeDecl(ASTNode):
-    def __init__(self, nome, definicao_tipo):
+    __slots__ = ('nome', 'definicao_tipo', 'linha')
+    def __init__(self, nome, definicao_tipo, linha=None):
         self.nome = nome
         self.definicao_tipo = definicao_tipo
+        self.linha = linha
 
 class ArrayType(ASTNode):
+    __slots__ = ('tamanho', 'tipo_base')
     def __init__(self, tamanho, tipo_base):
         self.tamanho = tamanho
         self.tipo_base = tipo_base
 
 class ArrayAccess(ASTNode):
-    def __init__(self, var, indice):
+    __slots__ = ('var', 'indice', 'tamanho')
+    def __init__(self, var, indice, tamanho=None):
         self.var = var
         self.indice = indice
+        self.tamanho = tamanho  # tamanho do vetor, preenchido pela análise semântica
 
 class RecordType(ASTNode):
+    __slots__ = ('campos',)
     def __init__(self, campos):
         self.campos = campos
 
 class RecordAccess(ASTNode):
+    __slots__ = ('var', 'campo')
     def __init__(self, var, campo):
         self.var = var
         self.campo = campo
 
+# --------------------------------------------------------------------
+# DIAGNÓSTICOS
+# Os erros de todas as fases são registrados com a linha e a compilação segue
+# até o fim (ou até o limite de erros), em vez de parar no primeiro.
+# --------------------------------------------------------------------
+
+MAX_ERROS = 50
+
+class Diagnostico:
+    __slots__ = ('fase', 'mensagem', 'linha')
+    def __init__(self, fase, mensagem, linha=None):
+        self.fase = fase          # 'sintatico' ou 'semantico'
+        self.mensagem = mensagem
+        self.linha = linha
+
+    def __str__(self):
+        return f"Linha {self.linha}: {self.mensagem}" if self.linha else self.mensagem
+
+    def __repr__(self):
+        return f"Diagnostico({self.fase}, {self.linha}, {self.mensagem!r})"
+
+class LimiteDiagnosticos(Exception):
+    pass
+
+class Diagnosticos:
+    """ Coletor de diagnósticos. Ao atingir `max_erros` (None = sem limite) interrompe a fase com LimiteDiagnosticos. """
+    def __init__(self, max_erros=None):
+        self.lista = []
+        self.max_erros = max_erros
+
+    def registrar(self, fase, mensagem, linha=None):
+        self.lista.append(Diagnostico(fase, mensagem, linha))
+        if self.max_erros is not None and len(self.lista) >= self.max_erros:
+            raise LimiteDiagnosticos()
+
+class ErroSemantico(Exception):
+    def __init__(self, mensagem, linha=None):
+        super().__init__(mensagem)
+        self.linha = linha
+
 # --------------------------------------------------------------------
 # ETAPA 2: PARSER (ANÁLISE SINTÁTICA) - GRAMÁTICA CORRIGIDA
 # --------------------------------------------------------------------
 
+# Define o ponto de partida da gramática
+start = 'programa'
+
 precedence = (
     ('left', 'PLUS', 'MINUS'),
     ('left', 'TIMES', 'DIVIDE'),
@@ -104,8 +209,11 @@ def p_programa(p):
 def p_lista_declaracoes(p):
     '''lista_declaracoes : lista_declaracoes declaracao
                          | empty'''
-    if len(p) == 3 and p[2]:
-        p[0] = p[1] + p[2] if isinstance(p[2], list) else p[1] + [p[2]]
+    if len(p) == 3:
+        # Acrescenta na própria lista (O(1) amortizado) em vez de copiá-la a cada redução.
+        if isinstance(p[2], list): p[1].extend(p[2])
+        elif p[2]: p[1].append(p[2])
+        p[0] = p[1]
     else:
         p[0] = []
 
@@ -122,17 +230,40 @@ def p_corpo_principal(p):
 def p_lista_comandos(p):
     '''lista_comandos : lista_comandos comando
                       | empty'''
-    if len(p) == 3 and p[2]:
-        p[0] = p[1] + [p[2]]
+    if len(p) == 3:
+        if p[2]: p[1].append(p[2])
+        p[0] = p[1]
     else:
         p[0] = []
 
 def p_comando(p):
     '''comando : atribuicao
                | return_statement
+               | if_statement
+               | while_statement
                | function_call SEMI'''
     p[0] = p[1]
 
+def p_if_statement(p):
+    '''if_statement : IF condicao THEN lista_comandos END SEMI
+                    | IF condicao THEN lista_comandos ELSE lista_comandos END SEMI'''
+    p[0] = IfStmt(condicao=p[2], entao=p[4], senao=p[6] if len(p) == 9 else None, linha=p.lineno(1))
+
+def p_while_statement(p):
+    '''while_statement : WHILE condicao DO lista_comandos END SEMI'''
+    p[0] = WhileStmt(condicao=p[2], corpo=p[4], linha=p.lineno(1))
+
+def p_condicao(p):
+    '''condicao : expressao EQUAL_TO expressao
+                | expressao EQUAL expressao
+                | expressao NOT_EQUAL_TO expressao
+                | expressao LESS_THAN expressao
+                | expressao LESS_THAN_OR_EQUAL expressao
+                | expressao GREATER_THAN expressao
+                | expressao GREATER_THAN_OR_EQUAL expressao'''
+    # '=' e '==' são a mesma comparação.
+    p[0] = Comparacao(esq=p[1], op='==' if p[2] == '=' else p[2], dir=p[3])
+
 def p_type_declaration_block(p):
     '''type_declaration_block : TYPE type_definition_list'''
     p[0] = p[2]
@@ -140,12 +271,14 @@ def p_type_declaration_block(p):
 def p_type_definition_list(p):
     '''type_definition_list : type_definition_list single_type_definition
                            | single_type_definition'''
-    if len(p) == 3: p[0] = p[1] + [p[2]]
-    else: p[0] = [p[1]]
+    if len(p) == 3:
+        if p[2]: p[1].append(p[2])
+        p[0] = p[1]
+    else: p[0] = [p[1]] if p[1] else []
 
 def p_single_type_definition(p):
     '''single_type_definition : ID EQUAL_TO type_definition SEMI'''
-    p[0] = TypeDecl(nome=p[1], definicao_tipo=p[3])
+    p[0] = TypeDecl(nome=p[1], definicao_tipo=p[3], linha=p.lineno(1))
 
 def p_type_definition(p):
     '''type_definition : array_type_definition
@@ -163,12 +296,14 @@ def p_record_type_definition(p):
 def p_field_list(p):
     '''field_list : field_list field_declaration
                   | empty'''
-    if len(p) == 3: p[0] = p[1] + [p[2]]
+    if len(p) == 3:
+        if p[2]: p[1].append(p[2])
+        p[0] = p[1]
     else: p[0] = []
 
 def p_field_declaration(p):
     '''field_declaration : ID COLON tipo_specifier SEMI'''
-    p[0] = Param(Variavel(p[1]), p[3])
+    p[0] = Param(Variavel(p[1]), p[3], linha=p.lineno(1))
 
 def p_var_declaration_block(p):
     '''var_declaration_block : VAR var_declaration_list'''
@@ -177,12 +312,14 @@ def p_var_declaration_block(p):
 def p_var_declaration_list(p):
     '''var_declaration_list : var_declaration_list declaracao_var
                            | declaracao_var'''
-    if len(p) == 3: p[0] = p[1] + [p[2]]
-    else: p[0] = [p[1]]
+    if len(p) == 3:
+        if p[2]: p[1].append(p[2])
+        p[0] = p[1]
+    else: p[0] = [p[1]] if p[1] else []
 
 def p_declaracao_var(p):
     '''declaracao_var : ID COLON tipo_specifier SEMI'''
-    p[0] = DeclaracaoVar(variaveis=[Variavel(p[1])], tipo=p[3])
+    p[0] = DeclaracaoVar(variaveis=[Variavel(p[1])], tipo=p[3], linha=p.lineno(1))
 
 def p_tipo_specifier(p):
     '''tipo_specifier : INTEGER
@@ -193,7 +330,7 @@ def p_tipo_specifier(p):
 
 def p_atribuicao(p):
     '''atribuicao : lvalue ATRIB expressao SEMI'''
-    p[0] = Atribuicao(var=p[1], expressao=p[3])
+    p[0] = Atribuicao(var=p[1], expressao=p[3], linha=p.lineno(2))
 
 def p_lvalue(p):
     '''lvalue : ID
@@ -211,7 +348,7 @@ def p_record_access(p):
 
 def p_function_declaration(p):
     '''function_declaration : DEF ID LPAREN params_opt RPAREN tipo_retorno_opt function_body'''
-    p[0] = FunctionDecl(nome=p[2], params=p[4], tipo_retorno=p[6], corpo=p[7])
+    p[0] = FunctionDecl(nome=p[2], params=p[4], tipo_retorno=p[6], corpo=p[7], linha=p.lineno(2))
 
 def p_var_declarations_opt(p):
     '''var_declarations_opt : var_declaration_block
@@ -224,7 +361,7 @@ def p_function_body(p):
 
 def p_return_statement(p):
     '''return_statement : RETURN expressao SEMI'''
-    p[0] = ReturnStmt(p[2])
+    p[0] = ReturnStmt(p[2], linha=p.lineno(1))
 
 def p_params_opt(p):
     '''params_opt : params
@@ -234,12 +371,12 @@ def p_params_opt(p):
 def p_params(p):
     '''params : params COMMA param
               | param'''
-    if len(p) == 4: p[0] = p[1] + [p[3]]
+    if len(p) == 4: p[1].append(p[3]); p[0] = p[1]
     else: p[0] = [p[1]]
 
 def p_param(p):
     '''param : ID COLON tipo_specifier'''
-    p[0] = Param(Variavel(p[1]), p[3])
+    p[0] = Param(Variavel(p[1]), p[3], linha=p.lineno(1))
 
 def p_tipo_retorno_opt(p):
     '''tipo_retorno_opt : COLON COLON tipo_specifier
@@ -272,7 +409,7 @@ def p_termo(p):
 
 def p_function_call(p):
     '''function_call : ID LPAREN args_opt RPAREN'''
-    p[0] = FunctionCall(nome=p[1], args=p[3])
+    p[0] = FunctionCall(nome=p[1], args=p[3], linha=p.lineno(1))
 
 def p_args_opt(p):
     '''args_opt : args
@@ -282,212 +419,590 @@ def p_args_opt(p):
 def p_args(p):
     '''args : args COMMA expressao
             | expressao'''
-    if len(p) == 4: p[0] = p[1] + [p[3]]
+    if len(p) == 4: p[1].append(p[3]); p[0] = p[1]
     else: p[0] = [p[1]]
 
+# Pontos de recuperação: um comando ou declaração com erro é descartado até o
+# próximo ';' e a análise continua, registrando os demais erros do arquivo.
+def p_comando_erro(p):
+    '''comando : error SEMI'''
+    p[0] = None
+
+def p_single_type_definition_erro(p):
+    '''single_type_definition : error SEMI'''
+    p[0] = None
+
+def p_field_declaration_erro(p):
+    '''field_declaration : error SEMI'''
+    p[0] = None
+
+def p_declaracao_var_erro(p):
+    '''declaracao_var : error SEMI'''
+    p[0] = None
+
 def p_empty(p):
     'empty :'
     p[0] = None
 
+# Os erros de sintaxe vão para o coletor do próprio parser (diagnosticos_sintaticos,
+# ver construir_parser), que quem inicia o parse troca; assim dois parsers podem
+# rodar ao mesmo tempo em threads diferentes. Com a recuperação de erros o parse
+# pode terminar com uma AST mesmo após um erro.
+def registrar_erro_sintatico(diagnosticos, p):
+    if p: diagnosticos.registrar('sintatico', f"Erro de sintaxe no token '{p.value}' (tipo: {p.type})", p.lineno)
+    else: diagnosticos.registrar('sintatico', "Erro de sintaxe: Fim inesperado do arquivo!")
+
 def p_error(p):
-    if p: print(f"Erro de sintaxe no token '{p.value}' (tipo: {p.type}) na linha {p.lineno}")
-    else: print("Erro de sintaxe: Fim inesperado do arquivo!")
+    # O yacc exige a regra, mas construir_parser troca o errorfunc de cada parser.
+    raise RuntimeError("Parser sem coletor de diagnósticos: construa-o com construir_parser().")
 
 # --------------------------------------------------------------------
 # ETAPA 3: ANÁLISE SEMÂNTICA
 # --------------------------------------------------------------------
 
-class AnalisadorSemantico:
-    def __init__(self):
-        self.pilha_escopos = [{}]
-        self.funcao_atual = None
+class Tipo:
+    """ Descritor de tipo. Cada tipo existe uma única vez, então igualdade de tipos é identidade (`is`). """
+    __slots__ = ('nome',)
+    def __init__(self, nome): self.nome = nome
+    def __str__(self): return self.nome
+    def __repr__(self): return f"{type(self).__name__}({self.nome})"
+
+class TipoPrimitivo(Tipo):
+    __slots__ = ()
+
+class TipoArray(Tipo):
+    __slots__ = ('tamanho', 'tipo_base')
+    def __init__(self, nome, tamanho, tipo_base):
+        super().__init__(nome)
+        self.tamanho = tamanho
+        self.tipo_base = tipo_base
+    def chave(self): return ('array', self.nome, self.tamanho, self.tipo_base)
+
+class TipoRecord(Tipo):
+    __slots__ = ('campos',)
+    def __init__(self, nome, campos):
+        super().__init__(nome)
+        self.campos = campos  # nome do campo -> (tipo, índice)
+    def chave(self): return ('record', self.nome, tuple((nome, tipo) for nome, (tipo, _) in self.campos.items()))
+
+INTEGER = TipoPrimitivo('integer')
+REAL = TipoPrimitivo('real')
+STRING = TipoPrimitivo('string')
+VOID = TipoPrimitivo('void')
+# Tipo de símbolos e expressões com erro já registrado; nenhuma checagem o rejeita.
+ERRO = TipoPrimitivo('<erro>')
+PRIMITIVOS = {'integer': INTEGER, 'real': REAL, 'string': STRING}
+
+class Visitante:
+    """ Base dos passes sobre a AST.
+
+    Cada subclasse tem uma tabela de despacho própria, preenchida na primeira
+    visita a cada tipo de nó: tipo -> visitar_<Classe>. Listas e None também
+    passam pela tabela, sem testes de isinstance a cada visita.
+    """
+    _despacho = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._despacho = {}
 
     def visitar(self, no):
-        if no is None: return
-        if isinstance(no, list):
-            for item in no: self.visitar(item)
-            return
-        nome_metodo = f'visitar_{type(no).__name__}'
-        visitante = getattr(self, nome_metodo, self.erro_generico)
-        return visitante(no)
+        try:
+            metodo = self._despacho[type(no)]
+        except KeyError:
+            metodo = self._resolver(type(no))
+        return metodo(self, no)
+
+    @classmethod
+    def _resolver(cls, tipo):
+        if tipo is list:
+            metodo = cls.visitar_lista
+        elif tipo is type(None):
+            metodo = cls.visitar_nada
+        else:
+            metodo = getattr(cls, f'visitar_{tipo.__name__}', cls.erro_generico)
+        cls._despacho[tipo] = metodo
+        return metodo
+
+    def visitar_lista(self, no):
+        for item in no: self.visitar(item)
+
+    def visitar_nada(self, no):
+        return None
+
+    def erro_generico(self, no):
+        pass
+
+class AnalisadorSemantico(Visitante):
+    """ Checa escopos e tipos. `tipos` é a tabela de internação dos descritores
+    (chave estrutural -> descritor); pode ser compartilhada entre análises para que
+    tipos estruturalmente iguais continuem sendo o mesmo objeto.
+
+    Os erros vão para self.diagnosticos e a análise continua no próximo comando ou
+    declaração. Símbolos com tipo inválido recebem o tipo ERRO, que é aceito por
+    todas as checagens, para que um erro não se repita em cascata nos seus usos.
+    """
+    def __init__(self, tipos=None, max_erros=None):
+        self.pilha_escopos = [{}]
+        self.funcao_atual = None
+        self.tipos = tipos if tipos is not None else {}
+        self.diagnosticos = Diagnosticos(max_erros)
 
     def erro_generico(self, no):
         raise Exception(f'Nenhum método visitar_{type(no).__name__} encontrado para {no}')
 
+    def visitar_lista(self, no):
+        # Cada item (declaração ou comando) é um ponto de recuperação.
+        for item in no:
+            try:
+                self.visitar(item)
+            except ErroSemantico as e:
+                self.diagnosticos.registrar('semantico', str(e), e.linha or getattr(item, 'linha', None))
+
+    def reportar(self, mensagem, linha):
+        self.diagnosticos.registrar('semantico', mensagem, linha)
+
     def abrir_escopo(self): self.pilha_escopos.append({})
     def fechar_escopo(self): self.pilha_escopos.pop()
 
     def declarar_simbolo(self, nome, info):
         escopo_atual = self.pilha_escopos[-1]
-        if nome in escopo_atual: raise Exception(f"Erro Semântico: Símbolo '{nome}' já foi declarado neste escopo.")
+        if nome in escopo_atual: raise ErroSemantico(f"Erro Semântico: Símbolo '{nome}' já foi declarado neste escopo.")
         escopo_atual[nome] = info
 
     def buscar_simbolo(self, nome):
         for escopo in reversed(self.pilha_escopos):
             if nome in escopo: return escopo[nome]
         return None
-    
+
+    def resolver_tipo(self, nome):
+        """ Devolve o descritor do tipo `nome` (primitivo ou declarado com type) ou None. """
+        tipo = PRIMITIVOS.get(nome)
+        if tipo is None:
+            info = self.buscar_simbolo(nome)
+            if info and info['tipo_estrutura'] == 'type': tipo = info['descritor']
+        return tipo
+
+    def tipo_declarado(self, nome, linha):
+        """ Como resolver_tipo, mas registra o erro e devolve ERRO se o tipo não existe. """
+        tipo = self.resolver_tipo(nome)
+        if tipo is None:
+            self.reportar(f"Erro Semântico: Tipo '{nome}' não foi definido.", linha)
+            return ERRO
+        return tipo
+
+    def internar(self, tipo):
+        return self.tipos.setdefault(tipo.chave(), tipo)
+
     def visitar_Programa(self, no):
         self.visitar(no.declaracoes)
         self.visitar(no.corpo)
 
     def visitar_TypeDecl(self, no):
         nome_tipo = no.nome
-        self.visitar(no.definicao_tipo)
-        info_tipo = {'tipo_estrutura': 'type', 'definicao': no.definicao_tipo}
+        try:
+            descritor = self.visitar(no.definicao_tipo)
+            descritor.nome = nome_tipo
+            descritor = self.internar(descritor)
+        except ErroSemantico as e:
+            self.reportar(str(e), no.linha)
+            descritor = ERRO
+        info_tipo = {'tipo_estrutura': 'type', 'definicao': no.definicao_tipo, 'descritor': descritor}
         self.declarar_simbolo(nome_tipo, info_tipo)
 
     def visitar_ArrayType(self, no):
-        tipo_base = no.tipo_base
-        if tipo_base not in ['integer', 'real', 'string'] and not self.buscar_simbolo(tipo_base):
-            raise Exception(f"Erro Semântico: Tipo base '{tipo_base}' do array não foi definido.")
+        tipo_base = self.resolver_tipo(no.tipo_base)
+        if tipo_base is None:
+            raise ErroSemantico(f"Erro Semântico: Tipo base '{no.tipo_base}' do array não foi definido.")
+        return TipoArray(None, no.tamanho, tipo_base)
 
     def visitar_RecordType(self, no):
+        campos = {}
         for campo in no.campos:
-            tipo_campo = campo.tipo_node
-            if tipo_campo not in ['integer', 'real', 'string'] and not self.buscar_simbolo(tipo_campo):
-                raise Exception(f"Erro Semântico: Tipo '{tipo_campo}' usado no campo '{campo.var_node.nome}' não foi definido.")
+            tipo_campo = self.resolver_tipo(campo.tipo_node)
+            if tipo_campo is None:
+                self.reportar(f"Erro Semântico: Tipo '{campo.tipo_node}' usado no campo '{campo.var_node.nome}' não foi definido.", campo.linha)
+                tipo_campo = ERRO
+            campos.setdefault(campo.var_node.nome, (tipo_campo, len(campos)))
+        return TipoRecord(None, campos)
+
+    # As regras de tipo ficam em métodos checar_*/tipo_* separados da travessia,
+    # para serem reaproveitadas pela travessia fundida (AnalisadorGeradorCI).
 
     def visitar_ArrayAccess(self, no):
+        definicao_array = self.checar_vetor(no)
+        tipo_indice = self.visitar(no.indice)
+        return self.checar_indice(no, definicao_array, tipo_indice)
+
+    def checar_vetor(self, no):
         nome_var = no.var.nome
         info_var = self.buscar_simbolo(nome_var)
         if not info_var or info_var['tipo_estrutura'] != 'var':
-            raise Exception(f"Erro Semântico: '{nome_var}' não é uma variável declarada.")
-        info_tipo_var = self.buscar_simbolo(info_var['tipo'])
-        if not info_tipo_var or not isinstance(info_tipo_var.get('definicao'), ArrayType):
-            raise Exception(f"Erro de Tipo: A variável '{nome_var}' não é do tipo vetor (array).")
-        tipo_indice = self.visitar(no.indice)
-        if tipo_indice != 'integer': raise Exception(f"Erro de Tipo: O índice de um vetor deve ser um 'integer', mas recebeu '{tipo_indice}'.")
-        definicao_array = info_tipo_var['definicao']
+            raise ErroSemantico(f"Erro Semântico: '{nome_var}' não é uma variável declarada.")
+        tipo_var = info_var['tipo']
+        if type(tipo_var) is not TipoArray and tipo_var is not ERRO:
+            raise ErroSemantico(f"Erro de Tipo: A variável '{nome_var}' não é do tipo vetor (array).")
+        return tipo_var
+
+    def checar_indice(self, no, definicao_array, tipo_indice):
+        """ Checa o índice e devolve o tipo dos elementos do vetor. """
+        if definicao_array is ERRO: return ERRO
+        if tipo_indice is not INTEGER and tipo_indice is not ERRO:
+            raise ErroSemantico(f"Erro de Tipo: O índice de um vetor deve ser um 'integer', mas recebeu '{tipo_indice}'.")
         if isinstance(no.indice, Numero):
             if not (1 <= no.indice.valor <= definicao_array.tamanho):
-                raise Exception(f"Erro Semântico: Índice '{no.indice.valor}' fora dos limites do vetor '{nome_var}' (1 a {definicao_array.tamanho}).")
+                raise ErroSemantico(f"Erro Semântico: Índice '{no.indice.valor}' fora dos limites do vetor '{no.var.nome}' (1 a {definicao_array.tamanho}).")
+        no.tamanho = definicao_array.tamanho
         return definicao_array.tipo_base
 
     def visitar_RecordAccess(self, no):
-        tipo_var_esquerda = self.visitar(no.var)
-        info_tipo = self.buscar_simbolo(tipo_var_esquerda)
-        if not info_tipo or not isinstance(info_tipo.get('definicao'), RecordType):
-            raise Exception(f"Erro de Tipo: Tentativa de acessar campo em uma variável que não é do tipo '{tipo_var_esquerda}' (record).")
-        definicao_record = info_tipo['definicao']
+        return self.tipo_campo(no, self.visitar(no.var))
+
+    def tipo_campo(self, no, tipo_var_esquerda):
+        if tipo_var_esquerda is ERRO: return ERRO
+        if type(tipo_var_esquerda) is not TipoRecord:
+            raise ErroSemantico(f"Erro de Tipo: Tentativa de acessar campo em uma variável que não é do tipo '{tipo_var_esquerda}' (record).")
         nome_campo_acessado = no.campo.nome
-        for campo_declarado in definicao_record.campos:
-            if campo_declarado.var_node.nome == nome_campo_acessado:
-                return campo_declarado.tipo_node
-        raise Exception(f"Erro Semântico: O campo '{nome_campo_acessado}' não existe no tipo '{tipo_var_esquerda}'.")
+        campo = tipo_var_esquerda.campos.get(nome_campo_acessado)
+        if campo is not None: return campo[0]
+        raise ErroSemantico(f"Erro Semântico: O campo '{nome_campo_acessado}' não existe no tipo '{tipo_var_esquerda}'.")
 
     def visitar_DeclaracaoVar(self, no):
-        tipo_nome = no.tipo
-        info_tipo = self.buscar_simbolo(tipo_nome)
-        if tipo_nome not in ['integer', 'real', 'string'] and (not info_tipo or info_tipo.get('tipo_estrutura') != 'type'):
-            raise Exception(f"Erro Semântico: Tipo '{tipo_nome}' não foi definido.")
-        self.declarar_simbolo(no.variaveis[0].nome, {'tipo_estrutura': 'var', 'tipo': tipo_nome})
+        tipo = self.tipo_declarado(no.tipo, no.linha)
+        self.declarar_simbolo(no.variaveis[0].nome, {'tipo_estrutura': 'var', 'tipo': tipo})
 
     def visitar_FunctionDecl(self, no):
         nome_func = no.nome
-        info_func = {'tipo_estrutura': 'function', 'tipo_retorno': no.tipo_retorno, 'parametros': []}
+        tipo_retorno = VOID if no.tipo_retorno == 'void' else self.tipo_declarado(no.tipo_retorno, no.linha)
+        info_func = {'tipo_estrutura': 'function', 'tipo_retorno': tipo_retorno, 'parametros': []}
         self.declarar_simbolo(nome_func, info_func)
         self.funcao_atual = info_func
         self.abrir_escopo()
-        if no.params:
-            for param in no.params:
-                nome_param = param.var_node.nome
-                tipo_param = param.tipo_node
-                info_param = {'tipo_estrutura': 'var', 'tipo': tipo_param}
-                self.declarar_simbolo(nome_param, info_param)
-                info_func['parametros'].append(info_param)
-        self.visitar(no.corpo)
-        self.fechar_escopo()
-        self.funcao_atual = None
+        try:
+            if no.params:
+                for param in no.params:
+                    nome_param = param.var_node.nome
+                    info_param = {'tipo_estrutura': 'var', 'tipo': self.tipo_declarado(param.tipo_node, param.linha)}
+                    info_func['parametros'].append(info_param)
+                    try:
+                        self.declarar_simbolo(nome_param, info_param)
+                    except ErroSemantico as e:
+                        self.reportar(str(e), param.linha)
+            self.visitar(no.corpo)
+        finally:
+            self.fechar_escopo()
+            self.funcao_atual = None
 
     def visitar_FunctionBody(self, no):
         if no.declaracoes_locais: self.visitar(no.declaracoes_locais)
         if no.comandos: self.visitar(no.comandos)
 
     def visitar_ReturnStmt(self, no):
-        if self.funcao_atual is None: raise Exception("Erro Semântico: Instrução 'return' encontrada fora de uma função.")
-        tipo_retornado = self.visitar(no.expressao)
+        self.checar_retorno_permitido()
+        self.checar_retorno(self.visitar(no.expressao))
+
+    def checar_retorno_permitido(self):
+        if self.funcao_atual is None: raise ErroSemantico("Erro Semântico: Instrução 'return' encontrada fora de uma função.")
+
+    def checar_retorno(self, tipo_retornado):
         tipo_esperado = self.funcao_atual['tipo_retorno']
-        if tipo_retornado != tipo_esperado: raise Exception(f"Erro de Tipo: A função espera um retorno do tipo '{tipo_esperado}', mas recebeu '{tipo_retornado}'.")
+        if tipo_retornado is not tipo_esperado and tipo_retornado is not ERRO and tipo_esperado is not ERRO:
+            raise ErroSemantico(f"Erro de Tipo: A função espera um retorno do tipo '{tipo_esperado}', mas recebeu '{tipo_retornado}'.")
 
     def visitar_FunctionCall(self, no):
+        info_func = self.checar_chamada(no)
+        for i, arg_node in enumerate(no.args):
+            self.checar_argumento(no, info_func, i, self.visitar(arg_node))
+        return info_func['tipo_retorno']
+
+    def checar_chamada(self, no):
         nome_func = no.nome
         info_func = self.buscar_simbolo(nome_func)
-        if not info_func or info_func['tipo_estrutura'] != 'function': raise Exception(f"Erro Semântico: Função '{nome_func}' não foi declarada.")
+        if not info_func or info_func['tipo_estrutura'] != 'function': raise ErroSemantico(f"Erro Semântico: Função '{nome_func}' não foi declarada.")
         params_esperados = info_func['parametros']
         args_passados = no.args
-        if len(params_esperados) != len(args_passados): raise Exception(f"Erro Semântico: Função '{nome_func}' espera {len(params_esperados)} argumentos, mas recebeu {len(args_passados)}.")
-        for i, arg_node in enumerate(args_passados):
-            tipo_esperado = params_esperados[i]['tipo']
-            tipo_passado = self.visitar(arg_node)
-            if tipo_esperado != tipo_passado: raise Exception(f"Erro de Tipo: Argumento {i+1} da função '{nome_func}' deveria ser do tipo '{tipo_esperado}', mas é do tipo '{tipo_passado}'.")
-        return info_func['tipo_retorno']
+        if len(params_esperados) != len(args_passados): raise ErroSemantico(f"Erro Semântico: Função '{nome_func}' espera {len(params_esperados)} argumentos, mas recebeu {len(args_passados)}.")
+        return info_func
+
+    def checar_argumento(self, no, info_func, i, tipo_passado):
+        tipo_esperado = info_func['parametros'][i]['tipo']
+        if tipo_esperado is not tipo_passado and tipo_esperado is not ERRO and tipo_passado is not ERRO:
+            raise ErroSemantico(f"Erro de Tipo: Argumento {i+1} da função '{no.nome}' deveria ser do tipo '{tipo_esperado}', mas é do tipo '{tipo_passado}'.")
 
     def visitar_Atribuicao(self, no): # aqui tava com "lvalue"
         tipo_expressao = self.visitar(no.expressao)
         tipo_lhs = self.visitar(no.var)
-        if tipo_lhs != tipo_expressao:
-            raise Exception(f"Erro de Tipo: Não é possível atribuir tipo '{tipo_expressao}' a um local do tipo '{tipo_lhs}'.")
+        self.checar_atribuicao(tipo_lhs, tipo_expressao)
+
+    def checar_atribuicao(self, tipo_lhs, tipo_expressao):
+        if tipo_lhs is not tipo_expressao and tipo_lhs is not ERRO and tipo_expressao is not ERRO:
+            raise ErroSemantico(f"Erro de Tipo: Não é possível atribuir tipo '{tipo_expressao}' a um local do tipo '{tipo_lhs}'.")
 
     def visitar_Variavel(self, no):
         nome_var = no.nome
         info_var = self.buscar_simbolo(nome_var)
-        if not info_var: raise Exception(f"Erro Semântico: Símbolo '{nome_var}' não foi declarado.")
+        if not info_var: raise ErroSemantico(f"Erro Semântico: Símbolo '{nome_var}' não foi declarado.")
         if info_var['tipo_estrutura'] == 'var': return info_var['tipo']
-        elif info_var['tipo_estrutura'] == 'type': return no.nome
-        else: raise Exception(f"Erro Semântico: '{nome_var}' não é uma variável ou tipo utilizável neste contexto.")
+        elif info_var['tipo_estrutura'] == 'type': return info_var['descritor']
+        else: raise ErroSemantico(f"Erro Semântico: '{nome_var}' não é uma variável ou tipo utilizável neste contexto.")
     
     def visitar_Numero(self, no):
-        if isinstance(no.valor, int): return 'integer'
-        elif isinstance(no.valor, float): return 'real'
+        if isinstance(no.valor, int):
+            if not MIN_INTEIRO <= no.valor <= MAX_INTEIRO:
+                raise ErroSemantico(f"Erro Semântico: O inteiro {no.valor} não cabe em 64 bits.")
+            return INTEGER
+        elif isinstance(no.valor, float): return REAL
+
+    def visitar_IfStmt(self, no):
+        self.visitar_condicao(no)
+        self.visitar(no.entao)
+        self.visitar(no.senao)
+
+    def visitar_WhileStmt(self, no):
+        self.visitar_condicao(no)
+        self.visitar(no.corpo)
+
+    def visitar_condicao(self, no):
+        # Um erro na condição não impede a análise dos comandos do if/while.
+        try:
+            self.visitar(no.condicao)
+        except ErroSemantico as e:
+            self.reportar(str(e), e.linha or no.linha)
+
+    def visitar_Comparacao(self, no):
+        return self.tipo_comparacao(no, self.visitar(no.esq), self.visitar(no.dir))
+
+    def tipo_comparacao(self, no, tipo_esq, tipo_dir):
+        if tipo_esq is ERRO or tipo_dir is ERRO: return ERRO
+        if (tipo_esq is not INTEGER and tipo_esq is not REAL) or (tipo_dir is not INTEGER and tipo_dir is not REAL):
+            raise ErroSemantico(f"Erro de Tipo: Comparação '{no.op}' não suportada entre '{tipo_esq}' e '{tipo_dir}'.")
+        no.tipo = REAL if tipo_esq is REAL or tipo_dir is REAL else INTEGER
+        return INTEGER
 
     def visitar_OperacaoBinaria(self, no):
-        tipo_esq = self.visitar(no.esq)
-        tipo_dir = self.visitar(no.dir)
-        validos = ['integer', 'real']
-        if tipo_esq not in validos or tipo_dir not in validos: raise Exception(f"Erro de Tipo: Operação '{no.op}' não suportada entre '{tipo_esq}' e '{tipo_dir}'.")
-        if tipo_esq == 'real' or tipo_dir == 'real': return 'real'
-        else: return 'integer'
+        return self.tipo_binario(no, self.visitar(no.esq), self.visitar(no.dir))
+
+    def tipo_binario(self, no, tipo_esq, tipo_dir):
+        if tipo_esq is ERRO or tipo_dir is ERRO: return ERRO
+        if (tipo_esq is not INTEGER and tipo_esq is not REAL) or (tipo_dir is not INTEGER and tipo_dir is not REAL):
+            raise ErroSemantico(f"Erro de Tipo: Operação '{no.op}' não suportada entre '{tipo_esq}' e '{tipo_dir}'.")
+        no.tipo = REAL if tipo_esq is REAL or tipo_dir is REAL else INTEGER
+        return no.tipo
+
+# --------------------------------------------------------------------
+# ETAPA 3B: OTIMIZAÇÃO DA AST
+# Roda entre a análise semântica e a geração de código, usando os tipos que
+# a análise anotou em cada OperacaoBinaria.
+# --------------------------------------------------------------------
+
+def avaliar_constante(op, a, b, tipo):
+    """ Valor de `a op b` no tipo da operação, ou None se não puder ser dobrado.
+    Inteiros dão a volta em 64 bits, como na execução. """
+    if tipo is REAL:
+        a, b = float(a), float(b)
+        if op == '/': return a / b if b != 0 else None
+    elif tipo is not INTEGER:
+        return None
+    elif op == '/':
+        # A divisão inteira só é dobrada quando é exata (e não depende do arredondamento).
+        return ajustar_inteiro(a // b) if b != 0 and a % b == 0 else None
+    if op == '+': return ajustar_inteiro(a + b)
+    if op == '-': return ajustar_inteiro(a - b)
+    if op == '*': return ajustar_inteiro(a * b)
+    return None
+
+def expressao_pura(no):
+    """ Se a expressão pode ser descartada: sem chamadas, sem divisões que possam falhar e sem
+    índices de vetor que possam sair dos limites (só um índice constante dentro deles é seguro). """
+    tipo = type(no)
+    if tipo is Numero or tipo is Variavel: return True
+    if tipo is OperacaoBinaria:
+        if no.op == '/' and (type(no.dir) is not Numero or no.dir.valor == 0): return False
+        return expressao_pura(no.esq) and expressao_pura(no.dir)
+    if tipo is ArrayAccess:
+        indice = no.indice
+        return (type(indice) is Numero and no.tamanho is not None and 1 <= indice.valor <= no.tamanho
+                and expressao_pura(no.var))
+    if tipo is RecordAccess: return expressao_pura(no.var)
+    return False
+
+class OtimizadorAST(Visitante):
+    """ Dobra subexpressões constantes e aplica identidades algébricas, reescrevendo a AST.
+
+    Cada visita a uma expressão devolve o nó que a substitui. As identidades
+    (e+0, e-0, e*1, e/1, e*0) e a reassociação de constantes ((e+c1)+c2, (e*c1)*c2)
+    só são aplicadas a operações inteiras: em real elas mudariam o resultado para
+    -0.0, infinitos e NaN.
+    """
+    def __init__(self):
+        self.simplificacoes = 0
+
+    def visitar_Programa(self, no):
+        self.visitar(no.declaracoes)
+        self.visitar(no.corpo)
+
+    def visitar_FunctionDecl(self, no):
+        self.visitar(no.corpo)
+
+    def visitar_FunctionBody(self, no):
+        self.visitar(no.comandos)
+
+    def visitar_Atribuicao(self, no):
+        no.expressao = self.visitar(no.expressao)
+        no.var = self.visitar(no.var)
+
+    def visitar_ReturnStmt(self, no):
+        no.expressao = self.visitar(no.expressao)
+
+    def visitar_IfStmt(self, no):
+        self.visitar(no.condicao)
+        self.visitar(no.entao)
+        self.visitar(no.senao)
+
+    def visitar_WhileStmt(self, no):
+        self.visitar(no.condicao)
+        self.visitar(no.corpo)
+
+    def visitar_Comparacao(self, no):
+        no.esq = self.visitar(no.esq)
+        no.dir = self.visitar(no.dir)
+        return no
+
+    def visitar_FunctionCall(self, no):
+        no.args = [self.visitar(arg) for arg in no.args]
+        return no
+
+    def visitar_ArrayAccess(self, no):
+        no.indice = self.visitar(no.indice)
+        return no
+
+    def visitar_RecordAccess(self, no):
+        no.var = self.visitar(no.var)
+        return no
+
+    def visitar_Variavel(self, no): return no
+    def visitar_Numero(self, no): return no
+
+    def visitar_OperacaoBinaria(self, no):
+        esq = no.esq = self.visitar(no.esq)
+        dir = no.dir = self.visitar(no.dir)
+        if type(esq) is Numero and type(dir) is Numero:
+            valor = avaliar_constante(no.op, esq.valor, dir.valor, no.tipo)
+            if valor is None: return no
+            self.simplificacoes += 1
+            return Numero(valor)
+        if no.tipo is not INTEGER: return no
+        novo = self.simplificar_inteiro(no)
+        if novo is not no: self.simplificacoes += 1
+        return novo
+
+    def simplificar_inteiro(self, no):
+        op, esq, dir = no.op, no.esq, no.dir
+        if type(esq) is Numero and op in ('+', '*'):
+            # Constante à direita: c + e -> e + c, c * e -> e * c.
+            esq, dir = dir, esq
+            no.esq, no.dir = esq, dir
+        if type(dir) is not Numero: return no
+        c = dir.valor
+        if (op == '+' or op == '-') and c == 0: return esq
+        if (op == '*' or op == '/') and c == 1: return esq
+        if op == '*' and c == 0 and expressao_pura(esq): return Numero(0)
+        if type(esq) is OperacaoBinaria and type(esq.dir) is Numero and esq.tipo is INTEGER:
+            # (e ± c1) ± c2 -> e ± c e (e * c1) * c2 -> e * c.
+            if (op == '+' or op == '-') and (esq.op == '+' or esq.op == '-'):
+                k = ajustar_inteiro((esq.dir.valor if esq.op == '+' else -esq.dir.valor) + (c if op == '+' else -c))
+                if k == 0: return esq.esq
+                return OperacaoBinaria(esq.esq, '+', Numero(k), INTEGER) if k < 0 and -k > MAX_INTEIRO \
+                    else OperacaoBinaria(esq.esq, '+' if k > 0 else '-', Numero(abs(k)), INTEGER)
+            if op == '*' and esq.op == '*':
+                c = ajustar_inteiro(esq.dir.valor * c)
+                return self.simplificar_inteiro(OperacaoBinaria(esq.esq, '*', Numero(c), INTEGER))
+        return no
 
 # --------------------------------------------------------------------
 # ETAPA 4: GERAÇÃO DE CÓDIGO INTERMEDIÁRIO (CI)
 # --------------------------------------------------------------------
+# Comparações: 'tN := a < b' guarda 1 ou 0. Desvios: 'label' (dest é o rótulo),
+# 'goto' e 'ifFalse' (desvia para dest se arg1 for 0). Verificação de limites:
+# 'limite k, n (v)' é um erro de execução se k não estiver entre 1 e n; vem antes
+# de cada acesso v[k] cujo índice não é uma constante dentro dos limites (arg1
+# é o índice, arg2 o tamanho e dest o nome do vetor, só para a mensagem).
 class InstrucaoTAC:
     def __init__(self, op, arg1, arg2, dest): self.op = op; self.arg1 = arg1; self.arg2 = arg2; self.dest = dest
     def __repr__(self):
-        if self.op in ['+', '-', '*', '/']: return f"{self.dest} := {self.arg1} {self.op} {self.arg2}"
+        if self.op in ['+', '-', '*', '/', '==', '!=', '<', '<=', '>', '>=']: return f"{self.dest} := {self.arg1} {self.op} {self.arg2}"
         elif self.op == ':=': return f"{self.dest} := {self.arg1}"
+        elif self.op == 'label': return f"{self.dest}:"
+        elif self.op == 'goto': return f"goto {self.dest}"
+        elif self.op == 'ifFalse': return f"ifFalse {self.arg1} goto {self.dest}"
         elif self.op == 'return': return f"return {self.arg1}"
         elif self.op == 'param': return f"param {self.arg1}"
         elif self.op == 'call': return f"{self.dest} := call {self.arg1}, {self.arg2}"
+        elif self.op == 'limite': return f"limite {self.arg1}, {self.arg2} ({self.dest})"
         else: return f"{self.op} {self.arg1} {self.arg2} {self.dest}"
 
-class GeradorCI:
+class FuncaoTAC:
+    """ TAC do corpo de uma função. `parametros` e `locais` são pares (nome, nome do tipo),
+    na ordem da declaração; os outros nomes do código são globais ou temporários da função. """
+    __slots__ = ('nome', 'parametros', 'locais', 'tipo_retorno', 'codigo')
+    def __init__(self, nome, parametros, locais, tipo_retorno, codigo):
+        self.nome = nome
+        self.parametros = parametros
+        self.locais = locais
+        self.tipo_retorno = tipo_retorno
+        self.codigo = codigo
+
+def linhas_tac(codigo, funcoes):
+    """ Texto do TAC, uma linha por vez: o corpo principal e depois cada função, com a
+    assinatura, os locais e o código recuado até o 'end'. """
+    for instr in codigo:
+        yield str(instr)
+    for funcao in funcoes.values():
+        parametros = ', '.join(f"{nome}: {tipo}" for nome, tipo in funcao.parametros)
+        yield ''
+        yield f"def {funcao.nome}({parametros}) :: {funcao.tipo_retorno}"
+        if funcao.locais:
+            yield "var " + ', '.join(f"{nome}: {tipo}" for nome, tipo in funcao.locais)
+        for instr in funcao.codigo:
+            yield f"    {instr}"
+        yield "end"
+
+class GeradorCI(Visitante):
+    """ Emite o TAC do corpo principal em `codigo` e o de cada função em `funcoes` (nome -> FuncaoTAC). """
     def __init__(self):
         self.codigo = []
+        self.funcoes = {}
         self.contador_temp = 0
+        self.contador_rotulo = 0
     
     def novo_temp(self):
         nome_temp = f"t{self.contador_temp}"
         self.contador_temp += 1
         return nome_temp
-    
-    def visitar(self, no):
-        if no is None: return
-        if isinstance(no, list):
-            for item in no: self.visitar(item)
-            return
-        nome_metodo = f'visitar_{type(no).__name__}'
-        visitante = getattr(self, nome_metodo, self.erro_generico)
-        return visitante(no)
-        
-    def erro_generico(self, no):
 
-        pass
+    def novo_rotulo(self):
+        rotulo = f"L{self.contador_rotulo}"
+        self.contador_rotulo += 1
+        return rotulo
         
     def visitar_Programa(self, no):
         self.visitar(no.declaracoes)
         self.visitar(no.corpo)
+
+    def visitar_FunctionDecl(self, no):
+        self.emitir_funcao(no, lambda: self.visitar(no.corpo.comandos))
+
+    def emitir_funcao(self, no, visitar_corpo):
+        # O corpo vai para uma lista própria, com temporários e rótulos numerados a partir de 0.
+        codigo, contador_temp, contador_rotulo = self.codigo, self.contador_temp, self.contador_rotulo
+        self.codigo, self.contador_temp, self.contador_rotulo = [], 0, 0
+        try:
+            visitar_corpo()
+            parametros = [(param.var_node.nome, param.tipo_node) for param in no.params or ()]
+            locais = [(decl.variaveis[0].nome, decl.tipo) for decl in no.corpo.declaracoes_locais or () if decl]
+            self.funcoes[no.nome] = FuncaoTAC(no.nome, parametros, locais, no.tipo_retorno, self.codigo)
+        finally:
+            self.codigo, self.contador_temp, self.contador_rotulo = codigo, contador_temp, contador_rotulo
         
     def visitar_Atribuicao(self, no):
         loc_expr = self.visitar(no.expressao)
@@ -511,7 +1026,13 @@ class GeradorCI:
         
     def visitar_ArrayAccess(self, no):
         indice_loc = self.visitar(no.indice)
+        self.emitir_limite(no, indice_loc)
         return f"{no.var.nome}[{indice_loc}]"
+
+    def emitir_limite(self, no, indice_loc):
+        # Um índice constante dentro dos limites já foi conferido pela análise semântica.
+        if type(indice_loc) is int and 1 <= indice_loc <= no.tamanho: return
+        self.codigo.append(InstrucaoTAC('limite', indice_loc, no.tamanho, no.var.nome))
         
     def visitar_RecordAccess(self, no):
         base_loc = self.visitar(no.var)
@@ -529,47 +1050,430 @@ class GeradorCI:
         loc_expr = self.visitar(no.expressao)
         self.codigo.append(InstrucaoTAC('return', loc_expr, None, None))
 
+    visitar_Comparacao = visitar_OperacaoBinaria
+
+    def visitar_IfStmt(self, no):
+        self.emitir_if(no, self.visitar(no.condicao))
+
+    def emitir_if(self, no, loc_condicao):
+        #     ifFalse c goto Lsenao; entao; goto Lfim; Lsenao: senao; Lfim:
+        rotulo_senao = self.novo_rotulo()
+        self.codigo.append(InstrucaoTAC('ifFalse', loc_condicao, None, rotulo_senao))
+        self.visitar(no.entao)
+        if no.senao:
+            rotulo_fim = self.novo_rotulo()
+            self.codigo.append(InstrucaoTAC('goto', None, None, rotulo_fim))
+            self.codigo.append(InstrucaoTAC('label', None, None, rotulo_senao))
+            self.visitar(no.senao)
+            self.codigo.append(InstrucaoTAC('label', None, None, rotulo_fim))
+        else:
+            self.codigo.append(InstrucaoTAC('label', None, None, rotulo_senao))
+
+    def visitar_WhileStmt(self, no):
+        #     Linicio: c := condição; ifFalse c goto Lfim; corpo; goto Linicio; Lfim:
+        rotulo_inicio, rotulo_fim = self.novo_rotulo(), self.novo_rotulo()
+        self.codigo.append(InstrucaoTAC('label', None, None, rotulo_inicio))
+        loc_condicao = self.visitar(no.condicao)
+        self.codigo.append(InstrucaoTAC('ifFalse', loc_condicao, None, rotulo_fim))
+        self.visitar(no.corpo)
+        self.codigo.append(InstrucaoTAC('goto', None, None, rotulo_inicio))
+        self.codigo.append(InstrucaoTAC('label', None, None, rotulo_fim))
+
+
+class AnalisadorGeradorCI(AnalisadorSemantico):
+    """ Travessia fundida: checa os tipos e emite o TAC em uma única visita à AST.
+
+    Produz a mesma tabela de símbolos e o mesmo código que AnalisadorSemantico
+    seguido de GeradorCI. Cada visita a uma expressão devolve o tipo (como no
+    analisador) e deixa em self.loc o local do resultado (como no gerador).
+    """
+    def __init__(self, tipos=None, max_erros=None):
+        super().__init__(tipos, max_erros)
+        self.codigo = []
+        self.funcoes = {}
+        self.contador_temp = 0
+        self.contador_rotulo = 0
+        self.loc = None
+
+    novo_temp = GeradorCI.novo_temp
+    novo_rotulo = GeradorCI.novo_rotulo
+    emitir_if = GeradorCI.emitir_if
+    emitir_funcao = GeradorCI.emitir_funcao
+    emitir_limite = GeradorCI.emitir_limite
+
+    def visitar_FunctionDecl(self, no):
+        self.emitir_funcao(no, lambda: super(AnalisadorGeradorCI, self).visitar_FunctionDecl(no))
+
+    def visitar_Atribuicao(self, no):
+        tipo_expressao = self.visitar(no.expressao)
+        loc_expr = self.loc
+        tipo_lhs = self.visitar(no.var)
+        self.checar_atribuicao(tipo_lhs, tipo_expressao)
+        self.codigo.append(InstrucaoTAC(':=', loc_expr, None, self.loc))
+
+    def visitar_OperacaoBinaria(self, no):
+        tipo_esq = self.visitar(no.esq)
+        loc_esq = self.loc
+        tipo_dir = self.visitar(no.dir)
+        tipo = self.tipo_binario(no, tipo_esq, tipo_dir)
+        temp_dest = self.novo_temp()
+        self.codigo.append(InstrucaoTAC(no.op, loc_esq, self.loc, temp_dest))
+        self.loc = temp_dest
+        return tipo
+
+    def visitar_Numero(self, no):
+        self.loc = no.valor
+        return super().visitar_Numero(no)
+
+    def visitar_Variavel(self, no):
+        tipo = super().visitar_Variavel(no)
+        self.loc = no.nome
+        return tipo
+
+    def visitar_ArrayAccess(self, no):
+        definicao_array = self.checar_vetor(no)
+        tipo_indice = self.visitar(no.indice)
+        tipo = self.checar_indice(no, definicao_array, tipo_indice)
+        if definicao_array is not ERRO: self.emitir_limite(no, self.loc)
+        self.loc = f"{no.var.nome}[{self.loc}]"
+        return tipo
+
+    def visitar_RecordAccess(self, no):
+        tipo = self.tipo_campo(no, self.visitar(no.var))
+        self.loc = f"{self.loc}.{no.campo.nome}"
+        return tipo
+
+    def visitar_FunctionCall(self, no):
+        info_func = self.checar_chamada(no)
+        args_locs = []
+        for i, arg_node in enumerate(no.args):
+            self.checar_argumento(no, info_func, i, self.visitar(arg_node))
+            args_locs.append(self.loc)
+        for loc in reversed(args_locs):
+            self.codigo.append(InstrucaoTAC('param', loc, None, None))
+        temp_retorno = self.novo_temp()
+        self.codigo.append(InstrucaoTAC('call', no.nome, len(args_locs), temp_retorno))
+        self.loc = temp_retorno
+        return info_func['tipo_retorno']
+
+    def visitar_ReturnStmt(self, no):
+        self.checar_retorno_permitido()
+        self.checar_retorno(self.visitar(no.expressao))
+        self.codigo.append(InstrucaoTAC('return', self.loc, None, None))
+
+    def visitar_Comparacao(self, no):
+        tipo_esq = self.visitar(no.esq)
+        loc_esq = self.loc
+        tipo_dir = self.visitar(no.dir)
+        tipo = self.tipo_comparacao(no, tipo_esq, tipo_dir)
+        temp_dest = self.novo_temp()
+        self.codigo.append(InstrucaoTAC(no.op, loc_esq, self.loc, temp_dest))
+        self.loc = temp_dest
+        return tipo
+
+    def visitar_IfStmt(self, no):
+        self.visitar_condicao(no)
+        self.emitir_if(no, self.loc)
+
+    def visitar_WhileStmt(self, no):
+        rotulo_inicio, rotulo_fim = self.novo_rotulo(), self.novo_rotulo()
+        self.codigo.append(InstrucaoTAC('label', None, None, rotulo_inicio))
+        self.visitar_condicao(no)
+        self.codigo.append(InstrucaoTAC('ifFalse', self.loc, None, rotulo_fim))
+        self.visitar(no.corpo)
+        self.codigo.append(InstrucaoTAC('goto', None, None, rotulo_inicio))
+        self.codigo.append(InstrucaoTAC('label', None, None, rotulo_fim))
+
 # --------------------------------------------------------------------
-# ETAPA FINAL: EXECUTAR TODAS AS FASES DO COMPILADOR
+# ETAPA FINAL: API DO COMPILADOR
 # --------------------------------------------------------------------
 
-# Define o ponto de partida da gramática
-start = 'programa'
-
-parser = yacc.yacc()
-try:
-    # Lembre-se de ter um arquivo 'exemplo.pas' no mesmo diretório
-    with open('exemplo.pas', 'r') as file:
-        codigo = file.read()
-    
-    print("--- Iniciando Análise Sintática ---")
-    arvore_sintatica = parser.parse(codigo, lexer=lexer)
-    if arvore_sintatica is None:
-        print("\nErro sintático grave impediu a construção da AST. Verifique os erros acima.")
+def construir_parser(desenvolvimento=False):
+    """ Parser com o seu próprio coletor de erros de sintaxe em `diagnosticos_sintaticos`. """
+    # O yacc lê as regras p_* do módulo de quem o chama, por isso a
+    # construção fica em uma função deste mesmo módulo.
+    if desenvolvimento:
+        # Valida a gramática e regrava parsetab.py e parser.out se ela mudou.
+        parser = yacc.yacc()
     else:
-        print("--- Análise Sintática Concluída ---\n")
-
-    if arvore_sintatica:
-        print("--- Iniciando Análise Semântica ---")
-        try:
-            analisador = AnalisadorSemantico()
-            analisador.visitar(arvore_sintatica)
-            print("--- Análise Semântica Concluída com Sucesso! ---\n")
-            
-            print("--- Iniciando Geração de Código Intermediário ---")
+        # Carrega as tabelas de parsetab.py sem conferir a assinatura nem gravar
+        # nada (sem parsetab.py, gera as tabelas só em memória). Depois de mudar a
+        # gramática, regenere as tabelas com: python3 gerar_tabelas.py
+        parser = yacc.yacc(optimize=True, write_tables=False, debug=False)
+    parser.diagnosticos_sintaticos = Diagnosticos()
+    def erro(p):
+        registrar_erro_sintatico(parser.diagnosticos_sintaticos, p)
+    parser.errorfunc = erro
+    return parser
+
+MSG_ERRO_SINTATICO = "Erro sintático grave impediu a construção da AST."
+
+# Faz parte da chave do cache de compilação (cache_compilacao.py): incremente
+# quando a saída do compilador mudar para o mesmo código-fonte.
+VERSAO_COMPILADOR = '1.0'
+
+
+class ResultadoCompilacao:
+    """ `diagnosticos` traz os erros estruturados (Diagnostico); `erros`, as mesmas mensagens como texto.
+
+    `num_temporarios` só é preenchido quando os temporários são reaproveitados:
+    é o máximo de temporários vivos ao mesmo tempo (t0..t(n-1) no código).
+    `expansao` só é preenchido com a expansão de funções em linha (RelatorioExpansao).
+    `codigo` é o TAC do corpo principal; `funcoes`, o de cada função (nome -> FuncaoTAC).
+    """
+    def __init__(self, ast=None, tabela_simbolos=None, codigo=None, erros=None, num_tokens=0, diagnosticos=None,
+                 num_temporarios=None, funcoes=None, expansao=None):
+        self.ast = ast
+        self.tabela_simbolos = tabela_simbolos
+        self.codigo = codigo if codigo is not None else []
+        self.funcoes = funcoes if funcoes is not None else {}
+        self.diagnosticos = diagnosticos if diagnosticos is not None else []
+        self.erros = erros if erros is not None else [str(d) for d in self.diagnosticos]
+        self.num_tokens = num_tokens
+        self.num_temporarios = num_temporarios
+        self.expansao = expansao
+
+    @property
+    def sucesso(self):
+        return not self.erros
+
+class AnalisadorSemanticoInstrumentado(ContadorBuscas, AnalisadorSemantico):
+    pass
+
+class AnalisadorGeradorCIInstrumentado(ContadorBuscas, AnalisadorGeradorCI):
+    pass
+
+def _sem_fase(nome):
+    return nullcontext()
+
+def _eliminar_verificacoes(codigo, funcoes, tabela):
+    """ eliminar_verificacoes no corpo principal e em cada função, com as variáveis inteiras de cada uma. """
+    def inteiro(nome_tipo):
+        tipo = PRIMITIVOS.get(nome_tipo)
+        return (tipo if tipo is not None else tabela[nome_tipo]['descritor']) is INTEGER
+
+    inteiros = {nome for nome, info in tabela.items() if info['tipo_estrutura'] == 'var' and info['tipo'] is INTEGER}
+    for funcao in funcoes.values():
+        proprias = funcao.parametros + funcao.locais
+        locais = {nome for nome, _ in proprias}
+        inteiros_funcao = (inteiros - locais) | {nome for nome, nome_tipo in proprias if inteiro(nome_tipo)}
+        funcao.codigo = eliminar_verificacoes(funcao.codigo, inteiros_funcao, locais)
+    return eliminar_verificacoes(codigo, inteiros)
+
+class Compilador:
+    """ Executa todas as fases do compilador reaproveitando o mesmo parser e lexer.
+
+    Com lexer_rapido=True a análise léxica usa o LexerRapido (lexer_rapido.py),
+    que produz a mesma sequência de tokens do lexer PLY. Com passo_unico=True a
+    análise semântica e a geração de TAC são feitas pelo AnalisadorGeradorCI, em
+    uma única travessia da AST.
+
+    Todos os erros de sintaxe e, se não houver nenhum, todos os erros semânticos
+    são registrados em uma só compilação, até o limite de max_erros.
+
+    Com otimizar=True o OtimizadorAST reescreve a AST (a devolvida no resultado)
+    antes da geração de código e o TAC gerado passa por otimizar_tac
+    (otimizador_tac.py), seguido da remoção das verificações de limites que
+    sempre passam (eliminar_verificacoes, limites.py). Nesse caso a travessia
+    fundida não é usada, pois a otimização da AST precisa rodar entre a análise
+    e a geração.
+
+    Com expandir=True as chamadas de funções pequenas e sem desvios são
+    trocadas pelo corpo da função (expandir_chamadas, expansao.py) antes de
+    qualquer otimização do TAC; tamanho_expansao é o tamanho máximo da função e
+    orcamento_expansao, o crescimento máximo do código, como fração do total de
+    instruções. O resultado informa em expansao as chamadas expandidas e a
+    variação do número de instruções.
+
+    Com reusar_temps=True os temporários mortos são reaproveitados
+    (reusar_temporarios, depois de qualquer otimização) e o resultado informa
+    em num_temporarios quantos temporários o código usa.
+
+    Com trabalhadores_lexico=N, textos grandes são tokenizados em N processos
+    (LexerParalelo, lexer_paralelo.py), com o mesmo fluxo de tokens. fechar()
+    (ou o uso como gerenciador de contexto) encerra esses processos.
+    """
+    def __init__(self, lexer_rapido=False, passo_unico=False, max_erros=MAX_ERROS, otimizar=False, reusar_temps=False,
+                 trabalhadores_lexico=0, expandir=False, tamanho_expansao=TAMANHO_MAXIMO, orcamento_expansao=ORCAMENTO):
+        self.passo_unico = passo_unico and not otimizar
+        self.otimizar = otimizar
+        self.expandir = expandir
+        self.tamanho_expansao = tamanho_expansao
+        self.orcamento_expansao = orcamento_expansao
+        self.reusar_temps = reusar_temps
+        self.max_erros = max_erros
+        self.parser = construir_parser()
+        if trabalhadores_lexico:
+            self.lexer = LexerParalelo(trabalhadores_lexico)
+        elif lexer_rapido:
+            self.lexer = LexerRapido()
+        else:
+            self.lexer = lexer.clone()
+
+    def fechar(self):
+        if isinstance(self.lexer, LexerParalelo):
+            self.lexer.fechar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def compilar_codigo(self, codigo, instrumentacao=None):
+        """ Com uma Instrumentacao (instrumentacao.py), mede as fases e conta o trabalho de cada uma.
+        Nesse caso os tokens são lidos todos antes da análise sintática, para medir as duas em separado. """
+        self.lexer.lineno = 1
+        self.lexer.input(codigo)
+        return self._compilar(self.lexer, instrumentacao)
+
+    def compilar_arquivo(self, caminho, mmap=False, instrumentacao=None):
+        """ Com mmap=True o arquivo é lido aos poucos, por um mmap, sem nunca estar
+        inteiro na memória (LexerRapido.input_arquivo; o lexer PLY precisa do texto todo). """
+        if isinstance(self.lexer, LexerParalelo):
+            # Cada processo lê o seu bloco do arquivo.
+            self.lexer.lineno = 1
+            self.lexer.input_arquivo(caminho)
+            return self._compilar(self.lexer, instrumentacao)
+        if not mmap:
+            with open(caminho, 'r') as file:
+                return self.compilar_codigo(file.read(), instrumentacao)
+        lexer_arquivo = LexerRapido()
+        lexer_arquivo.input_arquivo(caminho)
+        return self._compilar(lexer_arquivo, instrumentacao)
+
+    def _compilar(self, lexer_entrada, instrumentacao):
+        diagnosticos_sintaticos = self.parser.diagnosticos_sintaticos = Diagnosticos(self.max_erros)
+        fase = instrumentacao.fase if instrumentacao else _sem_fase
+        if instrumentacao:
+            with fase('lexico'):
+                tokens = list(iter(lexer_entrada.token, None))
+            num_tokens = len(tokens)
+            instrumentacao.contar('tokens', num_tokens)
+            contar_token = iter(tokens + [None]).__next__
+        else:
+            proximo_token = lexer_entrada.token
+            num_tokens = 0
+            def contar_token():
+                nonlocal num_tokens
+                tok = proximo_token()
+                if tok is not None: num_tokens += 1
+                return tok
+
+        with fase('sintatico'):
+            try:
+                arvore_sintatica = self.parser.parse(lexer=lexer_entrada, tokenfunc=contar_token)
+            except LimiteDiagnosticos:
+                arvore_sintatica = None
+        # A análise semântica de uma AST recuperada de erros de sintaxe só
+        # produziria erros em cascata das declarações descartadas.
+        if arvore_sintatica is None or diagnosticos_sintaticos.lista:
+            diagnosticos = diagnosticos_sintaticos.lista or [Diagnostico('sintatico', MSG_ERRO_SINTATICO)]
+            return ResultadoCompilacao(diagnosticos=diagnosticos, num_tokens=num_tokens)
+        if instrumentacao:
+            instrumentacao.registrar_ast(arvore_sintatica)
+
+        if self.passo_unico:
+            classe = AnalisadorGeradorCIInstrumentado if instrumentacao else AnalisadorGeradorCI
+        else:
+            classe = AnalisadorSemanticoInstrumentado if instrumentacao else AnalisadorSemantico
+        analisador = classe(max_erros=self.max_erros)
+        with fase('semantico_e_geracao' if self.passo_unico else 'semantico'):
+            try:
+                analisador.visitar(arvore_sintatica)
+            except LimiteDiagnosticos:
+                pass
+        if instrumentacao:
+            instrumentacao.registrar_analisador(analisador)
+        if analisador.diagnosticos.lista:
+            return ResultadoCompilacao(ast=arvore_sintatica, tabela_simbolos=analisador.pilha_escopos[0],
+                                       diagnosticos=analisador.diagnosticos.lista, num_tokens=num_tokens)
+
+        if self.otimizar:
+            with fase('otimizacao_ast'):
+                OtimizadorAST().visitar(arvore_sintatica)
+        if self.passo_unico:
+            gerador = analisador
+        else:
             gerador = GeradorCI()
-            gerador.visitar(arvore_sintatica)
-            codigo_intermediario = gerador.codigo
-            print("--- Geração de Código Concluída! ---")
-            
-            print("\nCódigo Intermediário Gerado (TAC):")
-            if not codigo_intermediario:
-                print("(Nenhuma instrução gerada. O corpo do programa pode estar vazio.)")
-            for instr in codigo_intermediario:
-                print(instr)
-
-        except Exception as e:
-            print(f"\nERRO: {e}")
-            
-except FileNotFoundError:
-    print("Arquivo 'exemplo.pas' não encontrado. Crie um com código para testar.")
\ No newline at end of file
+            with fase('geracao'):
+                gerador.visitar(arvore_sintatica)
+        codigo, funcoes = gerador.codigo, gerador.funcoes
+        if instrumentacao:
+            instrumentacao.registrar_codigo('gerado', codigo)
+        expansao = None
+        if self.expandir:
+            with fase('expansao'):
+                codigo, expansao = expandir_chamadas(codigo, funcoes, self.tamanho_expansao, self.orcamento_expansao)
+            if instrumentacao:
+                instrumentacao.contar('chamadas_expandidas', expansao.chamadas)
+                instrumentacao.contar('variacao_instrucoes_expansao', expansao.variacao)
+        if self.otimizar:
+            with fase('otimizacao_tac'):
+                codigo = otimizar_tac(codigo)
+                for funcao in funcoes.values(): funcao.codigo = otimizar_tac(funcao.codigo)
+                codigo = _eliminar_verificacoes(codigo, funcoes, analisador.pilha_escopos[0])
+        num_temporarios = None
+        if self.reusar_temps:
+            with fase('alocacao_temporarios'):
+                codigo, num_temporarios = reusar_temporarios(codigo)
+                for funcao in funcoes.values(): funcao.codigo = reusar_temporarios(funcao.codigo)[0]
+        if instrumentacao and (self.otimizar or self.reusar_temps or self.expandir):
+            instrumentacao.registrar_codigo('final', codigo)
+        return ResultadoCompilacao(ast=arvore_sintatica, tabela_simbolos=analisador.pilha_escopos[0], codigo=codigo,
+                                   num_tokens=num_tokens, num_temporarios=num_temporarios, funcoes=funcoes,
+                                   expansao=expansao)
+
+# --------------------------------------------------------------------
+# EXECUÇÃO COMO SCRIPT
+# --------------------------------------------------------------------
+
+def main(argv):
+    # Uso: python3 parser.py [-O] [--expandir] [--mmap] [--lexico-paralelo N] [--stats [ARQUIVO]] [--profile DIR] [arquivo.pas]
+    ap = argparse.ArgumentParser(prog=argv[0], description="Compila um arquivo Paston e mostra o TAC gerado.")
+    ap.add_argument('arquivo', nargs='?', default='exemplo.pas')
+    ap.add_argument('-O', dest='otimizar', action='store_true', help="otimiza a AST e o TAC")
+    ap.add_argument('--expandir', action='store_true', help="expande em linha as chamadas de funções pequenas")
+    ap.add_argument('--mmap', action='store_true', help="lê o arquivo aos poucos, por um mmap (para fontes muito grandes)")
+    ap.add_argument('--lexico-paralelo', type=int, default=0, metavar='N', help="tokeniza arquivos grandes em N processos")
+    ap.add_argument('--stats', nargs='?', const='-', metavar='ARQUIVO',
+                    help="grava o relatório JSON de tempos e contagens por fase (sem ARQUIVO: só ele, na saída padrão)")
+    ap.add_argument('--profile', metavar='DIR', help="grava em DIR um perfil cProfile e um snapshot tracemalloc por fase")
+    args = ap.parse_args(argv[1:])
+    if not os.path.isfile(args.arquivo):
+        print(f"Arquivo '{args.arquivo}' não encontrado. Crie um com código para testar.")
+        return 1
+
+    instrumentacao = None
+    if args.stats or args.profile:
+        from instrumentacao import Instrumentacao
+        instrumentacao = Instrumentacao(perfil=args.profile)
+    # Com o relatório na saída padrão, ela traz só o JSON.
+    mostrar = print if args.stats != '-' else lambda *a, **k: None
+
+    with Compilador(otimizar=args.otimizar, trabalhadores_lexico=args.lexico_paralelo,
+                    expandir=args.expandir) as compilador:
+        mostrar("--- Iniciando Compilação ---")
+        resultado = compilador.compilar_arquivo(args.arquivo, mmap=args.mmap, instrumentacao=instrumentacao)
+    if args.stats:
+        relatorio = dict(instrumentacao.relatorio(), arquivo=args.arquivo, sucesso=resultado.sucesso)
+        if args.stats == '-':
+            print(json.dumps(relatorio, ensure_ascii=False, indent=2))
+        else:
+            with open(args.stats, 'w') as file:
+                json.dump(relatorio, file, ensure_ascii=False, indent=2)
+    if not resultado.sucesso:
+        for erro in resultado.erros:
+            mostrar(f"\nERRO: {erro}")
+        return 1
+    mostrar("--- Análise Sintática, Semântica e Geração de Código Concluídas! ---")
+
+    mostrar("\nCódigo Intermediário Gerado (TAC):")
+    if not resultado.codigo:
+        mostrar("(Nenhuma instrução gerada. O corpo do programa pode estar vazio.)")
+    for linha in linhas_tac(resultado.codigo, resultado.funcoes):
+        mostrar(linha)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
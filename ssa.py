@@ -0,0 +1,709 @@
+import copy
+from collections import namedtuple
+
+from grafo_fluxo import Bits, GrafoFluxo, resolver_fluxo
+from otimizador_tac import (COMUTATIVOS, OPERADORES, chave_constante, dobrar, eh_acesso, eh_constante, eh_temp,
+                           ler_acesso, montar_acesso)
+
+# --------------------------------------------------------------------
+# FORMA SSA E NUMERAÇÃO DE VALORES GLOBAL
+# construir_ssa renomeia o TAC de um corpo (o principal, o único que o
+# GeradorCI emite) para que cada nome seja definido uma só vez: 'x' vira
+# 'x#1', 'x#2', ... e 'x#0' é o valor na entrada. As funções phi ficam no
+# início dos blocos de junção em que o nome está vivo (SSA podada, pelas
+# fronteiras de dominância). Uma escrita em 'a[i].f' define uma nova versão
+# de 'a' a partir da anterior, e uma chamada define uma nova versão de cada
+# variável (criada só quando alguém a lê).
+#
+# numerar_valores_global percorre a árvore de dominadores com tabelas com
+# escopo: uma expressão (ou leitura de memória) já calculada em um bloco
+# dominante vira cópia do nome que guarda o valor. Só temporários com uma
+# única definição servem de líderes; se o valor está numa variável, a
+# definição passa por um temporário novo. Assim duas versões do mesmo nome
+# nunca ficam vivas ao mesmo tempo (SSA convencional) e sair_ssa só tira os
+# números de versão. verificar_ssa confere esses invariantes.
+# --------------------------------------------------------------------
+
+ROTULO_ENTRADA = '<entrada>'
+
+class Acesso(namedtuple('Acesso', 'base partes')):
+    """ Leitura de memória em SSA: `base` é a versão do vetor/record lida. """
+    __slots__ = ()
+    def __str__(self):
+        return montar_acesso(self.base, self.partes)
+    __repr__ = __str__
+
+class Escrita(namedtuple('Escrita', 'nova base partes')):
+    """ Destino de uma escrita em memória: a versão `nova` é `base` com a posição alterada. """
+    __slots__ = ()
+    def __str__(self):
+        return montar_acesso(self.nova, self.partes)
+    __repr__ = __str__
+
+class Phi:
+    __slots__ = ('nome', 'dest', 'args')
+
+    def __init__(self, nome, num_args):
+        self.nome = nome
+        self.dest = None
+        self.args = [None] * num_args   # um por predecessor alcançável, na ordem de FuncaoSSA.predecessores
+
+    def __repr__(self):
+        return f"{self.dest} := phi({', '.join(map(str, self.args))})"
+
+def _instrucao(modelo, op, arg1, arg2, dest):
+    novo = copy.copy(modelo)
+    novo.op, novo.arg1, novo.arg2, novo.dest = op, arg1, arg2, dest
+    return novo
+
+def _nomes(operando):
+    """ Nomes lidos por um operando do TAC original (a base e os índices de um acesso). """
+    if type(operando) is not str:
+        return []
+    if not eh_acesso(operando):
+        return [operando]
+    base, partes = ler_acesso(operando)
+    nomes = [base]
+    for tipo, valor in partes:
+        if tipo == '[': nomes.extend(_nomes(valor))
+    return nomes
+
+def _efeitos(instr):
+    """ (nomes lidos, nome definido ou None, se é chamada) de uma instrução do TAC original. """
+    op = instr.op
+    if op in OPERADORES or op == ':=' or op == 'call':
+        lidos = [] if op == 'call' else _nomes(instr.arg1) + _nomes(instr.arg2)
+        dest = instr.dest
+        if eh_acesso(dest):
+            # Escrita parcial: lê a versão anterior do vetor/record e define a próxima.
+            lidos.extend(_nomes(dest))
+            return lidos, ler_acesso(dest)[0], op == 'call'
+        return lidos, dest if type(dest) is str else None, op == 'call'
+    if op == 'param' or op == 'return' or op == 'ifFalse' or op == 'limite':
+        return _nomes(instr.arg1), None, False
+    if op == 'label' or op == 'goto':
+        return [], None, False
+    return _nomes(instr.arg1) + _nomes(instr.arg2) + _nomes(instr.dest), None, False
+
+def dominadores(grafo):
+    """ Dominador imediato de cada bloco (algoritmo de Cooper, Harvey e Kennedy).
+
+    A entrada é o seu próprio dominador e os blocos inalcançáveis ficam com None.
+    """
+    alcancaveis = grafo.alcancaveis()
+    pos = [b for b in grafo.pos_ordem() if b in alcancaveis]
+    numero = [0] * len(grafo.blocos)
+    for i, b in enumerate(pos): numero[b] = i
+    idom = [None] * len(grafo.blocos)
+    if not pos:
+        return idom
+    idom[0] = 0
+    ordem = pos[-2::-1]   # pós-ordem reversa, sem a entrada
+    mudou = True
+    while mudou:
+        mudou = False
+        for b in ordem:
+            novo = None
+            for p in grafo.blocos[b].predecessores:
+                if idom[p] is None:
+                    continue
+                if novo is None:
+                    novo = p
+                    continue
+                a = p
+                while a != novo:
+                    while numero[a] < numero[novo]: a = idom[a]
+                    while numero[novo] < numero[a]: novo = idom[novo]
+            if idom[b] != novo:
+                idom[b] = novo
+                mudou = True
+    return idom
+
+def fronteiras_dominancia(grafo, idom):
+    fronteiras = [set() for _ in grafo.blocos]
+    for bloco in grafo.blocos:
+        b = bloco.indice
+        if idom[b] is None:
+            continue
+        predecessores = [p for p in bloco.predecessores if idom[p] is not None]
+        if len(predecessores) < 2:
+            continue
+        for p in predecessores:
+            while p != idom[b]:
+                fronteiras[p].add(b)
+                p = idom[p]
+    return fronteiras
+
+class FuncaoSSA:
+    """ Código em forma SSA.
+
+    `grafo` é o grafo de fluxo do código original, precedido de um rótulo de
+    entrada (que garante que a entrada não seja uma junção). `blocos[b]` são
+    as instruções do bloco b com os operandos renomeados (None para blocos
+    inalcançáveis, mantidos como estão) e `phis[b]` as suas funções phi.
+    Uma chamada guarda em `versoes` as versões das variáveis que define.
+    """
+    def __init__(self, grafo, idom):
+        self.grafo = grafo
+        self.idom = idom
+        self.filhos = [[] for _ in grafo.blocos]
+        for b, pai in enumerate(idom):
+            if pai is not None and b != 0: self.filhos[pai].append(b)
+        self.predecessores = [[p for p in bloco.predecessores if idom[p] is not None] for bloco in grafo.blocos]
+        self.blocos = [None] * len(grafo.blocos)
+        self.phis = [[] for _ in grafo.blocos]
+        self.nome_de = {}         # versão -> nome original
+        self.entrada = set()      # versões 'x#0'
+        self.contagem = {}        # nome -> última versão criada
+        self.num_definicoes = {}  # nome -> definições explícitas no código original
+        self.proximo_temp = 0
+
+    def nova_versao(self, nome):
+        k = self.contagem.get(nome, 0) + 1
+        self.contagem[nome] = k
+        versao = f"{nome}#{k}"
+        self.nome_de[versao] = nome
+        return versao
+
+    def versao_entrada(self, nome):
+        versao = f"{nome}#0"
+        if versao not in self.nome_de:
+            self.nome_de[versao] = nome
+            self.entrada.add(versao)
+        return versao
+
+    def novo_temporario(self):
+        nome = f"t{self.proximo_temp}"
+        self.proximo_temp += 1
+        return self.nova_versao(nome)
+
+    def preordem(self):
+        """ Blocos alcançáveis em pré-ordem da árvore de dominadores. """
+        ordem = []
+        pilha = [0] if self.blocos else []
+        while pilha:
+            b = pilha.pop()
+            ordem.append(b)
+            pilha.extend(reversed(self.filhos[b]))
+        return ordem
+
+    def __str__(self):
+        linhas = []
+        for bloco in self.grafo.blocos:
+            instrucoes = self.blocos[bloco.indice]
+            if instrucoes is None: instrucoes = self.grafo.instrucoes(bloco)
+            rotulo = 1 if instrucoes and instrucoes[0].op == 'label' else 0
+            linhas.extend(map(repr, instrucoes[:rotulo]))
+            linhas.extend(f"    {phi!r}" for phi in self.phis[bloco.indice])
+            linhas.extend(map(repr, instrucoes[rotulo:]))
+        return '\n'.join(linhas)
+
+# ---------------- construção ----------------
+
+def _vivos_na_entrada(grafo, alcancaveis, efeitos, variaveis):
+    """ Nomes lidos antes de redefinidos a partir da entrada de cada bloco.
+
+    Só as leituras explícitas contam: as phi servem para dar versão a elas, e o
+    que uma chamada lê das variáveis não precisa de versão. Uma chamada define
+    todas as variáveis.
+    """
+    bits = Bits()
+    gen, kill = [], []
+    todas = None
+    for bloco in grafo.blocos:
+        g = k = 0
+        if bloco.indice in alcancaveis:
+            for i in range(bloco.fim - 1, bloco.inicio - 1, -1):
+                lidos, definido, chamada = efeitos[i]
+                if chamada:
+                    if todas is None:
+                        todas = 0
+                        for nome in variaveis: todas |= bits.bit(nome)
+                    g &= ~todas
+                    k |= todas
+                if definido is not None:
+                    b = bits.bit(definido)
+                    g &= ~b
+                    k |= b
+                for nome in lidos: g |= bits.bit(nome)
+        gen.append(g)
+        kill.append(k)
+    entradas, _ = resolver_fluxo(grafo, gen, kill, para_frente=False)
+    return bits, entradas
+
+def construir_ssa(codigo):
+    """ Converte um corpo em TAC para a forma SSA (podada). Devolve uma FuncaoSSA. """
+    if codigo:
+        codigo = [_instrucao(codigo[0], 'label', None, None, ROTULO_ENTRADA)] + list(codigo)
+    grafo = GrafoFluxo(codigo)
+    idom = dominadores(grafo)
+    ssa = FuncaoSSA(grafo, idom)
+    alcancaveis = {b for b, pai in enumerate(idom) if pai is not None}
+
+    efeitos = [_efeitos(instr) for instr in codigo]
+    variaveis = set()
+    definicoes = {}   # nome -> blocos alcançáveis que o definem
+    blocos_com_chamada = []
+    maior_temp = -1
+    for bloco in grafo.blocos:
+        for i in range(bloco.inicio, bloco.fim):
+            lidos, definido, chamada = efeitos[i]
+            for nome in lidos + ([definido] if definido is not None else []):
+                if eh_temp(nome): maior_temp = max(maior_temp, int(nome[1:]))
+                else: variaveis.add(nome)
+            if definido is not None:
+                ssa.num_definicoes[definido] = ssa.num_definicoes.get(definido, 0) + 1
+                if bloco.indice in alcancaveis: definicoes.setdefault(definido, set()).add(bloco.indice)
+            if chamada and bloco.indice in alcancaveis and (not blocos_com_chamada or blocos_com_chamada[-1] != bloco.indice):
+                blocos_com_chamada.append(bloco.indice)
+    ssa.proximo_temp = maior_temp + 1
+
+    # Inserção das phi: fronteira de dominância iterada das definições, só onde o nome está vivo.
+    bits, vivos = _vivos_na_entrada(grafo, alcancaveis, efeitos, sorted(variaveis))
+    fronteiras = fronteiras_dominancia(grafo, idom)
+    for nome in sorted(set(definicoes) | (variaveis if blocos_com_chamada else set())):
+        indice = bits.indices.get(nome)
+        if indice is None:
+            continue   # nunca vivo na entrada de um bloco
+        trabalho = list(definicoes.get(nome, ()))
+        if not eh_temp(nome): trabalho.extend(blocos_com_chamada)
+        vistos = set(trabalho)
+        com_phi = set()
+        while trabalho:
+            for y in fronteiras[trabalho.pop()]:
+                if y in com_phi:
+                    continue
+                com_phi.add(y)
+                if vivos[y] >> indice & 1:
+                    ssa.phis[y].append(Phi(nome, len(ssa.predecessores[y])))
+                if y not in vistos:
+                    vistos.add(y)
+                    trabalho.append(y)
+
+    _renomear(ssa, codigo, sorted(variaveis))
+    return ssa
+
+def _renomear(ssa, codigo, variaveis):
+    atual = {}   # nome -> versão atual, ou a chamada que a define
+    desfazer = []
+
+    def versao(nome):
+        v = atual.get(nome)
+        if v is None:
+            return ssa.versao_entrada(nome)
+        if type(v) is not str:
+            # Versão definida por uma chamada: criada no primeiro uso.
+            w = v.versoes.get(nome)
+            if w is None: w = v.versoes[nome] = ssa.nova_versao(nome)
+            return w
+        return v
+
+    def definir(nome, v):
+        desfazer.append((nome, atual.get(nome)))
+        atual[nome] = v
+
+    def uso(operando):
+        if type(operando) is not str:
+            return operando
+        if not eh_acesso(operando):
+            return versao(operando)
+        base, partes = ler_acesso(operando)
+        return Acesso(versao(base), tuple((t, uso(v)) if t == '[' else (t, v) for t, v in partes))
+
+    def destino(nome):
+        if eh_acesso(nome):
+            base, partes = ler_acesso(nome)
+            anterior = versao(base)
+            partes = tuple((t, uso(v)) if t == '[' else (t, v) for t, v in partes)
+            nova = ssa.nova_versao(base)
+            definir(base, nova)
+            return Escrita(nova, anterior, partes)
+        if type(nome) is not str:
+            return nome
+        nova = ssa.nova_versao(nome)
+        definir(nome, nova)
+        return nova
+
+    grafo = ssa.grafo
+    pilha = [(0, None)] if grafo.blocos else []
+    while pilha:
+        b, marca = pilha.pop()
+        if marca is not None:
+            while len(desfazer) > marca:
+                nome, anterior = desfazer.pop()
+                if anterior is None: del atual[nome]
+                else: atual[nome] = anterior
+            continue
+        pilha.append((b, len(desfazer)))
+        for phi in ssa.phis[b]:
+            phi.dest = ssa.nova_versao(phi.nome)
+            definir(phi.nome, phi.dest)
+        bloco = grafo.blocos[b]
+        novas = []
+        for instr in codigo[bloco.inicio:bloco.fim]:
+            op = instr.op
+            if op in OPERADORES or op == ':=':
+                arg1, arg2 = uso(instr.arg1), uso(instr.arg2)
+                novas.append(_instrucao(instr, op, arg1, arg2, destino(instr.dest)))
+            elif op == 'param' or op == 'return' or op == 'ifFalse' or op == 'limite':
+                novas.append(_instrucao(instr, op, uso(instr.arg1), instr.arg2, instr.dest))
+            elif op == 'call':
+                novo = _instrucao(instr, op, instr.arg1, instr.arg2, None)
+                novo.versoes = {}
+                for nome in variaveis: definir(nome, novo)
+                # O resultado é gravado depois das variáveis alteradas pela chamada.
+                novo.dest = destino(instr.dest)
+                novas.append(novo)
+            elif op == 'label' or op == 'goto':
+                novas.append(instr)
+            else:
+                novas.append(_instrucao(instr, op, uso(instr.arg1), uso(instr.arg2), uso(instr.dest)))
+        ssa.blocos[b] = novas
+        for s in bloco.sucessores:
+            j = ssa.predecessores[s].index(b)
+            for phi in ssa.phis[s]:
+                phi.args[j] = versao(phi.nome)
+        pilha.extend((f, None) for f in reversed(ssa.filhos[b]))
+
+# ---------------- verificação ----------------
+
+def _lidas(operando):
+    """ Versões lidas por um operando em SSA. """
+    if type(operando) is str:
+        return [operando]
+    if isinstance(operando, Acesso) or isinstance(operando, Escrita):
+        lidas = [operando.base]
+        for tipo, valor in operando.partes:
+            if tipo == '[': lidas.extend(_lidas(valor))
+        return lidas
+    return []
+
+def _usos_e_definicoes(instr):
+    op = instr.op
+    if op == 'label' or op == 'goto':
+        return [], []
+    if op == 'param' or op == 'return' or op == 'ifFalse' or op == 'limite':
+        return _lidas(instr.arg1), []
+    lidos = [] if op == 'call' else _lidas(instr.arg1) + _lidas(instr.arg2)
+    dest = instr.dest
+    if op not in OPERADORES and op not in (':=', 'call'):
+        return lidos + _lidas(dest), []
+    definidas = list(getattr(instr, 'versoes', {}).values())
+    if isinstance(dest, Escrita):
+        # O resultado de uma chamada é gravado sobre a versão que a própria chamada define.
+        lidos.extend(_lidas(dest)[1 if op == 'call' else 0:])
+        definidas.append(dest.nova)
+    elif type(dest) is str:
+        definidas.append(dest)
+    return lidos, definidas
+
+def verificar_ssa(ssa, convencional=True):
+    """ Confere os invariantes da forma SSA e devolve a lista de problemas (vazia se estiver tudo certo).
+
+    Cada versão é definida uma só vez e a definição domina cada uso (o de um
+    argumento de phi fica no fim do predecessor correspondente); cada phi tem
+    um argumento por predecessor. Com convencional=True confere também que
+    duas versões do mesmo nome nunca estão vivas ao mesmo tempo, condição para
+    sair_ssa só tirar os números de versão.
+    """
+    problemas = []
+    ordem = ssa.preordem()
+    # Intervalos da árvore de dominadores: a domina b se entra[a] <= entra[b] < sai[a].
+    entra, sai = {}, {}
+    relogio = 0
+    pilha = [(0, False)] if ordem else []
+    while pilha:
+        b, fim = pilha.pop()
+        if fim:
+            sai[b] = relogio
+            continue
+        entra[b] = relogio
+        relogio += 1
+        pilha.append((b, True))
+        pilha.extend((f, False) for f in ssa.filhos[b])
+    domina = lambda a, b: entra[a] <= entra[b] < sai[a]
+
+    definicao = {v: (0, -1) for v in ssa.entrada}
+    def definir(v, lugar):
+        if v in definicao:
+            problemas.append(f"'{v}' definida mais de uma vez.")
+        definicao[v] = lugar
+    for b in ordem:
+        for phi in ssa.phis[b]:
+            definir(phi.dest, (b, -1))
+            if len(phi.args) != len(ssa.predecessores[b]) or None in phi.args:
+                problemas.append(f"Phi {phi!r} do bloco {b} sem um argumento por predecessor.")
+        for k, instr in enumerate(ssa.blocos[b]):
+            for v in _usos_e_definicoes(instr)[1]: definir(v, (b, k))
+
+    def conferir(v, b, k, onde):
+        lugar = definicao.get(v)
+        if lugar is None:
+            problemas.append(f"'{v}' usada {onde} sem definição.")
+        elif not (lugar[0] == b and lugar[1] < k) and not (lugar[0] != b and domina(lugar[0], b)):
+            problemas.append(f"A definição de '{v}' não domina o seu uso {onde}.")
+    for b in ordem:
+        for k, instr in enumerate(ssa.blocos[b]):
+            for v in _usos_e_definicoes(instr)[0]: conferir(v, b, k, f"em '{instr!r}'")
+        for j, p in enumerate(ssa.predecessores[b]):
+            for phi in ssa.phis[b]:
+                if phi.args[j] is not None:
+                    conferir(phi.args[j], p, len(ssa.blocos[p]), f"na phi {phi!r}")
+    if convencional and not problemas:
+        problemas.extend(_interferencias(ssa, ordem))
+    return problemas
+
+def _interferencias(ssa, ordem):
+    """ Versões do mesmo nome vivas ao mesmo tempo. """
+    grafo = ssa.grafo
+    nome_de = ssa.nome_de
+    args_saida = [[] for _ in grafo.blocos]   # argumentos de phi lidos no fim de cada bloco
+    for b in ordem:
+        for j, p in enumerate(ssa.predecessores[b]):
+            args_saida[p].extend(phi.args[j] for phi in ssa.phis[b])
+    bits = Bits()
+    gen, kill = [], []
+    for bloco in grafo.blocos:
+        b = bloco.indice
+        expostos, mortos = set(args_saida[b]), set()
+        for instr in reversed(ssa.blocos[b] or ()):
+            lidos, definidas = _usos_e_definicoes(instr)
+            expostos.difference_update(definidas)
+            mortos.update(definidas)
+            expostos.update(lidos)
+        for phi in ssa.phis[b]:
+            expostos.discard(phi.dest)
+            mortos.add(phi.dest)
+        gen.append(sum(bits.bit(v) for v in expostos))
+        kill.append(mortos)
+    indices = bits.indices
+    kill = [sum(1 << indices[v] for v in mortos if v in indices) for mortos in kill]
+    _, saidas = resolver_fluxo(grafo, gen, kill, para_frente=False)
+
+    problemas = []
+    variaveis = {nome for v, nome in nome_de.items() if not eh_temp(nome)}
+    for b in ordem:
+        vivas = set(bits.conjunto(saidas[b])) | set(args_saida[b])
+        por_nome = {}
+        for v in vivas: por_nome.setdefault(nome_de[v], set()).add(v)
+        def definir(definidas, onde):
+            # As versões definidas pela mesma instrução (uma chamada que grava num vetor) são simultâneas.
+            for v in definidas: por_nome.get(nome_de[v], set()).discard(v)
+            for v in definidas:
+                outras = por_nome.get(nome_de[v])
+                if outras:
+                    problemas.append(f"'{v}' definida {onde} com {sorted(outras)} ainda viva.")
+        for instr in reversed(ssa.blocos[b]):
+            lidos, definidas = _usos_e_definicoes(instr)
+            definir(definidas, f"em '{instr!r}'")
+            if instr.op == 'call':
+                # A chamada pode alterar qualquer variável, mesmo as versões que ninguém lê.
+                for nome in variaveis & por_nome.keys():
+                    if por_nome[nome]:
+                        problemas.append(f"{sorted(por_nome[nome])} viva depois de '{instr!r}', que pode alterar '{nome}'.")
+            for v in lidos: por_nome.setdefault(nome_de[v], set()).add(v)
+        definir([phi.dest for phi in ssa.phis[b]], f"pelas phi do bloco {b}")
+    return problemas
+
+# ---------------- numeração de valores global ----------------
+
+def numerar_valores_ssa(ssa):
+    """ Numeração de valores sobre a árvore de dominadores (em SSA). Devolve quantas
+    expressões e leituras de memória viraram cópias de um valor já calculado. """
+    vn = {}          # versão -> número de valor
+    constante = {}   # número -> constante
+    numeros = {}     # chave de uma constante ou expressão -> número (as expressões com escopo)
+    lider = {}       # número -> versão que guarda o valor, definida num bloco dominante (com escopo)
+    definicao = {}   # versão -> (bloco, instrução) que a calcula
+    temporarios = {} # id da instrução materializada -> (temporário novo, bloco, instrução)
+    desfazer = []
+    proximo = [0]
+    trocas = 0
+
+    def novo():
+        proximo[0] += 1
+        return proximo[0]
+
+    def com_escopo(tabela, chave, valor):
+        desfazer.append((tabela, chave, tabela.get(chave)))
+        tabela[chave] = valor
+
+    def valor(operando):
+        if eh_constante(operando):
+            chave = ('c', chave_constante(operando))
+            n = numeros.get(chave)
+            if n is None:
+                n = numeros[chave] = novo()
+                constante[n] = operando
+            return n
+        if isinstance(operando, Acesso):
+            chave = ('m', valor(operando.base), tuple((t, valor(v)) if t == '[' else (t, v) for t, v in operando.partes))
+            n = numeros.get(chave)
+            if n is None:
+                n = novo()
+                com_escopo(numeros, chave, n)
+            return n
+        n = vn.get(operando)
+        if n is None: n = vn[operando] = novo()
+        return n
+
+    def propagar(operando):
+        """ Troca as versões de valor constante pela constante. """
+        if type(operando) is str:
+            n = vn.get(operando)
+            return constante[n] if n in constante else operando
+        if isinstance(operando, Acesso):
+            return Acesso(operando.base, tuple((t, propagar(v)) if t == '[' else (t, v) for t, v in operando.partes))
+        if isinstance(operando, Escrita):
+            return Escrita(operando.nova, operando.base, tuple((t, propagar(v)) if t == '[' else (t, v) for t, v in operando.partes))
+        return operando
+
+    def disponivel(n):
+        """ Nome que pode substituir o valor n aqui, ou None. """
+        v = lider.get(n)
+        if v is None:
+            return None
+        nome = ssa.nome_de[v]
+        if eh_temp(nome) and ssa.num_definicoes.get(nome) == 1:
+            return v   # o valor nunca sai do temporário
+        lugar = definicao.get(v)
+        if lugar is None:
+            return None
+        # O valor está numa variável (ou num temporário redefinido): passa a ser calculado num temporário novo.
+        b, instr = lugar
+        materializado = temporarios.get(id(instr))
+        if materializado is None:
+            materializado = temporarios[id(instr)] = (ssa.novo_temporario(), b, instr)
+        return materializado[0]
+
+    def registrar(dest, n, b, instr):
+        vn[dest] = n
+        if n not in lider:
+            com_escopo(lider, n, dest)
+            definicao[dest] = (b, instr)
+
+    for v in ssa.entrada: vn[v] = novo()
+    pilha = [(0, None)] if ssa.blocos and ssa.blocos[0] is not None else []
+    while pilha:
+        b, marca = pilha.pop()
+        if marca is not None:
+            while len(desfazer) > marca:
+                tabela, chave, anterior = desfazer.pop()
+                if anterior is None: del tabela[chave]
+                else: tabela[chave] = anterior
+            continue
+        pilha.append((b, len(desfazer)))
+
+        for phi in ssa.phis[b]:
+            if any(a not in vn for a in phi.args):
+                vn[phi.dest] = novo()   # argumento vindo de uma aresta de retorno
+                continue
+            args = tuple(vn[a] for a in phi.args)
+            if len(set(args)) == 1:
+                vn[phi.dest] = args[0]
+                continue
+            chave = ('phi', b, args)
+            n = numeros.get(chave)
+            if n is None:
+                n = novo()
+                com_escopo(numeros, chave, n)
+            vn[phi.dest] = n
+
+        instrucoes = ssa.blocos[b]
+        for k, instr in enumerate(instrucoes):
+            op = instr.op
+            if op in OPERADORES or op == ':=':
+                a, c = propagar(instr.arg1), propagar(instr.arg2)
+                dest = propagar(instr.dest) if isinstance(instr.dest, Escrita) else instr.dest
+                if op in OPERADORES and eh_constante(a) and eh_constante(c):
+                    dobrado = dobrar(op, a, c)
+                    if dobrado is not None: op, a, c = ':=', dobrado, None
+                substituto = None
+                calcula = op in OPERADORES or isinstance(a, Acesso)   # expressão ou leitura de memória
+                if op in OPERADORES:
+                    na, nc = valor(a), valor(c)
+                    if op in COMUTATIVOS and nc < na: na, nc = nc, na
+                    chave = (op, na, nc)
+                    n = numeros.get(chave)
+                    if n is None:
+                        n = novo()
+                        com_escopo(numeros, chave, n)
+                else:
+                    n = valor(a)
+                if calcula:
+                    substituto = disponivel(n)
+                    if substituto is not None:
+                        op, a, c = ':=', substituto, None
+                        trocas += 1
+                if (op, a, c, dest) != (instr.op, instr.arg1, instr.arg2, instr.dest):
+                    instr = instrucoes[k] = _instrucao(instr, op, a, c, dest)
+                if isinstance(dest, Escrita):
+                    vn[dest.nova] = novo()
+                elif calcula and substituto is None:
+                    registrar(dest, n, b, instr)
+                else:
+                    vn[dest] = n
+            elif op == 'param' or op == 'return' or op == 'ifFalse' or op == 'limite':
+                a = propagar(instr.arg1)
+                if a != instr.arg1 or type(a) is not type(instr.arg1):
+                    instrucoes[k] = _instrucao(instr, op, a, instr.arg2, instr.dest)
+            elif op == 'call':
+                for v in instr.versoes.values(): vn[v] = novo()
+                if isinstance(instr.dest, Escrita): vn[instr.dest.nova] = novo()
+                elif instr.dest is not None: vn[instr.dest] = novo()
+        pilha.extend((f, None) for f in reversed(ssa.filhos[b]))
+
+    # 'x := e' vira 't := e; x := t' nas definições cujo valor passou a ser lido de um temporário novo.
+    por_bloco = {}
+    for temporario, b, instr in temporarios.values():
+        por_bloco.setdefault(b, {})[id(instr)] = temporario
+    for b, trocar in por_bloco.items():
+        novas = []
+        for instr in ssa.blocos[b]:
+            temporario = trocar.get(id(instr))
+            if temporario is not None:
+                novas.append(_instrucao(instr, instr.op, instr.arg1, instr.arg2, temporario))
+                instr = _instrucao(instr, ':=', temporario, None, instr.dest)
+            novas.append(instr)
+        ssa.blocos[b] = novas
+    return trocas
+
+# ---------------- saída da forma SSA ----------------
+
+def sair_ssa(ssa):
+    """ Volta ao TAC tirando os números de versão e as phi.
+
+    Só vale para SSA convencional (verificar_ssa(ssa, convencional=True)), como
+    a produzida por construir_ssa e mantida por numerar_valores_ssa.
+    """
+    nome_de = ssa.nome_de
+
+    def nome(operando):
+        if type(operando) is str:
+            return nome_de.get(operando, operando)
+        if isinstance(operando, Acesso) or isinstance(operando, Escrita):
+            return montar_acesso(nome_de[operando.base], tuple((t, nome(v)) if t == '[' else (t, v) for t, v in operando.partes))
+        return operando
+
+    codigo = []
+    for bloco in ssa.grafo.blocos:
+        instrucoes = ssa.blocos[bloco.indice]
+        if instrucoes is None:
+            codigo.extend(ssa.grafo.instrucoes(bloco))
+            continue
+        for instr in instrucoes:
+            if instr.op == 'label' and instr.dest == ROTULO_ENTRADA:
+                continue
+            if instr.op == 'label' or instr.op == 'goto':
+                codigo.append(instr)
+                continue
+            novo = _instrucao(instr, instr.op, nome(instr.arg1), nome(instr.arg2), nome(instr.dest))
+            if instr.op == 'call': del novo.versoes
+            codigo.append(novo)
+    return codigo
+
+def numerar_valores_global(codigo):
+    """ Numeração de valores global: SSA, numeração sobre a árvore de dominadores e volta ao TAC. """
+    ssa = construir_ssa(codigo)
+    numerar_valores_ssa(ssa)
+    return sair_ssa(ssa)
@@ -0,0 +1,264 @@
+import struct
+import sys
+from array import array
+
+from otimizador_tac import eh_acesso, eh_temp, ler_acesso, montar_acesso
+from parser import FuncaoTAC, InstrucaoTAC
+
+# --------------------------------------------------------------------
+# FORMATO BINÁRIO DO TAC
+# Cabeçalho (little-endian):
+#   'PTAC', versão u16, largura u16 (2 ou 4 bytes por campo), entradas do
+#   pool u32, temporários u32, instruções u32, bytes do pool u32, funções u32
+# Pool de constantes e nomes, sem repetições. Cada entrada é um byte de tipo
+# seguido do valor:
+#   INTEIRO   i64            GRANDE  u32 + dígitos (inteiro fora de 64 bits)
+#   REAL      f64            NOME    u16 + UTF-8
+#   ACESSO    u32 base, u16 partes, e para cada parte u8 ('[' = 0, '.' = 1)
+#             e o operando i32: 'a[t1].f' guardado com a estrutura
+# Preenchimento até múltiplo de 4 e a tabela de funções. Cada função tem o
+# nome e o tipo de retorno (i32, operandos), os números de parâmetros, de
+# locais e de instruções (u32) e um par de operandos i32 (nome, tipo) por
+# parâmetro e por local, na ordem da declaração.
+# Depois, as instruções do corpo principal seguidas das de cada função, na
+# ordem da tabela: 4 campos inteiros com
+# sinal por instrução, (opcode, arg1, arg2, dest). Um operando k >= 0 é a
+# entrada k do pool, -1 é None e -(n + 2) é o temporário tN, que não ocupa o
+# pool. Um opcode negativo -(k + 1) indica uma operação fora da tabela cujo
+# nome é a entrada k do pool.
+# O carregador lê as instruções direto do buffer (memoryview.cast), sem cópia.
+# --------------------------------------------------------------------
+
+MAGICO = b'PTAC'
+VERSAO = 2
+OPCODES = (':=', '+', '-', '*', '/', 'param', 'call', 'return')
+_NUM_OPCODE = {op: i for i, op in enumerate(OPCODES)}
+
+INTEIRO, REAL, NOME, ACESSO, GRANDE = range(5)
+
+_CABECALHO = struct.Struct('<4sHHIIIII')
+_FUNCAO = struct.Struct('<iiIII')
+_PAR = struct.Struct('<ii')
+_INTEIRO = struct.Struct('<q')
+_REAL = struct.Struct('<d')
+_U32 = struct.Struct('<I')
+_PARTE = struct.Struct('<Bi')
+_U16 = struct.Struct('<H')
+_BASE_ACESSO = struct.Struct('<IH')
+_PARTES = {'[': 0, '.': 1}
+_FORMATOS = {2: 'h', 4: 'i'}
+
+class ErroFormatoTAC(Exception):
+    pass
+
+class _Pool:
+    def __init__(self):
+        self.indices = {}
+        self.partes = []
+        self.num_temporarios = 0
+
+    def indice(self, valor):
+        if valor is None:
+            return -1
+        if type(valor) is str and eh_temp(valor) and str(int(valor[1:])) == valor[1:]:
+            n = int(valor[1:])
+            if n >= self.num_temporarios: self.num_temporarios = n + 1
+            return -2 - n
+        # 1 e 1.0 são entradas diferentes, por isso o tipo faz parte da chave; um
+        # real é guardado pelos seus bytes, para que 0.0 e -0.0 não se confundam.
+        chave = (float, _REAL.pack(valor)) if type(valor) is float else (type(valor), valor)
+        k = self.indices.get(chave)
+        if k is None:
+            self.partes.append(self.codificar(valor))
+            k = self.indices[chave] = len(self.partes) - 1
+        return k
+
+    def codificar(self, valor):
+        if type(valor) is int:
+            if -2**63 <= valor < 2**63:
+                return bytes((INTEIRO,)) + _INTEIRO.pack(valor)
+            digitos = str(valor).encode('ascii')
+            return bytes((GRANDE,)) + _U32.pack(len(digitos)) + digitos
+        if type(valor) is float:
+            return bytes((REAL,)) + _REAL.pack(valor)
+        if type(valor) is not str:
+            raise ErroFormatoTAC(f"Operando não suportado: {valor!r}")
+        if eh_acesso(valor):
+            base, partes = ler_acesso(valor)
+            # Só guarda a estrutura quando ela reconstrói exatamente o mesmo texto.
+            if montar_acesso(base, partes) == valor:
+                indices = [(_PARTES[tipo], self.indice(v)) for tipo, v in partes]
+                cabecalho = _BASE_ACESSO.pack(self.indice(base), len(indices))
+                return bytes((ACESSO,)) + cabecalho + b''.join(_PARTE.pack(t, k) for t, k in indices)
+        texto = valor.encode('utf-8')
+        if len(texto) > 0xFFFF:
+            raise ErroFormatoTAC(f"Nome longo demais: {valor[:20]}...")
+        return bytes((NOME,)) + _U16.pack(len(texto)) + texto
+
+def codificar_tac(codigo, funcoes=None):
+    """ Serializa uma lista de InstrucaoTAC e as FuncaoTAC de `funcoes` (nome -> FuncaoTAC)
+    no formato binário. Devolve bytes. """
+    funcoes = list(funcoes.values()) if funcoes else []
+    pool = _Pool()
+    tabela = []
+    for funcao in funcoes:
+        tabela.append(_FUNCAO.pack(pool.indice(funcao.nome), pool.indice(funcao.tipo_retorno), len(funcao.parametros),
+                                   len(funcao.locais), len(funcao.codigo)))
+        for nome, tipo in funcao.parametros + funcao.locais:
+            tabela.append(_PAR.pack(pool.indice(nome), pool.indice(tipo)))
+    campos = array('i')
+    for corpo in [codigo] + [funcao.codigo for funcao in funcoes]:
+        for instr in corpo:
+            opcode = _NUM_OPCODE.get(instr.op)
+            if opcode is None:
+                opcode = -1 - pool.indice(instr.op)
+            campos.extend((opcode, pool.indice(instr.arg1), pool.indice(instr.arg2), pool.indice(instr.dest)))
+    # Campos de 16 bits quando todos os índices cabem neles.
+    largura = 2 if not campos or (-2**15 <= min(campos) and max(campos) < 2**15) else 4
+    instrucoes = array(_FORMATOS[largura], campos) if largura == 2 else campos
+    if sys.byteorder == 'big':
+        instrucoes.byteswap()
+    dados_pool = b''.join(pool.partes)
+    preenchimento = b'\0' * (-(_CABECALHO.size + len(dados_pool)) % 4)
+    cabecalho = _CABECALHO.pack(MAGICO, VERSAO, largura, len(pool.partes), pool.num_temporarios,
+                                len(codigo), len(dados_pool), len(funcoes))
+    return cabecalho + dados_pool + preenchimento + b''.join(tabela) + instrucoes.tobytes()
+
+def _ler_pool(buf, inicio, num_entradas, temporarios):
+    pool = []
+    pos = inicio
+    for _ in range(num_entradas):
+        tipo = buf[pos]
+        pos += 1
+        if tipo == INTEIRO:
+            pool.append(_INTEIRO.unpack_from(buf, pos)[0]); pos += 8
+        elif tipo == REAL:
+            pool.append(_REAL.unpack_from(buf, pos)[0]); pos += 8
+        elif tipo == NOME:
+            n = _U16.unpack_from(buf, pos)[0]
+            pool.append(str(buf[pos + 2:pos + 2 + n], 'utf-8'))
+            pos += 2 + n
+        elif tipo == GRANDE:
+            n = _U32.unpack_from(buf, pos)[0]
+            pool.append(int(bytes(buf[pos + 4:pos + 4 + n])))
+            pos += 4 + n
+        elif tipo == ACESSO:
+            base, n = _BASE_ACESSO.unpack_from(buf, pos)
+            pos += _BASE_ACESSO.size
+            partes = []
+            for _ in range(n):
+                t, k = _PARTE.unpack_from(buf, pos)
+                partes.append(('[' if t == 0 else '.', pool[k] if k >= 0 else temporarios[-2 - k]))
+                pos += _PARTE.size
+            pool.append(montar_acesso(pool[base], partes))
+        else:
+            raise ErroFormatoTAC(f"Tipo de entrada do pool desconhecido: {tipo}")
+    return pool
+
+class _Corpo:
+    """ Instruções de um corpo (principal ou de uma função) vistas no buffer. """
+    def __init__(self, instrucoes, pool, operandos):
+        self.instrucoes = instrucoes
+        self.pool = pool
+        self.operandos = operandos
+
+    def __len__(self):
+        return len(self.instrucoes) // 4
+
+    def __getitem__(self, i):
+        if i < 0: i += len(self)
+        if not 0 <= i < len(self): raise IndexError(i)
+        opcode, a, b, d = self.instrucoes[4 * i:4 * i + 4]
+        op = OPCODES[opcode] if opcode >= 0 else self.pool[-1 - opcode]
+        operandos = self.operandos
+        return InstrucaoTAC(op, operandos[a], operandos[b], operandos[d])
+
+    def __iter__(self):
+        operandos, pool = self.operandos, self.pool
+        campos = iter(self.instrucoes)
+        for opcode, a, b, d in zip(campos, campos, campos, campos):
+            op = OPCODES[opcode] if opcode >= 0 else pool[-1 - opcode]
+            yield InstrucaoTAC(op, operandos[a], operandos[b], operandos[d])
+
+    def lista(self):
+        return list(self)
+
+class CodigoTAC(_Corpo):
+    """ TAC carregado de um buffer binário.
+
+    `instrucoes` é uma visão de inteiros (opcode, arg1, arg2, dest) sobre o
+    próprio buffer e `pool` a lista de constantes e nomes. `operandos` estende o
+    pool com os temporários em ordem inversa e None no fim, de modo que
+    operandos[k] decodifica qualquer campo k, inclusive os negativos. As
+    InstrucaoTAC só são criadas quando pedidas (iteração, índice ou lista()).
+    `funcoes` (nome -> FuncaoTAC) traz as funções, cujo `codigo` é uma visão
+    do mesmo tipo.
+    """
+    def __init__(self, dados):
+        buf = memoryview(dados)
+        if len(buf) < 8:
+            raise ErroFormatoTAC("Arquivo TAC truncado.")
+        magico, versao = struct.unpack_from('<4sH', buf, 0)
+        if magico != MAGICO:
+            raise ErroFormatoTAC("Não é um arquivo TAC binário.")
+        if versao != VERSAO:
+            raise ErroFormatoTAC(f"Versão {versao} do formato TAC não suportada (esperada {VERSAO}).")
+        if len(buf) < _CABECALHO.size:
+            raise ErroFormatoTAC("Arquivo TAC truncado.")
+        (_, _, largura, num_pool, num_temporarios, num_instrucoes, bytes_pool,
+         num_funcoes) = _CABECALHO.unpack_from(buf, 0)
+        if largura not in _FORMATOS:
+            raise ErroFormatoTAC(f"Largura de campo inválida: {largura}.")
+        pos = _CABECALHO.size + bytes_pool
+        pos += -pos % 4
+        temporarios = [f"t{n}" for n in range(num_temporarios)]
+        pool = _ler_pool(buf, _CABECALHO.size, num_pool, temporarios)
+        temporarios.reverse()
+        operandos = pool + temporarios + [None]
+        assinaturas = []
+        try:
+            for _ in range(num_funcoes):
+                nome, tipo_retorno, num_parametros, num_locais, tamanho = _FUNCAO.unpack_from(buf, pos)
+                pos += _FUNCAO.size
+                pares = [tuple(operandos[k] for k in _PAR.unpack_from(buf, pos + _PAR.size * j))
+                         for j in range(num_parametros + num_locais)]
+                pos += _PAR.size * len(pares)
+                assinaturas.append((operandos[nome], pares[:num_parametros], pares[num_parametros:],
+                                    operandos[tipo_retorno], tamanho))
+        except struct.error:
+            raise ErroFormatoTAC("Arquivo TAC truncado.") from None
+        fim = pos + 4 * largura * (num_instrucoes + sum(a[-1] for a in assinaturas))
+        if len(buf) < fim:
+            raise ErroFormatoTAC("Arquivo TAC truncado.")
+        if sys.byteorder == 'little':
+            instrucoes = buf[pos:fim].cast(_FORMATOS[largura])
+        else:
+            copia = array(_FORMATOS[largura], buf[pos:fim].tobytes())
+            copia.byteswap()
+            instrucoes = memoryview(copia)
+        super().__init__(instrucoes[:4 * num_instrucoes], pool, operandos)
+        self.funcoes = {}
+        inicio = 4 * num_instrucoes
+        for nome, parametros, locais, tipo_retorno, tamanho in assinaturas:
+            corpo = _Corpo(instrucoes[inicio:inicio + 4 * tamanho], pool, operandos)
+            self.funcoes[nome] = FuncaoTAC(nome, parametros, locais, tipo_retorno, corpo)
+            inicio += 4 * tamanho
+
+def carregar_tac(dados):
+    """ Lê o formato binário (bytes, bytearray, mmap...) e devolve a lista de InstrucaoTAC do corpo principal. """
+    return CodigoTAC(dados).lista()
+
+def carregar_programa(dados):
+    """ Como carregar_tac, mas devolve (código, funções), com o código de cada FuncaoTAC em lista. """
+    codigo = CodigoTAC(dados)
+    funcoes = {nome: FuncaoTAC(nome, f.parametros, f.locais, f.tipo_retorno, f.codigo.lista())
+               for nome, f in codigo.funcoes.items()}
+    return codigo.lista(), funcoes
+
+def salvar_tac(codigo, caminho, funcoes=None):
+    with open(caminho, 'wb') as file:
+        file.write(codificar_tac(codigo, funcoes))
+
+def abrir_tac(caminho):
+    with open(caminho, 'rb') as file:
+        return CodigoTAC(file.read())